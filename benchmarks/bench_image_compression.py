@@ -0,0 +1,144 @@
+"""
+Time per image and output size of the attachment compression pipeline.
+
+Runs compress_image_bytes over a directory of phone photos and compares
+it with the previous pipeline: base64 in and out, a full decode, a LANCZOS
+resize, then JPEG encodes at quality 85/70/55/40 until one fits. Also
+reports throughput through the process pool used on the message path, and
+how long the event loop went without running (the loop should stay free
+while images compress).
+
+Without --images, it generates synthetic 12MP photo-like JPEGs (gradients
+plus sensor-like noise). These are harder to compress than most real
+photos, so run it on a real corpus for representative numbers.
+
+Usage:
+    python benchmarks/bench_image_compression.py [--images DIR] [--count N] [--max-bytes BYTES]
+"""
+
+import argparse
+import asyncio
+import base64
+import io
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from PIL import Image  # noqa: E402
+
+from signal_bot import image_compression  # noqa: E402
+from signal_bot.image_compression import compress_image_async, compress_image_bytes  # noqa: E402
+
+IMAGE_SUFFIXES = {".jpg", ".jpeg", ".png", ".webp"}
+
+
+def legacy_compress(base64_data: str, media_type: str, max_bytes: int) -> tuple[str, str]:
+    """The linear quality sweep this pipeline replaced."""
+    image_bytes = base64.b64decode(base64_data)
+    if len(image_bytes) <= max_bytes:
+        return base64_data, media_type
+    img = Image.open(io.BytesIO(image_bytes))
+    if img.mode in ('RGBA', 'P'):
+        img = img.convert('RGB')
+    if max(img.size) > 2000:
+        ratio = 2000 / max(img.size)
+        img = img.resize((int(img.width * ratio), int(img.height * ratio)), Image.Resampling.LANCZOS)
+    for quality in [85, 70, 55, 40]:
+        buffer = io.BytesIO()
+        img.save(buffer, format='JPEG', quality=quality, optimize=True)
+        compressed = buffer.getvalue()
+        if len(compressed) <= max_bytes:
+            return base64.b64encode(compressed).decode('utf-8'), 'image/jpeg'
+    img = img.resize((int(img.width * 0.5), int(img.height * 0.5)), Image.Resampling.LANCZOS)
+    buffer = io.BytesIO()
+    img.save(buffer, format='JPEG', quality=40, optimize=True)
+    return base64.b64encode(buffer.getvalue()).decode('utf-8'), 'image/jpeg'
+
+
+def synthetic_photo(seed: int) -> bytes:
+    """A 4032x3024 JPEG with smooth gradients and per-pixel noise."""
+    width, height = 4032, 3024
+    gradient = Image.linear_gradient("L").resize((width, height))
+    noise = Image.effect_noise((width, height), 40 + seed * 5)
+    img = Image.merge("RGB", (gradient, noise, gradient.rotate(90 + seed, expand=False)))
+    buffer = io.BytesIO()
+    img.save(buffer, format="JPEG", quality=95)
+    return buffer.getvalue()
+
+
+def load_corpus(directory, count: int) -> list[tuple[str, bytes, str]]:
+    """(name, image_bytes, media_type) per image."""
+    if directory:
+        paths = sorted(p for p in Path(directory).iterdir() if p.suffix.lower() in IMAGE_SUFFIXES)[:count]
+        corpus = []
+        for path in paths:
+            media_type = "image/png" if path.suffix.lower() == ".png" else "image/jpeg"
+            corpus.append((path.name, path.read_bytes(), media_type))
+        return corpus
+    return [(f"synthetic-{i}.jpg", synthetic_photo(i), "image/jpeg") for i in range(count)]
+
+
+def run(label: str, compress, corpus, max_bytes: int, as_base64: bool = False):
+    times, sizes = [], []
+    for _name, data, media_type in corpus:
+        if as_base64:
+            data = base64.b64encode(data).decode()
+        start = time.perf_counter()
+        out, _ = compress(data, media_type, max_bytes)
+        times.append((time.perf_counter() - start) * 1000)
+        sizes.append(len(out) * 3 // 4 if as_base64 else len(out))
+    print(f"{label:>8}: {statistics.mean(times):7.0f} ms/image (median {statistics.median(times):.0f}), "
+          f"output {statistics.mean(sizes) / 1e6:.2f} MB avg, max {max(sizes) / 1e6:.2f} MB")
+
+
+async def run_pool(corpus, max_bytes: int):
+    """Compress the corpus concurrently through the pool while measuring event loop stalls."""
+    longest_stall = 0.0
+    running = True
+
+    async def ticker():
+        nonlocal longest_stall
+        last = time.perf_counter()
+        while running:
+            await asyncio.sleep(0.005)
+            now = time.perf_counter()
+            longest_stall = max(longest_stall, now - last - 0.005)
+            last = now
+
+    # Start the workers before timing
+    await compress_image_async(corpus[0][1], corpus[0][2], max_bytes)
+    tick = asyncio.create_task(ticker())
+    start = time.perf_counter()
+    await asyncio.gather(*(compress_image_async(data, media_type, max_bytes) for _n, data, media_type in corpus))
+    elapsed = time.perf_counter() - start
+    running = False
+    await tick
+    print(f"    pool: {elapsed / len(corpus) * 1000:7.0f} ms/image wall-clock for {len(corpus)} concurrent, "
+          f"longest event loop stall {longest_stall * 1000:.0f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--images", help="directory of phone photos (default: synthetic)")
+    parser.add_argument("--count", type=int, default=8, help="images to use")
+    parser.add_argument("--max-bytes", type=int, default=4_000_000, help="compression target")
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.images, args.count)
+    if not corpus:
+        sys.exit(f"No images found in {args.images}")
+    oversized = sum(len(data) > args.max_bytes for _n, data, _m in corpus)
+    print(f"{len(corpus)} images, {oversized} over {args.max_bytes:,} bytes, "
+          f"{statistics.mean(len(d) for _n, d, _m in corpus) / 1e6:.2f} MB avg input")
+
+    run("legacy", legacy_compress, corpus, args.max_bytes, as_base64=True)
+    run("new", compress_image_bytes, corpus, args.max_bytes)
+    asyncio.run(run_pool(corpus, args.max_bytes))
+    image_compression.shutdown_pool()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Peak memory of building the API request for an image-bearing response.
+
+Replays the path from stored attachment to request body for a response
+with a few images in context, and reports the tracemalloc peak:
+
+- base64: images stored as base64 text, decoded to check the size limit,
+  put in a data URL f-string, then JSON-encoded and UTF-8 encoded
+  (how attachments were handled before);
+- bytes: raw bytes from the BLOB column passed as a memoryview and
+  base64-encoded once, straight into the body (shared_utils._encode_payload).
+
+Usage:
+    python benchmarks/bench_image_payload.py [--images N] [--image-kb KB]
+"""
+
+import argparse
+import base64
+import json
+import os
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from shared_utils import ImageDataURL, _encode_payload  # noqa: E402
+
+MAX_BYTES = 4_000_000
+
+
+def build_base64(stored: list[str]) -> bytes:
+    content = [{"type": "text", "text": "what do you see?"}]
+    for data in stored:
+        if len(base64.b64decode(data)) > MAX_BYTES:  # The old size check decoded every image
+            raise ValueError("benchmark images should be under the limit")
+        content.append({"type": "image_url", "image_url": {"url": f"data:image/jpeg;base64,{data}"}})
+    payload = {"model": "bench", "messages": [{"role": "user", "content": content}]}
+    return json.dumps(payload).encode("utf-8")
+
+
+def build_bytes(stored: list[bytes]) -> bytes:
+    content = [{"type": "text", "text": "what do you see?"}]
+    for data in stored:
+        if len(data) > MAX_BYTES:
+            raise ValueError("benchmark images should be under the limit")
+        content.append({"type": "image_url", "image_url": {"url": ImageDataURL("image/jpeg", memoryview(data))}})
+    payload = {"model": "bench", "messages": [{"role": "user", "content": content}]}
+    return _encode_payload(payload)
+
+
+def measure(label: str, build, load, rounds: int):
+    peaks, times = [], []
+    for _ in range(rounds):
+        tracemalloc.start()
+        start = time.perf_counter()
+        stored = load()  # What the DB hands back for the images in context
+        body = build(stored)
+        times.append(time.perf_counter() - start)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        peaks.append(peak)
+        del stored, body
+    print(f"{label:>7}: peak {min(peaks) / 1e6:6.1f} MB per response, {min(times) * 1000:6.1f} ms to build the body")
+    return min(peaks)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--images", type=int, default=4, help="images in the request (current + history)")
+    parser.add_argument("--image-kb", type=int, default=1500, help="size of each (already compressed) image")
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+
+    raw = [os.urandom(args.image_kb * 1024) for _ in range(args.images)]
+    encoded = [base64.b64encode(r).decode() for r in raw]
+    print(f"{args.images} images of {args.image_kb} KB ({args.images * args.image_kb / 1024:.1f} MB raw)")
+
+    # Copies stand in for the values loaded from the database on each response
+    before = measure("base64", build_base64, lambda: [e.encode().decode() for e in encoded], args.rounds)
+    after = measure("bytes", build_bytes, lambda: [bytes(bytearray(r)) for r in raw], args.rounds)
+
+    assert json.loads(build_bytes(raw)) == json.loads(build_base64(encoded)), "bodies differ"
+    print(f"peak memory: {after / before:.0%} of before; request bodies identical")
+
+
+if __name__ == "__main__":
+    main()
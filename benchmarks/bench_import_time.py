@@ -0,0 +1,89 @@
+"""
+Cold-start import cost of the bot's entry points.
+
+Runs each scenario in a fresh interpreter with ``-X importtime`` and reports
+the total import time, how many modules were loaded, and the heaviest
+top-level imports. Scenarios mirror what ``run_signal.py --bots-only`` and the
+admin UI load at startup, plus the tool schema selection for a bot with only
+light features enabled (which should not pull in the sheets or D&D schemas).
+
+Run it on two commits to compare. Scenarios whose dependencies are missing
+in the current environment are reported as errors rather than timed.
+
+Usage:
+    python benchmarks/bench_import_time.py [--repeat N] [--top N]
+"""
+
+import argparse
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+
+SCENARIOS = {
+    "bots-only": "import signal_bot.bot_manager",
+    "admin UI": "import signal_bot.admin.app, signal_bot.admin.routes",
+    "shared_utils": "import shared_utils",
+    "tool_schemas": "import tool_schemas",
+    "light bot tools": "from tool_schemas import get_tools_for_context, get_fast_path_tools\n"
+                       "get_tools_for_context(context='signal', weather_enabled=True, time_enabled=True)\n"
+                       "get_fast_path_tools('weather', {'weather_enabled': True})",
+    "executor": "import tool_executor",
+}
+
+
+def _run(code: str) -> tuple[list[tuple[int, int, int, str]], str]:
+    """Run code in a fresh interpreter; return (importtime rows, error)."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=ROOT, capture_output=True, text=True,
+    )
+    rows = []
+    error_lines = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:"):
+            error_lines.append(line)
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3 or not parts[0].strip().isdigit():
+            continue  # Header row
+        name = parts[2].rstrip()
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        rows.append((int(parts[0]), int(parts[1]), depth, name.strip()))
+    error = error_lines[-1] if proc.returncode != 0 and error_lines else ""
+    return rows, error
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--repeat", type=int, default=5, help="runs per scenario (best is reported)")
+    parser.add_argument("--top", type=int, default=5, help="heaviest imports to list per scenario")
+    args = parser.parse_args()
+
+    # Modules the interpreter loads on its own (site, encodings, ...) aren't counted
+    startup = {row[3] for row in _run("pass")[0]}
+
+    print(f"{'scenario':<16} {'import ms':>9} {'modules':>7}  heaviest imports (cumulative ms)")
+    for name, code in SCENARIOS.items():
+        best = None
+        error = ""
+        for _ in range(args.repeat):
+            rows, error = _run(code)
+            if error:
+                break
+            rows = [row for row in rows if row[3] not in startup]
+            total = sum(row[0] for row in rows)
+            if best is None or total < best[0]:
+                best = (total, rows)
+        if error:
+            print(f"{name:<16} {'error':>9} {'':>7}  {error}")
+            continue
+        total, rows = best
+        top_level = sorted((row for row in rows if row[2] == 0), key=lambda row: row[1], reverse=True)
+        heaviest = ", ".join(f"{row[3]} {row[1] / 1000:.1f}" for row in top_level[:args.top])
+        print(f"{name:<16} {total / 1000:>9.1f} {len(rows):>7}  {heaviest}")
+
+
+if __name__ == "__main__":
+    main()
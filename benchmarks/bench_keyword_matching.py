@@ -0,0 +1,143 @@
+"""
+Micro-benchmarks for per-message keyword and trigger checks.
+
+Compares the per-module scans (each check lowercases the message and runs
+its own ``any(kw in message_lower ...)`` loop, and the ~40 memory trigger
+regexes are searched case-insensitively) with a single ``analyze_message``
+pass, and checks that both give the same answers on the sample messages.
+
+Usage:
+    python benchmarks/bench_keyword_matching.py [--repeat N]
+"""
+
+import argparse
+import re
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from signal_bot.message_features import analyze_message, get_keyword_matcher, get_trigger_matcher  # noqa: E402
+from signal_bot.message_keywords import LOCATION_KEYWORDS, COLLECTIVE_KEYWORDS, REMEMBER_TRIGGERS  # noqa: E402
+from tool_schemas.routing import (  # noqa: E402
+    HIGH_CONFIDENCE_KEYWORDS,
+    MEDIUM_CONFIDENCE_KEYWORDS,
+    TICKER_PATTERN,
+    FINANCE_STRONG_SIGNALS,
+    SHEETS_STRONG_SIGNALS,
+    DND_CONTEXT_SIGNALS,
+    detect_tool_domains,
+)
+
+MESSAGES = [
+    "lol",
+    "good morning everyone!",
+    "haha that's exactly what I was thinking yesterday",
+    "what's the weather like in Denver this weekend?",
+    "can you check $AAPL and $MSFT for me",
+    "remember that I prefer short answers please",
+    "I'm heading to Tokyo next week for a conference, any restaurant recommendations?",
+    "roll a d20 for my character's stealth check",
+    "add this to the spreadsheet: 3 coffees at $4 each",
+    "does anyone know what time the game starts tonight?",
+    "I just started a job at a bakery downtown and honestly it's been a lot, the hours are "
+    "brutal but the people are nice and I get free bread which is a huge perk",
+    "Can you summarize what everybody said in the chat history about the trip?",
+    "keep it short",
+    "what do you all think about the new season of that show, is it worth watching or should "
+    "I just rewatch the old ones instead? I've heard mixed things from friends who saw it",
+    "TSLA stock price today?",
+    "schedule a meeting with the team for next tuesday at 3pm in the calendar",
+] * 4
+
+
+def _legacy_domains(message: str, dnd_enabled: bool = False) -> set:
+    """detect_tool_domains as separate substring scans."""
+    message_lower = message.lower()
+    matched = set()
+    for domain, keywords in HIGH_CONFIDENCE_KEYWORDS.items():
+        if any(kw in message_lower for kw in keywords):
+            matched.add(domain)
+    if TICKER_PATTERN.search(message):
+        if not (dnd_enabled and any(sig in message_lower for sig in DND_CONTEXT_SIGNALS)):
+            matched.add("finance")
+    elif any(sig in message_lower for sig in FINANCE_STRONG_SIGNALS):
+        matched.add("finance")
+    if any(sig in message_lower for sig in SHEETS_STRONG_SIGNALS):
+        matched.add("sheets")
+    if len(matched) == 0:
+        for domain, keywords in MEDIUM_CONFIDENCE_KEYWORDS.items():
+            if any(kw in message_lower for kw in keywords):
+                matched.add(domain)
+    return matched
+
+
+_LEGACY_TRIGGERS = {c: [re.compile(p, re.IGNORECASE) for p in ps] for c, ps in REMEMBER_TRIGGERS.items()}
+
+
+def _legacy_trigger(message: str):
+    for category, patterns in _LEGACY_TRIGGERS.items():
+        for pattern in patterns:
+            if pattern.search(message):
+                return category
+    return None
+
+
+def _legacy_location(message: str) -> tuple[bool, bool]:
+    message_lower = message.lower()
+    location = any(kw in message_lower for kw in LOCATION_KEYWORDS)
+    message_lower = message.lower()
+    collective = any(kw in message_lower for kw in COLLECTIVE_KEYWORDS) and \
+        any(kw in message_lower for kw in LOCATION_KEYWORDS)
+    return location, collective
+
+
+def legacy(message: str):
+    return _legacy_trigger(message), _legacy_location(message), _legacy_domains(message)
+
+
+def shared(message: str):
+    features = analyze_message(message)
+    location = features.has("location")
+    collective = features.has("collective") and location
+    return features.memory_trigger, (location, collective), detect_tool_domains(message, features=features)
+
+
+def _time_per_message(fn, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for message in MESSAGES:
+            fn(message)
+    return (time.perf_counter() - start) / (repeat * len(MESSAGES)) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    mismatches = [m for m in MESSAGES if legacy(m) != shared(m)]
+    if mismatches:
+        print(f"MISMATCH on {len(mismatches)} message(s), e.g. {mismatches[0]!r}")
+        print(f"  legacy: {legacy(mismatches[0])}")
+        print(f"  shared: {shared(mismatches[0])}")
+        sys.exit(1)
+
+    analyze_message("warm up")  # Build the matchers outside the timed loops
+    keyword_matcher = get_keyword_matcher()
+    trigger_matcher = get_trigger_matcher()
+    rows = [
+        ("keywords", lambda m: (_legacy_location(m), _legacy_domains(m)),
+         lambda m: keyword_matcher.match_groups(m.lower())),
+        ("memory triggers", _legacy_trigger, lambda m: trigger_matcher.first_group(m.lower())),
+        ("all checks", legacy, shared),
+    ]
+    print(f"{len(MESSAGES)} messages, avg {sum(map(len, MESSAGES)) / len(MESSAGES):.0f} chars, results identical")
+    print(f"{'check':<16} {'separate us/msg':>15} {'shared us/msg':>14}")
+    for name, old, new in rows:
+        print(f"{name:<16} {_time_per_message(old, args.repeat):>15.1f} {_time_per_message(new, args.repeat):>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
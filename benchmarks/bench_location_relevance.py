@@ -0,0 +1,86 @@
+"""
+How many location-relevance LLM calls the local first pass and memo avoid.
+
+With a member_memory_model set, every response used to ask the LLM whether
+the speaker's location was relevant. This replays a stream of chat messages
+through resolve_location_relevance with the LLM replaced by a fixed delay,
+then reports the share of checks answered locally or from the memo and the
+latency that saved, as shown at the admin ``/api/metrics`` endpoint.
+
+Usage:
+    python benchmarks/bench_location_relevance.py [--llm-ms MS] [--rounds N]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from signal_bot import member_memory_scanner, metrics  # noqa: E402
+from signal_bot.member_memory_scanner import classify_location_relevance_local, resolve_location_relevance  # noqa: E402
+
+# Typical group chat: mostly chatter, a few location questions, repeats
+MESSAGES = [
+    "lol",
+    "good morning everyone!",
+    "haha that's exactly what I was thinking yesterday",
+    "what's the weather like this weekend?",
+    "can you check $AAPL and $MSFT for me",
+    "remember that I prefer short answers please",
+    "I'm heading to Tokyo next week, any restaurant recommendations?",
+    "roll a d20 for my character's stealth check",
+    "keep it short",
+    "omg",
+    "that's wild",
+    "did you see what Sam posted?",
+    "should I bring an umbrella tomorrow",
+    "who wants to play tonight",
+    "explain how recursion works",
+    "yeah agreed",
+    "thanks!",
+    "what's a good book to read",
+    "where should we go for dinner",
+    "ok",
+]
+
+
+def _fake_llm(delay: float):
+    def llm(message_content: str, model_id: str):
+        time.sleep(delay)
+        return False, False
+    return llm
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--llm-ms", type=float, default=800, help="simulated LLM call latency")
+    parser.add_argument("--rounds", type=int, default=3, help="times the message stream is replayed")
+    args = parser.parse_args()
+
+    member_memory_scanner._location_relevance_llm = _fake_llm(args.llm_ms / 1000)
+    metrics.reset_metrics()
+
+    local = sum(classify_location_relevance_local(m) is not None for m in MESSAGES)
+    print(f"{len(MESSAGES)} distinct messages, {local} decided locally, "
+          f"{len(MESSAGES) - local} escalated on first sight")
+
+    start = time.perf_counter()
+    for _ in range(args.rounds):
+        for message in MESSAGES:
+            resolve_location_relevance(message, [], "bench-model", bot_id="bench")
+    elapsed = time.perf_counter() - start
+
+    data = metrics.get_metrics("bench")["bench"]
+    checks = len(MESSAGES) * args.rounds
+    counters = data["counters"]
+    print(f"checks: {checks}  local: {counters.get('location_checks_local', 0):.0f}  "
+          f"memo: {counters.get('location_checks_memo', 0):.0f}  llm: {counters.get('location_checks_llm', 0):.0f}")
+    print(f"LLM calls avoided: {data['location_llm_avoided_ratio']:.1%}")
+    print(f"time: {elapsed:.2f}s vs {checks * args.llm_ms / 1000:.2f}s calling the LLM every time "
+          f"(location_llm_saved_ms: {data.get('location_llm_saved_ms', 0):.0f})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""
+Count OpenRouter round trips for requests that need meta-tool expansion.
+
+Replays scripted tool-using requests against a fake chat completions
+endpoint (requests.post is swapped for a scripted model, nothing goes over
+the network) in two modes:
+
+- retry: expansion ends the call and the caller re-runs call_openrouter_api
+  with a bigger tool list and a fresh message list (the old behaviour)
+- in place: expand_tools answers the meta-tool call with the newly unlocked
+  schemas and the same conversation continues
+
+The scripted model calls the real tools it needs in order, requesting a
+meta-tool first whenever a needed tool isn't in the current tool list.
+
+Usage:
+    python benchmarks/bench_meta_tool_expansion.py
+"""
+
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import shared_utils  # noqa: E402
+from tool_schemas import ALL_META_CATEGORIES, get_tools_for_context  # noqa: E402
+
+SCENARIOS = {
+    "one category": ["get_stock_quote"],
+    "two categories": ["get_stock_quote", "read_sheet"],
+    "three categories": ["get_stock_quote", "get_stock_news", "write_to_sheet"],
+}
+
+HISTORY = [{"role": "user", "content": f"Member {i}: some earlier chat message number {i}"} for i in range(25)]
+BOT_FLAGS = dict(context="signal", finance_enabled=True, sheets_enabled=True, time_enabled=True)
+
+META_FOR_TOOL = {tool: meta for meta, info in ALL_META_CATEGORIES.items() for tool in info["sub_tools"]}
+
+
+class FakeResponse:
+    def __init__(self, message: dict):
+        self.status_code = 200
+        self.text = ""
+        self._data = {"choices": [{"message": message, "finish_reason": "stop"}]}
+
+    def json(self):
+        return self._data
+
+
+class ScriptedModel:
+    """Stands in for requests.post, recording round trips and request size."""
+
+    def __init__(self, plan: list[str]):
+        self.plan = plan
+        self.round_trips = 0
+        self.bytes_sent = 0
+
+    def __call__(self, url, headers=None, data=None, timeout=None, **kwargs):
+        self.round_trips += 1
+        self.bytes_sent += len(data)
+        payload = json.loads(data)
+
+        available = {t["function"]["name"] for t in payload.get("tools", [])}
+        called = {m.get("tool_call_id") for m in payload["messages"] if m.get("role") == "tool"}
+
+        for tool in self.plan:
+            if f"call_{tool}" in called:
+                continue
+            name = tool if tool in available else META_FOR_TOOL[tool]
+            return FakeResponse({
+                "content": None,
+                "tool_calls": [{
+                    "id": f"call_{name}",
+                    "type": "function",
+                    "function": {"name": name, "arguments": "{\"intent\": \"benchmark\"}"}
+                }]
+            })
+        return FakeResponse({"content": "All done.", "tool_calls": []})
+
+
+def make_executor(state: dict):
+    """Tool executor that mimics the meta-tool expansion signal of the real executors."""
+    def execute(name: str, args: dict) -> dict:
+        if name in ALL_META_CATEGORIES:
+            group = "finance" if name.startswith("finance") else "sheets"
+            state["expanded"].setdefault(group, set()).add(name)
+            return {
+                "success": True,
+                "expansion_needed": True,
+                "category": name,
+                "available_tools": ALL_META_CATEGORIES[name]["sub_tools"],
+                "message": f"Expanding {name}"
+            }
+        return {"success": True, "message": f"{name} ok"}
+    return execute
+
+
+def run(plan: list[str], in_place: bool) -> tuple[int, int]:
+    model = ScriptedModel(plan)
+    shared_utils.requests.post = model
+    state = {"expanded": {}}
+
+    def expand_tools(expansion):
+        return get_tools_for_context(expanded_categories=state["expanded"], **BOT_FLAGS)
+
+    for _ in range(6):  # Same retry cap as the message handler
+        before = {g: set(c) for g, c in state["expanded"].items()}
+        shared_utils.call_openrouter_api(
+            prompt="Bench: please do the thing",
+            conversation_history=HISTORY,
+            model="anthropic/claude-sonnet-4",
+            system_prompt="You are a helpful bot. " * 200,
+            tools=get_tools_for_context(expanded_categories=state["expanded"], **BOT_FLAGS),
+            tool_executor=make_executor(state),
+            expand_tools=expand_tools if in_place else None,
+        )
+        if in_place or state["expanded"] == before:
+            break
+    return model.round_trips, model.bytes_sent
+
+
+def main():
+    original_post = shared_utils.requests.post
+    shared_utils.print = lambda *a, **k: None  # Silence request logging
+    try:
+        print(f"{'scenario':<18} {'retry trips':>11} {'in-place trips':>14} {'retry KB':>9} {'in-place KB':>12}")
+        for name, plan in SCENARIOS.items():
+            retry_trips, retry_bytes = run(plan, in_place=False)
+            inplace_trips, inplace_bytes = run(plan, in_place=True)
+            print(f"{name:<18} {retry_trips:>11} {inplace_trips:>14} "
+                  f"{retry_bytes / 1024:>9.1f} {inplace_bytes / 1024:>12.1f}")
+    finally:
+        shared_utils.requests.post = original_post
+        del shared_utils.print
+
+
+if __name__ == "__main__":
+    main()
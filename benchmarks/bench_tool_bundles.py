@@ -0,0 +1,86 @@
+"""
+Per-message cost of tool schema selection and request encoding.
+
+Compares building the Signal tool list from scratch and JSON-encoding the
+whole request payload (what every message used to pay) with the memoised
+ToolBundle path, where the tool list and its encoding are cached per feature
+set and spliced into the encoded payload. Also checks that both produce the
+same request body.
+
+Usage:
+    python benchmarks/bench_tool_bundles.py [--repeat N]
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from shared_utils import _encode_payload  # noqa: E402
+from tool_schemas import get_tools_for_context  # noqa: E402
+from tool_schemas.helpers import SIGNAL_TOOL_FLAGS, _signal_tool_bundle  # noqa: E402
+
+CONFIGS = {
+    "minimal": dict(time_enabled=True),
+    "typical": dict(weather_enabled=True, finance_enabled=True, time_enabled=True, wikipedia_enabled=True,
+                    reaction_enabled=True, triggers_enabled=True),
+    "everything": dict(image_enabled=True, weather_enabled=True, finance_enabled=True, time_enabled=True,
+                       wikipedia_enabled=True, reaction_enabled=True, sheets_enabled=True, calendar_enabled=True,
+                       member_memory_enabled=True, triggers_enabled=True, dnd_enabled=True, chat_log_enabled=True),
+    "expanded": dict(finance_enabled=True, sheets_enabled=True, time_enabled=True,
+                     expanded_categories={"finance": {"finance_quotes"}, "sheets": {"sheets_core"}}),
+}
+
+MESSAGES = [{"role": "user", "content": f"Member {i}: an ordinary chat message number {i}"} for i in range(30)]
+
+
+def _payload(tools) -> dict:
+    return {"model": "anthropic/claude-sonnet-4", "messages": MESSAGES, "temperature": 1,
+            "max_tokens": 4000, "stream": True, "tools": tools, "tool_choice": "auto"}
+
+
+def _key(config: dict) -> tuple:
+    """The (bitmask, finance expanded, sheets expanded) memo key get_tools_for_context uses."""
+    expanded = config.get("expanded_categories") or {}
+    mask = sum(1 << i for i, flag in enumerate(SIGNAL_TOOL_FLAGS) if config.get(f"{flag}_enabled"))
+    return (mask,
+            frozenset(expanded.get("finance", ())) if config.get("finance_enabled") else frozenset(),
+            frozenset(expanded.get("sheets", ())) if config.get("sheets_enabled") else frozenset())
+
+
+def uncached(config: dict) -> bytes:
+    """Rebuild the tool list (bypassing the memo) and encode the full payload."""
+    tools = list(_signal_tool_bundle.__wrapped__(*_key(config)))
+    return json.dumps(_payload(tools)).encode("utf-8")
+
+
+def cached(config: dict) -> bytes:
+    """Memoised bundle with its encoding spliced into the payload."""
+    return _encode_payload(_payload(get_tools_for_context(context="signal", **config)))
+
+
+def _time(fn, config: dict, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn(config)
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--repeat", type=int, default=500)
+    args = parser.parse_args()
+
+    print(f"{'config':<11} {'tools':>5} {'tools KB':>8} {'rebuild+encode us':>17} {'bundle us':>9}")
+    for name, config in CONFIGS.items():
+        assert json.loads(uncached(config)) == json.loads(cached(config)), f"payload mismatch for {name}"
+        bundle = get_tools_for_context(context="signal", **config)
+        print(f"{name:<11} {len(bundle):>5} {len(bundle.json_bytes) / 1024:>8.1f} "
+              f"{_time(uncached, config, args.repeat):>17.1f} {_time(cached, config, args.repeat):>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
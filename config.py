@@ -15,6 +15,13 @@ SORA_SIZE="1280x720"
 # OpenRouter API enhancements
 OPENROUTER_MIDDLE_OUT_ENABLED = True  # Enable middle-out compression for large contexts
 OPENROUTER_TOOL_CALLING_ENABLED = True  # Enable native tool calling (falls back to regex if unsupported)
+OPENROUTER_PROMPT_CACHE_ENABLED = True  # Mark stable prompt prefixes with cache_control hints (Anthropic, Gemini)
+# Opt-in collection of tool router training data: appends the raw text of every tool-calling
+# group message, with the tools it used, to logs/tool_usage.jsonl. The file is rotated at
+# TOOL_USAGE_LOG_MAX_BYTES, keeping TOOL_USAGE_LOG_BACKUPS older files (.1 is the newest)
+TOOL_USAGE_LOG_ENABLED = False
+TOOL_USAGE_LOG_MAX_BYTES = 10 * 1024 * 1024
+TOOL_USAGE_LOG_BACKUPS = 2
 
 # Available AI models
 AI_MODELS = {
@@ -0,0 +1,28 @@
+"""Migration for token-budget-aware context windowing.
+
+Adds new column:
+- context_token_budget: Max prompt tokens per response (NULL = default, capped by model context length)
+"""
+import sqlite3
+
+
+def migrate():
+    conn = sqlite3.connect('signal_bot.db')
+    cursor = conn.cursor()
+
+    try:
+        cursor.execute("ALTER TABLE bots ADD COLUMN context_token_budget INTEGER")
+        print("Added context_token_budget column")
+    except sqlite3.OperationalError as e:
+        if "duplicate column" in str(e).lower():
+            print("context_token_budget column already exists")
+        else:
+            raise
+
+    conn.commit()
+    conn.close()
+    print("Migration complete!")
+
+
+if __name__ == "__main__":
+    migrate()
@@ -0,0 +1,28 @@
+"""Migration for per-message model tiers.
+
+Adds new column:
+- fast_model: Optional cheaper model for random-chance replies and idle news
+"""
+import sqlite3
+
+
+def migrate():
+    conn = sqlite3.connect('signal_bot.db')
+    cursor = conn.cursor()
+
+    try:
+        cursor.execute("ALTER TABLE bots ADD COLUMN fast_model VARCHAR(100)")
+        print("Added fast_model column")
+    except sqlite3.OperationalError as e:
+        if "duplicate column" in str(e).lower():
+            print("fast_model column already exists")
+        else:
+            raise
+
+    conn.commit()
+    conn.close()
+    print("Migration complete!")
+
+
+if __name__ == "__main__":
+    migrate()
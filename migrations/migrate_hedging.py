@@ -0,0 +1,28 @@
+"""Migration for hedged LLM requests.
+
+Adds new column:
+- hedging_enabled: Boolean toggle for racing a second request when a mention reply is slow to start
+"""
+import sqlite3
+
+
+def migrate():
+    conn = sqlite3.connect('signal_bot.db')
+    cursor = conn.cursor()
+
+    try:
+        cursor.execute("ALTER TABLE bots ADD COLUMN hedging_enabled BOOLEAN DEFAULT 0")
+        print("Added hedging_enabled column")
+    except sqlite3.OperationalError as e:
+        if "duplicate column" in str(e).lower():
+            print("hedging_enabled column already exists")
+        else:
+            raise
+
+    conn.commit()
+    conn.close()
+    print("Migration complete!")
+
+
+if __name__ == "__main__":
+    migrate()
@@ -0,0 +1,56 @@
+"""Migration for binary image storage.
+
+Adds new columns:
+- message_logs.image_bytes: Raw image bytes (BLOB), replacing base64 text in image_data
+- chat_logs.image_bytes: Raw image bytes (BLOB), replacing base64 text in image_data
+
+Existing base64 images are decoded into the new columns and image_data is cleared.
+"""
+import base64
+import binascii
+import sqlite3
+
+TABLES = ("message_logs", "chat_logs")
+
+
+def migrate():
+    conn = sqlite3.connect('signal_bot.db')
+    cursor = conn.cursor()
+
+    for table in TABLES:
+        try:
+            cursor.execute(f"ALTER TABLE {table} ADD COLUMN image_bytes BLOB")
+            print(f"Added {table}.image_bytes column")
+        except sqlite3.OperationalError as e:
+            if "duplicate column" in str(e).lower():
+                print(f"{table}.image_bytes column already exists")
+            else:
+                raise
+
+        # One row at a time: each image can be several MB
+        converted = 0
+        ids = [row[0] for row in cursor.execute(
+            f"SELECT id FROM {table} WHERE image_data IS NOT NULL AND image_bytes IS NULL"
+        ).fetchall()]
+        for row_id in ids:
+            (image_data,) = cursor.execute(f"SELECT image_data FROM {table} WHERE id = ?", (row_id,)).fetchone()
+            try:
+                image_bytes = base64.b64decode(image_data)
+            except (binascii.Error, ValueError):
+                print(f"Skipping {table} row {row_id}: image_data is not valid base64")
+                continue
+            cursor.execute(
+                f"UPDATE {table} SET image_bytes = ?, image_data = NULL WHERE id = ?",
+                (sqlite3.Binary(image_bytes), row_id)
+            )
+            converted += 1
+        conn.commit()
+        print(f"Converted {converted} {table} image(s) to binary")
+
+    conn.commit()
+    conn.close()
+    print("Migration complete!")
+
+
+if __name__ == "__main__":
+    migrate()
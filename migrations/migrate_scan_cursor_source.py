@@ -0,0 +1,37 @@
+"""Migration for the memory scanner's message cursor.
+
+Adds new column:
+- last_message_source: Table last_message_id_scanned refers to (chat_logs or message_logs)
+
+Existing cursors may be ids in either table, so they are cleared; each
+group's next scan starts from its latest messages.
+"""
+import sqlite3
+
+
+def migrate():
+    conn = sqlite3.connect('signal_bot.db')
+    cursor = conn.cursor()
+
+    try:
+        cursor.execute("ALTER TABLE memory_scan_state ADD COLUMN last_message_source VARCHAR(20)")
+        print("Added last_message_source column")
+    except sqlite3.OperationalError as e:
+        if "duplicate column" in str(e).lower():
+            print("last_message_source column already exists")
+        else:
+            raise
+
+    cursor.execute(
+        "UPDATE memory_scan_state SET last_message_id_scanned = NULL "
+        "WHERE last_message_source IS NULL AND last_message_id_scanned IS NOT NULL"
+    )
+    print(f"Cleared {cursor.rowcount} scan cursors without a source")
+
+    conn.commit()
+    conn.close()
+    print("Migration complete!")
+
+
+if __name__ == "__main__":
+    migrate()
@@ -0,0 +1,28 @@
+"""Migration for streaming responses.
+
+Adds new column:
+- streaming_enabled: Boolean toggle for progressive message edits while the model generates
+"""
+import sqlite3
+
+
+def migrate():
+    conn = sqlite3.connect('signal_bot.db')
+    cursor = conn.cursor()
+
+    try:
+        cursor.execute("ALTER TABLE bots ADD COLUMN streaming_enabled BOOLEAN DEFAULT 0")
+        print("Added streaming_enabled column")
+    except sqlite3.OperationalError as e:
+        if "duplicate column" in str(e).lower():
+            print("streaming_enabled column already exists")
+        else:
+            raise
+
+    conn.commit()
+    conn.close()
+    print("Migration complete!")
+
+
+if __name__ == "__main__":
+    migrate()
@@ -34,6 +34,12 @@ from migrations import migrate_dnd_support
 from migrations import migrate_dnd_template
 from migrations import migrate_chat_logs
 from migrations import drop_memory_snippets
+from migrations import migrate_streaming
+from migrations import migrate_context_token_budget
+from migrations import migrate_hedging
+from migrations import migrate_fast_model
+from migrations import migrate_image_bytes
+from migrations import migrate_scan_cursor_source
 
 
 MIGRATIONS = [
@@ -54,6 +60,12 @@ MIGRATIONS = [
     ("dnd_template", migrate_dnd_template),
     ("chat_logs", migrate_chat_logs),
     ("drop_memory_snippets", drop_memory_snippets),
+    ("streaming", migrate_streaming),
+    ("context_token_budget", migrate_context_token_budget),
+    ("hedging", migrate_hedging),
+    ("fast_model", migrate_fast_model),
+    ("image_bytes", migrate_image_bytes),
+    ("scan_cursor_source", migrate_scan_cursor_source),
 ]
 
 
@@ -1,29 +1,47 @@
 # shared_utils.py
 
 import requests
+import itertools
 import logging
-import openai
+import queue
+import threading
 import time
 import json
 import os
+from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Optional
 from urllib.parse import quote as url_quote
 from dotenv import load_dotenv
 import base64
-from openai import OpenAI
 import re
-try:
-    from bs4 import BeautifulSoup
-except ImportError:
-    print("BeautifulSoup not found. Please install it with 'pip install beautifulsoup4'")
 
 # Load environment variables
 load_dotenv()
 
-# Initialize OpenAI client
-openai_client = OpenAI(api_key=os.getenv('OPENAI_API_KEY'))
+# OpenAI client, created on first use (the SDK is slow to import and most
+# deployments only talk to OpenRouter)
+_openai_client = None
+_openai_client_lock = threading.Lock()
+
+
+def get_openai_client():
+    """Return the shared OpenAI client, importing the SDK on first call."""
+    global _openai_client
+    if _openai_client is None:
+        with _openai_client_lock:
+            if _openai_client is None:
+                from openai import OpenAI
+                _openai_client = OpenAI(api_key=os.getenv('OPENAI_API_KEY'))
+    return _openai_client
+
+
+def __getattr__(name):
+    # Backward compatibility for code that used the module-level client
+    if name == "openai_client":
+        return get_openai_client()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def _add_openrouter_transforms(payload: dict) -> dict:
@@ -42,6 +60,134 @@ def _add_openrouter_transforms(payload: dict) -> dict:
     return payload
 
 
+# Providers that need explicit cache_control breakpoints (others cache prefixes automatically)
+CACHE_CONTROL_MODEL_PREFIXES = ("anthropic/", "google/gemini")
+
+
+def _supports_cache_control(model: str) -> bool:
+    """Check if prompt-cache breakpoints should be added for this model."""
+    try:
+        from config import OPENROUTER_PROMPT_CACHE_ENABLED
+        if not OPENROUTER_PROMPT_CACHE_ENABLED:
+            return False
+    except ImportError:
+        pass
+    return model.lower().startswith(CACHE_CONTROL_MODEL_PREFIXES)
+
+
+def _with_cache_control(content):
+    """Return a copy of message content with a cache breakpoint on its last text part.
+
+    The input is not modified (history dicts are shared with the prompt builder).
+    """
+    marker = {"type": "ephemeral"}
+    if isinstance(content, str):
+        return [{"type": "text", "text": content, "cache_control": marker}] if content else content
+    if not isinstance(content, list):
+        return content
+
+    parts = list(content)
+    for i in range(len(parts) - 1, -1, -1):
+        if parts[i].get('type') == 'text':
+            parts[i] = {**parts[i], "cache_control": marker}
+            break
+    return parts
+
+
+class ImageDataURL:
+    """A data: URL for raw image bytes, base64-encoded only when the request body is built.
+
+    Image parts with a "bytes" source (raw bytes or a memoryview, as the
+    Signal bot stores attachments) become one of these instead of a data URL
+    string, so the image is encoded exactly once, straight into the body.
+    """
+    __slots__ = ("media_type", "data")
+
+    # Bytes encoded per step (a multiple of 3, so the pieces join into valid base64)
+    CHUNK_BYTES = 3 * 64 * 1024
+
+    def __init__(self, media_type: str, data):
+        self.media_type = media_type
+        self.data = data
+
+    def _prefix(self) -> bytes:
+        return b"data:" + self.media_type.encode("ascii") + b";base64,"
+
+    def encoded_size(self) -> int:
+        return len(self._prefix()) + 4 * ((memoryview(self.data).nbytes + 2) // 3)
+
+    def write_into(self, out: bytearray, offset: int) -> int:
+        """Write the URL into out at offset, a chunk at a time; returns the offset after it."""
+        prefix = self._prefix()
+        out[offset:offset + len(prefix)] = prefix
+        offset += len(prefix)
+        view = memoryview(self.data).cast("B")
+        for start in range(0, len(view), self.CHUNK_BYTES):
+            piece = base64.b64encode(view[start:start + self.CHUNK_BYTES])
+            out[offset:offset + len(piece)] = piece
+            offset += len(piece)
+        return offset
+
+    def __str__(self) -> str:
+        out = bytearray(self.encoded_size())
+        self.write_into(out, 0)
+        return out.decode("ascii")
+
+
+def _join_encoded(pieces: list) -> bytearray:
+    """Concatenate byte strings and ImageDataURLs into one buffer allocated up front."""
+    size = sum(p.encoded_size() if isinstance(p, ImageDataURL) else len(p) for p in pieces)
+    out = bytearray(size)
+    offset = 0
+    for piece in pieces:
+        if isinstance(piece, ImageDataURL):
+            offset = piece.write_into(out, offset)
+        else:
+            out[offset:offset + len(piece)] = piece
+            offset += len(piece)
+    return out
+
+
+def _encode_payload(payload: dict) -> bytes:
+    """JSON-encode a chat completion payload, splicing in pre-encoded tool schemas and images.
+
+    Tool lists from tool_schemas are ToolBundles that carry their own cached
+    encoding, so only the messages and settings are encoded per request.
+    ImageDataURLs are encoded as placeholders, then replaced by their base64
+    written directly into the final body (no intermediate str or copies).
+    """
+    encoded_tools = getattr(payload.get("tools"), "json_bytes", None)
+    if encoded_tools is not None:
+        payload = {k: v for k, v in payload.items() if k != "tools"}
+
+    images = []
+    nonce = os.urandom(8).hex()
+
+    def defer_image(obj):
+        if isinstance(obj, ImageDataURL):
+            images.append(obj)
+            return f"{nonce}-{len(images) - 1}"
+        raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+    body = json.dumps(payload, default=defer_image).encode("utf-8")
+    if not images and encoded_tools is None:
+        return body
+
+    view = memoryview(body)
+    pieces, pos = [], 0
+    for i, image in enumerate(images):
+        marker = f'"{nonce}-{i}"'.encode("ascii")
+        at = body.index(marker, pos)
+        pieces += [view[pos:at], b'"', image, b'"']
+        pos = at + len(marker)
+    if encoded_tools is None:
+        pieces.append(view[pos:])
+    else:
+        separator = b"," if body != b"{}" else b""
+        pieces += [view[pos:-1], separator, b'"tools":', encoded_tools, b"}"]
+    return _join_encoded(pieces)
+
+
 def call_openrouter_api_structured(
     prompt: str,
     model: str,
@@ -291,7 +437,7 @@ def call_openai_api(prompt, conversation_history, model, system_prompt):
         
         messages.append({"role": "user", "content": prompt})
         
-        response = openai.chat.completions.create(
+        response = get_openai_client().chat.completions.create(
             model=model,
             messages=messages,
             # Increase max_tokens and add n parameter
@@ -876,6 +1022,235 @@ def _responses_api_streaming_request(headers, payload, stream_callback):
         return None
 
 
+def _iter_stream_chunks(response):
+    """Yield the parsed data chunks of a streaming chat completion, up to [DONE]."""
+    for line in response.iter_lines():
+        if not line:
+            continue
+        line_text = line.decode('utf-8')
+        if not line_text.startswith('data: '):
+            continue  # SSE comments (": OPENROUTER PROCESSING") and other fields
+        json_str = line_text[6:]
+        if json_str.strip() == '[DONE]':
+            return
+        try:
+            yield json.loads(json_str)
+        except json.JSONDecodeError:
+            continue
+
+
+@dataclass
+class HedgePolicy:
+    """Send a second request when a chat completion is slow to start.
+
+    If the first request hasn't produced its first byte (the first streamed
+    chunk, or the whole response when not streaming) within `delay` seconds,
+    a hedge request is sent: to fallback_model if set, otherwise to the same
+    model with OpenRouter's latency-sorted provider routing. The first
+    successful response is used and the other request is closed.
+    """
+    delay: float  # Seconds to wait for the first byte before hedging
+    fallback_model: Optional[str] = None
+    on_outcome: Optional[Callable[[str], None]] = None  # Called per request: "not_needed", "primary" or "hedge"
+
+
+class _CompletionAttempt:
+    """One chat completion request running in its own thread (for hedging)."""
+
+    def __init__(self, headers: dict, payload: dict, use_streaming: bool, label: str):
+        self.headers = headers
+        self.payload = payload
+        self.use_streaming = use_streaming
+        self.label = label
+        self.response = None
+        self.abandoned = False
+
+    def start(self, results: queue.Queue):
+        threading.Thread(target=self._run, args=(results,), daemon=True, name=f"openrouter-{self.label}").start()
+
+    def _run(self, results: queue.Queue):
+        """Post the request and wait for its first byte; puts (self, (status_code, value)) on results.
+
+        value is (first_chunk, remaining_chunks) when streaming, the response JSON
+        otherwise, the error text for non-200 responses, or the exception raised.
+        """
+        try:
+            self.response = requests.post(
+                "https://openrouter.ai/api/v1/chat/completions",
+                headers=self.headers,
+                data=_encode_payload(self.payload),
+                timeout=180 if self.use_streaming else 60,
+                stream=self.use_streaming
+            )
+            if self.response.status_code != 200:
+                outcome = (self.response.status_code, self.response.text)
+            elif self.use_streaming:
+                chunks = _iter_stream_chunks(self.response)
+                outcome = (200, (next(chunks, None), chunks))
+            else:
+                outcome = (200, self.response.json())
+        except Exception as e:
+            outcome = (None, e)
+        if self.abandoned:
+            self.close()
+        results.put((self, outcome))
+
+    def close(self):
+        """Abandon the request, closing its connection if it has one."""
+        self.abandoned = True
+        if self.response is not None:
+            self.response.close()
+
+
+def _hedged_completion(headers: dict, payload: dict, use_streaming: bool, hedge: HedgePolicy) -> tuple:
+    """Post a chat completion, hedging it per the policy.
+
+    Returns (status_code, value) as described in _CompletionAttempt._run for the
+    winning request. Raises the request's exception if every attempt raised.
+    """
+    results = queue.Queue()
+    attempts = [_CompletionAttempt(headers, payload, use_streaming, "primary")]
+    attempts[0].start(results)
+    try:
+        winner, outcome = results.get(timeout=hedge.delay)
+    except queue.Empty:
+        hedge_payload = dict(payload)
+        if hedge.fallback_model:
+            suffix = ":online" if payload["model"].endswith(":online") else ""
+            hedge_payload["model"] = hedge.fallback_model.removesuffix(":online") + suffix
+        else:
+            hedge_payload["provider"] = {"sort": "latency"}
+        print(f"[OpenRouter] No first byte after {hedge.delay:.1f}s, hedging with "
+              f"{hedge_payload['model'] if hedge.fallback_model else 'latency-sorted providers'}")
+        attempts.append(_CompletionAttempt(headers, hedge_payload, use_streaming, "hedge"))
+        attempts[1].start(results)
+        winner, outcome = results.get()
+        if outcome[0] != 200:
+            # First one back failed; use the other (it may still succeed)
+            winner, outcome = results.get()
+
+    for attempt in attempts:
+        if attempt is not winner:
+            attempt.close()
+
+    if len(attempts) > 1:
+        print(f"[OpenRouter] Hedge race won by {winner.label} request")
+    if hedge.on_outcome:
+        try:
+            hedge.on_outcome("not_needed" if len(attempts) == 1 else winner.label)
+        except Exception as e:
+            print(f"[OpenRouter] Hedge outcome callback error: {e}")
+
+    status_code, value = outcome
+    if status_code is None:
+        raise value
+    return status_code, value
+
+
+def _stream_chat_completion(headers: dict, payload: dict, stream_callback, model: str,
+                            hedge: Optional[HedgePolicy] = None) -> tuple:
+    """Stream a chat completion, forwarding content deltas to stream_callback.
+
+    Tool-call deltas are reassembled by index. A round that offers tools may
+    open with preamble text ("Let me check that.") before calling one, so its
+    deltas are held and forwarded only once the round ends without tool calls;
+    rounds without tools are forwarded as they arrive. With a hedge policy,
+    only the winning request's deltas are forwarded.
+
+    Returns:
+        (status_code, result) - result is a dict with 'content', 'tool_calls',
+        'finish_reason', 'message' and 'first_byte' (seconds to the first chunk)
+        on success, or the error text otherwise.
+    """
+    started = time.monotonic()
+    if hedge:
+        status_code, value = _hedged_completion(headers, payload, True, hedge)
+        if status_code != 200:
+            return status_code, value
+        first_chunk, chunks = value
+        if first_chunk is not None:
+            chunks = itertools.chain([first_chunk], chunks)
+    else:
+        response = requests.post(
+            "https://openrouter.ai/api/v1/chat/completions",
+            headers=headers,
+            data=_encode_payload(payload),
+            timeout=180,
+            stream=True
+        )
+        if response.status_code != 200:
+            return response.status_code, response.text
+        chunks = _iter_stream_chunks(response)
+
+    full_response = ""
+    tool_calls_by_index = {}
+    hold_content = bool(payload.get("tools"))
+    chunk_count = 0
+    last_finish_reason = None
+    usage = None
+    debug_chunks = []  # Store first few chunks for debugging
+    first_byte = None
+    for chunk_data in chunks:
+        if first_byte is None:
+            first_byte = time.monotonic() - started
+
+        # Store first 5 chunks for debugging
+        if len(debug_chunks) < 5:
+            debug_chunks.append(chunk_data)
+        if chunk_data.get('usage'):
+            usage = chunk_data['usage']  # Sent with the final chunk
+        if 'choices' not in chunk_data or len(chunk_data['choices']) == 0:
+            continue
+
+        choice = chunk_data['choices'][0]
+        delta = choice.get('delta', {})
+        last_finish_reason = choice.get('finish_reason') or last_finish_reason
+        content = delta.get('content', '')
+        if content:
+            full_response += content
+            if not hold_content:
+                stream_callback(content)
+
+        for tc_delta in delta.get('tool_calls') or []:
+            tc = tool_calls_by_index.setdefault(tc_delta.get('index', 0), {
+                "id": "",
+                "type": "function",
+                "function": {"name": "", "arguments": ""}
+            })
+            if tc_delta.get('id'):
+                tc["id"] = tc_delta["id"]
+            fn_delta = tc_delta.get('function') or {}
+            if fn_delta.get('name'):
+                tc["function"]["name"] += fn_delta["name"]
+            if fn_delta.get('arguments'):
+                tc["function"]["arguments"] += fn_delta["arguments"]
+        chunk_count += 1
+
+    tool_calls = [tool_calls_by_index[i] for i in sorted(tool_calls_by_index)]
+    if hold_content and full_response and not tool_calls:
+        stream_callback(full_response)
+
+    # Log if response is empty
+    if not tool_calls and (not full_response or not full_response.strip()):
+        print(f"[OpenRouter STREAM] Empty response from {model}", flush=True)
+        print(f"[OpenRouter STREAM]   Chunks received: {chunk_count}", flush=True)
+        print(f"[OpenRouter STREAM]   Last finish_reason: {last_finish_reason}", flush=True)
+        print(f"[OpenRouter STREAM]   Response repr: {repr(full_response)}", flush=True)
+        # Print the actual chunk data for debugging
+        for i, chunk in enumerate(debug_chunks):
+            print(f"[OpenRouter STREAM]   Chunk {i}: {json.dumps(chunk)[:300]}", flush=True)
+
+    return 200, {
+        "content": full_response,
+        "tool_calls": tool_calls,
+        "finish_reason": last_finish_reason,
+        "message": {"content": full_response, "tool_calls": tool_calls},
+        "choice_keys": ["delta", "finish_reason"],
+        "usage": usage,
+        "first_byte": first_byte
+    }
+
+
 def call_openrouter_api(
     prompt,
     conversation_history,
@@ -884,19 +1259,44 @@ def call_openrouter_api(
     stream_callback=None,
     web_search=False,
     tools=None,
-    tool_executor=None
+    tool_executor=None,
+    history_has_images=None,
+    system_prompt_suffix=None,
+    usage_callback=None,
+    expand_tools=None,
+    hedge=None,
+    first_byte_callback=None,
+    cancel_token=None
 ):
     """Call the OpenRouter API to access various LLM models.
 
     Args:
-        stream_callback: Optional function(chunk: str) to call with each streaming token
+        stream_callback: Optional function(chunk: str) called with the text of tool-free rounds
         web_search: If True, enable OpenRouter's web search via Responses API (returns citations)
         tools: Optional list of tool schemas for function calling
         tool_executor: Optional callback function(name, args) -> dict to execute tool calls
+        history_has_images: Precomputed flag for images in conversation_history (skips the scan)
+        system_prompt_suffix: Per-call system text appended after the cacheable system prompt
+        usage_callback: Optional function(usage: dict, seconds: float) called after each completion
+        expand_tools: Optional function(expansion_result: dict) -> list | None. When a meta-tool
+            asks for expansion, this returns the enlarged tool list and the conversation continues
+            in place with it. Without it (or if it returns None) the call returns the expansion
+            message so the caller can retry.
+        hedge: Optional HedgePolicy; each chat completion that is slow to produce its first
+            byte is raced against a second request (see HedgePolicy)
+        first_byte_callback: Optional function(seconds: float) called with each completion's
+            time to first byte (first streamed chunk, or the full response when not streaming)
+        cancel_token: Optional threading.Event-like (signal_bot.cancellation.CancelToken). Once set, no
+            further tool round or retry starts and the call returns None
     """
+    def cancelled():
+        return cancel_token is not None and cancel_token.is_set()
+
+    full_system_prompt = (system_prompt or "") + (system_prompt_suffix or "")
+
     # Check if prompt OR conversation history contains images (structured content with image parts)
     # If any images exist, we must skip Responses API which strips image data from history
-    has_images = False
+    has_images = bool(history_has_images)
 
     # Check current prompt
     if isinstance(prompt, list):
@@ -905,8 +1305,8 @@ def call_openrouter_api(
                 has_images = True
                 break
 
-    # Also check conversation history for images
-    if not has_images and conversation_history:
+    # Also check conversation history for images (unless the caller already knows)
+    if not has_images and history_has_images is None and conversation_history:
         for msg in conversation_history:
             content = msg.get('content')
             if isinstance(content, list):
@@ -922,7 +1322,7 @@ def call_openrouter_api(
     if web_search and not has_images:
         print(f"[OpenRouter] Web search enabled, using Responses API for citations")
         result = call_openrouter_responses_api(
-            prompt, conversation_history, model, system_prompt,
+            prompt, conversation_history, model, full_system_prompt,
             tools=tools, tool_executor=tool_executor,
             stream_callback=stream_callback
         )
@@ -947,6 +1347,10 @@ def call_openrouter_api(
         if model.startswith("claude-") and not model.startswith("anthropic/"):
             openrouter_model = f"anthropic/{model}"
             print(f"Normalized Claude model ID for OpenRouter: {model} -> {openrouter_model}")
+
+        # Prompt caching: breakpoints after the system prompt (which also covers the
+        # tool schemas ahead of it) and after the older history, both stable between turns
+        use_cache_control = _supports_cache_control(openrouter_model)
         
         # Format messages - need to handle structured content with images
         messages = []
@@ -971,7 +1375,15 @@ def call_openrouter_api(
                     if include_images:
                         # Convert Anthropic format to OpenAI format
                         source = part.get('source', {})
-                        if source.get('type') == 'base64':
+                        if source.get('type') == 'bytes':
+                            # Raw bytes: base64-encoded once, when the request body is built
+                            converted.append({
+                                "type": "image_url",
+                                "image_url": {
+                                    "url": ImageDataURL(source.get('media_type', 'image/png'), source['data'])
+                                }
+                            })
+                        elif source.get('type') == 'base64':
                             media_type = source.get('media_type', 'image/png')
                             data = source.get('data', '')
                             converted.append({
@@ -1000,8 +1412,13 @@ def call_openrouter_api(
         def build_messages(include_images=True):
             """Build the messages list, optionally stripping images."""
             msgs = []
-            if system_prompt:
-                msgs.append({"role": "system", "content": system_prompt})
+            if use_cache_control and system_prompt:
+                system_parts = [{"type": "text", "text": system_prompt, "cache_control": {"type": "ephemeral"}}]
+                if system_prompt_suffix:
+                    system_parts.append({"type": "text", "text": system_prompt_suffix})
+                msgs.append({"role": "system", "content": system_parts})
+            elif full_system_prompt:
+                msgs.append({"role": "system", "content": full_system_prompt})
             
             for msg in conversation_history:
                 if msg["role"] != "system":  # Skip system prompts
@@ -1009,11 +1426,144 @@ def call_openrouter_api(
                         "role": msg["role"],
                         "content": convert_to_openai_format(msg["content"], include_images)
                     })
+
+            if use_cache_control and len(msgs) > 1 and msgs[-1]["role"] != "system":
+                msgs[-1] = {**msgs[-1], "content": _with_cache_control(msgs[-1]["content"])}
             
             # Also convert the prompt if it's structured content
             msgs.append({"role": "user", "content": convert_to_openai_format(prompt, include_images)})
             return msgs
         
+        def execute_tool_calls(msgs, content, tool_calls, round_tools, label="tool"):
+            """Run requested tools and append results to msgs.
+
+            Meta-tool expansions are resolved in place via expand_tools, replacing
+            round_tools["tools"]. Returns the expansion message if a meta-tool asked
+            for expansion that couldn't be resolved in place, else None.
+            """
+            # Add assistant message with tool calls to conversation
+            msgs.append({
+                "role": "assistant",
+                "content": content,  # May be null
+                "tool_calls": tool_calls
+            })
+
+            for tc in tool_calls:
+                try:
+                    fn_name = tc.get('function', {}).get('name', '')
+                    fn_args_str = tc.get('function', {}).get('arguments') or '{}'  # Handle empty string
+                    tc_id = tc.get('id', '')
+
+                    # Parse arguments
+                    try:
+                        fn_args = json.loads(fn_args_str) if isinstance(fn_args_str, str) else (fn_args_str or {})
+                    except json.JSONDecodeError:
+                        fn_args = {}
+
+                    print(f"[OpenRouter] Executing {label}: {fn_name}({fn_args})")
+
+                    # Execute the tool
+                    tool_result = tool_executor(fn_name, fn_args)
+
+                    # Check for meta-tool expansion signal
+                    if isinstance(tool_result, dict) and tool_result.get("expansion_needed"):
+                        new_tools = expand_tools(tool_result) if expand_tools else None
+                        if new_tools is None:
+                            print(f"[OpenRouter] Meta-tool expansion requested for {fn_name}, returning early")
+                            return tool_result.get("message", f"Expanded {fn_name}")
+
+                        round_tools["tools"] = new_tools
+                        print(f"[OpenRouter] Expanded {fn_name} in place ({len(new_tools)} tools now available)")
+                        tool_result = {
+                            "success": True,
+                            "message": (f"The {fn_name} tools are now available: "
+                                        f"{', '.join(tool_result.get('available_tools', []))}. "
+                                        f"Call them to complete the request.")
+                        }
+
+                    # Add tool result to messages
+                    msgs.append({
+                        "role": "tool",
+                        "tool_call_id": tc_id,
+                        "content": json.dumps(tool_result) if isinstance(tool_result, dict) else str(tool_result)
+                    })
+                    print(f"[OpenRouter] {label.capitalize()} result: {tool_result}")
+
+                except Exception as e:
+                    print(f"[OpenRouter] {label.capitalize()} error: {e}")
+                    msgs.append({
+                        "role": "tool",
+                        "tool_call_id": tc.get('id', ''),
+                        "content": json.dumps({"success": False, "message": str(e)})
+                    })
+            return None
+
+        def post_completion(payload, use_streaming):
+            """POST one chat completion.
+
+            Returns (status_code, result) where result is a dict with 'content',
+            'tool_calls', 'finish_reason' and 'message' on success, or the error text.
+            Streaming requests forward content to stream_callback only for rounds
+            that end without tool calls, so at most one round's text reaches the
+            streamer and a retried (empty or failed) round never adds to it.
+            """
+            if usage_callback:
+                payload["usage"] = {"include": True}  # Token counts incl. prompt-cache reads/writes
+
+            started = time.monotonic()
+            if use_streaming:
+                status_code, result = _stream_chat_completion(headers, payload, stream_callback, model, hedge=hedge)
+                usage = result.get("usage") if isinstance(result, dict) else None
+                first_byte = result.get("first_byte") if isinstance(result, dict) else None
+            else:
+                if hedge:
+                    status_code, response_data = _hedged_completion(headers, payload, False, hedge)
+                    if status_code != 200:
+                        return status_code, response_data
+                else:
+                    response = requests.post(
+                        "https://openrouter.ai/api/v1/chat/completions",
+                        headers=headers,
+                        data=_encode_payload(payload),
+                        timeout=60
+                    )
+                    if response.status_code != 200:
+                        return response.status_code, response.text
+                    response_data = response.json()
+
+                first_byte = time.monotonic() - started
+                usage = response_data.get('usage') if isinstance(response_data, dict) else None
+                if 'choices' not in response_data or len(response_data['choices']) == 0:
+                    print(f"[OpenRouter] No choices in response. Keys: {list(response_data.keys()) if isinstance(response_data, dict) else 'non-dict'}")
+                    status_code, result = 200, None
+                else:
+                    choice = response_data['choices'][0]
+                    message = choice.get('message', {})
+                    status_code, result = 200, {
+                        "content": message.get('content', '') if message else '',
+                        "tool_calls": message.get('tool_calls', []),
+                        "finish_reason": choice.get('finish_reason', ''),
+                        "message": message,
+                        "choice_keys": list(choice.keys())
+                    }
+
+            if first_byte is not None and first_byte_callback:
+                try:
+                    first_byte_callback(first_byte)
+                except Exception as e:
+                    print(f"[OpenRouter] First byte callback error: {e}")
+
+            if usage:
+                details = usage.get('prompt_tokens_details') or {}
+                print(f"[OpenRouter] Usage: prompt={usage.get('prompt_tokens')}, cached={details.get('cached_tokens', 0)}, "
+                      f"cache_write={details.get('cache_write_tokens', 0)}, completion={usage.get('completion_tokens')}")
+                if usage_callback:
+                    try:
+                        usage_callback(usage, time.monotonic() - started)
+                    except Exception as e:
+                        print(f"[OpenRouter] Usage callback error: {e}")
+            return status_code, result
+
         def make_api_call(include_images=True):
             """Make the API call, returns (success, result_or_error)"""
             msgs = build_messages(include_images=include_images)
@@ -1028,8 +1578,9 @@ def call_openrouter_api(
             else:
                 print(f"[OpenRouter] Web search: DISABLED")
 
-            # Disable streaming when tools are provided (incompatible)
-            use_streaming = stream_callback is not None and not tools
+            # Stream whenever a callback is given; tool-call deltas are reassembled
+            # from the stream and only a tool-free round's text is forwarded
+            use_streaming = stream_callback is not None
 
             payload = {
                 "model": model_to_use,
@@ -1039,9 +1590,13 @@ def call_openrouter_api(
                 "stream": use_streaming
             }
 
+            # Tools for this conversation; meta-tool expansion can replace the list mid-conversation.
+            # The list is passed through as-is so a ToolBundle's cached encoding is reused.
+            round_tools = {"tools": tools or []}
+
             # Add tools for function calling if provided
-            if tools:
-                payload["tools"] = tools
+            if round_tools["tools"]:
+                payload["tools"] = round_tools["tools"]
                 payload["tool_choice"] = "auto"  # Let model decide when to use tools
                 print(f"[OpenRouter] Tool calling enabled with {len(tools)} tools")
 
@@ -1059,253 +1614,107 @@ def call_openrouter_api(
                 else:
                     preview = str(content)[:80] + "..." if len(str(content)) > 80 else content
                     print(f"  [{i}] {m.get('role')}: {preview}")
-            
-            if stream_callback:
-                # Streaming mode
-                response = requests.post(
-                    "https://openrouter.ai/api/v1/chat/completions",
-                    headers=headers,
-                    json=payload,
-                    timeout=180,
-                    stream=True
-                )
-                
-                print(f"Response status: {response.status_code}")
-                
-                if response.status_code == 200:
-                    full_response = ""
-                    chunk_count = 0
-                    last_finish_reason = None
-                    debug_chunks = []  # Store first few chunks for debugging
-                    for line in response.iter_lines():
-                        if line:
-                            line_text = line.decode('utf-8')
-                            if line_text.startswith('data: '):
-                                json_str = line_text[6:]
-                                if json_str.strip() == '[DONE]':
-                                    break
-                                try:
-                                    chunk_data = json.loads(json_str)
-                                    # Store first 5 chunks for debugging
-                                    if len(debug_chunks) < 5:
-                                        debug_chunks.append(chunk_data)
-                                    if 'choices' in chunk_data and len(chunk_data['choices']) > 0:
-                                        choice = chunk_data['choices'][0]
-                                        delta = choice.get('delta', {})
-                                        content = delta.get('content', '')
-                                        last_finish_reason = choice.get('finish_reason')
-                                        if content:
-                                            full_response += content
-                                            stream_callback(content)
-                                        chunk_count += 1
-                                except json.JSONDecodeError:
-                                    continue
-                    # Log if response is empty
-                    if not full_response or not full_response.strip():
-                        print(f"[OpenRouter STREAM] Empty response from {model}", flush=True)
-                        print(f"[OpenRouter STREAM]   Chunks received: {chunk_count}", flush=True)
-                        print(f"[OpenRouter STREAM]   Last finish_reason: {last_finish_reason}", flush=True)
-                        print(f"[OpenRouter STREAM]   Response repr: {repr(full_response)}", flush=True)
-                        # Print the actual chunk data for debugging
-                        for i, chunk in enumerate(debug_chunks):
-                            print(f"[OpenRouter STREAM]   Chunk {i}: {json.dumps(chunk)[:300]}", flush=True)
-                    return True, full_response
-                else:
-                    return False, (response.status_code, response.text)
-            else:
-                # Non-streaming mode
-                response = requests.post(
-                    "https://openrouter.ai/api/v1/chat/completions",
-                    headers=headers,
-                    json=payload,
-                    timeout=60
-                )
-                
-                print(f"Response status: {response.status_code}")
-                
-                if response.status_code == 200:
-                    response_data = response.json()
-                    # Debug: log full response structure for empty responses
-                    if 'choices' in response_data and len(response_data['choices']) > 0:
-                        choice = response_data['choices'][0]
-                        message = choice.get('message', {})
-                        finish_reason = choice.get('finish_reason', '')
-                        content = message.get('content', '') if message else ''
-                        tool_calls = message.get('tool_calls', [])
-
-                        # Handle tool calls if present and we have an executor
-                        if tool_calls and tool_executor:
-                            print(f"[OpenRouter] Model requested {len(tool_calls)} tool call(s)")
-
-                            # Add assistant message with tool calls to conversation
-                            tool_call_msg = {
-                                "role": "assistant",
-                                "content": content,  # May be null
-                                "tool_calls": tool_calls
-                            }
-                            msgs.append(tool_call_msg)
-
-                            # Execute each tool and collect results
-                            for tc in tool_calls:
-                                try:
-                                    fn_name = tc.get('function', {}).get('name', '')
-                                    fn_args_str = tc.get('function', {}).get('arguments') or '{}'  # Handle empty string
-                                    tc_id = tc.get('id', '')
 
-                                    # Parse arguments
-                                    try:
-                                        fn_args = json.loads(fn_args_str) if isinstance(fn_args_str, str) else (fn_args_str or {})
-                                    except json.JSONDecodeError:
-                                        fn_args = {}
+            status_code, result = post_completion(payload, use_streaming)
+            print(f"Response status: {status_code}")
 
-                                    print(f"[OpenRouter] Executing tool: {fn_name}({fn_args})")
+            if status_code != 200:
+                return False, (status_code, result)
+            if result is None:
+                return True, None
 
-                                    # Execute the tool
-                                    tool_result = tool_executor(fn_name, fn_args)
+            content = result["content"]
+            tool_calls = result["tool_calls"]
 
-                                    # Check for meta-tool expansion signal
-                                    if isinstance(tool_result, dict) and tool_result.get("expansion_needed"):
-                                        print(f"[OpenRouter] Meta-tool expansion requested for {fn_name}, returning early")
-                                        return tool_result.get("message", f"Expanded {fn_name}")
-
-                                    # Add tool result to messages
-                                    msgs.append({
-                                        "role": "tool",
-                                        "tool_call_id": tc_id,
-                                        "content": json.dumps(tool_result) if isinstance(tool_result, dict) else str(tool_result)
-                                    })
-                                    print(f"[OpenRouter] Tool result: {tool_result}")
+            # Handle tool calls if present and we have an executor
+            if tool_calls and tool_executor and cancelled():
+                return True, None
+            if tool_calls and tool_executor:
+                print(f"[OpenRouter] Model requested {len(tool_calls)} tool call(s)")
 
-                                except Exception as e:
-                                    print(f"[OpenRouter] Tool execution error: {e}")
-                                    msgs.append({
-                                        "role": "tool",
-                                        "tool_call_id": tc.get('id', ''),
-                                        "content": json.dumps({"success": False, "message": str(e)})
-                                    })
+                expansion_message = execute_tool_calls(msgs, content, tool_calls, round_tools)
+                if expansion_message is not None:
+                    return True, expansion_message
+
+                # Make follow-up API call WITH tools to allow chained tool calls
+                max_tool_iterations = 10  # Prevent infinite loops
+                for iteration in range(max_tool_iterations):
+                    follow_up_payload = {
+                        "model": model_to_use,
+                        "messages": msgs,
+                        "temperature": 1,
+                        "max_tokens": 4000,
+                        "stream": use_streaming
+                    }
+                    # Include tools for chained tool calls
+                    if round_tools["tools"]:
+                        follow_up_payload["tools"] = round_tools["tools"]
+                    _add_openrouter_transforms(follow_up_payload)
+
+                    print(f"[OpenRouter] Making follow-up call (iteration {iteration + 1})...")
+                    follow_up_status, follow_up = post_completion(follow_up_payload, use_streaming)
+
+                    if follow_up_status != 200:
+                        print(f"[OpenRouter] Follow-up call failed with status {follow_up_status}")
+                        break
+                    if follow_up is None:
+                        break
+
+                    follow_up_content = follow_up["content"]
+                    follow_up_tool_calls = follow_up["tool_calls"]
+
+                    # If model wants more tool calls, execute them
+                    if follow_up_tool_calls and tool_executor and cancelled():
+                        return True, None
+                    if follow_up_tool_calls and tool_executor:
+                        print(f"[OpenRouter] Follow-up requested {len(follow_up_tool_calls)} more tool call(s)")
+                        expansion_message = execute_tool_calls(
+                            msgs, follow_up_content, follow_up_tool_calls, round_tools, label="chained tool"
+                        )
+                        if expansion_message is not None:
+                            return True, expansion_message
+                        # Continue loop for next iteration
+                        continue
+
+                    # No more tool calls - return content
+                    if follow_up_content:
+                        return True, follow_up_content
+                    break  # Exit loop if no content and no tool calls
+
+                print(f"[OpenRouter] Follow-up loop ended, using initial content if any")
+
+            if content and content.strip():
+                return True, content
+
+            # Log detailed info about empty response (avoiding base64)
+            import sys
+            message = result.get("message") or {}
+            print(f"[OpenRouter] Empty content from model: {model}", flush=True)
+            print(f"[OpenRouter]   Choice keys: {result.get('choice_keys')}", flush=True)
+            print(f"[OpenRouter]   Message keys: {list(message.keys()) if message else 'None'}", flush=True)
+            print(f"[OpenRouter]   Finish reason: {result.get('finish_reason')}", flush=True)
+            print(f"[OpenRouter]   Content type: {type(content).__name__}, len: {len(content) if content else 0}", flush=True)
+            print(f"[OpenRouter]   Content repr: {repr(content)}", flush=True)
+            # Check for refusal or other indicators
+            if message.get('refusal'):
+                print(f"[OpenRouter]   Refusal: {message.get('refusal')}", flush=True)
+            # Check for tool_calls that weren't handled
+            if tool_calls and not tool_executor:
+                print(f"[OpenRouter]   Tool calls: {len(tool_calls)} call(s) (no executor provided)", flush=True)
+            sys.stdout.flush()
+            return True, None
 
-                            # Make follow-up API call WITH tools to allow chained tool calls
-                            max_tool_iterations = 10  # Prevent infinite loops
-                            for iteration in range(max_tool_iterations):
-                                follow_up_payload = {
-                                    "model": model_to_use,
-                                    "messages": msgs,
-                                    "temperature": 1,
-                                    "max_tokens": 4000,
-                                    "stream": False
-                                }
-                                # Include tools for chained tool calls
-                                if tools:
-                                    follow_up_payload["tools"] = tools
-                                _add_openrouter_transforms(follow_up_payload)
-
-                                print(f"[OpenRouter] Making follow-up call (iteration {iteration + 1})...")
-                                follow_up_response = requests.post(
-                                    "https://openrouter.ai/api/v1/chat/completions",
-                                    headers=headers,
-                                    json=follow_up_payload,
-                                    timeout=60
-                                )
-
-                                if follow_up_response.status_code == 200:
-                                    follow_up_data = follow_up_response.json()
-                                    if 'choices' in follow_up_data and len(follow_up_data['choices']) > 0:
-                                        follow_up_choice = follow_up_data['choices'][0]
-                                        follow_up_message = follow_up_choice.get('message', {})
-                                        follow_up_content = follow_up_message.get('content', '')
-                                        follow_up_tool_calls = follow_up_message.get('tool_calls', [])
-
-                                        # If model wants more tool calls, execute them
-                                        if follow_up_tool_calls and tool_executor:
-                                            print(f"[OpenRouter] Follow-up requested {len(follow_up_tool_calls)} more tool call(s)")
-
-                                            # Add assistant message with tool calls
-                                            msgs.append({
-                                                "role": "assistant",
-                                                "content": follow_up_content,
-                                                "tool_calls": follow_up_tool_calls
-                                            })
-
-                                            # Execute each tool
-                                            for tc in follow_up_tool_calls:
-                                                try:
-                                                    fn_name = tc.get('function', {}).get('name', '')
-                                                    fn_args_str = tc.get('function', {}).get('arguments') or '{}'  # Handle empty string
-                                                    tc_id = tc.get('id', '')
-
-                                                    try:
-                                                        fn_args = json.loads(fn_args_str) if isinstance(fn_args_str, str) else (fn_args_str or {})
-                                                    except json.JSONDecodeError:
-                                                        fn_args = {}
-
-                                                    print(f"[OpenRouter] Executing chained tool: {fn_name}({fn_args})")
-                                                    tool_result = tool_executor(fn_name, fn_args)
-
-                                                    # Check for meta-tool expansion signal
-                                                    if isinstance(tool_result, dict) and tool_result.get("expansion_needed"):
-                                                        print(f"[OpenRouter] Meta-tool expansion in chained call for {fn_name}, returning early")
-                                                        return True, tool_result.get("message", f"Expanded {fn_name}")
-
-                                                    msgs.append({
-                                                        "role": "tool",
-                                                        "tool_call_id": tc_id,
-                                                        "content": json.dumps(tool_result) if isinstance(tool_result, dict) else str(tool_result)
-                                                    })
-                                                    print(f"[OpenRouter] Chained tool result: {tool_result}")
-                                                except Exception as e:
-                                                    print(f"[OpenRouter] Chained tool error: {e}")
-                                                    msgs.append({
-                                                        "role": "tool",
-                                                        "tool_call_id": tc.get('id', ''),
-                                                        "content": json.dumps({"success": False, "message": str(e)})
-                                                    })
-                                            # Continue loop for next iteration
-                                            continue
-
-                                        # No more tool calls - return content
-                                        if follow_up_content:
-                                            return True, follow_up_content
-                                        break  # Exit loop if no content and no tool calls
-                                else:
-                                    print(f"[OpenRouter] Follow-up call failed with status {follow_up_response.status_code}")
-                                    break
-
-                            print(f"[OpenRouter] Follow-up loop ended, using initial content if any")
-
-                        if content and content.strip():
-                            return True, content
-                        else:
-                            # Log detailed info about empty response (avoiding base64)
-                            import sys
-                            print(f"[OpenRouter] Empty content from model: {model}", flush=True)
-                            print(f"[OpenRouter]   Choice keys: {list(choice.keys())}", flush=True)
-                            print(f"[OpenRouter]   Message keys: {list(message.keys()) if message else 'None'}", flush=True)
-                            print(f"[OpenRouter]   Finish reason: {finish_reason}", flush=True)
-                            print(f"[OpenRouter]   Content type: {type(content).__name__}, len: {len(content) if content else 0}", flush=True)
-                            print(f"[OpenRouter]   Content repr: {repr(content)}", flush=True)
-                            # Check for refusal or other indicators
-                            if message.get('refusal'):
-                                print(f"[OpenRouter]   Refusal: {message.get('refusal')}", flush=True)
-                            # Check for tool_calls that weren't handled
-                            if tool_calls and not tool_executor:
-                                print(f"[OpenRouter]   Tool calls: {len(tool_calls)} call(s) (no executor provided)", flush=True)
-                            sys.stdout.flush()
-                            return True, None
-                    else:
-                        print(f"[OpenRouter] No choices in response. Keys: {list(response_data.keys()) if isinstance(response_data, dict) else 'non-dict'}")
-                    return True, None
-                else:
-                    return False, (response.status_code, response.text)
-        
         # Try with images first
         success, result = make_api_call(include_images=True)
+        if cancelled():
+            print(f"[OpenRouter] Generation cancelled, discarding result")
+            return None
         print(f"[OpenRouter] First call result - success: {success}, result type: {type(result).__name__}, result: {repr(result)[:100] if result else 'None'}", flush=True)
         
         if success:
             # Check for empty response and retry once
             if result is None or (isinstance(result, str) and not result.strip()):
                 print(f"[OpenRouter] WARNING: Model {model} returned empty response, retrying...", flush=True)
-                import time
                 time.sleep(1)
                 success, result = make_api_call(include_images=True)
                 print(f"[OpenRouter] Retry result - success: {success}, result type: {type(result).__name__}, result: {repr(result)[:100] if result else 'None'}", flush=True)
@@ -1331,7 +1740,6 @@ def call_openrouter_api(
 
         # Handle 429 rate limit with exponential backoff retry
         if status_code == 429:
-            import time
             max_retries = 3
             base_delay = 2  # seconds
 
@@ -1339,6 +1747,8 @@ def call_openrouter_api(
                 delay = base_delay * (2 ** retry)  # 2, 4, 8 seconds
                 print(f"[OpenRouter] Rate limited (429), waiting {delay}s before retry {retry + 1}/{max_retries}...")
                 time.sleep(delay)
+                if cancelled():
+                    return None
 
                 success, result = make_api_call(include_images=True)
                 if success:
@@ -1822,34 +2232,34 @@ def ensure_videos_dir() -> Path:
     videos_dir.mkdir(exist_ok=True)
     return videos_dir
 
-def generate_video_with_sora(
+def _sora_vlog(msg: str):
+    if os.getenv('SORA_VERBOSE', '1').strip() == '1':
+        print(msg)
+
+def _sora_api() -> tuple[str, str | None]:
+    """Base URL and API key for the Sora REST API."""
+    return os.getenv('OPENAI_BASE_URL', 'https://api.openai.com/v1'), os.getenv('OPENAI_API_KEY')
+
+def start_sora_video(
     prompt: str,
     model: str = "sora-2",
     seconds: int | None = None,
     size: str | None = None,
-    poll_interval_seconds: float = 5.0,
 ) -> dict:
     """
-    Create a Sora video via REST API, poll until completion, and save MP4 to videos/.
+    Start a Sora render job without waiting for it.
 
-    Returns a dict with keys: success, video_id, status, video_path (when completed), error
+    Returns a dict with keys: success, video_id, status, error
     """
     try:
-        api_key = os.getenv('OPENAI_API_KEY')
+        base_url, api_key = _sora_api()
         if not api_key:
             return {"success": False, "error": "OPENAI_API_KEY not set"}
-
-        base_url = os.getenv('OPENAI_BASE_URL', 'https://api.openai.com/v1')
-        verbose = os.getenv('SORA_VERBOSE', '1').strip() == '1'
-        def vlog(msg: str):
-            if verbose:
-                print(msg)
         headers_json = {
             'Authorization': f'Bearer {api_key}',
             'Content-Type': 'application/json'
         }
 
-        # Start render job
         payload = {"model": model, "prompt": prompt}
         if seconds is not None:
             payload["seconds"] = str(seconds)
@@ -1857,53 +2267,60 @@ def generate_video_with_sora(
             payload["size"] = size
 
         create_url = f"{base_url}/videos"
-        vlog(f"[Sora] Create: url={create_url} model={model} seconds={seconds} size={size}")
-        vlog(f"[Sora] Prompt (truncated): {prompt[:200]}{'...' if len(prompt) > 200 else ''}")
+        _sora_vlog(f"[Sora] Create: url={create_url} model={model} seconds={seconds} size={size}")
+        _sora_vlog(f"[Sora] Prompt (truncated): {prompt[:200]}{'...' if len(prompt) > 200 else ''}")
         resp = requests.post(create_url, headers=headers_json, json=payload, timeout=60)
         if not resp.ok:
             err_text = resp.text
             try:
                 err_json = resp.json()
-                vlog(f"[Sora] Create error JSON: {err_json}")
+                _sora_vlog(f"[Sora] Create error JSON: {err_json}")
             except Exception:
-                vlog(f"[Sora] Create error TEXT: {err_text}")
+                _sora_vlog(f"[Sora] Create error TEXT: {err_text}")
             return {"success": False, "error": f"Create failed {resp.status_code}: {err_text}"}
         job = resp.json()
         video_id = job.get('id')
         status = job.get('status')
-        vlog(f"[Sora] Job started: id={video_id} status={status}")
+        _sora_vlog(f"[Sora] Job started: id={video_id} status={status}")
         if not video_id:
             return {"success": False, "error": "No video id returned from create()"}
+        return {"success": True, "video_id": video_id, "status": status}
+    except Exception as e:
+        logging.exception("Sora video create error")
+        return {"success": False, "error": str(e)}
+
+def get_sora_video_status(video_id: str) -> dict:
+    """
+    Check a Sora render job once.
+
+    Returns a dict with keys: success, video_id, status, progress, error
+    """
+    try:
+        base_url, api_key = _sora_api()
+        r = requests.get(f"{base_url}/videos/{video_id}", headers={'Authorization': f'Bearer {api_key}'}, timeout=60)
+        if not r.ok:
+            _sora_vlog(f"[Sora] Retrieve failed: code={r.status_code} body={r.text}")
+            return {"success": False, "video_id": video_id, "error": f"Retrieve failed {r.status_code}: {r.text}"}
+        job = r.json()
+        return {"success": True, "video_id": video_id, "status": job.get('status'), "progress": job.get('progress')}
+    except Exception as e:
+        logging.exception("Sora video retrieve error")
+        return {"success": False, "video_id": video_id, "error": str(e)}
 
-        # Poll until completion/failed
-        retrieve_url = f"{base_url}/videos/{video_id}"
-        last_status = status
-        last_progress = None
-        while status in ("queued", "in_progress"):
-            time.sleep(poll_interval_seconds)
-            r = requests.get(retrieve_url, headers=headers_json, timeout=60)
-            if not r.ok:
-                vlog(f"[Sora] Retrieve failed: code={r.status_code} body={r.text}")
-                return {"success": False, "video_id": video_id, "error": f"Retrieve failed {r.status_code}: {r.text}"}
-            job = r.json()
-            status = job.get('status')
-            progress = job.get('progress')
-            if status != last_status or progress != last_progress:
-                vlog(f"[Sora] Status update: status={status} progress={progress}")
-                last_status = status
-                last_progress = progress
-
-        if status != "completed":
-            vlog(f"[Sora] Final non-completed status: {status} job={job}")
-            return {"success": False, "video_id": video_id, "status": status, "error": f"Final status: {status}"}
-
-        # Download the MP4
+def download_sora_video(video_id: str, prompt: str) -> dict:
+    """
+    Download a completed Sora video to videos/.
+
+    Returns a dict with keys: success, video_id, video_path, error
+    """
+    try:
+        base_url, api_key = _sora_api()
         content_url = f"{base_url}/videos/{video_id}/content"
-        vlog(f"[Sora] Download: url={content_url}")
+        _sora_vlog(f"[Sora] Download: url={content_url}")
         rc = requests.get(content_url, headers={'Authorization': f'Bearer {api_key}'}, stream=True, timeout=300)
         if not rc.ok:
-            vlog(f"[Sora] Download failed: code={rc.status_code} body={rc.text}")
-            return {"success": False, "video_id": video_id, "status": status, "error": f"Download failed {rc.status_code}: {rc.text}"}
+            _sora_vlog(f"[Sora] Download failed: code={rc.status_code} body={rc.text}")
+            return {"success": False, "video_id": video_id, "error": f"Download failed {rc.status_code}: {rc.text}"}
 
         videos_dir = ensure_videos_dir()
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
@@ -1914,14 +2331,53 @@ def generate_video_with_sora(
                 if chunk:
                     f.write(chunk)
 
-        vlog(f"[Sora] Saved video: {out_path}")
-        return {
-            "success": True,
-            "video_id": video_id,
-            "status": status,
-            "video_path": str(out_path)
-        }
+        _sora_vlog(f"[Sora] Saved video: {out_path}")
+        return {"success": True, "video_id": video_id, "video_path": str(out_path)}
     except Exception as e:
-        logging.exception("Sora video generation error")
-        return {"success": False, "error": str(e)}
+        logging.exception("Sora video download error")
+        return {"success": False, "video_id": video_id, "error": str(e)}
+
+def generate_video_with_sora(
+    prompt: str,
+    model: str = "sora-2",
+    seconds: int | None = None,
+    size: str | None = None,
+    poll_interval_seconds: float = 5.0,
+) -> dict:
+    """
+    Create a Sora video via REST API, poll until completion, and save MP4 to videos/.
+
+    Blocks for the whole render; the Signal bot runs the same steps as a
+    background job instead (see signal_bot/media_jobs.py).
+
+    Returns a dict with keys: success, video_id, status, video_path (when completed), error
+    """
+    started = start_sora_video(prompt, model=model, seconds=seconds, size=size)
+    if not started.get("success"):
+        return started
+    video_id = started["video_id"]
+    status = started.get("status")
+
+    # Poll until completion/failed
+    last_status = status
+    last_progress = None
+    while status in ("queued", "in_progress"):
+        time.sleep(poll_interval_seconds)
+        job = get_sora_video_status(video_id)
+        if not job.get("success"):
+            return job
+        status = job.get('status')
+        progress = job.get('progress')
+        if status != last_status or progress != last_progress:
+            _sora_vlog(f"[Sora] Status update: status={status} progress={progress}")
+            last_status = status
+            last_progress = progress
+
+    if status != "completed":
+        _sora_vlog(f"[Sora] Final non-completed status: {status}")
+        return {"success": False, "video_id": video_id, "status": status, "error": f"Final status: {status}"}
+
+    result = download_sora_video(video_id, prompt)
+    result["status"] = status
+    return result
 
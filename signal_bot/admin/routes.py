@@ -8,6 +8,10 @@ from signal_bot.models import (
     SystemPromptTemplate, ActivityLog, GroupMemberMemory, MessageLog,
     CustomModel, ScheduledTrigger, ChatLog, ImageModel
 )
+from signal_bot.db_session import get_connection_stats
+from signal_bot.metrics import get_metrics
+from signal_bot.media_jobs import get_media_jobs
+from signal_bot.member_memory_index import invalidate_member_memory_index
 
 
 def _get_all_models():
@@ -57,12 +61,16 @@ def register_routes(app):
             ActivityLog.event_type == "image_generated"
         ).count()
 
+        # Recent image/video jobs (shared process only; empty otherwise)
+        media_jobs = get_media_jobs().jobs()[:20]
+
         return render_template("dashboard.html",
                                bots=bots,
                                groups=groups,
                                activity=recent_activity,
                                messages_today=messages_today,
-                               images_generated=images_generated)
+                               images_generated=images_generated,
+                               media_jobs=media_jobs)
 
     @app.route("/bots")
     def bots_list():
@@ -126,12 +134,15 @@ def register_routes(app):
         if request.method == "POST":
             bot.name = request.form.get("name", bot.name).strip()
             bot.model = request.form.get("model", bot.model).strip()
+            bot.fast_model = request.form.get("fast_model", "").strip() or None
             bot.phone_number = request.form.get("phone_number", "").strip() or None
             bot.signal_api_port = int(request.form.get("signal_api_port", bot.signal_api_port))
             bot.system_prompt = request.form.get("system_prompt", "").strip() or None
             bot.respond_on_mention = request.form.get("respond_on_mention") == "on"
             bot.random_chance_percent = int(request.form.get("random_chance_percent", 15))
             bot.context_window = int(request.form.get("context_window", 25))
+            context_token_budget = request.form.get("context_token_budget", "").strip()
+            bot.context_token_budget = int(context_token_budget) if context_token_budget else None
             bot.image_generation_enabled = request.form.get("image_generation_enabled") == "on"
             bot.image_model = request.form.get("image_model", "").strip() or None
             bot.web_search_enabled = request.form.get("web_search_enabled") == "on"
@@ -161,6 +172,8 @@ def register_routes(app):
             bot.max_reactions_per_response = int(request.form.get("max_reactions_per_response", 3))
             bot.typing_enabled = request.form.get("typing_enabled") == "on"
             bot.read_receipts_enabled = request.form.get("read_receipts_enabled") == "on"
+            bot.streaming_enabled = request.form.get("streaming_enabled") == "on"
+            bot.hedging_enabled = request.form.get("hedging_enabled") == "on"
 
             # Member memory settings
             bot.member_memory_model = request.form.get("member_memory_model", "").strip() or None
@@ -186,7 +199,11 @@ def register_routes(app):
         all_models = _get_all_models()
         image_models = _get_image_models()
 
-        return render_template("edit_bot.html", bot=bot, prompts=prompts, all_models=all_models, image_models=image_models)
+        # Per-tier LLM stats since the bots started (shared process only; empty otherwise)
+        tier_stats = get_metrics(bot_id).get(bot_id, {}).get("tiers", {})
+
+        return render_template("edit_bot.html", bot=bot, prompts=prompts, all_models=all_models,
+                               image_models=image_models, tier_stats=tier_stats)
 
     @app.route("/bots/<bot_id>/delete", methods=["POST"])
     def delete_bot(bot_id):
@@ -876,8 +893,10 @@ def register_routes(app):
     def delete_member_memory(memory_id):
         """Delete a member memory."""
         memory = GroupMemberMemory.query.get_or_404(memory_id)
+        group_id = memory.group_id
         db.session.delete(memory)
         db.session.commit()
+        invalidate_member_memory_index(group_id)
         flash("Member memory deleted", "success")
         return redirect(url_for("member_memories_list"))
 
@@ -898,6 +917,7 @@ def register_routes(app):
         memory.valid_until = datetime.fromisoformat(valid_until) if valid_until else None
 
         db.session.commit()
+        invalidate_member_memory_index(memory.group_id)
         flash("Member memory updated", "success")
         return redirect(url_for("member_memories_list"))
 
@@ -963,6 +983,7 @@ def register_routes(app):
             flash(f"Added {slot_type} for {member_name}", "success")
 
         db.session.commit()
+        invalidate_member_memory_index(group_id)
         return redirect(url_for("member_memories_list"))
 
     @app.route("/member-memories/force-scan/<path:group_id>", methods=["POST"])
@@ -1001,6 +1022,21 @@ def register_routes(app):
             "groups": [g.to_dict() for g in groups]
         })
 
+    @app.route("/api/db-stats")
+    def api_db_stats():
+        """Get database connection checkout statistics."""
+        return jsonify(get_connection_stats())
+
+    @app.route("/api/metrics")
+    def api_metrics():
+        """Get per-bot performance metrics (latencies, counters)."""
+        return jsonify(get_metrics(request.args.get("bot_id") or None))
+
+    @app.route("/api/media-jobs")
+    def api_media_jobs():
+        """Get recent image/video generation jobs and their status."""
+        return jsonify(get_media_jobs().jobs(request.args.get("bot_id") or None))
+
     @app.route("/api/activity")
     def api_activity():
         """Get recent activity."""
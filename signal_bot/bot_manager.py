@@ -1,8 +1,6 @@
 """Bot manager for orchestrating multiple Signal bots."""
 
 import asyncio
-import base64
-import io
 import logging
 import httpx
 import random
@@ -12,7 +10,6 @@ import uuid
 from typing import Optional, Callable
 from dataclasses import dataclass
 from flask import Flask
-from PIL import Image
 
 from signal_bot.models import db, Bot, GroupConnection, BotGroupAssignment, ActivityLog
 from signal_bot.config_signal import (
@@ -24,6 +21,11 @@ from signal_bot.config_signal import (
     WEBSOCKET_PING_TIMEOUT
 )
 from signal_bot.message_handler import get_message_handler
+from signal_bot.group_ingest import get_group_ingest
+from signal_bot.media_jobs import get_media_jobs
+from signal_bot.image_compression import compress_image_async, shutdown_pool as shutdown_image_pool
+from signal_bot.model_tiers import select_model_tier, model_for_tier
+from signal_bot import metrics
 from signal_bot.member_memory_scanner import get_memory_scanner, set_flask_app as set_scanner_app
 from signal_bot.trigger_scheduler import create_trigger_scheduler, set_flask_app as set_scheduler_app
 from signal_bot.websocket_handler import SignalWebSocketHandler, WebSocketConfig, probe_websocket
@@ -43,59 +45,16 @@ def set_flask_app(app: Flask):
     set_scheduler_app(app)
 
 
-def compress_image_for_api(base64_data: str, media_type: str, max_bytes: int = 4_000_000) -> tuple[str, str]:
-    """Compress image to stay under API size limits (Claude: 5MB).
+def schedule_on_loop(loop: asyncio.AbstractEventLoop, coro):
+    """Schedule a coroutine on the bot loop from either the loop or a worker thread."""
+    try:
+        running = asyncio.get_running_loop()
+    except RuntimeError:
+        running = None
 
-    Args:
-        base64_data: Base64-encoded image data
-        media_type: MIME type (e.g., 'image/jpeg', 'image/png')
-        max_bytes: Target maximum size in bytes (default 4MB, leaves headroom for 5MB API limit)
-
-    Returns:
-        Tuple of (compressed_base64, media_type). May convert PNG to JPEG.
-    """
-    # Decode base64 to bytes
-    image_bytes = base64.b64decode(base64_data)
-    original_size = len(image_bytes)
-
-    # If already under limit, return as-is
-    if original_size <= max_bytes:
-        return base64_data, media_type
-
-    logger.info(f"Compressing image: {original_size:,} bytes -> target {max_bytes:,} bytes")
-
-    # Open image with PIL
-    img = Image.open(io.BytesIO(image_bytes))
-
-    # Convert RGBA/P to RGB for JPEG (JPEG doesn't support alpha)
-    if img.mode in ('RGBA', 'P'):
-        img = img.convert('RGB')
-
-    # Scale down if very large (max 2000px on longest side)
-    max_dimension = 2000
-    if max(img.size) > max_dimension:
-        ratio = max_dimension / max(img.size)
-        new_size = (int(img.width * ratio), int(img.height * ratio))
-        img = img.resize(new_size, Image.Resampling.LANCZOS)
-        logger.info(f"Resized image to {new_size[0]}x{new_size[1]}")
-
-    # Try progressively lower quality until under limit
-    for quality in [85, 70, 55, 40]:
-        buffer = io.BytesIO()
-        img.save(buffer, format='JPEG', quality=quality, optimize=True)
-        compressed = buffer.getvalue()
-        if len(compressed) <= max_bytes:
-            logger.info(f"Compressed to {len(compressed):,} bytes at quality={quality}")
-            return base64.b64encode(compressed).decode('utf-8'), 'image/jpeg'
-
-    # Final fallback: aggressive resize + low quality
-    ratio = 0.5
-    img = img.resize((int(img.width * ratio), int(img.height * ratio)), Image.Resampling.LANCZOS)
-    buffer = io.BytesIO()
-    img.save(buffer, format='JPEG', quality=40, optimize=True)
-    compressed = buffer.getvalue()
-    logger.info(f"Aggressive compression: {len(compressed):,} bytes (50% scale, quality=40)")
-    return base64.b64encode(compressed).decode('utf-8'), 'image/jpeg'
+    if running is loop:
+        return loop.create_task(coro)
+    return asyncio.run_coroutine_threadsafe(coro, loop)
 
 
 @dataclass
@@ -121,6 +80,8 @@ class SignalBotManager:
         self._tasks: dict[str, asyncio.Task] = {}
         self._http_clients: dict[int, httpx.AsyncClient] = {}
         self._port_locks: dict[int, asyncio.Semaphore] = {}  # Serialize Signal container requests
+        self._ingest_locks: dict[str, asyncio.Lock] = {}  # Per-bot: log messages in arrival order
+        self._message_tasks: set[asyncio.Task] = set()  # Messages being processed (responses run concurrently)
         self.message_handler = get_message_handler()
 
         # WebSocket handlers for json-rpc mode (per-bot)
@@ -153,6 +114,9 @@ class SignalBotManager:
             bots = Bot.query.filter_by(enabled=True).all()
             bot_ids = [bot.id for bot in bots]
 
+        # Image/video jobs are queued from worker threads but run on this loop
+        get_media_jobs().attach(asyncio.get_running_loop())
+
         for bot_id in bot_ids:
             await self.start_bot(bot_id)
 
@@ -181,6 +145,9 @@ class SignalBotManager:
         # Stop memory scanner
         await self.memory_scanner.stop()
 
+        # Stop image compression workers
+        shutdown_image_pool()
+
         # Cancel idle checker
         if self._idle_checker_task:
             self._idle_checker_task.cancel()
@@ -189,6 +156,10 @@ class SignalBotManager:
             except asyncio.CancelledError:
                 pass
 
+        # Cancel in-flight message processing
+        for task in list(self._message_tasks):
+            task.cancel()
+
         # Stop WebSocket handlers
         for handler in list(self._ws_handlers.values()):
             await handler.stop()
@@ -249,6 +220,8 @@ class SignalBotManager:
                 'max_reactions_per_response': getattr(bot, 'max_reactions_per_response', 3),
                 'typing_enabled': getattr(bot, 'typing_enabled', True),
                 'read_receipts_enabled': getattr(bot, 'read_receipts_enabled', False),
+                'streaming_enabled': getattr(bot, 'streaming_enabled', False),
+                'hedging_enabled': getattr(bot, 'hedging_enabled', False),
                 # Google Sheets integration
                 'google_sheets_enabled': getattr(bot, 'google_sheets_enabled', False),
                 'google_client_id': getattr(bot, 'google_client_id', None),
@@ -261,7 +234,9 @@ class SignalBotManager:
                 # Member memory tools
                 'member_memory_tools_enabled': getattr(bot, 'member_memory_tools_enabled', False),
                 'member_memory_model': getattr(bot, 'member_memory_model', None),
+                'fast_model': getattr(bot, 'fast_model', None),
                 'context_window': getattr(bot, 'context_window', 25),
+                'context_token_budget': getattr(bot, 'context_token_budget', None),
                 # Scheduled triggers
                 'triggers_enabled': getattr(bot, 'triggers_enabled', True),
                 'max_triggers': getattr(bot, 'max_triggers', 10),
@@ -391,8 +366,29 @@ class SignalBotManager:
         mentions: Optional[list[dict]] = None,
         text_styles: Optional[list[dict]] = None
     ) -> bool:
+        """Send a text message to a group. See send_message_with_timestamp for args."""
+        sent, _ = await self.send_message_with_timestamp(
+            phone_number, group_id, message, port,
+            quote_timestamp=quote_timestamp,
+            quote_author=quote_author,
+            mentions=mentions,
+            text_styles=text_styles
+        )
+        return sent
+
+    async def send_message_with_timestamp(
+        self,
+        phone_number: str,
+        group_id: str,
+        message: str,
+        port: int = 8080,
+        quote_timestamp: Optional[int] = None,
+        quote_author: Optional[str] = None,
+        mentions: Optional[list[dict]] = None,
+        text_styles: Optional[list[dict]] = None
+    ) -> tuple[bool, Optional[int]]:
         """
-        Send a text message to a group.
+        Send a text message to a group, returning its Signal timestamp (needed to edit it).
 
         Args:
             phone_number: Bot's phone number
@@ -403,6 +399,9 @@ class SignalBotManager:
             quote_author: Author UUID of message to quote
             mentions: List of mentions [{start, length, uuid}]
             text_styles: List of styles [{start, length, style}] where style is BOLD, ITALIC, etc.
+
+        Returns:
+            (sent, timestamp) - timestamp is None if unknown (e.g. partial delivery)
         """
         url = f"http://localhost:{port}/v2/send"
 
@@ -433,22 +432,27 @@ class SignalBotManager:
                 response = await client.post(url, json=payload, timeout=30.0)
 
             if response.status_code in (200, 201):
-                return True
+                timestamp = None
+                try:
+                    timestamp = int(response.json().get("timestamp"))
+                except (ValueError, TypeError, AttributeError):
+                    pass
+                return True, timestamp
             elif response.status_code == 400:
                 # Check for partial delivery (unregistered user in group)
                 error_text = response.text
                 if "Unregistered user" in error_text:
                     logger.warning(f"Partial send - some recipients unregistered: {error_text}")
-                    return True  # Message likely delivered to other members
+                    return True, None  # Message likely delivered to other members
                 else:
                     logger.error(f"Send message failed: {response.status_code} - {error_text}")
-                    return False
+                    return False, None
             else:
                 logger.error(f"Send message failed: {response.status_code} - {response.text}")
-                return False
+                return False, None
         except Exception as e:
             logger.error(f"Error sending message: {e}\n{traceback.format_exc()}")
-            return False
+            return False, None
 
     async def send_image(
         self,
@@ -503,11 +507,11 @@ class SignalBotManager:
         group_id: str,
         account: str,
         port: int = 8080
-    ) -> Optional[str]:
-        """Fetch attachment data from Signal API as base64 string.
+    ) -> Optional[bytes]:
+        """Fetch attachment data from Signal API as raw bytes.
 
         Tries JSON-RPC first (for json-rpc mode), falls back to REST (for normal mode).
-        Returns base64-encoded attachment data.
+        JSON-RPC returns base64, which is decoded here; REST bytes are used as-is.
         """
         import base64 as b64
         client = await self._get_http_client(port)
@@ -532,7 +536,7 @@ class SignalBotManager:
                 result = response.json()
                 if "result" in result:
                     logger.info(f"Successfully fetched attachment via JSON-RPC: {len(result['result'])} chars")
-                    return result["result"]  # Base64 string
+                    return b64.b64decode(result["result"])
                 elif "error" in result:
                     logger.warning(f"JSON-RPC error: {result['error']}")
             else:
@@ -548,9 +552,8 @@ class SignalBotManager:
                 response = await client.get(rest_url, timeout=30.0)
             logger.info(f"[DEBUG] REST response: {response.status_code}, content-type: {response.headers.get('content-type')}, size: {len(response.content)}")
             if response.status_code == 200:
-                encoded = b64.b64encode(response.content).decode('utf-8')
-                logger.info(f"Successfully fetched attachment via REST: {len(encoded)} chars")
-                return encoded
+                logger.info(f"Successfully fetched attachment via REST: {len(response.content)} bytes")
+                return response.content
             else:
                 logger.error(f"REST fallback failed: HTTP {response.status_code}")
         except Exception as e:
@@ -803,7 +806,8 @@ class SignalBotManager:
         group_id: str,
         original_timestamp: int,
         new_text: str,
-        port: int = 8080
+        port: int = 8080,
+        text_styles: Optional[list[dict]] = None
     ) -> bool:
         """Edit a previously sent message."""
         url = f"http://localhost:{port}/v2/send"
@@ -815,6 +819,9 @@ class SignalBotManager:
             "edit_timestamp": original_timestamp
         }
 
+        if text_styles:
+            payload["text_style"] = text_styles
+
         try:
             client = await self._get_http_client(port)
             async with self._get_port_lock(port):
@@ -913,7 +920,7 @@ class SignalBotManager:
 
         # Create message callback that processes messages
         async def on_message(message: dict):
-            await self._process_message(bot_data, message)
+            self._dispatch_message(bot_data, message)
 
         # Create WebSocket handler with config
         ws_config = WebSocketConfig(
@@ -957,7 +964,7 @@ class SignalBotManager:
                 messages = await self._receive_messages(phone, port)
 
                 for msg in messages:
-                    await self._process_message(bot_data, msg)
+                    self._dispatch_message(bot_data, msg)
 
             except asyncio.CancelledError:
                 break
@@ -1074,7 +1081,38 @@ class SignalBotManager:
             return None
 
 
-    async def _process_message(self, bot_data: dict, message: dict):
+    def _dispatch_message(self, bot_data: dict, message: dict):
+        """Process a message in its own task so a slow response doesn't block the next message."""
+        task = asyncio.create_task(self._process_message_in_order(bot_data, message))
+        self._message_tasks.add(task)
+        task.add_done_callback(self._message_tasks.discard)
+
+    async def _process_message_in_order(self, bot_data: dict, message: dict):
+        """
+        Process a message, holding the bot's ingest lock until it has been logged.
+
+        Messages are logged and the respond decision is made in arrival order
+        (asyncio.Lock wakes waiters FIFO); response generation then runs
+        concurrently, so a newer message can supersede an unsent response.
+        """
+        lock = self._ingest_locks.setdefault(str(bot_data['id']), asyncio.Lock())
+        await lock.acquire()
+        released = False
+
+        def release_ingest():
+            nonlocal released
+            if not released:
+                released = True
+                lock.release()
+
+        try:
+            await self._process_message(bot_data, message, on_ingested=release_ingest)
+        except Exception as e:
+            logger.error(f"Error processing message for {bot_data['name']}: {e}\n{traceback.format_exc()}")
+        finally:
+            release_ingest()
+
+    async def _process_message(self, bot_data: dict, message: dict, on_ingested: Optional[Callable[[], None]] = None):
         """Process an incoming Signal message."""
         # Extract message details
         envelope = message.get("envelope", {})
@@ -1101,12 +1139,14 @@ class SignalBotManager:
         if not group_id:
             return  # Not a group message (could add DM support later)
 
-        # All database operations need app context - keep it open for the whole handler
+        # Short unit of work: refresh settings and check assignment, then release the
+        # session before any network I/O (attachment downloads, LLM calls, sends)
         with _flask_app.app_context():
             # Refresh bot settings from database to pick up any changes made in admin UI
             bot = Bot.query.get(bot_data['id'])
             if bot:
                 bot_data['model'] = bot.model
+                bot_data['fast_model'] = getattr(bot, 'fast_model', None)
                 bot_data['system_prompt'] = bot.system_prompt
                 bot_data['enabled'] = bot.enabled
                 bot_data['respond_on_mention'] = bot.respond_on_mention
@@ -1122,6 +1162,9 @@ class SignalBotManager:
                 bot_data['max_reactions_per_response'] = getattr(bot, 'max_reactions_per_response', 3)
                 bot_data['typing_enabled'] = getattr(bot, 'typing_enabled', True)
                 bot_data['read_receipts_enabled'] = getattr(bot, 'read_receipts_enabled', False)
+                bot_data['streaming_enabled'] = getattr(bot, 'streaming_enabled', False)
+                bot_data['hedging_enabled'] = getattr(bot, 'hedging_enabled', False)
+                bot_data['context_token_budget'] = getattr(bot, 'context_token_budget', None)
                 # Refresh D&D settings
                 bot_data['dnd_enabled'] = getattr(bot, 'dnd_enabled', False)
                 bot_data['dnd_template_spreadsheet_id'] = getattr(bot, 'dnd_template_spreadsheet_id', None)
@@ -1148,198 +1191,244 @@ class SignalBotManager:
                 return
             group_name = group.name
 
-            # Extract sender and message
-            sender_id = envelope.get("sourceUuid", envelope.get("source", "Unknown"))
-            sender_name = envelope.get("sourceName", "Unknown")
-            message_text = data_message.get("message") or ""  # Handle None value from image-only messages
-            message_timestamp = data_message.get("timestamp")  # For reactions
-
-            # Extract image attachments
-            attachments = data_message.get("attachments", [])
-            image_attachments = []
-            for att in attachments:
-                # Debug: log full attachment structure
-                logger.info(f"[DEBUG] Attachment object keys: {list(att.keys())}")
-                logger.info(f"[DEBUG] Attachment object: {att}")
-                content_type = att.get("contentType", "")
-                if content_type.startswith("image/"):
-                    attachment_id = att.get("id")
-                    if attachment_id:
-                        image_attachments.append({
-                            "content_type": content_type,
-                            "id": attachment_id,
-                            "filename": att.get("filename"),
-                            "size": att.get("size", 0)
-                        })
+        # Extract sender and message
+        sender_id = envelope.get("sourceUuid", envelope.get("source", "Unknown"))
+        sender_name = envelope.get("sourceName", "Unknown")
+        message_text = data_message.get("message") or ""  # Handle None value from image-only messages
+        message_timestamp = data_message.get("timestamp")  # For reactions
+
+        # Extract image attachments
+        attachments = data_message.get("attachments", [])
+        image_attachments = []
+        for att in attachments:
+            # Debug: log full attachment structure
+            logger.info(f"[DEBUG] Attachment object keys: {list(att.keys())}")
+            logger.info(f"[DEBUG] Attachment object: {att}")
+            content_type = att.get("contentType", "")
+            if content_type.startswith("image/"):
+                attachment_id = att.get("id")
+                if attachment_id:
+                    image_attachments.append({
+                        "content_type": content_type,
+                        "id": attachment_id,
+                        "filename": att.get("filename"),
+                        "size": att.get("size", 0)
+                    })
+
+        if image_attachments:
+            logger.info(f"Found {len(image_attachments)} image attachment(s)")
+
+        if not message_text and not image_attachments:
+            return  # Empty message with no attachments
+
+        # Don't respond to own messages
+        if sender_id == bot_data['phone_number']:
+            return
 
-            if image_attachments:
-                logger.info(f"Found {len(image_attachments)} image attachment(s)")
+        # Track activity for idle news feature
+        self._group_last_activity[group_id] = time.time()
 
-            if not message_text and not image_attachments:
-                return  # Empty message with no attachments
+        # Check for Signal native @mentions of the bot
+        mentions = data_message.get("mentions", [])
+        is_mentioned_native = False
 
-            # Don't respond to own messages
-            if sender_id == bot_data['phone_number']:
-                return
+        # Normalize bot's phone number for comparison
+        bot_phone_normalized = bot_data['phone_number'].replace("+", "").replace("-", "").replace(" ", "")
 
-            # Track activity for idle news feature
-            self._group_last_activity[group_id] = time.time()
-
-            # Check for Signal native @mentions of the bot
-            mentions = data_message.get("mentions", [])
-            is_mentioned_native = False
-
-            # Normalize bot's phone number for comparison
-            bot_phone_normalized = bot_data['phone_number'].replace("+", "").replace("-", "").replace(" ", "")
-
-            for mention in mentions:
-                mentioned_uuid = mention.get("uuid", "")
-                mentioned_number = mention.get("number", "")
-                # Normalize mentioned number for comparison
-                mentioned_normalized = mentioned_number.replace("+", "").replace("-", "").replace(" ", "") if mentioned_number else ""
-
-                if mentioned_normalized and bot_phone_normalized == mentioned_normalized:
-                    is_mentioned_native = True
-                    break
-                # Also check UUID match (future-proofing)
-                if mentioned_uuid and mentioned_uuid == bot_data.get('signal_uuid'):
-                    is_mentioned_native = True
-                    break
-
-            # FALLBACK: If Signal mentions array failed, check text for bot name
-            if not is_mentioned_native:
-                bot_name_lower = bot_data['name'].lower()
-                text_lower = message_text.lower()
-                if bot_name_lower in text_lower or f"@{bot_name_lower}" in text_lower:
-                    is_mentioned_native = True
-
-            # Check if this is a reply to one of the bot's messages
-            is_reply_to_bot = False
-            quote_info = data_message.get("quote")
-            if quote_info:
-                quote_author = quote_info.get("author", "")
-                # Check if quoted message was from the bot (by phone number or UUID)
-                if quote_author:
-                    quote_author_normalized = quote_author.replace("+", "").replace("-", "").replace(" ", "")
-                    bot_uuid = bot_data.get('signal_uuid')
-                    if quote_author_normalized == bot_phone_normalized:
-                        is_reply_to_bot = True
-                    elif quote_author == bot_uuid:
-                        is_reply_to_bot = True
-                    else:
-                        # Debug: log when quote doesn't match bot
-                        logger.info(f"[DEBUG] Quote author '{quote_author}' doesn't match bot phone '{bot_phone_normalized}' or UUID '{bot_uuid}'")
-
-            # Log safely (encode special chars for Windows)
-            safe_text = message_text[:50].encode('ascii', 'replace').decode('ascii')
-            has_quote = "quote" in data_message
-            logger.info(f"[{group_name}] {sender_name}: {safe_text}... (mentions: {len(mentions)}, bot_mentioned: {is_mentioned_native}, reply_to_bot: {is_reply_to_bot})")
-
-            # Send read receipt if enabled
-            if bot_data.get('read_receipts_enabled', False) and message_timestamp and sender_id:
-                asyncio.create_task(
-                    self.send_read_receipt(
-                        bot_data['phone_number'],
-                        group_id,
-                        sender_id,
-                        [message_timestamp],
-                        bot_data['signal_api_port']
-                    )
-                )
+        for mention in mentions:
+            mentioned_uuid = mention.get("uuid", "")
+            mentioned_number = mention.get("number", "")
+            # Normalize mentioned number for comparison
+            mentioned_normalized = mentioned_number.replace("+", "").replace("-", "").replace(" ", "") if mentioned_number else ""
 
-            # Create send callbacks with quote support
-            async def send_text(
-                text: str,
-                quote_timestamp: Optional[int] = None,
-                quote_author: Optional[str] = None,
-                mentions: Optional[list] = None,
-                text_styles: Optional[list] = None
-            ):
-                await self.send_message(
+            if mentioned_normalized and bot_phone_normalized == mentioned_normalized:
+                is_mentioned_native = True
+                break
+            # Also check UUID match (future-proofing)
+            if mentioned_uuid and mentioned_uuid == bot_data.get('signal_uuid'):
+                is_mentioned_native = True
+                break
+
+        # FALLBACK: If Signal mentions array failed, check text for bot name
+        if not is_mentioned_native:
+            bot_name_lower = bot_data['name'].lower()
+            text_lower = message_text.lower()
+            if bot_name_lower in text_lower or f"@{bot_name_lower}" in text_lower:
+                is_mentioned_native = True
+
+        # Check if this is a reply to one of the bot's messages
+        is_reply_to_bot = False
+        quote_info = data_message.get("quote")
+        if quote_info:
+            quote_author = quote_info.get("author", "")
+            # Check if quoted message was from the bot (by phone number or UUID)
+            if quote_author:
+                quote_author_normalized = quote_author.replace("+", "").replace("-", "").replace(" ", "")
+                bot_uuid = bot_data.get('signal_uuid')
+                if quote_author_normalized == bot_phone_normalized:
+                    is_reply_to_bot = True
+                elif quote_author == bot_uuid:
+                    is_reply_to_bot = True
+                else:
+                    # Debug: log when quote doesn't match bot
+                    logger.info(f"[DEBUG] Quote author '{quote_author}' doesn't match bot phone '{bot_phone_normalized}' or UUID '{bot_uuid}'")
+
+        # Log safely (encode special chars for Windows)
+        safe_text = message_text[:50].encode('ascii', 'replace').decode('ascii')
+        has_quote = "quote" in data_message
+        logger.info(f"[{group_name}] {sender_name}: {safe_text}... (mentions: {len(mentions)}, bot_mentioned: {is_mentioned_native}, reply_to_bot: {is_reply_to_bot})")
+
+        # Send read receipt if enabled
+        if bot_data.get('read_receipts_enabled', False) and message_timestamp and sender_id:
+            asyncio.create_task(
+                self.send_read_receipt(
                     bot_data['phone_number'],
                     group_id,
-                    text,
-                    bot_data['signal_api_port'],
-                    quote_timestamp=quote_timestamp,
-                    quote_author=quote_author,
-                    mentions=mentions,
-                    text_styles=text_styles
+                    sender_id,
+                    [message_timestamp],
+                    bot_data['signal_api_port']
                 )
+            )
+
+        # Create send callbacks with quote support
+        async def send_text(
+            text: str,
+            quote_timestamp: Optional[int] = None,
+            quote_author: Optional[str] = None,
+            mentions: Optional[list] = None,
+            text_styles: Optional[list] = None
+        ):
+            await self.send_message(
+                bot_data['phone_number'],
+                group_id,
+                text,
+                bot_data['signal_api_port'],
+                quote_timestamp=quote_timestamp,
+                quote_author=quote_author,
+                mentions=mentions,
+                text_styles=text_styles
+            )
+
+        async def send_image_cb(path: str):
+            await self.send_image(bot_data['phone_number'], group_id, path, port=bot_data['signal_api_port'])
+
+        # Streaming callbacks: send the first chunk (keeping its timestamp), then edit it
+        async def stream_send_cb(
+            text: str,
+            text_styles: Optional[list] = None,
+            quote_timestamp: Optional[int] = None,
+            quote_author: Optional[str] = None
+        ):
+            return await self.send_message_with_timestamp(
+                bot_data['phone_number'],
+                group_id,
+                text,
+                bot_data['signal_api_port'],
+                quote_timestamp=quote_timestamp,
+                quote_author=quote_author,
+                text_styles=text_styles
+            )
 
-            async def send_image_cb(path: str):
-                await self.send_image(bot_data['phone_number'], group_id, path, port=bot_data['signal_api_port'])
+        async def stream_edit_cb(timestamp: int, text: str, text_styles: Optional[list] = None):
+            return await self.edit_message(
+                bot_data['phone_number'],
+                group_id,
+                timestamp,
+                text,
+                bot_data['signal_api_port'],
+                text_styles=text_styles
+            )
 
-            # Create typing callbacks
-            async def send_typing_cb():
-                await self.send_typing(bot_data['phone_number'], group_id, bot_data['signal_api_port'])
+        # Create typing callbacks
+        async def send_typing_cb():
+            await self.send_typing(bot_data['phone_number'], group_id, bot_data['signal_api_port'])
 
-            async def stop_typing_cb():
-                await self.send_typing(bot_data['phone_number'], group_id, bot_data['signal_api_port'], stop=True)
+        async def stop_typing_cb():
+            await self.send_typing(bot_data['phone_number'], group_id, bot_data['signal_api_port'], stop=True)
 
-            # Process image attachments into base64 (with compression for API limits)
-            incoming_images = []
+        # Process image attachments into raw bytes (with compression for API limits).
+        # Other bots in the group receive the same envelope; the first one downloads
+        async def load_images() -> list[dict]:
+            images = []
             for att in image_attachments:
                 try:
-                    base64_data = await self.get_attachment_data(
+                    image_bytes = await self.get_attachment_data(
                         attachment_id=att["id"],
                         group_id=group_id,
                         account=bot_data['phone_number'],
                         port=bot_data['signal_api_port']
                     )
-                    if base64_data:
+                    if image_bytes:
                         # Compress if needed to stay under API limits (Claude: 5MB)
-                        compressed_data, final_media_type = compress_image_for_api(
-                            base64_data,
+                        compressed_data, final_media_type = await compress_image_async(
+                            image_bytes,
                             att["content_type"]
                         )
-                        incoming_images.append({
+                        images.append({
                             "media_type": final_media_type,
-                            "data": compressed_data
+                            "data": compressed_data  # Raw bytes; base64 only in the API request body
                         })
-                        logger.info(f"Processed image attachment: {final_media_type}, {len(compressed_data)} chars")
+                        logger.info(f"Processed image attachment: {final_media_type}, {len(compressed_data):,} bytes")
                 except Exception as e:
                     logger.error(f"Failed to process attachment {att['id']}: {e}")
+            return images
 
-            # Queue for reactions - execute synchronously after message handler returns
-            pending_reactions: list[tuple[str, int, str]] = []
-
-            # Handle the message (inside app context for DB operations)
-            await self.message_handler.handle_incoming_message(
-                group_id=group_id,
-                sender_name=sender_name,
-                sender_id=sender_id,
-                message_text=message_text,
-                message_timestamp=message_timestamp,
-                bot_data=bot_data,
-                is_mentioned=is_mentioned_native,  # Pass native mention flag
-                is_reply_to_bot=is_reply_to_bot,  # Pass reply-to-bot flag
-                send_callback=lambda t, qt=None, qa=None, m=None, ts=None: asyncio.create_task(send_text(t, qt, qa, m, ts)),
-                send_image_callback=lambda p: asyncio.create_task(send_image_cb(p)),
-                send_typing_callback=lambda: asyncio.create_task(send_typing_cb()),
-                stop_typing_callback=lambda: asyncio.create_task(stop_typing_cb()),
-                incoming_images=incoming_images if incoming_images else None,
-                send_reaction_callback=lambda sid, ts, em: pending_reactions.append((sid, ts, em))
+        incoming_images = []
+        if image_attachments:
+            incoming_images = await get_group_ingest().once(
+                (group_id, message_timestamp), "images", load_images, bot_data['id']
             )
 
-            # Execute queued reactions synchronously after message handler completes
-            for target_sender_id, target_timestamp, emoji in pending_reactions:
-                try:
-                    await self.send_reaction(
-                        bot_data['phone_number'],
-                        group_id,
-                        target_sender_id,
-                        target_timestamp,
-                        emoji,
-                        bot_data['signal_api_port']
-                    )
-                    self._log_activity(
-                        "reaction_sent",
-                        bot_data['id'],
-                        group_id,
-                        f"{bot_data['name']} reacted with {emoji}"
-                    )
-                except Exception as e:
-                    logger.error(f"Failed to send queued reaction {emoji}: {e}\n{traceback.format_exc()}")
+        # Queue for reactions - execute synchronously after message handler returns
+        pending_reactions: list[tuple[str, int, str]] = []
+
+        # Generation (and tool execution) runs in a worker thread, so callbacks
+        # must schedule their coroutines back onto this loop
+        loop = asyncio.get_running_loop()
+
+        def schedule(coro):
+            return schedule_on_loop(loop, coro)
+
+        # Handle the message (the handler opens its own short DB units of work)
+        await self.message_handler.handle_incoming_message(
+            group_id=group_id,
+            sender_name=sender_name,
+            sender_id=sender_id,
+            message_text=message_text,
+            message_timestamp=message_timestamp,
+            bot_data=bot_data,
+            is_mentioned=is_mentioned_native,  # Pass native mention flag
+            is_reply_to_bot=is_reply_to_bot,  # Pass reply-to-bot flag
+            send_callback=lambda t, qt=None, qa=None, m=None, ts=None: schedule(send_text(t, qt, qa, m, ts)),
+            send_image_callback=lambda p: schedule(send_image_cb(p)),
+            send_typing_callback=lambda: schedule(send_typing_cb()),
+            stop_typing_callback=lambda: schedule(stop_typing_cb()),
+            incoming_images=incoming_images if incoming_images else None,
+            send_reaction_callback=lambda sid, ts, em: pending_reactions.append((sid, ts, em)),
+            stream_send_callback=stream_send_cb,
+            stream_edit_callback=stream_edit_cb,
+            on_ingested=on_ingested
+        )
+
+        # Execute queued reactions synchronously after message handler completes
+        for target_sender_id, target_timestamp, emoji in pending_reactions:
+            try:
+                await self.send_reaction(
+                    bot_data['phone_number'],
+                    group_id,
+                    target_sender_id,
+                    target_timestamp,
+                    emoji,
+                    bot_data['signal_api_port']
+                )
+                self._log_activity(
+                    "reaction_sent",
+                    bot_data['id'],
+                    group_id,
+                    f"{bot_data['name']} reacted with {emoji}"
+                )
+            except Exception as e:
+                logger.error(f"Failed to send queued reaction {emoji}: {e}\n{traceback.format_exc()}")
 
     async def _idle_news_checker(self):
         """
@@ -1435,13 +1524,13 @@ class SignalBotManager:
         """Generate and post news commentary to spark conversation."""
         try:
             from shared_utils import call_openrouter_api
-            from config import AI_MODELS
         except ImportError as e:
             logger.error(f"Failed to import for idle news: {e}")
             return
 
-        # Get model ID
-        model_id = AI_MODELS.get(bot_data['model'], bot_data['model'])
+        # Get model ID (the fast tier, if the bot has one)
+        tier = select_model_tier(bot_data, "idle_news")
+        model_id = model_for_tier(bot_data, tier)
 
         # Prompt that encourages searching for current news
         system_prompt = f"""You are {bot_data['name']}, casually dropping into a quiet group chat with something interesting.
@@ -1465,6 +1554,7 @@ Examples of tone:
 Search for current news and pick something good!"""
 
         try:
+            started = time.monotonic()
             response = call_openrouter_api(
                 prompt="What's the most interesting or weird news happening today? Find something good to share with the group.",
                 conversation_history=[],
@@ -1473,6 +1563,8 @@ Search for current news and pick something good!"""
                 stream_callback=None,
                 web_search=True  # This is key - enables news search
             )
+            # The web search (Responses API) path doesn't report token usage; count the call and its latency
+            metrics.record_llm_usage(bot_data['id'], None, time.monotonic() - started, tier=tier)
 
             if response and response.strip():
                 # Send the message
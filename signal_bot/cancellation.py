@@ -0,0 +1,45 @@
+"""
+Cancelling a response whose generation runs in a worker thread.
+
+Cancelling the asyncio task of a superseded response doesn't stop its
+worker thread: the API call and the tool loop keep going. The thread checks
+a CancelToken instead (shared_utils.call_openrouter_api before each tool
+round, SignalToolExecutor before each side-effecting tool).
+"""
+
+import threading
+
+
+class CancelToken:
+    """Cancellation for one response generation, shared with its worker thread.
+
+    Cancelling and starting a side-effecting tool exclude each other: once
+    cancelled, no side-effecting tool starts (begin_side_effect returns
+    False), and once one has started, cancel() is refused so the generation
+    finishes and reports what it did instead of being redone.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._event = threading.Event()
+        self.committed = False  # A side-effecting tool has started
+
+    def is_set(self) -> bool:
+        """Whether the generation was cancelled (same check as threading.Event.is_set)."""
+        return self._event.is_set()
+
+    def cancel(self) -> bool:
+        """Cancel unless a side-effecting tool already started; returns whether it was cancelled."""
+        with self._lock:
+            if self.committed:
+                return False
+            self._event.set()
+            return True
+
+    def begin_side_effect(self) -> bool:
+        """Claim the right to run a side-effecting tool; False if already cancelled."""
+        with self._lock:
+            if self._event.is_set():
+                return False
+            self.committed = True
+            return True
@@ -14,6 +14,7 @@ DEFAULT_RANDOM_CHANCE = 15   # % chance to respond randomly
 
 # Real-time memory settings
 REALTIME_MEMORY_ENABLED = True  # Enable instant memory saves when user says "remember..."
+REALTIME_MEMORY_CONFIRM_WAIT_SECONDS = 0.5  # Extra wait for extraction before the reply; later saves get a follow-up
 
 # Location context settings
 TRAVEL_PROXIMITY_DAYS = 7  # Include travel location if within N days of travel date
@@ -42,3 +43,62 @@ WEBSOCKET_RECONNECT_DELAY = 1.0  # Initial reconnect delay in seconds
 WEBSOCKET_MAX_RECONNECT_DELAY = 60.0  # Max reconnect delay (exponential backoff cap)
 WEBSOCKET_PING_INTERVAL = 20.0  # Send ping every N seconds to keep connection alive
 WEBSOCKET_PING_TIMEOUT = 10.0  # Consider connection dead if no pong in N seconds
+
+# Database session settings
+DB_CONNECTION_HOLD_WARN_SECONDS = 1.0  # Warn when a pooled connection is held longer than this
+
+# Shared ingest for bots in the same group (attachments, message log, real-time memory)
+INGEST_SHARE_SECONDS = 300  # Keep per-message results this long for the other bots' copies of the envelope
+
+# Response arbitration between bots in the same group
+RESPONSE_ARBITRATION_ENABLED = True  # Cap how many bots answer one message on random chance
+ARBITRATION_WINDOW_SECONDS = 1.0  # Collect random-chance candidates this long (response delay floor is longer)
+ARBITRATION_MAX_RESPONDERS = 1  # Bots answering one message; addressed bots always answer
+
+# Burst coalescing: one response to several quick messages from the same sender
+BURST_COALESCING_ENABLED = True
+BURST_MIN_WINDOW_SECONDS = 0.75  # Mid-burst, wait at least this long for a follow-up before generating
+BURST_MAX_WINDOW_SECONDS = 3.0  # ...and never longer than this
+BURST_MAX_GAP_SECONDS = 6.0  # Messages closer together than this count as one burst
+BURST_GAP_SAMPLES = 20  # Recent in-burst gaps kept per sender to adapt the window
+BURST_STATE_TTL_SECONDS = 3600  # Forget a sender's burst timing after this long without messages
+
+# Image/video generation jobs (run in the background; the file follows the text reply)
+MEDIA_IMAGE_CONCURRENCY = 2  # Images generating at once across all bots; more wait in the queue
+MEDIA_VIDEO_CONCURRENCY = 1  # Sora renders in progress at once
+MEDIA_JOBS_PER_BOT_ACTIVE = 2  # Queued or running jobs per bot; more are rejected
+MEDIA_JOBS_PER_BOT_PER_HOUR = 20  # Jobs submitted per bot per rolling hour
+MEDIA_VIDEO_COMMANDS_ENABLED = False  # Act on !video in replies of bots with image generation on (Sora renders are costly)
+MEDIA_VIDEO_POLL_SECONDS = 5.0  # Time between Sora status checks
+MEDIA_VIDEO_TIMEOUT_SECONDS = 900  # Give up on a render that isn't done after this long
+
+# Image compression for API size limits (oversized attachments only)
+IMAGE_COMPRESSION_WORKERS = 2  # Worker processes decoding/re-encoding images off the event loop
+
+# Member memory index settings
+MEMBER_MEMORY_INDEX_TTL_SECONDS = 300  # Reload cached memories at least this often (admin may run in another process)
+LOCATION_RELEVANCE_MEMO_SIZE = 1024  # LLM location-relevance verdicts remembered per (model, normalised message)
+MEMORY_SCAN_CONCURRENCY = 4  # Groups scanned at once (each makes one LLM call per batch)
+MEMORY_SCAN_MAX_BATCHES = 5  # Batches of new messages per group per scan; the rest wait for the next scan
+
+# Streaming response settings (per-bot toggle: streaming_enabled)
+STREAM_MIN_FIRST_CHARS = 20  # Don't send a first sentence shorter than this
+STREAM_EDIT_INTERVAL_SECONDS = 1.5  # Minimum time between progressive edits
+STREAM_MAX_EDITS = 8  # Signal caps edits per message; the final edit is reserved from this
+
+# Hedged LLM request settings (per-bot toggle: hedging_enabled; mention/reply responses only)
+HEDGE_PERCENTILE = 95  # Hedge when the first byte takes longer than this percentile of recent calls
+HEDGE_MIN_SAMPLES = 20  # First-byte samples needed before the percentile is trusted
+HEDGE_DEFAULT_DELAY_SECONDS = 8.0  # Hedge delay until there are enough samples
+HEDGE_MIN_DELAY_SECONDS = 2.0  # Never hedge sooner than this (limits duplicate spend)
+HEDGE_FALLBACK_MODELS = {}  # Model ID -> model to hedge with (default: same model, latency-sorted providers)
+
+# Tool result cache settings (TTLs are per tool: see cache_ttl in tool_executors)
+TOOL_CACHE_ENABLED = True  # Reuse weather, Wikipedia and finance results for identical calls
+TOOL_CACHE_MAX_ENTRIES = 512  # Least recently used results are evicted past this
+
+# Context token budget settings (per-bot override: context_token_budget)
+DEFAULT_CONTEXT_TOKEN_BUDGET = 16000  # Prompt tokens when the bot has no budget set
+CONTEXT_BUDGET_MODEL_FRACTION = 0.5  # Never use more than this share of the model's context length
+IMAGE_TOKEN_ESTIMATE = 1600  # Estimated tokens per image (full-size vision input)
+MODEL_CONTEXT_LENGTH_TTL_SECONDS = 600  # Re-read custom model context lengths at least this often
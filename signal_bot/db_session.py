@@ -0,0 +1,113 @@
+"""Short-lived database units of work and connection checkout instrumentation.
+
+The bot runs on a single asyncio loop, so a Flask app context (and with it the
+scoped SQLAlchemy session and its SQLite connection) must never stay open across
+an ``await``. Code on the message path wraps each read or write in
+``db_session()`` and copies what it needs into plain Python values before the
+block ends.
+
+Pool checkout/checkin events are timed so long-held connections show up in the
+logs and in the admin ``/api/db-stats`` endpoint.
+"""
+
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+from flask import Flask, has_app_context
+from sqlalchemy import event
+from sqlalchemy.pool import Pool
+
+from signal_bot.config_signal import DB_CONNECTION_HOLD_WARN_SECONDS
+
+logger = logging.getLogger(__name__)
+
+# Flask app reference for context
+_flask_app: Optional[Flask] = None
+
+# Connection hold statistics (updated from pool events, possibly from several threads)
+_stats_lock = threading.Lock()
+_stats = {
+    "checkouts": 0,
+    "checked_out": 0,
+    "total_hold_seconds": 0.0,
+    "max_hold_seconds": 0.0,
+    "long_holds": 0,
+}
+
+
+def set_flask_app(app: Flask):
+    """Set the Flask app for database context."""
+    global _flask_app
+    _flask_app = app
+
+
+@contextmanager
+def db_session() -> Iterator[None]:
+    """Open a short unit of work against the database.
+
+    Reuses the current app context when one is already active (admin requests,
+    nested helpers) so we never open a second session on the same thread.
+    The connection is returned to the pool as soon as the block exits.
+    """
+    if has_app_context() or _flask_app is None:
+        yield
+        return
+
+    with _flask_app.app_context():
+        yield
+
+
+@event.listens_for(Pool, "checkout")
+def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+    """Record when a connection leaves the pool."""
+    connection_record.info["checkout_started"] = time.perf_counter()
+    with _stats_lock:
+        _stats["checkouts"] += 1
+        _stats["checked_out"] += 1
+
+
+@event.listens_for(Pool, "checkin")
+def _on_checkin(dbapi_connection, connection_record):
+    """Measure how long the connection was held and warn on long holds."""
+    started = connection_record.info.pop("checkout_started", None)
+    if started is None:
+        return
+
+    held = time.perf_counter() - started
+    with _stats_lock:
+        _stats["checked_out"] = max(0, _stats["checked_out"] - 1)
+        _stats["total_hold_seconds"] += held
+        if held > _stats["max_hold_seconds"]:
+            _stats["max_hold_seconds"] = held
+        if held >= DB_CONNECTION_HOLD_WARN_SECONDS:
+            _stats["long_holds"] += 1
+
+    if held >= DB_CONNECTION_HOLD_WARN_SECONDS:
+        logger.warning(f"DB connection held for {held:.2f}s (threshold {DB_CONNECTION_HOLD_WARN_SECONDS}s)")
+
+
+def get_connection_stats() -> dict:
+    """Get a snapshot of connection checkout statistics."""
+    with _stats_lock:
+        stats = dict(_stats)
+
+    checkins = stats["checkouts"] - stats["checked_out"]
+    stats["avg_hold_ms"] = round(stats["total_hold_seconds"] / checkins * 1000, 2) if checkins else 0.0
+    stats["max_hold_ms"] = round(stats.pop("max_hold_seconds") * 1000, 2)
+    stats["total_hold_seconds"] = round(stats["total_hold_seconds"], 3)
+    return stats
+
+
+def reset_connection_stats():
+    """Reset connection checkout statistics."""
+    with _stats_lock:
+        _stats.update(
+            checkouts=0,
+            checked_out=0,
+            total_hold_seconds=0.0,
+            max_hold_seconds=0.0,
+            long_holds=0,
+        )
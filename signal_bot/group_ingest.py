@@ -0,0 +1,93 @@
+"""
+Shared per-envelope work for bots in the same group.
+
+Every bot in a group has its own Signal container, so a message to a group
+with three bots arrives three times. The work that doesn't depend on which
+bot received it (downloading and compressing attachments, logging to
+MessageLog/ChatLog, real-time memory extraction) runs once per message,
+keyed by (group_id, Signal timestamp); each bot only makes its own respond
+decision and generates its own response.
+
+``once(key, step, factory)`` runs ``factory()`` for the first bot to reach a
+step and hands the same result to the others, including ones that arrive
+while it is still running. Results are kept for INGEST_SHARE_SECONDS, long
+enough for every container to deliver the envelope. A step that raises is
+forgotten so the next bot retries it.
+"""
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Optional
+
+from signal_bot import metrics
+
+logger = logging.getLogger(__name__)
+
+
+class GroupIngest:
+    """Single-flight results per (group_id, signal_timestamp, step)."""
+
+    def __init__(self, ttl_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        # (group_id, signal_timestamp, step) -> (created_at, task); insertion order = age
+        self._results: OrderedDict = OrderedDict()
+
+    def _prune(self, now: float):
+        while self._results:
+            key, (created_at, task) = next(iter(self._results.items()))
+            if now - created_at < self.ttl_seconds or not task.done():
+                break
+            del self._results[key]
+
+    async def once(
+        self,
+        key: tuple[str, Optional[int]],
+        step: str,
+        factory: Callable[[], Awaitable[Any]],
+        bot_id: Optional[str] = None
+    ) -> Any:
+        """Run factory() for the first caller of (key, step); later callers share its result.
+
+        Messages without a Signal timestamp can't be matched across bots and
+        always run factory().
+        """
+        group_id, signal_timestamp = key
+        if not signal_timestamp:
+            return await factory()
+
+        now = time.monotonic()
+        self._prune(now)
+        entry_key = (group_id, signal_timestamp, step)
+        entry = self._results.get(entry_key)
+        if entry is not None:
+            metrics.increment(bot_id, f"ingest_shared_{step}")
+            task = entry[1]
+        else:
+            # Its own task, so a superseded or cancelled bot doesn't cancel the shared work
+            task = asyncio.ensure_future(factory())
+            self._results[entry_key] = (now, task)
+            task.add_done_callback(lambda done: self._forget_if_failed(entry_key, done))
+        return await asyncio.shield(task)
+
+    def _forget_if_failed(self, entry_key: tuple, task: asyncio.Future):
+        if task.cancelled() or task.exception() is not None:
+            entry = self._results.get(entry_key)
+            if entry is not None and entry[1] is task:
+                del self._results[entry_key]
+
+    def __len__(self) -> int:
+        return len(self._results)
+
+
+_group_ingest: Optional[GroupIngest] = None
+
+
+def get_group_ingest() -> GroupIngest:
+    """Get the shared ingest stage (all bots run on one event loop)."""
+    global _group_ingest
+    if _group_ingest is None:
+        from signal_bot.config_signal import INGEST_SHARE_SECONDS
+        _group_ingest = GroupIngest(INGEST_SHARE_SECONDS)
+    return _group_ingest
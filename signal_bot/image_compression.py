@@ -0,0 +1,172 @@
+"""
+Image compression for API size limits, off the event loop.
+
+Phone photos are often larger than the vision APIs accept (Claude: 5MB).
+Decoding, resizing and re-encoding one takes hundreds of milliseconds of
+CPU. On the event loop that stalled every bot, and in a thread it still
+holds the GIL. compress_image_async runs the work in a small process pool
+(IMAGE_COMPRESSION_WORKERS), and images already under the limit are
+returned without being decoded at all. Images are raw bytes throughout
+(see shared_utils.ImageDataURL for where they become base64).
+
+The pipeline, per oversized image:
+- JPEG: Image.draft decodes at 1/2, 1/4 or 1/8 scale when that is still at
+  least MAX_DIMENSION, so most of the downscale happens inside the decoder;
+- the rest of the downscale is a LANCZOS resize with a reducing gap;
+- one encode at DEFAULT_QUALITY. If that is still too big, the quality is
+  binary searched between MIN_QUALITY and DEFAULT_QUALITY, with the first
+  probe predicted from the size at DEFAULT_QUALITY;
+- the probes encode into one reused buffer per process without the optimize
+  pass. Only the chosen quality is encoded with optimize.
+
+See benchmarks/bench_image_compression.py.
+"""
+
+import asyncio
+import io
+import logging
+import math
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+MAX_DIMENSION = 2000  # Longest side after resizing
+DEFAULT_QUALITY = 85
+MIN_QUALITY = 40
+QUALITY_SEARCH_STEPS = 3  # Binary search probes below DEFAULT_QUALITY
+QUALITY_SIZE_SLOPE = 0.025  # JPEG size grows ~2.5% per quality point in the 40-85 range (size model)
+
+# Encode buffer reused across probes and calls (one per worker process, or thread outside the pool)
+_local = threading.local()
+
+
+def _encode_buffer() -> io.BytesIO:
+    buffer = getattr(_local, "buffer", None)
+    if buffer is None:
+        buffer = _local.buffer = io.BytesIO()
+    return buffer
+
+
+def _encode_jpeg(img, quality: int, optimize: bool = False) -> int:
+    """Encode img into the reused buffer; returns the encoded size."""
+    buffer = _encode_buffer()
+    buffer.seek(0)
+    buffer.truncate()
+    img.save(buffer, format='JPEG', quality=quality, optimize=optimize)
+    return buffer.tell()
+
+
+def _open_downscaled(image_bytes: bytes):
+    """Open an image at no more than MAX_DIMENSION, using JPEG draft mode where possible."""
+    from PIL import Image
+
+    img = Image.open(io.BytesIO(image_bytes))
+    longest = max(img.size)
+    if longest > MAX_DIMENSION:
+        ratio = MAX_DIMENSION / longest
+        target = (int(img.width * ratio), int(img.height * ratio))
+        if img.format == 'JPEG':
+            # Picks the smallest DCT scale that still covers target (no-op for other formats)
+            img.draft('RGB', target)
+        if max(img.size) > MAX_DIMENSION:
+            img = img.resize(target, Image.Resampling.LANCZOS, reducing_gap=2.0)
+        logger.info(f"Resized image to {img.width}x{img.height}")
+
+    # JPEG has no alpha or palette
+    if img.mode not in ('RGB', 'L'):
+        img = img.convert('RGB')
+    return img
+
+
+def _predict_quality(size_at_default: int, max_bytes: int) -> int:
+    """First quality to probe: size(q) ~ size(DEFAULT_QUALITY) * exp(QUALITY_SIZE_SLOPE * (q - DEFAULT_QUALITY))."""
+    estimate = DEFAULT_QUALITY + math.log(max_bytes / size_at_default) / QUALITY_SIZE_SLOPE
+    return max(MIN_QUALITY, min(DEFAULT_QUALITY - 1, int(estimate)))
+
+
+def compress_image_bytes(image_bytes: bytes, media_type: str, max_bytes: int = 4_000_000) -> tuple[bytes, str]:
+    """Compress raw image bytes to at most max_bytes (best effort). May convert to JPEG.
+
+    Returns:
+        Tuple of (image_bytes, media_type); the input is returned unchanged if already small enough.
+    """
+    original_size = len(image_bytes)
+    if original_size <= max_bytes:
+        return image_bytes, media_type
+
+    logger.info(f"Compressing image: {original_size:,} bytes -> target {max_bytes:,} bytes")
+    img = _open_downscaled(image_bytes)
+
+    size = _encode_jpeg(img, DEFAULT_QUALITY)
+    if size <= max_bytes:
+        quality = DEFAULT_QUALITY
+    else:
+        # Largest quality in [MIN_QUALITY, DEFAULT_QUALITY) that fits, first probe predicted
+        low, high = MIN_QUALITY, DEFAULT_QUALITY - 1
+        quality = None
+        probe = _predict_quality(size, max_bytes)
+        for _ in range(QUALITY_SEARCH_STEPS):
+            if _encode_jpeg(img, probe) <= max_bytes:
+                quality, low = probe, probe + 1
+            else:
+                high = probe - 1
+            if low > high:
+                break
+            probe = (low + high + 1) // 2
+
+    if quality is not None:
+        _encode_jpeg(img, quality, optimize=True)
+    else:
+        # The optimize pass may still fit at the lowest quality; otherwise halve the size
+        quality = MIN_QUALITY
+        if _encode_jpeg(img, quality, optimize=True) > max_bytes:
+            from PIL import Image
+
+            img = img.resize((img.width // 2, img.height // 2), Image.Resampling.LANCZOS, reducing_gap=2.0)
+            _encode_jpeg(img, quality, optimize=True)
+            logger.info(f"Aggressive compression: 50% scale, quality={quality}")
+    compressed = _encode_buffer().getvalue()
+    logger.info(f"Compressed to {len(compressed):,} bytes at quality={quality}")
+    return compressed, 'image/jpeg'
+
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                from signal_bot.config_signal import IMAGE_COMPRESSION_WORKERS
+                _pool = ProcessPoolExecutor(max_workers=IMAGE_COMPRESSION_WORKERS)
+    return _pool
+
+
+async def compress_image_async(image_bytes: bytes, media_type: str, max_bytes: int = 4_000_000) -> tuple[bytes, str]:
+    """compress_image_bytes in the process pool (falls back to a thread if the pool is broken)."""
+    global _pool
+    if len(image_bytes) <= max_bytes:
+        return image_bytes, media_type
+
+    loop = asyncio.get_running_loop()
+    try:
+        return await loop.run_in_executor(_get_pool(), compress_image_bytes, image_bytes, media_type, max_bytes)
+    except BrokenProcessPool:
+        logger.warning("Image compression pool broke; compressing in a thread")
+        with _pool_lock:
+            _pool = None
+        return await asyncio.to_thread(compress_image_bytes, image_bytes, media_type, max_bytes)
+
+
+def shutdown_pool():
+    """Stop the worker processes (called when the bot manager stops)."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
@@ -0,0 +1,98 @@
+"""
+Multi-pattern matching for message keyword and trigger checks.
+
+``KeywordMatcher`` is an Aho-Corasick automaton over literal keywords, each
+tagged with a group name: one pass over the lowercased message reports every
+group with at least one keyword occurring as a substring (the same result
+as ``any(kw in message_lower for kw in group)`` for each group).
+
+``PatternMatcher`` checks ordered groups of regexes against text that was
+already lowercased, so the patterns are compiled without IGNORECASE. That
+is several times faster in CPython's re than case-insensitive matching, and
+faster than one big alternation of all patterns, which loses each pattern's
+literal-prefix scan and tries every branch at every position.
+"""
+
+import re
+from collections import deque
+from typing import Iterable, Optional
+
+
+class KeywordMatcher:
+    """Aho-Corasick matcher reporting which keyword groups occur in a text."""
+
+    def __init__(self, groups: dict[str, Iterable[str]]):
+        """
+        Args:
+            groups: Group name -> keywords (matched case-sensitively; pass lowercase
+                keywords and lowercased text for case-insensitive matching)
+        """
+        goto: list[dict[str, int]] = [{}]
+        outputs: list[set[str]] = [set()]
+
+        for group, keywords in groups.items():
+            for keyword in keywords:
+                if not keyword:
+                    continue
+                state = 0
+                for ch in keyword:
+                    next_state = goto[state].get(ch)
+                    if next_state is None:
+                        next_state = len(goto)
+                        goto[state][ch] = next_state
+                        goto.append({})
+                        outputs.append(set())
+                    state = next_state
+                outputs[state].add(group)
+
+        # Breadth-first failure links, folded into a full transition table so
+        # matching never has to follow failure links
+        fail = [0] * len(goto)
+        delta: list[dict[str, int]] = [dict(goto[0])]
+        delta.extend({} for _ in range(len(goto) - 1))
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            outputs[state] |= outputs[fail[state]]
+            transitions = dict(delta[fail[state]])
+            for ch, child in goto[state].items():
+                fail[child] = delta[fail[state]].get(ch, 0)
+                transitions[ch] = child
+                queue.append(child)
+            delta[state] = transitions
+
+        self._delta = delta
+        self._outputs = [frozenset(out) for out in outputs]
+        self.groups = tuple(groups)
+
+    def match_groups(self, text: str) -> set[str]:
+        """Names of the groups with at least one keyword in text."""
+        delta = self._delta
+        outputs = self._outputs
+        found = set()
+        state = 0
+        for ch in text:
+            state = delta[state].get(ch, 0)
+            if outputs[state]:
+                found |= outputs[state]
+        return found
+
+
+class PatternMatcher:
+    """First-matching group for ordered groups of lowercase regexes."""
+
+    def __init__(self, groups: dict[str, Iterable[str]], flags: int = 0):
+        """
+        Args:
+            groups: Group name -> regex patterns, in priority order
+            flags: re flags applied to every pattern
+        """
+        self.groups = tuple(groups)
+        self._patterns = [(group, re.compile(p, flags)) for group, patterns in groups.items() for p in patterns]
+
+    def first_group(self, text: str) -> Optional[str]:
+        """The highest-priority group with a pattern matching anywhere in text."""
+        for group, pattern in self._patterns:
+            if pattern.search(text):
+                return group
+        return None
@@ -0,0 +1,283 @@
+"""
+Background jobs for image and video generation.
+
+Generating an image is a blocking OpenRouter call of up to a minute, and a
+Sora video is a render job polled for several minutes. Neither should hold
+up the text reply. The ``!image``/``!video`` commands and the
+generate_image tool submit a job here and return at once. The reply goes
+out immediately, and the file follows via the bot's send_image callback
+when it is ready.
+
+- At most MEDIA_IMAGE_CONCURRENCY images and MEDIA_VIDEO_CONCURRENCY videos
+  generate at once; further jobs wait in a queue.
+- Per-bot quotas: MEDIA_JOBS_PER_BOT_ACTIVE jobs queued or running, and
+  MEDIA_JOBS_PER_BOT_PER_HOUR submitted per rolling hour. A job over quota
+  is rejected and never calls the API.
+- Video polling awaits between status checks, so it never holds a worker
+  thread.
+
+Recent jobs and their status are kept in memory for the admin
+(``/api/media-jobs`` and the dashboard). Per-bot counters are
+media_jobs_submitted, media_jobs_done, media_jobs_failed and
+media_jobs_rejected, with latencies media_job_wait and media_job:<kind>.
+"""
+
+import asyncio
+import itertools
+import logging
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Optional
+
+from signal_bot import metrics
+
+logger = logging.getLogger(__name__)
+
+KIND_IMAGE = "image"
+KIND_VIDEO = "video"
+
+DEFAULT_IMAGE_MODEL = "google/gemini-3-pro-image-preview"
+DEFAULT_VIDEO_MODEL = "sora-2"
+
+
+@dataclass
+class MediaJob:
+    """One image or video generation request."""
+    id: int
+    kind: str
+    bot_id: str
+    bot_name: str
+    group_id: str
+    prompt: str
+    model: str
+    status: str = "queued"  # queued, running, done, failed, rejected
+    created_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    progress: Optional[int] = None  # Video render progress (percent), when the API reports it
+    path: Optional[str] = None
+    error: Optional[str] = None
+
+    def to_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "kind": self.kind,
+            "bot_id": self.bot_id,
+            "bot_name": self.bot_name,
+            "group_id": self.group_id,
+            "prompt": self.prompt[:100],
+            "model": self.model,
+            "status": self.status,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "progress": self.progress,
+            "path": self.path,
+            "error": self.error,
+        }
+
+
+class MediaJobQueue:
+    """Bounded-concurrency media generation with per-bot quotas.
+
+    submit_image/submit_video may be called from the bot loop or from a worker
+    thread (the tool executor); the job itself always runs on the bot loop.
+    """
+
+    def __init__(self, image_concurrency: int, video_concurrency: int, per_bot_active: int,
+                 per_bot_per_hour: int, history: int = 100):
+        self.per_bot_active = per_bot_active
+        self.per_bot_per_hour = per_bot_per_hour
+        self._limits = {KIND_IMAGE: image_concurrency, KIND_VIDEO: video_concurrency}
+        self._semaphores: dict[str, asyncio.Semaphore] = {}
+        self._jobs: deque[MediaJob] = deque(maxlen=history)  # Recent jobs, newest last
+        self._active: dict[str, int] = {}  # bot_id -> queued or running jobs
+        self._submitted: dict[str, deque] = {}  # bot_id -> submission times in the last hour
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._tasks: set[asyncio.Task] = set()  # Strong references to running jobs
+
+    def attach(self, loop: asyncio.AbstractEventLoop):
+        """Run jobs on this loop (the bot manager's)."""
+        self._loop = loop
+
+    def submit_image(self, bot_data: dict, group_id: str, prompt: str,
+                     deliver: Callable[[str], object]) -> MediaJob:
+        """Queue an image; deliver(path) is called with the file once it is generated."""
+        model = bot_data.get('image_model') or DEFAULT_IMAGE_MODEL
+        return self._submit(KIND_IMAGE, bot_data, group_id, prompt, model, deliver,
+                            lambda job: self._generate_image(job))
+
+    def submit_video(self, bot_data: dict, group_id: str, prompt: str,
+                     deliver: Callable[[str], object]) -> MediaJob:
+        """Queue a Sora video; deliver(path) is called with the MP4 once it is downloaded."""
+        return self._submit(KIND_VIDEO, bot_data, group_id, prompt, DEFAULT_VIDEO_MODEL, deliver,
+                            lambda job: self._generate_video(job))
+
+    def _submit(self, kind: str, bot_data: dict, group_id: str, prompt: str, model: str,
+                deliver: Callable[[str], object], generate: Callable[[MediaJob], Awaitable[dict]]) -> MediaJob:
+        bot_id = bot_data['id']
+        job = MediaJob(next(self._ids), kind, bot_id, bot_data.get('name', ''), group_id, prompt, model)
+        now = time.monotonic()
+        with self._lock:
+            self._jobs.append(job)
+            submitted = self._submitted.setdefault(bot_id, deque())
+            while submitted and now - submitted[0] > 3600:
+                submitted.popleft()
+            if self._active.get(bot_id, 0) >= self.per_bot_active:
+                job.error = f"{self.per_bot_active} media jobs already in progress"
+            elif len(submitted) >= self.per_bot_per_hour:
+                job.error = f"hourly limit of {self.per_bot_per_hour} media jobs reached"
+            else:
+                submitted.append(now)
+                self._active[bot_id] = self._active.get(bot_id, 0) + 1
+
+        if job.error:
+            job.status = "rejected"
+            job.finished_at = job.created_at
+            metrics.increment(bot_id, "media_jobs_rejected")
+            logger.info(f"Rejected {kind} job for {job.bot_name}: {job.error}")
+            return job
+
+        metrics.increment(bot_id, "media_jobs_submitted")
+        logger.info(f"Queued {kind} job #{job.id} for {job.bot_name}: {prompt[:50]}...")
+        coro = self._run(job, generate, deliver)
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        loop = self._loop or running
+        try:
+            if loop is None:
+                raise RuntimeError("No event loop to run media jobs on")
+            if running is loop:
+                scheduled = loop.create_task(coro, name=f"media-job-{job.id}")
+            else:
+                scheduled = asyncio.run_coroutine_threadsafe(coro, loop)
+        except RuntimeError as e:  # No loop, or it is closed
+            coro.close()
+            self._finish(job, "failed", error=str(e))
+            logger.error(f"Could not schedule {kind} job #{job.id}: {e}")
+            return job
+        # Releases the job's quota slot even if it is cancelled before it starts running
+        scheduled.add_done_callback(lambda future: self._settle(job, future))
+        return job
+
+    async def _run(self, job: MediaJob, generate: Callable[[MediaJob], Awaitable[dict]],
+                   deliver: Callable[[str], object]):
+        task = asyncio.current_task()
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        semaphore = self._semaphores.get(job.kind)
+        if semaphore is None:
+            semaphore = self._semaphores[job.kind] = asyncio.Semaphore(self._limits[job.kind])
+        try:
+            async with semaphore:
+                job.status = "running"
+                job.started_at = time.time()
+                metrics.record_latency(job.bot_id, "media_job_wait", job.started_at - job.created_at)
+                try:
+                    result = await generate(job)
+                except Exception as e:
+                    logger.exception(f"{job.kind} job #{job.id} crashed")
+                    result = {"success": False, "error": str(e)}
+                metrics.record_latency(job.bot_id, f"media_job:{job.kind}", time.time() - job.started_at)
+        except asyncio.CancelledError:
+            self._finish(job, "failed", error="Cancelled")
+            raise
+
+        path = (result.get("image_path") or result.get("video_path")) if result.get("success") else None
+        if not path:
+            self._finish(job, "failed", error=result.get("error") or f"{job.kind} generation failed")
+            logger.error(f"{job.kind} job #{job.id} failed: {job.error}")
+            return
+
+        self._finish(job, "done", path=path)
+        try:
+            delivered = deliver(path)
+            if asyncio.iscoroutine(delivered):
+                await delivered
+        except Exception as e:
+            logger.error(f"Failed to send {job.kind} from job #{job.id}: {e}")
+
+    def _settle(self, job: MediaJob, future):
+        """Done callback of a job's task/future: fail the job if _run never finished it."""
+        if job.finished_at is not None:
+            return
+        if future.cancelled():
+            error = "Cancelled"
+        else:
+            error = str(future.exception() or "Job ended without a result")
+        self._finish(job, "failed", error=error)
+
+    def _finish(self, job: MediaJob, status: str, path: Optional[str] = None, error: Optional[str] = None):
+        """Record a job's outcome and release its quota slot (only the first call counts)."""
+        with self._lock:
+            if job.finished_at is not None:
+                return
+            job.status = status
+            job.path = path
+            job.error = error
+            job.finished_at = time.time()
+            self._active[job.bot_id] = max(0, self._active.get(job.bot_id, 0) - 1)
+        metrics.increment(job.bot_id, f"media_jobs_{status}")
+
+    async def _generate_image(self, job: MediaJob) -> dict:
+        from shared_utils import generate_image_from_text
+
+        return await asyncio.to_thread(generate_image_from_text, job.prompt, model=job.model)
+
+    async def _generate_video(self, job: MediaJob) -> dict:
+        """Start a Sora render, poll it without holding a thread, then download it."""
+        from shared_utils import start_sora_video, get_sora_video_status, download_sora_video
+        from config import SORA_SECONDS, SORA_SIZE
+        from signal_bot.config_signal import MEDIA_VIDEO_POLL_SECONDS, MEDIA_VIDEO_TIMEOUT_SECONDS
+
+        started = await asyncio.to_thread(start_sora_video, job.prompt, model=job.model,
+                                          seconds=SORA_SECONDS, size=SORA_SIZE)
+        if not started.get("success"):
+            return started
+        video_id = started["video_id"]
+        status = started.get("status")
+        deadline = time.monotonic() + MEDIA_VIDEO_TIMEOUT_SECONDS
+        while status in ("queued", "in_progress"):
+            if time.monotonic() > deadline:
+                return {"success": False, "error": f"Video not ready after {MEDIA_VIDEO_TIMEOUT_SECONDS}s"}
+            await asyncio.sleep(MEDIA_VIDEO_POLL_SECONDS)
+            polled = await asyncio.to_thread(get_sora_video_status, video_id)
+            if not polled.get("success"):
+                return polled
+            status = polled.get("status")
+            job.progress = polled.get("progress")
+
+        if status != "completed":
+            return {"success": False, "error": f"Final status: {status}"}
+        return await asyncio.to_thread(download_sora_video, video_id, job.prompt)
+
+    def jobs(self, bot_id: Optional[str] = None) -> list[dict]:
+        """Recent jobs, newest first."""
+        with self._lock:
+            recent = list(self._jobs)
+        return [job.to_dict() for job in reversed(recent) if bot_id is None or job.bot_id == bot_id]
+
+
+_media_jobs: Optional[MediaJobQueue] = None
+_media_jobs_lock = threading.Lock()
+
+
+def get_media_jobs() -> MediaJobQueue:
+    """Get the process-wide media job queue."""
+    global _media_jobs
+    if _media_jobs is None:
+        with _media_jobs_lock:
+            if _media_jobs is None:
+                from signal_bot.config_signal import (
+                    MEDIA_IMAGE_CONCURRENCY, MEDIA_VIDEO_CONCURRENCY,
+                    MEDIA_JOBS_PER_BOT_ACTIVE, MEDIA_JOBS_PER_BOT_PER_HOUR
+                )
+                _media_jobs = MediaJobQueue(MEDIA_IMAGE_CONCURRENCY, MEDIA_VIDEO_CONCURRENCY,
+                                            MEDIA_JOBS_PER_BOT_ACTIVE, MEDIA_JOBS_PER_BOT_PER_HOUR)
+    return _media_jobs
@@ -0,0 +1,159 @@
+"""
+In-memory index of member memories, one per group.
+
+Building the member-memory context block runs on every response, so the rows
+for a group are loaded once into plain snapshots and kept until something
+writes to that group's memories. Every writer (memory scanner, real-time
+memory, memory tools, admin UI) calls ``invalidate_member_memory_index()``
+after committing. A TTL bounds staleness when the admin UI runs in a
+separate process from the bots.
+
+The index also holds a single precompiled regex for member-name detection,
+so a message is scanned once regardless of how many members the group has.
+"""
+
+import logging
+import re
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+
+from signal_bot.config_signal import MEMBER_MEMORY_INDEX_TTL_SECONDS
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class MemorySnapshot:
+    """Detached copy of a GroupMemberMemory row."""
+    member_id: Optional[str]
+    member_name: str
+    slot_type: str
+    content: str
+    valid_from: Optional[datetime] = None
+    valid_until: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+
+class MemberMemoryIndex:
+    """All member memories for one group, grouped by member name."""
+
+    def __init__(self, group_id: str, memories: list[MemorySnapshot]):
+        self.group_id = group_id
+        self.memories = memories
+        self.loaded_at = time.monotonic()
+
+        self.by_member: dict[str, list[MemorySnapshot]] = {}
+        for mem in memories:
+            self.by_member.setdefault(mem.member_name, []).append(mem)
+
+        self.member_names = list(self.by_member.keys())
+        self._mention_pattern = self._compile_mention_pattern(self.member_names)
+
+        # Lowercased name -> canonical names (names may differ only by case)
+        self._names_by_lower: dict[str, list[str]] = {}
+        for name in self.member_names:
+            self._names_by_lower.setdefault(name.lower(), []).append(name)
+
+    @staticmethod
+    def _compile_mention_pattern(member_names: list[str]) -> Optional[re.Pattern]:
+        """Compile one alternation matching any member name.
+
+        Matches either ``@name`` anywhere or ``name`` on word boundaries,
+        mirroring the previous per-name checks. Longer names come first so
+        "Ann Marie" wins over "Ann" at the same position.
+        """
+        names = sorted({n.lower() for n in member_names if n}, key=len, reverse=True)
+        if not names:
+            return None
+
+        alternation = "|".join(re.escape(n) for n in names)
+        return re.compile(rf"@({alternation})|\b({alternation})\b", re.IGNORECASE)
+
+    def active_by_member(self, now: Optional[datetime] = None) -> dict[str, list[MemorySnapshot]]:
+        """Memories grouped by member, skipping expired travel locations."""
+        now = now or datetime.utcnow()
+        result = {}
+        for name, mems in self.by_member.items():
+            active = [
+                m for m in mems
+                if not (m.slot_type == "travel_location" and m.valid_until and m.valid_until < now)
+            ]
+            if active:
+                result[name] = active
+        return result
+
+    def detect_mentioned(self, message_content: str) -> list[str]:
+        """Return member names mentioned in the message, in member order."""
+        if not message_content or self._mention_pattern is None:
+            return []
+
+        found = set()
+        for match in self._mention_pattern.finditer(message_content):
+            matched = (match.group(1) or match.group(2)).lower()
+            found.update(self._names_by_lower.get(matched, []))
+
+        return [name for name in self.member_names if name in found]
+
+
+# Cached indexes keyed by group_id. The admin UI may run in another thread,
+# so access goes through a lock; the generation counter stops a load that
+# raced with an invalidation from overwriting the fresh state.
+_indexes: dict[str, MemberMemoryIndex] = {}
+_generations: dict[str, int] = {}
+_epoch = 0  # Bumped when every group is invalidated at once
+_lock = threading.Lock()
+
+
+def _load_index(group_id: str) -> MemberMemoryIndex:
+    """Load a group's memories from the database into a new index."""
+    from signal_bot.db_session import db_session
+    from signal_bot.models import GroupMemberMemory
+
+    with db_session():
+        rows = GroupMemberMemory.query.filter_by(group_id=group_id).all()
+        memories = [
+            MemorySnapshot(
+                member_id=row.member_id,
+                member_name=row.member_name,
+                slot_type=row.slot_type,
+                content=row.content,
+                valid_from=row.valid_from,
+                valid_until=row.valid_until,
+                updated_at=row.updated_at,
+            )
+            for row in rows
+        ]
+
+    return MemberMemoryIndex(group_id, memories)
+
+
+def get_member_memory_index(group_id: str) -> MemberMemoryIndex:
+    """Get the cached memory index for a group, loading it on first use."""
+    with _lock:
+        index = _indexes.get(group_id)
+        generation = (_epoch, _generations.get(group_id, 0))
+    if index is not None and time.monotonic() - index.loaded_at < MEMBER_MEMORY_INDEX_TTL_SECONDS:
+        return index
+
+    index = _load_index(group_id)
+
+    with _lock:
+        if (_epoch, _generations.get(group_id, 0)) == generation:
+            _indexes[group_id] = index
+    logger.debug(f"Loaded member memory index for {group_id}: {len(index.memories)} memories")
+    return index
+
+
+def invalidate_member_memory_index(group_id: Optional[str] = None):
+    """Drop the cached index for a group (or all groups) after memories change."""
+    global _epoch
+    with _lock:
+        if group_id is None:
+            _epoch += 1
+            _indexes.clear()
+        else:
+            _generations[group_id] = _generations.get(group_id, 0) + 1
+            _indexes.pop(group_id, None)
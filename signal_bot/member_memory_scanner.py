@@ -1,7 +1,8 @@
 """
 Memory scanner for extracting and updating member memories from chat history.
 
-Runs every 12 hours to analyze the last 100 messages and update:
+Runs every few hours over each group's messages since its last scan (a few
+groups at a time) and updates:
 - Location slots (home_location, travel_location)
 - General memory slots (general_1 through general_5)
 """
@@ -10,11 +11,19 @@ import asyncio
 import json
 import logging
 import re
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
 from datetime import datetime, timedelta
 from typing import Optional
 
 from flask import Flask
 
+from signal_bot.member_memory_index import get_member_memory_index, invalidate_member_memory_index
+from signal_bot.message_features import analyze_message
+from signal_bot.message_keywords import LOCATION_KEYWORDS, LOCATION_CUE_KEYWORDS, COLLECTIVE_KEYWORDS  # noqa: F401 (re-exported)
+
 logger = logging.getLogger(__name__)
 
 # Flask app reference for database context
@@ -30,25 +39,8 @@ TIER_ALWAYS = ["response_prefs"]  # Always include for current speaker
 TIER_CONTEXTUAL = ["interests", "media_prefs", "life_events", "work_info", "social_notes"]  # Include for speaker + mentioned
 TIER_SITUATIONAL = ["home_location", "travel_location"]  # Only when location-relevant
 
-# Keywords that make location contextually relevant
-LOCATION_KEYWORDS = [
-    "weather", "temperature", "forecast", "rain", "snow", "hot", "cold",
-    "time", "timezone", "what time",
-    "local", "nearby", "around here", "in your area",
-    "visit", "travel", "trip", "vacation", "flying",
-    "where are you", "where do you live", "where does", "where is",
-    "where i live", "where they live", "live in", "lives in",
-    "location", "home", "hometown", "from",
-    "distance", "how far", "drive", "flight",
-    "restaurant", "food", "eat", "coffee", "bar",
-    "event", "concert", "game", "show",
-]
-
-# Keywords indicating request for ALL members' info
-COLLECTIVE_KEYWORDS = [
-    "everyone", "everybody", "all of us", "each of us", "the group",
-    "all members", "whole group", "all of you", "each person",
-]
+# Capitalised word after a lowercase word or comma (place names, not sentence starts)
+_PROPER_NOUN_PATTERN = re.compile(r"(?<=[a-z,;:] )[A-Z][a-z]{2,}")
 
 # Instruction to prevent over-mentioning location
 LOCATION_INSTRUCTION = """[Context includes location info for reference. Do NOT proactively mention
@@ -59,6 +51,10 @@ Mentioning location unprompted feels intrusive.]"""
 SCAN_INTERVAL_HOURS = 6
 MESSAGES_TO_SCAN = 100
 
+# Tables a scan reads (MemoryScanState.last_message_source)
+SOURCE_CHAT_LOG = "chat_logs"
+SOURCE_MESSAGE_LOG = "message_logs"
+
 
 def set_flask_app(app: Flask):
     """Set the Flask app for database context."""
@@ -97,7 +93,7 @@ class MemberMemoryScanner:
         logger.info("Member memory scanner stopped")
 
     async def _scanner_loop(self):
-        """Main scanner loop - runs every 12 hours."""
+        """Main scanner loop - runs every SCAN_INTERVAL_HOURS."""
         # Wait a bit before first scan to let things initialize
         await asyncio.sleep(60)
 
@@ -113,81 +109,162 @@ class MemberMemoryScanner:
             await asyncio.sleep(SCAN_INTERVAL_HOURS * 3600)
 
     async def _scan_all_groups(self):
-        """Scan all active groups for memory updates."""
-        from signal_bot.models import db, GroupConnection, Bot, BotGroupAssignment, MemoryScanState
+        """Scan all active groups for memory updates, a few at a time."""
+        from signal_bot.config_signal import MEMORY_SCAN_CONCURRENCY
+        from signal_bot.db_session import db_session
 
         logger.info("Starting memory scan for all groups...")
+        # Stamp scans with the cycle start so the next cycle, one interval later, isn't skipped
+        cycle_started = datetime.utcnow()
 
-        with _flask_app.app_context():
-            # Get all active groups that have a bot with web search enabled
-            groups = GroupConnection.query.filter_by(enabled=True).all()
-
-            for group in groups:
-                # Check if any bot in this group has web search (needed for context)
-                assignments = BotGroupAssignment.query.filter_by(group_id=group.id).all()
-                has_capable_bot = False
-                bot_for_scan = None
-
-                for assignment in assignments:
-                    bot = Bot.query.get(assignment.bot_id)
-                    if bot and bot.enabled:
-                        has_capable_bot = True
-                        bot_for_scan = bot
-                        break
+        with db_session():
+            targets = self._find_scan_targets(cycle_started)
 
-                if not has_capable_bot:
-                    continue
+        semaphore = asyncio.Semaphore(MEMORY_SCAN_CONCURRENCY)
 
-                # Check if we need to scan (12 hours since last scan)
-                scan_state = MemoryScanState.query.get(group.id)
-                if scan_state and scan_state.last_scan_at:
-                    time_since_scan = datetime.utcnow() - scan_state.last_scan_at
-                    if time_since_scan < timedelta(hours=SCAN_INTERVAL_HOURS):
-                        logger.debug(f"Skipping {group.name} - scanned {time_since_scan.total_seconds()/3600:.1f}h ago")
-                        continue
+        async def scan(target: ScanTarget):
+            async with semaphore:
+                try:
+                    await self._scan_group(target, cycle_started)
+                except Exception as e:
+                    logger.error(f"Error scanning {target.group_name}: {e}")
 
-                # Perform the scan
-                await self._scan_group(group.id, group.name, bot_for_scan)
+        await asyncio.gather(*(scan(target) for target in targets))
 
-                # Update scan state
-                if not scan_state:
-                    scan_state = MemoryScanState(group_id=group.id)
-                    db.session.add(scan_state)
+        logger.info(f"Memory scan complete for all groups ({len(targets)} due)")
 
-                scan_state.last_scan_at = datetime.utcnow()
-                db.session.commit()
+    def _find_scan_targets(self, now: datetime) -> list['ScanTarget']:
+        """Groups due for a scan, copied out of the database (call inside db_session())."""
+        from signal_bot.models import GroupConnection, MemoryScanState
 
-        logger.info("Memory scan complete for all groups")
+        targets = []
+        for group in GroupConnection.query.filter_by(enabled=True).all():
+            # Check if we need to scan (interval since last scan)
+            scan_state = MemoryScanState.query.get(group.id)
+            if scan_state and scan_state.last_scan_at:
+                time_since_scan = now - scan_state.last_scan_at
+                if time_since_scan < timedelta(hours=SCAN_INTERVAL_HOURS):
+                    logger.debug(f"Skipping {group.name} - scanned {time_since_scan.total_seconds()/3600:.1f}h ago")
+                    continue
+
+            target = self._build_scan_target(group, scan_state)
+            if target:
+                targets.append(target)
+        return targets
+
+    @staticmethod
+    def _build_scan_target(group, scan_state) -> Optional['ScanTarget']:
+        """Scan target for a group, or None if no enabled bot is assigned to it."""
+        from signal_bot.models import Bot, BotGroupAssignment
+
+        bots = []
+        for assignment in BotGroupAssignment.query.filter_by(group_id=group.id).all():
+            bot = Bot.query.get(assignment.bot_id)
+            if bot and bot.enabled:
+                bots.append(bot)
+        if not bots:
+            return None
+
+        # Any bot with chat log keeps every message there; MessageLog only has the rolling window
+        use_chat_log = any(getattr(bot, 'chat_log_enabled', False) for bot in bots)
+        source = SOURCE_CHAT_LOG if use_chat_log else SOURCE_MESSAGE_LOG
+
+        # The cursor is an id in one table; when the source changes, start over from the latest messages
+        last_message_id = None
+        if scan_state and scan_state.last_message_id_scanned is not None:
+            if scan_state.last_message_source == source:
+                last_message_id = scan_state.last_message_id_scanned
+            else:
+                logger.info(f"Message source for {group.name} changed to {source}; resetting scan cursor")
+
+        return ScanTarget(
+            group_id=group.id,
+            group_name=group.name,
+            bot_name=bots[0].name,
+            bot_model=bots[0].model,
+            use_chat_log=use_chat_log,
+            last_message_id=last_message_id,
+        )
 
-    async def _scan_group(self, group_id: str, group_name: str, bot: 'Bot'):
-        """Scan a specific group and update member memories."""
-        from signal_bot.models import db, MessageLog, GroupMemberMemory
+    async def _scan_group(self, target: 'ScanTarget', scanned_at: Optional[datetime] = None):
+        """Scan a group's messages since the last scan and update member memories.
 
-        logger.info(f"Scanning group: {group_name}")
+        New messages are analysed in batches of MESSAGES_TO_SCAN (up to
+        MEMORY_SCAN_MAX_BATCHES per cycle; the rest are picked up next
+        cycle). The cursor only advances past a batch once its updates are
+        committed, so a failed LLM call or write is retried.
+        """
+        from signal_bot.config_signal import MEMORY_SCAN_MAX_BATCHES
+        from signal_bot.db_session import db_session
 
-        with _flask_app.app_context():
-            # Get last 100 messages
-            messages = MessageLog.query.filter_by(group_id=group_id).order_by(
-                MessageLog.timestamp.desc()
-            ).limit(MESSAGES_TO_SCAN).all()
+        scanned_at = scanned_at or datetime.utcnow()
+        with db_session():
+            messages = self._load_new_messages(target, MESSAGES_TO_SCAN * MEMORY_SCAN_MAX_BATCHES)
 
-            if not messages:
-                logger.debug(f"No messages to scan in {group_name}")
-                return
+        if not messages:
+            logger.debug(f"No new messages to scan in {target.group_name}")
+            await asyncio.to_thread(self._save_scan_state, target, scanned_at, None)
+            return
 
-            # Reverse to get chronological order
-            messages = list(reversed(messages))
+        logger.info(f"Scanning group: {target.group_name} ({len(messages)} new messages)")
 
-            # Get current memory state
-            current_memories = GroupMemberMemory.query.filter_by(group_id=group_id).all()
+        last_message_id = None
+        for start in range(0, len(messages), MESSAGES_TO_SCAN):
+            batch = messages[start:start + MESSAGES_TO_SCAN]
+            # Cached index snapshots; refreshed after each batch's writes invalidate it
+            current_memories = get_member_memory_index(target.group_id).memories
 
-            # Build context for AI analysis
             memory_updates = await self._analyze_messages_for_memories(
-                messages, current_memories, group_name, bot
+                batch, current_memories, target.group_name, target.bot_name, target.bot_model
             )
-
+            if memory_updates is None:
+                break
             if memory_updates:
-                self._apply_memory_updates(group_id, memory_updates)
+                applied = await asyncio.to_thread(self._apply_memory_updates, target.group_id, memory_updates)
+                if not applied:
+                    break
+            last_message_id = batch[-1].id
+
+        await asyncio.to_thread(self._save_scan_state, target, scanned_at, last_message_id)
+
+    @staticmethod
+    def _load_new_messages(target: 'ScanTarget', limit: int) -> list['ScannedMessage']:
+        """Messages after the scan cursor, oldest first (call inside db_session()).
+
+        The first scan of a group reads the latest MESSAGES_TO_SCAN messages.
+        Only the columns the prompt needs are loaded (not image data).
+        """
+        from signal_bot.models import db, ChatLog, MessageLog
+
+        model = ChatLog if target.use_chat_log else MessageLog
+        query = db.session.query(model.id, model.sender_name, model.content, model.timestamp).filter(
+            model.group_id == target.group_id
+        )
+        if target.last_message_id is None:
+            rows = list(reversed(query.order_by(model.id.desc()).limit(MESSAGES_TO_SCAN).all()))
+        else:
+            rows = query.filter(model.id > target.last_message_id).order_by(model.id).limit(limit).all()
+
+        return [
+            ScannedMessage(id=row.id, sender_name=row.sender_name, content=row.content, timestamp=row.timestamp)
+            for row in rows
+        ]
+
+    def _save_scan_state(self, target: 'ScanTarget', scanned_at: datetime, last_message_id: Optional[int]):
+        """Record the scan time and, if it advanced, the message cursor and its table."""
+        from signal_bot.models import db, MemoryScanState
+
+        with _flask_app.app_context():
+            scan_state = MemoryScanState.query.get(target.group_id)
+            if not scan_state:
+                scan_state = MemoryScanState(group_id=target.group_id)
+                db.session.add(scan_state)
+
+            scan_state.last_scan_at = scanned_at
+            if last_message_id is not None:
+                scan_state.last_message_id_scanned = last_message_id
+                scan_state.last_message_source = target.source
+            db.session.commit()
 
     # JSON Schema for memory scan results
     MEMORY_SCAN_SCHEMA = {
@@ -248,15 +325,19 @@ class MemberMemoryScanner:
         messages: list,
         current_memories: list,
         group_name: str,
-        bot: 'Bot'
-    ) -> list[dict]:
-        """Use AI to analyze messages and propose memory updates using structured outputs."""
+        bot_name: str,
+        bot_model: Optional[str]
+    ) -> Optional[list[dict]]:
+        """Use AI to analyze messages and propose memory updates using structured outputs.
+
+        Returns None if the analysis failed (as opposed to finding nothing).
+        """
         try:
             from shared_utils import call_openrouter_api_structured
             from config import AI_MODELS
         except ImportError as e:
             logger.error(f"Failed to import for memory scan: {e}")
-            return []
+            return None
 
         # Format messages for analysis
         message_text = "\n".join([
@@ -336,13 +417,14 @@ Analyze and return memory updates:"""
 
         try:
             # Use bot's configured model (no fallback - bot must have a model)
-            if not bot.model:
-                logger.error(f"Bot {bot.name} has no model configured for memory scan")
-                return []
-            model_id = AI_MODELS.get(bot.model, bot.model)
-
-            # Use structured outputs for guaranteed valid JSON
-            result = call_openrouter_api_structured(
+            if not bot_model:
+                logger.error(f"Bot {bot_name} has no model configured for memory scan")
+                return None
+            model_id = AI_MODELS.get(bot_model, bot_model)
+
+            # Use structured outputs for guaranteed valid JSON (blocking call, off the event loop)
+            result = await asyncio.to_thread(
+                call_openrouter_api_structured,
                 prompt=user_prompt,
                 model=model_id,
                 system_prompt=system_prompt,
@@ -351,7 +433,7 @@ Analyze and return memory updates:"""
             )
 
             if not result:
-                return []
+                return None
 
             updates = result.get("updates", [])
             if updates:
@@ -363,15 +445,25 @@ Analyze and return memory updates:"""
 
         except Exception as e:
             logger.error(f"Error in memory analysis: {e}")
-            return []
+            return None
+
+    def _apply_memory_updates(self, group_id: str, updates: list[dict]) -> bool:
+        """Apply memory updates to the database in one transaction.
 
-    def _apply_memory_updates(self, group_id: str, updates: list[dict]):
-        """Apply memory updates to the database."""
+        Runs in a worker thread. The group's memories are loaded once and
+        updates resolved against them in memory, so several updates to the
+        same slot in one batch land on the same row. Invalid updates are
+        skipped; returns False if the commit failed.
+        """
         from signal_bot.models import db, GroupMemberMemory, ActivityLog
 
         with _flask_app.app_context():
-            for update in updates:
-                try:
+            rows = GroupMemberMemory.query.filter_by(group_id=group_id).all()
+            by_name_slot = {(row.member_name, row.slot_type): row for row in rows}
+            by_id_slot = {(row.member_id, row.slot_type): row for row in rows}
+
+            try:
+                for update in updates:
                     operation = update.get("operation", "set")
                     member_name = update.get("member_name")
                     # Use member_name as fallback ID to avoid unique constraint collisions
@@ -389,15 +481,13 @@ Analyze and return memory updates:"""
                         continue
 
                     # Find existing memory for this slot
-                    existing = GroupMemberMemory.query.filter_by(
-                        group_id=group_id,
-                        member_name=member_name,
-                        slot_type=slot_type
-                    ).first()
+                    existing = by_name_slot.get((member_name, slot_type))
 
                     if operation == "delete":
                         if existing:
                             db.session.delete(existing)
+                            del by_name_slot[(member_name, slot_type)]
+                            by_id_slot.pop((existing.member_id, slot_type), None)
                             logger.info(f"Deleted memory: {member_name}/{slot_type} - {reason}")
 
                             # Log activity
@@ -407,11 +497,20 @@ Analyze and return memory updates:"""
                                 description=f"Deleted {slot_type} for {member_name}: {reason}"
                             )
                             db.session.add(log)
+                            # Deletes flush after inserts; a later set of this slot must not collide
+                            db.session.flush()
 
                     elif operation in ("set", "update"):
                         if not content:
                             continue
 
+                        # The slot is unique per member_id; skip rather than fail the whole batch
+                        holder = by_id_slot.get((member_id, slot_type))
+                        if holder is not None and holder is not existing:
+                            logger.warning(f"Skipping memory update for {member_name}/{slot_type}: "
+                                           f"slot already held by {holder.member_name}")
+                            continue
+
                         # Parse dates if provided
                         valid_from = None
                         valid_until = None
@@ -427,13 +526,14 @@ Analyze and return memory updates:"""
                                 pass
 
                         if existing:
+                            by_id_slot.pop((existing.member_id, slot_type), None)
                             existing.content = content
                             existing.valid_from = valid_from
                             existing.valid_until = valid_until
                             existing.member_id = member_id
                             logger.info(f"Updated memory: {member_name}/{slot_type} = {content[:50]}...")
                         else:
-                            new_memory = GroupMemberMemory(
+                            existing = GroupMemberMemory(
                                 group_id=group_id,
                                 member_id=member_id,
                                 member_name=member_name,
@@ -442,8 +542,10 @@ Analyze and return memory updates:"""
                                 valid_from=valid_from,
                                 valid_until=valid_until
                             )
-                            db.session.add(new_memory)
+                            db.session.add(existing)
+                            by_name_slot[(member_name, slot_type)] = existing
                             logger.info(f"Created memory: {member_name}/{slot_type} = {content[:50]}...")
+                        by_id_slot[(member_id, slot_type)] = existing
 
                         # Log activity
                         log = ActivityLog(
@@ -453,38 +555,58 @@ Analyze and return memory updates:"""
                         )
                         db.session.add(log)
 
-                    # Commit each update individually to avoid cascading failures
-                    db.session.commit()
+                db.session.commit()
+            except Exception as e:
+                logger.error(f"Error applying memory updates for group {group_id}: {e}")
+                db.session.rollback()
+                return False
 
-                except Exception as e:
-                    logger.error(f"Error applying memory update: {e}")
-                    db.session.rollback()  # Rollback failed transaction before continuing
-                    continue
+        # Context formatting reads from the cached index
+        invalidate_member_memory_index(group_id)
+        return True
 
     async def force_scan_group(self, group_id: str):
         """Force an immediate scan of a specific group (for testing/admin)."""
-        from signal_bot.models import GroupConnection, Bot, BotGroupAssignment
+        from signal_bot.db_session import db_session
+        from signal_bot.models import GroupConnection, MemoryScanState
 
-        with _flask_app.app_context():
+        with db_session():
             group = GroupConnection.query.get(group_id)
             if not group:
                 logger.error(f"Group {group_id} not found")
                 return
+            target = self._build_scan_target(group, MemoryScanState.query.get(group_id))
 
-            # Find a capable bot
-            assignments = BotGroupAssignment.query.filter_by(group_id=group_id).all()
-            bot = None
-            for assignment in assignments:
-                b = Bot.query.get(assignment.bot_id)
-                if b and b.enabled:
-                    bot = b
-                    break
+        if not target:
+            logger.error(f"No enabled bot found for group {group_id}")
+            return
 
-            if not bot:
-                logger.error(f"No enabled bot found for group {group_id}")
-                return
+        await self._scan_group(target)
+
+
+@dataclass(frozen=True)
+class ScanTarget:
+    """A group due for a memory scan, with what the scan needs copied out of the database."""
+    group_id: str
+    group_name: str
+    bot_name: str
+    bot_model: Optional[str]
+    use_chat_log: bool  # Read ChatLog (permanent) instead of MessageLog (rolling window)
+    last_message_id: Optional[int]  # MemoryScanState.last_message_id_scanned, if it is an id in that table
 
-            await self._scan_group(group_id, group.name, bot)
+    @property
+    def source(self) -> str:
+        """Table last_message_id refers to (MemoryScanState.last_message_source)."""
+        return SOURCE_CHAT_LOG if self.use_chat_log else SOURCE_MESSAGE_LOG
+
+
+@dataclass(frozen=True)
+class ScannedMessage:
+    """Detached copy of the MessageLog/ChatLog columns the scan prompt uses."""
+    id: int
+    sender_name: str
+    content: str
+    timestamp: datetime
 
 
 def detect_mentioned_members(message_content: str, group_id: str) -> list[str]:
@@ -493,43 +615,21 @@ def detect_mentioned_members(message_content: str, group_id: str) -> list[str]:
 
     Returns list of member_names that appear to be mentioned.
     """
-    from signal_bot.models import GroupMemberMemory
-
     try:
-        with _flask_app.app_context():
-            # Get all known member names from this group
-            members = GroupMemberMemory.query.filter_by(group_id=group_id).with_entities(
-                GroupMemberMemory.member_name
-            ).distinct().all()
-
-            member_names = [m.member_name for m in members]
-            mentioned = []
-
-            message_lower = message_content.lower()
-
-            for name in member_names:
-                name_lower = name.lower()
-                # Check for name mention (with word boundaries to avoid false positives)
-                if re.search(rf'\b{re.escape(name_lower)}\b', message_lower):
-                    mentioned.append(name)
-                # Also check for @mention style
-                elif f"@{name_lower}" in message_lower:
-                    if name not in mentioned:
-                        mentioned.append(name)
-
-            return mentioned
+        return get_member_memory_index(group_id).detect_mentioned(message_content)
     except Exception as e:
         logger.error(f"Error detecting mentioned members: {e}")
         return []
 
 
-def is_location_relevant(message_content: str, member_memories: list) -> tuple[bool, bool]:
+def is_location_relevant(message_content: str, member_memories: list, features=None) -> tuple[bool, bool]:
     """
     Determine if location info is relevant to include.
 
     Args:
         message_content: The message text
-        member_memories: List of GroupMemberMemory objects
+        member_memories: List of GroupMemberMemory objects or MemorySnapshots
+        features: Pre-computed MessageFeatures for the message (analysed here if omitted)
 
     Returns:
         Tuple of (should_include_location, is_explicitly_asked)
@@ -538,12 +638,11 @@ def is_location_relevant(message_content: str, member_memories: list) -> tuple[b
     """
     from signal_bot.config_signal import TRAVEL_PROXIMITY_DAYS
 
-    message_lower = message_content.lower()
+    if features is None:
+        features = analyze_message(message_content)
 
     # Check for keyword match
-    keyword_match = any(kw in message_lower for kw in LOCATION_KEYWORDS)
-
-    if keyword_match:
+    if features.has("location"):
         return True, True  # Include location, was explicitly relevant
 
     # Check for upcoming travel (within configured days)
@@ -590,11 +689,16 @@ def is_location_relevant_llm(message_content: str, model_id: str) -> tuple[bool,
     Returns:
         Tuple of (should_include_location, is_explicitly_asked)
     """
+    return _location_relevance_llm(message_content, model_id) or (False, False)
+
+
+def _location_relevance_llm(message_content: str, model_id: str) -> Optional[tuple[bool, bool]]:
+    """LLM location relevance check; None if the call failed (so it isn't memoised)."""
     try:
         from shared_utils import call_openrouter_api_structured
     except ImportError as e:
         logger.error(f"Failed to import for location relevance check: {e}")
-        return False, False
+        return None
 
     system_prompt = """You determine if a user's message would benefit from knowing their location.
 
@@ -626,10 +730,10 @@ Is location information relevant for responding to this message?"""
 
         if not result:
             logger.warning("No result from location relevance LLM")
-            return False, False
+            return None
 
-        is_relevant = result.get("is_relevant", False)
-        is_explicit = result.get("is_explicit", False)
+        is_relevant = bool(result.get("is_relevant", False))
+        is_explicit = bool(result.get("is_explicit", False))
 
         logger.debug(f"Location relevance LLM: relevant={is_relevant}, explicit={is_explicit}, reason={result.get('reason', 'N/A')}")
 
@@ -637,15 +741,106 @@ Is location information relevant for responding to this message?"""
 
     except Exception as e:
         logger.error(f"Error in location relevance LLM: {e}")
-        return False, False
+        return None
+
+
+def classify_location_relevance_local(message_content: str, features=None) -> Optional[tuple[bool, bool]]:
+    """
+    Cheap first pass over a message before asking the LLM about location relevance.
 
+    Returns (should_include_location, is_explicitly_asked) when the answer is
+    clear from the text alone, or None when the message is ambiguous. A
+    LOCATION_KEYWORDS hit is always relevant (the keyword check overrides a
+    "no" from the LLM anyway); a message with no keyword, cue or place-like
+    name is not. Only cue words and place-like names go to the memo or LLM.
+    """
+    if features is None:
+        features = analyze_message(message_content)
+    if features.has("location"):
+        return True, True
+    if features.has("location_cue") or _PROPER_NOUN_PATTERN.search(message_content or ""):
+        return None
+    return False, False
 
-def is_collective_location_request(message_content: str) -> bool:
+
+# LLM verdicts per (model, normalised message); "What's the weather?" asked by
+# three people in a row costs one call
+_relevance_memo: OrderedDict = OrderedDict()
+_relevance_memo_lock = threading.Lock()
+
+
+def _normalize_for_memo(message_content: str) -> str:
+    """Case-, punctuation- and whitespace-insensitive form of a message."""
+    return " ".join(re.sub(r"[^\w\s]", " ", (message_content or "").casefold()).split())
+
+
+def resolve_location_relevance(
+    message_content: str,
+    member_memories: list,
+    model_id: str,
+    features=None,
+    bot_id: Optional[str] = None
+) -> tuple[bool, bool]:
+    """
+    Location relevance using the LLM only for messages the local pass can't decide.
+
+    Clear cases are answered by classify_location_relevance_local, repeated
+    ambiguous messages by the memo, and the rest by is_location_relevant_llm.
+    Blocking: call it off the event loop.
+    The keyword/travel-proximity check still applies when the answer is no.
+    Each path is counted per bot (location_checks_local / _memo / _llm) and
+    LLM calls are timed as "location_llm", so /api/metrics can report the
+    share of calls avoided and the latency saved.
+
+    Returns:
+        Tuple of (should_include_location, is_explicitly_asked)
+    """
+    from signal_bot import metrics
+    from signal_bot.config_signal import LOCATION_RELEVANCE_MEMO_SIZE
+
+    if features is None:
+        features = analyze_message(message_content)
+
+    verdict = classify_location_relevance_local(message_content, features)
+    if verdict is not None:
+        metrics.increment(bot_id, "location_checks_local")
+    else:
+        key = (model_id, _normalize_for_memo(message_content))
+        with _relevance_memo_lock:
+            verdict = _relevance_memo.get(key)
+            if verdict is not None:
+                _relevance_memo.move_to_end(key)
+
+        if verdict is not None:
+            metrics.increment(bot_id, "location_checks_memo")
+        else:
+            metrics.increment(bot_id, "location_checks_llm")
+            started = time.monotonic()
+            verdict = _location_relevance_llm(message_content, model_id)
+            metrics.record_latency(bot_id, "location_llm", time.monotonic() - started)
+            if verdict is None:
+                verdict = (False, False)  # Not memoised, so the next message retries
+            else:
+                with _relevance_memo_lock:
+                    _relevance_memo[key] = verdict
+                    _relevance_memo.move_to_end(key)
+                    while len(_relevance_memo) > LOCATION_RELEVANCE_MEMO_SIZE:
+                        _relevance_memo.popitem(last=False)
+
+    include, explicit = verdict
+    # Also check keywords/travel proximity as fallback if the classifier says no
+    if not include:
+        kw_include, kw_explicit = is_location_relevant(message_content, member_memories, features)
+        if kw_include:
+            return kw_include, kw_explicit
+    return include, explicit
+
+
+def is_collective_location_request(message_content: str, features=None) -> bool:
     """Check if message asks about location info for all members (e.g., 'weather for everyone')."""
-    message_lower = message_content.lower()
-    has_collective = any(kw in message_lower for kw in COLLECTIVE_KEYWORDS)
-    has_location_keyword = any(kw in message_lower for kw in LOCATION_KEYWORDS)
-    return has_collective and has_location_keyword
+    if features is None:
+        features = analyze_message(message_content)
+    return features.has("collective") and features.has("location")
 
 
 def format_single_memory(mem) -> str:
@@ -684,17 +879,24 @@ def format_member_memories_for_context(
     current_speaker_name: str = "",
     current_speaker_id: str = "",
     message_content: str = "",
-    member_memory_model: str = None
+    member_memory_model: str = None,
+    message_features=None,
+    bot_id: Optional[str] = None
 ) -> str:
     """
     Format member memories prioritized for the current conversation context.
 
+    May call the location relevance LLM (with member_memory_model set), so the
+    message handler runs it in a worker thread.
+
     Args:
         group_id: The group's ID
         current_speaker_name: Name of person who sent the message
         current_speaker_id: Signal UUID of speaker (optional)
         message_content: The message text (for mentioned member detection)
         member_memory_model: Model ID for LLM-based relevance detection (optional)
+        message_features: Pre-computed MessageFeatures for message_content (optional)
+        bot_id: Bot to attribute location relevance metrics to (optional)
 
     Returns:
         Formatted string with tiered memory inclusion:
@@ -703,135 +905,120 @@ def format_member_memories_for_context(
         - Others: Omitted
         - Meta-awareness: What categories exist for speaker
     """
-    from signal_bot.models import GroupMemberMemory
-
     try:
-        with _flask_app.app_context():
-            memories = GroupMemberMemory.query.filter_by(group_id=group_id).all()
-
-            if not memories:
-                return ""
+        # Cached per-group index; only hits the database after memories change
+        index = get_member_memory_index(group_id)
+        if not index.memories:
+            return ""
+
+        # Group by member, filtering expired travel
+        by_member = index.active_by_member()
+        if not by_member:
+            return ""
+
+        if message_features is None:
+            message_features = analyze_message(message_content)
+
+        # Detect mentioned members
+        mentioned_members = index.detect_mentioned(message_content) if message_content else []
+
+        # Check location relevance (for travel_location, not home_location)
+        # Use LLM (for ambiguous messages) if model provided, otherwise keywords only
+        speaker_memories = by_member.get(current_speaker_name, [])
+        if member_memory_model:
+            include_extra_location, location_explicit = resolve_location_relevance(
+                message_content, speaker_memories, member_memory_model, message_features, bot_id
+            )
+        else:
+            include_extra_location, location_explicit = is_location_relevant(message_content, speaker_memories, message_features)
 
-            now = datetime.utcnow()
+        output_lines = []
+        included_categories = []  # Track what we include for meta-awareness
 
-            # Group by member, filtering expired travel
-            by_member = {}
-            for mem in memories:
-                # Skip expired travel locations
-                if mem.slot_type == "travel_location" and mem.valid_until:
-                    if mem.valid_until < now:
-                        continue
+        # === CURRENT SPEAKER SECTION ===
+        if current_speaker_name and current_speaker_name in by_member:
+            output_lines.append(f"\n=== WHAT I KNOW ABOUT {current_speaker_name.upper()} (CURRENT SPEAKER) ===")
 
-                if mem.member_name not in by_member:
-                    by_member[mem.member_name] = []
-                by_member[mem.member_name].append(mem)
-
-            if not by_member:
-                return ""
-
-            # Detect mentioned members
-            mentioned_members = detect_mentioned_members(message_content, group_id) if message_content else []
-
-            # Check location relevance (for travel_location, not home_location)
-            # Use LLM if model provided, otherwise fall back to keywords
-            speaker_memories = by_member.get(current_speaker_name, [])
-            if member_memory_model:
-                include_extra_location, location_explicit = is_location_relevant_llm(message_content, member_memory_model)
-                # Also check keywords as fallback if LLM says no
-                if not include_extra_location:
-                    kw_include, kw_explicit = is_location_relevant(message_content, speaker_memories)
-                    if kw_include:
-                        include_extra_location, location_explicit = kw_include, kw_explicit
-            else:
-                include_extra_location, location_explicit = is_location_relevant(message_content, speaker_memories)
+            for mem in by_member[current_speaker_name]:
+                # Tier 1: Always include response_prefs
+                if mem.slot_type in TIER_ALWAYS:
+                    output_lines.append(format_single_memory(mem))
+                    included_categories.append(mem.slot_type)
 
-            output_lines = []
-            included_categories = []  # Track what we include for meta-awareness
+                # Tier 2: Contextual - always include for speaker
+                elif mem.slot_type in TIER_CONTEXTUAL:
+                    output_lines.append(format_single_memory(mem))
+                    included_categories.append(mem.slot_type)
 
-            # === CURRENT SPEAKER SECTION ===
-            if current_speaker_name and current_speaker_name in by_member:
-                output_lines.append(f"\n=== WHAT I KNOW ABOUT {current_speaker_name.upper()} (CURRENT SPEAKER) ===")
+                # Always include home_location for current speaker (Option B)
+                elif mem.slot_type == "home_location":
+                    output_lines.append(format_single_memory(mem))
+                    included_categories.append(mem.slot_type)
 
-                for mem in by_member[current_speaker_name]:
-                    # Tier 1: Always include response_prefs
-                    if mem.slot_type in TIER_ALWAYS:
+                # Include travel_location only when relevant
+                elif mem.slot_type == "travel_location":
+                    if include_extra_location:
                         output_lines.append(format_single_memory(mem))
                         included_categories.append(mem.slot_type)
 
-                    # Tier 2: Contextual - always include for speaker
-                    elif mem.slot_type in TIER_CONTEXTUAL:
-                        output_lines.append(format_single_memory(mem))
-                        included_categories.append(mem.slot_type)
+        # === MENTIONED MEMBERS SECTION ===
+        for mentioned_name in mentioned_members:
+            if mentioned_name == current_speaker_name:
+                continue  # Already covered
+            if mentioned_name not in by_member:
+                continue
 
-                    # Always include home_location for current speaker (Option B)
-                    elif mem.slot_type == "home_location":
-                        output_lines.append(format_single_memory(mem))
-                        included_categories.append(mem.slot_type)
+            output_lines.append(f"\n=== {mentioned_name.upper()} (MENTIONED IN MESSAGE) ===")
 
-                    # Include travel_location only when relevant
-                    elif mem.slot_type == "travel_location":
-                        if include_extra_location:
-                            output_lines.append(format_single_memory(mem))
-                            included_categories.append(mem.slot_type)
-
-            # === MENTIONED MEMBERS SECTION ===
-            for mentioned_name in mentioned_members:
-                if mentioned_name == current_speaker_name:
-                    continue  # Already covered
-                if mentioned_name not in by_member:
+            for mem in by_member[mentioned_name]:
+                # Include all tiers for mentioned members
+                output_lines.append(format_single_memory(mem))
+
+        # === ALL MEMBERS SECTION (for collective requests like "weather for everyone") ===
+        include_all_locations = is_collective_location_request(message_content, message_features)
+
+        if include_all_locations:
+            # Gather all members with home_location who weren't already included
+            already_included = {current_speaker_name} | set(mentioned_members)
+            all_locations = []
+            for member_name, mems in by_member.items():
+                if member_name in already_included:
                     continue
+                for mem in mems:
+                    if mem.slot_type == "home_location":
+                        all_locations.append(f"- {member_name}: {mem.content}")
+                        break
 
-                output_lines.append(f"\n=== {mentioned_name.upper()} (MENTIONED IN MESSAGE) ===")
+            if all_locations:
+                output_lines.append(f"\n=== OTHER GROUP MEMBERS' LOCATIONS ===")
+                output_lines.extend(all_locations)
 
-                for mem in by_member[mentioned_name]:
-                    # Include all tiers for mentioned members
-                    output_lines.append(format_single_memory(mem))
+        # Add location instruction if travel location was included but not explicitly asked
+        # (home_location is always included, so instruction only for extra location info)
+        if include_extra_location and not location_explicit:
+            output_lines.append(f"\n{LOCATION_INSTRUCTION}")
 
-            # === ALL MEMBERS SECTION (for collective requests like "weather for everyone") ===
-            include_all_locations = is_collective_location_request(message_content)
+        # === META-AWARENESS SECTION (Option C) ===
+        # Tell the bot what categories exist for the speaker, even if not all were included
+        if current_speaker_name and current_speaker_name in by_member:
+            all_speaker_categories = list(set(mem.slot_type for mem in by_member[current_speaker_name]))
+            unique_included = list(set(included_categories))
 
-            if include_all_locations:
-                # Gather all members with home_location who weren't already included
-                already_included = {current_speaker_name} | set(mentioned_members)
-                all_locations = []
-                for member_name, mems in by_member.items():
-                    if member_name in already_included:
-                        continue
-                    for mem in mems:
-                        if mem.slot_type == "home_location":
-                            all_locations.append(f"- {member_name}: {mem.content}")
-                            break
-
-                if all_locations:
-                    output_lines.append(f"\n=== OTHER GROUP MEMBERS' LOCATIONS ===")
-                    output_lines.extend(all_locations)
-
-            # Add location instruction if travel location was included but not explicitly asked
-            # (home_location is always included, so instruction only for extra location info)
-            if include_extra_location and not location_explicit:
-                output_lines.append(f"\n{LOCATION_INSTRUCTION}")
-
-            # === META-AWARENESS SECTION (Option C) ===
-            # Tell the bot what categories exist for the speaker, even if not all were included
-            if current_speaker_name and current_speaker_name in by_member:
-                all_speaker_categories = list(set(mem.slot_type for mem in by_member[current_speaker_name]))
-                unique_included = list(set(included_categories))
-
-                # Only add meta-awareness if there's something useful to say
-                if all_speaker_categories:
-                    output_lines.append(f"\n[Available memory categories for {current_speaker_name}: {', '.join(sorted(all_speaker_categories))}]")
-                    output_lines.append(f"[Currently included: {', '.join(sorted(unique_included)) if unique_included else 'none'}]")
-
-            # Note about omitted members (if any) - skip if we included all locations
-            if not include_all_locations:
-                included_count = 1 if current_speaker_name in by_member else 0
-                included_count += len([m for m in mentioned_members if m in by_member and m != current_speaker_name])
-                omitted_count = len(by_member) - included_count
-
-                if omitted_count > 0:
-                    output_lines.append(f"\n[{omitted_count} other group member(s) - context available if mentioned]")
-
-            return "\n".join(output_lines) if output_lines else ""
+            # Only add meta-awareness if there's something useful to say
+            if all_speaker_categories:
+                output_lines.append(f"\n[Available memory categories for {current_speaker_name}: {', '.join(sorted(all_speaker_categories))}]")
+                output_lines.append(f"[Currently included: {', '.join(sorted(unique_included)) if unique_included else 'none'}]")
+
+        # Note about omitted members (if any) - skip if we included all locations
+        if not include_all_locations:
+            included_count = 1 if current_speaker_name in by_member else 0
+            included_count += len([m for m in mentioned_members if m in by_member and m != current_speaker_name])
+            omitted_count = len(by_member) - included_count
+
+            if omitted_count > 0:
+                output_lines.append(f"\n[{omitted_count} other group member(s) - context available if mentioned]")
+
+        return "\n".join(output_lines) if output_lines else ""
 
     except Exception as e:
         logger.error(f"Error formatting member memories: {e}")
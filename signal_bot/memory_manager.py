@@ -1,5 +1,6 @@
 """Memory management for Signal bot conversations."""
 
+import base64
 import logging
 from datetime import datetime
 from typing import Optional
@@ -11,7 +12,11 @@ logger = logging.getLogger(__name__)
 
 
 class MemoryManager:
-    """Manages conversation context (rolling message window)."""
+    """Manages conversation context (rolling message window).
+
+    Methods expect an active app context; callers on the message path wrap
+    each call in ``db_session()`` so no session is held across awaits.
+    """
 
     def __init__(self, group_id: str, rolling_window: int = DEFAULT_ROLLING_WINDOW):
         self.group_id = group_id
@@ -26,7 +31,7 @@ class MemoryManager:
         sender_id: Optional[str] = None,
         has_image: bool = False,
         signal_timestamp: Optional[int] = None,
-        image_data: Optional[str] = None,
+        image_bytes: Optional[bytes] = None,
         image_media_type: Optional[str] = None
     ) -> Optional[MessageLog]:
         """Add a message to the rolling log.
@@ -35,7 +40,7 @@ class MemoryManager:
             signal_timestamp: Signal's unique message timestamp (milliseconds) for deduplication.
                             If provided and a message with this timestamp already exists,
                             the existing message is returned instead of creating a duplicate.
-            image_data: Base64 encoded image data (used when chat_log is disabled as fallback)
+            image_bytes: Raw image bytes (used when chat_log is disabled as fallback)
             image_media_type: MIME type of the image, e.g., "image/jpeg"
         """
         # Deduplication: skip if this exact message already exists (by Signal timestamp)
@@ -55,7 +60,7 @@ class MemoryManager:
             is_bot=is_bot,
             bot_id=bot_id,
             has_image=has_image,
-            image_data=image_data,
+            image_bytes=image_bytes,
             image_media_type=image_media_type,
             timestamp=datetime.utcnow(),
             signal_timestamp=signal_timestamp
@@ -85,8 +90,6 @@ class MemoryManager:
         Note: Content can be either a string (text only) or a list (structured content
         with text and images) when include_images=True and image data is available.
         """
-        from signal_bot.models import ChatLog  # Import here to avoid circular
-
         limit = limit or self.rolling_window
 
         messages = MessageLog.query.filter_by(
@@ -111,69 +114,112 @@ class MemoryManager:
         context = []
         for i, msg in enumerate(messages):
             content = msg.content
-            image_found = False
 
             # Only include image if this message is in the allowed set
-            should_include_image = i in image_message_indices
-
-            # Check for image data if message has_image flag and images requested for this message
-            if msg.has_image and should_include_image:
-                # Lazy import to avoid circular dependency
-                from signal_bot.bot_manager import compress_image_for_api
-
-                # Priority 1: Check MessageLog directly (fallback storage when chat_log disabled)
-                if msg.image_data and msg.image_media_type:
-                    # Compress if needed to stay under API limits
-                    compressed_data, final_media_type = compress_image_for_api(
-                        msg.image_data, msg.image_media_type
-                    )
-                    content = [
-                        {"type": "text", "text": msg.content},
-                        {
-                            "type": "image",
-                            "source": {
-                                "type": "base64",
-                                "media_type": final_media_type,
-                                "data": compressed_data
-                            }
-                        }
-                    ]
-                    image_found = True
-
-                # Priority 2: Look up from ChatLog (primary storage when chat_log enabled)
-                if not image_found and msg.signal_timestamp:
-                    chat_log = ChatLog.query.filter_by(
-                        signal_timestamp=msg.signal_timestamp
-                    ).first()
-                    if chat_log and chat_log.image_data and chat_log.image_media_type:
-                        # Compress if needed to stay under API limits
-                        compressed_data, final_media_type = compress_image_for_api(
-                            chat_log.image_data, chat_log.image_media_type
-                        )
-                        content = [
-                            {"type": "text", "text": msg.content},
-                            {
-                                "type": "image",
-                                "source": {
-                                    "type": "base64",
-                                    "media_type": final_media_type,
-                                    "data": compressed_data
-                                }
-                            }
-                        ]
-                # If neither has image data, content stays as text (graceful degradation)
-
-            context.append({
-                "role": "assistant" if msg.is_bot else "user",
-                "content": content,
-                "name": msg.sender_name,
-                "timestamp": msg.timestamp.isoformat() if msg.timestamp else None,
-                "sender_id": msg.sender_id,
-                "signal_timestamp": msg.signal_timestamp
-            })
+            # If no image data is found, content stays as text (graceful degradation)
+            if msg.has_image and i in image_message_indices:
+                image_part = self.get_image_part(msg)
+                if image_part:
+                    content = [{"type": "text", "text": msg.content}, image_part]
+
+            context.append(self._to_context_dict(msg, content))
 
         return context
 
+    def get_messages_after(self, after_id: int, limit: Optional[int] = None) -> list[dict]:
+        """
+        Get messages newer than a known MessageLog id, oldest first.
+
+        Used by the incremental prompt builder to fetch only what arrived since
+        its last build. Content is always plain text; images are loaded
+        separately with get_image_part() when the caller decides to include them.
+        The message with id == after_id is included (if it still exists) so the
+        caller can detect a cleared log.
+        """
+        limit = limit or self.rolling_window
+
+        messages = MessageLog.query.filter(
+            MessageLog.group_id == self.group_id,
+            MessageLog.id >= after_id
+        ).order_by(
+            MessageLog.id.desc()
+        ).limit(limit + 1).all()
+
+        return [self._to_context_dict(msg, msg.content) for msg in reversed(messages)]
+
+    def get_image_part(self, msg) -> Optional[dict]:
+        """
+        Build an API image content part for a message, compressed for API limits.
+
+        The part carries the raw bytes (a "bytes" source); shared_utils
+        base64-encodes them once, when the request body is built.
+
+        Args:
+            msg: MessageLog row, or a context dict with 'id' and 'signal_timestamp'
+
+        Returns:
+            Anthropic-style image dict, or None if no image data is stored
+        """
+        from signal_bot.models import ChatLog  # Import here to avoid circular
+        from signal_bot.image_compression import compress_image_bytes
+
+        # Only the image columns are loaded (they're deferred on the models)
+        message_id = msg["id"] if isinstance(msg, dict) else msg.id
+        row = db.session.query(
+            MessageLog.image_bytes, MessageLog.image_data, MessageLog.image_media_type, MessageLog.signal_timestamp
+        ).filter(MessageLog.id == message_id).first()
+        if not row:
+            return None
+
+        image_bytes, media_type = None, None
+
+        # Priority 1: Check MessageLog directly (fallback storage when chat_log disabled)
+        if row.image_media_type:
+            image_bytes, media_type = self._stored_image(row), row.image_media_type
+
+        # Priority 2: Look up from ChatLog (primary storage when chat_log enabled)
+        if not image_bytes and row.signal_timestamp:
+            chat_log = db.session.query(
+                ChatLog.image_bytes, ChatLog.image_data, ChatLog.image_media_type
+            ).filter(ChatLog.signal_timestamp == row.signal_timestamp).first()
+            if chat_log and chat_log.image_media_type:
+                image_bytes, media_type = self._stored_image(chat_log), chat_log.image_media_type
+
+        if not image_bytes:
+            return None
+
+        # Compress if needed to stay under API limits
+        compressed, final_media_type = compress_image_bytes(image_bytes, media_type)
+        return {
+            "type": "image",
+            "source": {
+                "type": "bytes",
+                "media_type": final_media_type,
+                "data": memoryview(compressed)
+            }
+        }
+
+    @staticmethod
+    def _stored_image(row) -> Optional[bytes]:
+        """Raw image bytes from a row's image columns (decoding rows stored as base64 before the migration)."""
+        if row.image_bytes:
+            return row.image_bytes
+        return base64.b64decode(row.image_data) if row.image_data else None
+
+    @staticmethod
+    def _to_context_dict(msg: MessageLog, content) -> dict:
+        """Convert a MessageLog row into the context dict format."""
+        return {
+            "id": msg.id,
+            "role": "assistant" if msg.is_bot else "user",
+            "content": content,
+            "name": msg.sender_name,
+            "timestamp": msg.timestamp.isoformat() if msg.timestamp else None,
+            "sender_id": msg.sender_id,
+            "signal_timestamp": msg.signal_timestamp,
+            "has_image": bool(msg.has_image)
+        }
+
     def get_formatted_context(self, limit: Optional[int] = None) -> str:
         """Get context as a formatted string for the AI."""
         messages = self.get_context_messages(limit)
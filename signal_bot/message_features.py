@@ -0,0 +1,110 @@
+"""
+One-pass analysis of an incoming message for keyword-driven decisions.
+
+Tool routing, location relevance and real-time memory triggers all look for
+keywords or patterns in the same message. ``analyze_message`` lowercases the
+text once, runs one Aho-Corasick pass over every keyword set and the memory
+trigger patterns over the lowercased text, and returns a ``MessageFeatures``
+that the handler passes along instead of the raw text being re-scanned per
+check.
+
+Everything this module imports is free of app dependencies (the keyword
+lists live in message_keywords), so tool_schemas.routing can use it without
+Flask or the database.
+"""
+
+import threading
+from dataclasses import dataclass
+from typing import Optional
+
+from signal_bot.keyword_matcher import KeywordMatcher, PatternMatcher
+from signal_bot.message_keywords import (
+    REMEMBER_TRIGGERS,
+    LOCATION_KEYWORDS,
+    LOCATION_CUE_KEYWORDS,
+    COLLECTIVE_KEYWORDS,
+)
+
+
+@dataclass(frozen=True)
+class MessageFeatures:
+    """Keyword and pattern hits for one message."""
+    text: str
+    lower: str
+    keyword_groups: frozenset  # Keyword groups with at least one hit (see _build_keyword_groups)
+    has_ticker: bool  # routing.TICKER_PATTERN matched (case-sensitive)
+    memory_trigger: Optional[str]  # First matching REMEMBER_TRIGGERS category
+
+    def has(self, *groups: str) -> bool:
+        """Whether any of the named keyword groups matched."""
+        return any(group in self.keyword_groups for group in groups)
+
+
+_keyword_matcher: Optional[KeywordMatcher] = None
+_trigger_matcher: Optional[PatternMatcher] = None
+_build_lock = threading.Lock()
+
+
+def _build_keyword_groups() -> dict[str, set]:
+    """
+    Every keyword set checked per message, under one group name each:
+
+    - "high:<domain>" / "medium:<domain>": routing confidence keywords
+    - "finance_strong", "sheets_strong", "dnd_context": routing signals
+    - "location", "location_cue", "collective": member memory location relevance
+    """
+    from tool_schemas.routing import (
+        HIGH_CONFIDENCE_KEYWORDS,
+        MEDIUM_CONFIDENCE_KEYWORDS,
+        FINANCE_STRONG_SIGNALS,
+        SHEETS_STRONG_SIGNALS,
+        DND_CONTEXT_SIGNALS,
+    )
+
+    groups = {f"high:{domain}": keywords for domain, keywords in HIGH_CONFIDENCE_KEYWORDS.items()}
+    groups.update({f"medium:{domain}": keywords for domain, keywords in MEDIUM_CONFIDENCE_KEYWORDS.items()})
+    groups["finance_strong"] = FINANCE_STRONG_SIGNALS
+    groups["sheets_strong"] = SHEETS_STRONG_SIGNALS
+    groups["dnd_context"] = DND_CONTEXT_SIGNALS
+    groups["location"] = LOCATION_KEYWORDS
+    groups["location_cue"] = LOCATION_CUE_KEYWORDS
+    groups["collective"] = COLLECTIVE_KEYWORDS
+    return groups
+
+
+def _get_matchers() -> tuple[KeywordMatcher, PatternMatcher]:
+    """Build the shared matchers on first use (the routing keywords live in a module that imports this one)."""
+    global _keyword_matcher, _trigger_matcher
+    if _keyword_matcher is None:
+        with _build_lock:
+            if _keyword_matcher is None:
+                # Patterns are lowercase and run on the lowercased text
+                _trigger_matcher = PatternMatcher(REMEMBER_TRIGGERS)
+                _keyword_matcher = KeywordMatcher(_build_keyword_groups())
+    return _keyword_matcher, _trigger_matcher
+
+
+def get_keyword_matcher() -> KeywordMatcher:
+    """The matcher for every routing and memory keyword group (expects lowercased text)."""
+    return _get_matchers()[0]
+
+
+def get_trigger_matcher() -> PatternMatcher:
+    """The matcher for message_keywords.REMEMBER_TRIGGERS (expects lowercased text)."""
+    return _get_matchers()[1]
+
+
+def analyze_message(text: Optional[str]) -> MessageFeatures:
+    """Scan a message once for all routing and memory keywords and triggers."""
+    from tool_schemas.routing import TICKER_PATTERN
+
+    text = text or ""
+    keyword_matcher, trigger_matcher = _get_matchers()
+    lower = text.lower()
+    return MessageFeatures(
+        text=text,
+        lower=lower,
+        keyword_groups=frozenset(keyword_matcher.match_groups(lower)),
+        has_ticker=bool(TICKER_PATTERN.search(text)),
+        memory_trigger=trigger_matcher.first_group(lower),
+    )
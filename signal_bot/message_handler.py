@@ -3,6 +3,9 @@
 import asyncio
 import logging
 import sys
+import time
+from collections import deque
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Optional, Callable
 
@@ -13,14 +16,42 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from signal_bot.models import db, Bot, MessageLog, ActivityLog, ChatLog
 from signal_bot.memory_manager import MemoryManager, get_memory_manager
-from signal_bot.trigger_logic import should_bot_respond, get_response_delay
+from signal_bot.prompt_builder import ConversationPromptBuilder
+from signal_bot.trigger_logic import ADDRESSED_REASONS, should_bot_respond, get_response_delay
+from signal_bot.db_session import db_session, set_flask_app as set_db_session_flask_app
+from signal_bot.streaming import SignalStreamer
+from signal_bot.group_ingest import get_group_ingest
+from signal_bot.response_arbiter import get_response_arbiter
+from signal_bot.model_tiers import TIER_MAIN, select_model_tier, model_for_tier
+from signal_bot.media_jobs import get_media_jobs
+from signal_bot.message_features import MessageFeatures, analyze_message
+from signal_bot.token_budget import estimate_tokens, estimate_tools_tokens, get_context_token_budget
+from signal_bot.cancellation import CancelToken
+from signal_bot.config_signal import (
+    IMAGE_TOKEN_ESTIMATE,
+    REALTIME_MEMORY_CONFIRM_WAIT_SECONDS,
+    RESPONSE_ARBITRATION_ENABLED,
+    BURST_COALESCING_ENABLED,
+    BURST_MIN_WINDOW_SECONDS,
+    BURST_MAX_WINDOW_SECONDS,
+    BURST_MAX_GAP_SECONDS,
+    BURST_GAP_SAMPLES,
+    BURST_STATE_TTL_SECONDS,
+    HEDGE_PERCENTILE,
+    HEDGE_MIN_SAMPLES,
+    HEDGE_DEFAULT_DELAY_SECONDS,
+    HEDGE_MIN_DELAY_SECONDS,
+    HEDGE_FALLBACK_MODELS,
+    MEDIA_VIDEO_COMMANDS_ENABLED,
+)
+from signal_bot import metrics
 from signal_bot.member_memory_scanner import (
     format_member_memories_for_context,
     set_flask_app as set_scanner_flask_app
 )
 from signal_bot.realtime_memory import (
+    PendingMemory,
     check_and_save_realtime_memory,
-    format_memory_confirmation_instruction,
     set_flask_app as set_realtime_flask_app
 )
 
@@ -34,17 +65,84 @@ def set_flask_app(app: Flask):
     """Set the Flask app for database context."""
     global _flask_app
     _flask_app = app
+    # Short-lived DB units of work on the message path
+    set_db_session_flask_app(app)
     # Also set for realtime memory module
     set_realtime_flask_app(app)
     # Also set for member memory scanner module
     set_scanner_flask_app(app)
 
 
+@dataclass
+class PendingResponse:
+    """A bot's unsent response in a group, and the burst of messages it answers."""
+    task: asyncio.Task
+    streamer: Optional[SignalStreamer]
+    sender_id: str
+    reason: str
+    cancel_token: CancelToken
+    texts: list[str] = field(default_factory=list)
+    pending_memory: Optional[PendingMemory] = None
+
+    @property
+    def open(self) -> bool:
+        """Whether a newer message can still replace it (nothing sent, no side-effecting tool run)."""
+        return (not self.task.done()
+                and not (self.streamer and self.streamer.committed)
+                and not self.cancel_token.committed)
+
+
 class MessageHandler:
     """Handles incoming messages and generates AI responses."""
 
     def __init__(self):
         self.memory_managers: dict[str, MemoryManager] = {}
+        self.prompt_builders: dict[tuple[str, str], ConversationPromptBuilder] = {}
+        # In-flight response per (bot_id, group_id)
+        self._pending_responses: dict[tuple[str, str], PendingResponse] = {}
+        # Per (bot_id, group_id, sender_id): last message time and recent gaps within a burst
+        self._last_message_at: dict[tuple[str, str, str], float] = {}
+        self._burst_gaps: dict[tuple[str, str, str], deque] = {}
+        self._burst_pruned_at = 0.0
+        # Fire-and-forget tasks (memory extraction, follow-ups), referenced until done
+        self._background_tasks: set[asyncio.Task] = set()
+
+    def _spawn(self, coro) -> asyncio.Task:
+        """Run a coroutine as a background task that outlives the message handling."""
+        task = asyncio.create_task(coro)
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+        return task
+
+    def _burst_window(self, bot_id: str, group_id: str, sender_id: str, received_at: float) -> float:
+        """Seconds to wait for follow-up messages from this sender before generating.
+
+        Only a message that continues a burst (the sender's previous one was at
+        most BURST_MAX_GAP_SECONDS ago) waits, for the median gap between their
+        recent back-to-back messages within [BURST_MIN_WINDOW_SECONDS,
+        BURST_MAX_WINDOW_SECONDS]. Any other message generates at once; a
+        follow-up still supersedes it until something is sent.
+        """
+        self._prune_burst_state(received_at)
+        key = (bot_id, group_id, sender_id)
+        last = self._last_message_at.get(key)
+        self._last_message_at[key] = received_at
+        if last is None or received_at - last > BURST_MAX_GAP_SECONDS:
+            return 0.0
+        gaps = self._burst_gaps.setdefault(key, deque(maxlen=BURST_GAP_SAMPLES))
+        gaps.append(received_at - last)
+        typical = sorted(gaps)[len(gaps) // 2]
+        return min(BURST_MAX_WINDOW_SECONDS, max(BURST_MIN_WINDOW_SECONDS, typical * 1.2))
+
+    def _prune_burst_state(self, now: float):
+        """Drop burst timing for senders quiet for BURST_STATE_TTL_SECONDS (checked once a minute)."""
+        if now - self._burst_pruned_at < 60:
+            return
+        self._burst_pruned_at = now
+        stale = [key for key, at in self._last_message_at.items() if now - at > BURST_STATE_TTL_SECONDS]
+        for key in stale:
+            del self._last_message_at[key]
+            self._burst_gaps.pop(key, None)
 
     def get_memory_manager(self, group_id: str) -> MemoryManager:
         """Get or create memory manager for a group."""
@@ -52,6 +150,20 @@ class MessageHandler:
             self.memory_managers[group_id] = get_memory_manager(group_id)
         return self.memory_managers[group_id]
 
+    def get_prompt_builder(self, bot_data: dict, group_id: str) -> ConversationPromptBuilder:
+        """Get or create the incremental prompt builder for a bot in a group."""
+        key = (bot_data['id'], group_id)
+        window = bot_data.get('context_window', 25)
+        reaction_enabled = bot_data.get('reaction_tool_enabled', False)
+
+        builder = self.prompt_builders.get(key)
+        if builder is None:
+            builder = ConversationPromptBuilder(self.get_memory_manager(group_id), window, reaction_enabled)
+            self.prompt_builders[key] = builder
+        else:
+            builder.configure(window, reaction_enabled)
+        return builder
+
     async def handle_incoming_message(
         self,
         group_id: str,
@@ -67,7 +179,10 @@ class MessageHandler:
         send_typing_callback: Optional[Callable] = None,
         stop_typing_callback: Optional[Callable] = None,
         incoming_images: Optional[list[dict]] = None,
-        send_reaction_callback: Optional[Callable[[str, int, str], None]] = None
+        send_reaction_callback: Optional[Callable[[str, int, str], None]] = None,
+        stream_send_callback: Optional[Callable] = None,
+        stream_edit_callback: Optional[Callable] = None,
+        on_ingested: Optional[Callable[[], None]] = None
     ) -> Optional[str]:
         """
         Handle an incoming message and potentially generate a response.
@@ -85,66 +200,88 @@ class MessageHandler:
             message_timestamp: Signal timestamp of the triggering message (for quotes/replies)
             send_typing_callback: Function to start typing indicator
             stop_typing_callback: Function to stop typing indicator
-            incoming_images: List of base64-encoded images from the message
+            incoming_images: List of images from the message ({"media_type", "data": raw bytes})
             send_reaction_callback: Function to send emoji reactions (sender_id, timestamp, emoji)
+            stream_send_callback: Async (text, text_styles, quote_timestamp, quote_author) -> (sent, timestamp), for streaming
+            stream_edit_callback: Async (timestamp, text, text_styles) -> success, for streaming
+            on_ingested: Called once the message is logged and the respond decision is made
+                (the caller may then start processing the next message)
 
         Returns:
             The response text if one was generated, None otherwise
         """
+        received_at = time.monotonic()
         memory = self.get_memory_manager(group_id)
+        features = analyze_message(message_text)  # Keyword/trigger scan shared by all checks below
+        debounce = self._burst_window(bot_data['id'], group_id, sender_id, received_at) \
+            if BURST_COALESCING_ENABLED else 0.0
 
         # Extract first image for storage (limit to one image per message for DB size)
-        image_data = None
+        image_bytes = None
         image_media_type = None
         if incoming_images and len(incoming_images) > 0:
-            image_data = incoming_images[0].get("data")
+            image_bytes = incoming_images[0].get("data")
             image_media_type = incoming_images[0].get("media_type")
 
         # Decide where to store image data based on chat_log setting
         chat_log_enabled = bot_data.get('chat_log_enabled', False)
 
+        # Logging and memory extraction are shared by every bot in the group that
+        # receives this message; only the first one to get here does the work
+        ingest = get_group_ingest()
+        ingest_key = (group_id, message_timestamp)
+
         # Log incoming message (with Signal timestamp for deduplication)
         # Only include image data in MessageLog if chat_log is DISABLED (fallback storage)
-        memory.add_message(
-            sender_name=sender_name,
-            content=message_text or "[Image]",
-            is_bot=False,
-            sender_id=sender_id,
-            has_image=bool(incoming_images),
-            signal_timestamp=message_timestamp,
-            image_data=image_data if not chat_log_enabled else None,
-            image_media_type=image_media_type if not chat_log_enabled else None
-        )
+        async def log_message():
+            with db_session():
+                memory.add_message(
+                    sender_name=sender_name,
+                    content=message_text or "[Image]",
+                    is_bot=False,
+                    sender_id=sender_id,
+                    has_image=bool(incoming_images),
+                    signal_timestamp=message_timestamp,
+                    image_bytes=image_bytes if not chat_log_enabled else None,
+                    image_media_type=image_media_type if not chat_log_enabled else None
+                )
+
+        await ingest.once(ingest_key, "message_log", log_message, bot_data['id'])
 
         # Also save to permanent chat log for search (if enabled for this bot)
         # This is primary image storage when chat_log is enabled
         if chat_log_enabled:
-            self._save_to_chat_log(
-                group_id=group_id,
-                sender_name=sender_name,
-                content=message_text or "[Image]",
-                sender_id=sender_id,
-                is_bot=False,
-                signal_timestamp=message_timestamp,
-                image_data=image_data,
-                image_media_type=image_media_type
-            )
+            async def log_chat():
+                self._save_to_chat_log(
+                    group_id=group_id,
+                    sender_name=sender_name,
+                    content=message_text or "[Image]",
+                    sender_id=sender_id,
+                    is_bot=False,
+                    signal_timestamp=message_timestamp,
+                    image_bytes=image_bytes,
+                    image_media_type=image_media_type
+                )
 
-        # Check for real-time memory save (e.g., "remember I prefer...")
-        memory_result = await check_and_save_realtime_memory(
-            message_text=message_text,
-            sender_name=sender_name,
-            sender_id=sender_id,
-            group_id=group_id,
-            bot_data=bot_data
-        )
+            await ingest.once(ingest_key, "chat_log", log_chat, bot_data['id'])
+
+        # Real-time memory save (e.g., "remember I prefer...") runs alongside the response
+        pending_memory = None
+        if features.memory_trigger:
+            async def start_memory():
+                return PendingMemory(
+                    self._spawn(check_and_save_realtime_memory(
+                        message_text=message_text,
+                        sender_name=sender_name,
+                        sender_id=sender_id,
+                        group_id=group_id,
+                        bot_data=bot_data,
+                        features=features
+                    )),
+                    sender_name
+                )
 
-        memory_confirmation = None
-        if memory_result and memory_result.get('saved'):
-            memory_confirmation = format_memory_confirmation_instruction(
-                memory_result,
-                sender_name
-            )
+            pending_memory = await ingest.once(ingest_key, "realtime_memory", start_memory, bot_data['id'])
 
         # Check if bot should respond
         # If natively @mentioned in Signal, always respond
@@ -162,84 +299,161 @@ class MessageHandler:
                 sender_name=sender_name
             )
 
+        if on_ingested:
+            on_ingested()
+
+        # Other bots in the group may want to answer too; only the selected ones generate
+        if should_respond and RESPONSE_ARBITRATION_ENABLED and not await get_response_arbiter().admit(
+            group_id, message_timestamp, bot_data['id'], reason,
+            weight=bot_data.get('random_chance_percent') or 1
+        ):
+            should_respond, reason = False, "arbitrated_away"
+
+        # A follow-up while this bot's reply to the same sender is still unsent joins
+        # that burst: one response to all of it, even if this message alone wouldn't trigger
+        response_key = (bot_data['id'], group_id)
+        burst_texts = [message_text] if message_text else []
+        pending = self._pending_responses.get(response_key)
+        if BURST_COALESCING_ENABLED and pending and pending.open and pending.sender_id == sender_id:
+            if not should_respond or (pending.reason in ADDRESSED_REASONS and reason not in ADDRESSED_REASONS):
+                should_respond, reason = True, pending.reason
+            burst_texts = pending.texts + burst_texts
+            # A memory save started by an earlier message is confirmed by this response;
+            # only one fits, so an earlier one next to a new one gets the usual follow-up
+            if pending.pending_memory is not None:
+                if pending_memory is None:
+                    pending_memory = pending.pending_memory
+                else:
+                    self._spawn(self._acknowledge_memory(pending.pending_memory, bot_data, memory, send_callback))
+            metrics.increment(bot_data['id'], "bursts_coalesced")
+
         if not should_respond:
             logger.info(f"Bot {bot_data['name']} not responding: {reason}")
             return None
 
         logger.info(f"Bot {bot_data['name']} responding (reason: {reason})")
 
+        # A newer message supersedes a response that hasn't been sent yet
+        self._supersede_pending_response(response_key)
+
+        # The earlier messages are already in the history; tool routing and memory
+        # relevance look at the whole burst ("what's the weather" ... "in denver")
+        if len(burst_texts) > 1:
+            features = analyze_message("\n".join(burst_texts))
+
         # Start typing indicator if enabled
         typing_enabled = bot_data.get('typing_enabled', True)
         if typing_enabled and send_typing_callback:
             send_typing_callback()
 
-        # Add delay for natural feel
-        delay = get_response_delay(bot_data, reason)
-        await asyncio.sleep(delay)
+        # Delay for natural feel, counted from arrival: a floor on send time, not extra latency
+        send_not_before = received_at + get_response_delay(bot_data, reason)
+
+        # Someone is waiting on a reply (mention, reply, or direct command)
+        addressed = is_mentioned or is_reply_to_bot or reason in ADDRESSED_REASONS
+
+        # Determine if we should quote/reply to the original message
+        # - Always quote if triggered by mention, reply, or direct command
+        # - For random responses, use the random_chance_percent
+        should_quote = False
+        if message_timestamp and sender_id:
+            if addressed:
+                should_quote = True
+            elif reason == "random":
+                import random
+                # Use half the random_chance_percent as quote probability for random responses
+                quote_chance = bot_data.get('random_chance_percent', 15) / 2
+                should_quote = random.random() * 100 < quote_chance
+        quote_timestamp = message_timestamp if should_quote else None
+        quote_author = sender_id if should_quote else None
+
+        def record_first_visible():
+            metrics.record_latency(bot_data['id'], "time_to_first_text", time.monotonic() - received_at)
+
+        # Stream the response as it's generated (first sentence, then edits)
+        streamer = None
+        if bot_data.get('streaming_enabled', False) and stream_send_callback and stream_edit_callback:
+            streamer = SignalStreamer(
+                loop=asyncio.get_running_loop(),
+                send_first=lambda text, styles: stream_send_callback(text, styles, quote_timestamp, quote_author),
+                edit=stream_edit_callback,
+                render=lambda text: self._render_response(text, bot_data)[:2],
+                on_first_visible=record_first_visible,
+                not_before=send_not_before
+            )
 
-        # Generate response
-        response = await self._generate_response(
+        # Generate at once, or mid-burst once the sender pauses (a follow-up supersedes
+        # this task); the delay for natural feel is only a floor on send time
+        cancel_token = CancelToken()
+        generation = asyncio.create_task(self._generate_with_floor(
+            send_not_before,
+            debounce=debounce,
             bot_data=bot_data,
             memory=memory,
             trigger_message=message_text,
+            message_features=features,
             group_id=group_id,
             sender_name=sender_name,
             sender_id=sender_id,
-            memory_confirmation=memory_confirmation,
+            pending_memory=pending_memory,
             send_image_callback=send_image_callback,
             incoming_images=incoming_images,
             send_reaction_callback=send_reaction_callback,
-            message_timestamp=message_timestamp
+            message_timestamp=message_timestamp,
+            streamer=streamer,
+            latency_critical=addressed,
+            model_tier=select_model_tier(bot_data, reason, message_text, features, bool(incoming_images)),
+            cancel_token=cancel_token
+        ))
+        self._pending_responses[response_key] = PendingResponse(
+            generation, streamer, sender_id, reason, cancel_token, burst_texts, pending_memory
         )
+        try:
+            await asyncio.wait({generation})
+        except asyncio.CancelledError:
+            generation.cancel()
+            raise
+        finally:
+            current = self._pending_responses.get(response_key)
+            if current is not None and current.task is generation:
+                del self._pending_responses[response_key]
 
         # Stop typing indicator
         if typing_enabled and stop_typing_callback:
             stop_typing_callback()
 
+        if generation.cancelled():
+            logger.info(f"Bot {bot_data['name']} response superseded by a newer message")
+            return None
+        response = generation.result()
+
         if response:
-            # Parse for commands
-            cleaned_response, commands = self._parse_commands(response)
-
-            # Parse text for styling (markdown-like -> Signal styles)
-            styled_text, text_styles = self._parse_text_styles(cleaned_response)
-
-            # Strip bot name prefix if AI included it (e.g., "AI-Labo: Hello" -> "Hello")
-            bot_name = bot_data.get('name', '')
-            if bot_name and styled_text.startswith(f"{bot_name}: "):
-                styled_text = styled_text[len(f"{bot_name}: "):]
-            elif bot_name and styled_text.startswith(f"{bot_name}:"):
-                styled_text = styled_text[len(f"{bot_name}:"):]
-
-            # Determine if we should quote/reply to the original message
-            # - Always quote if triggered by mention, reply, or direct command
-            # - For random responses, use the random_chance_percent
-            should_quote = False
-            if message_timestamp and sender_id:
-                if is_mentioned or is_reply_to_bot or reason in ("native_mention", "reply_to_bot", "mention", "command"):
-                    should_quote = True
-                elif reason == "random":
-                    import random
-                    # Use half the random_chance_percent as quote probability for random responses
-                    quote_chance = bot_data.get('random_chance_percent', 15) / 2
-                    should_quote = random.random() * 100 < quote_chance
-
-            # Send the text response with optional quote and styling
+            styled_text, text_styles, commands = self._render_response(response, bot_data)
+
+            # Finish the streamed message, or send the text response with optional quote and styling
+            streamed = streamer is not None and await streamer.finish(styled_text, text_styles)
+            if streamed:
+                metrics.increment(bot_data['id'], "responses_streamed")
+
             if styled_text.strip():
-                send_callback(
-                    styled_text,
-                    message_timestamp if should_quote else None,
-                    sender_id if should_quote else None,
-                    None,  # mentions - could be enhanced later
-                    text_styles if text_styles else None
-                )
+                if not streamed:
+                    send_callback(
+                        styled_text,
+                        quote_timestamp,
+                        quote_author,
+                        None,  # mentions - could be enhanced later
+                        text_styles if text_styles else None
+                    )
+                    record_first_visible()
 
                 # Log bot's response
-                memory.add_message(
-                    sender_name=bot_data['name'],
-                    content=styled_text,
-                    is_bot=True,
-                    bot_id=bot_data['id']
-                )
+                with db_session():
+                    memory.add_message(
+                        sender_name=bot_data['name'],
+                        content=styled_text,
+                        is_bot=True,
+                        bot_id=bot_data['id']
+                    )
 
                 # Also save bot response to permanent chat log
                 if bot_data.get('chat_log_enabled', False):
@@ -259,6 +473,12 @@ class MessageHandler:
                     f"{bot_data['name']} replied in group"
                 )
 
+                # A memory saved too late to confirm in the reply gets a short follow-up
+                if pending_memory is not None:
+                    pending_memory.mark_delivered(bot_data['id'])
+                    if not pending_memory.confirmed:
+                        self._spawn(self._acknowledge_memory(pending_memory, bot_data, memory, send_callback))
+
             # Handle commands (like !image)
             if commands and send_image_callback:
                 await self._execute_commands(
@@ -267,8 +487,68 @@ class MessageHandler:
 
             return styled_text
 
+        if streamer is not None:
+            await streamer.finish("", None)
+
         return None
 
+    async def _acknowledge_memory(self, pending_memory: PendingMemory, bot_data: dict,
+                                  memory: MemoryManager, send_callback: Callable):
+        """Send a short acknowledgement once a memory the response didn't confirm is saved."""
+        text = await pending_memory.acknowledgement()
+        if not text:
+            return
+        send_callback(text, None, None, None, None)
+        with db_session():
+            memory.add_message(
+                sender_name=bot_data['name'],
+                content=text,
+                is_bot=True,
+                bot_id=bot_data['id']
+            )
+        metrics.increment(bot_data['id'], "memory_followups_sent")
+
+    def _supersede_pending_response(self, key: tuple[str, str]):
+        """Cancel this bot's unsent response in the group, if any."""
+        pending = self._pending_responses.get(key)
+        if not pending or not pending.open:
+            return
+        # The worker thread sees the token: no further tool rounds, and no side-effecting
+        # tools. Refused if one already started; that response then goes out as is
+        if not pending.cancel_token.cancel():
+            return
+        if pending.streamer:
+            pending.streamer.cancel()
+        pending.task.cancel()
+        metrics.increment(key[0], "responses_superseded")
+
+    async def _generate_with_floor(self, not_before: float, debounce: float = 0.0, **kwargs) -> Optional[str]:
+        """Wait debounce seconds, generate a response, then wait until not_before (monotonic) if faster."""
+        if debounce > 0:
+            await asyncio.sleep(debounce)
+        response = await self._generate_response(**kwargs)
+        remaining = not_before - time.monotonic()
+        if remaining > 0:
+            await asyncio.sleep(remaining)
+        return response
+
+    def _render_response(self, response: str, bot_data: dict) -> tuple[str, list[dict], list[dict]]:
+        """Turn raw model text into (display_text, text_styles, commands)."""
+        # Parse for commands
+        cleaned_response, commands = self._parse_commands(response)
+
+        # Parse text for styling (markdown-like -> Signal styles)
+        styled_text, text_styles = self._parse_text_styles(cleaned_response)
+
+        # Strip bot name prefix if AI included it (e.g., "AI-Labo: Hello" -> "Hello")
+        bot_name = bot_data.get('name', '')
+        if bot_name and styled_text.startswith(f"{bot_name}: "):
+            styled_text = styled_text[len(f"{bot_name}: "):]
+        elif bot_name and styled_text.startswith(f"{bot_name}:"):
+            styled_text = styled_text[len(f"{bot_name}:"):]
+
+        return styled_text, text_styles, commands
+
     async def _generate_response(
         self,
         bot_data: dict,
@@ -281,126 +561,68 @@ class MessageHandler:
         send_image_callback: Optional[Callable[[str], None]] = None,
         incoming_images: Optional[list[dict]] = None,
         send_reaction_callback: Optional[Callable[[str, int, str], None]] = None,
-        message_timestamp: Optional[int] = None
+        message_timestamp: Optional[int] = None,
+        streamer: Optional[SignalStreamer] = None,
+        message_features: Optional[MessageFeatures] = None,
+        latency_critical: bool = False,
+        pending_memory: Optional[PendingMemory] = None,
+        model_tier: str = TIER_MAIN,
+        cancel_token: Optional[CancelToken] = None
     ) -> Optional[str]:
-        """Generate an AI response using the configured model."""
+        """Generate an AI response using the model for model_tier (see model_tiers).
+
+        The API call (including tool execution) runs in a worker thread so the
+        event loop stays free to deliver streamed text and other groups' messages.
+        Latency-critical responses (someone is waiting on the bot) are hedged if
+        the bot has hedging enabled. cancel_token stops the worker thread's tool
+        rounds when the response is superseded. A real-time memory save still in progress
+        (pending_memory) is confirmed in the response only if it finishes by the
+        time the prompt is ready.
+        """
         try:
             # Import shared_utils for API calls
             from shared_utils import call_openrouter_api
-            from config import AI_MODELS, OPENROUTER_TOOL_CALLING_ENABLED
-            from tool_schemas import get_tools_for_context, model_supports_tools, route_tools_for_message
+            from config import OPENROUTER_TOOL_CALLING_ENABLED, TOOL_USAGE_LOG_ENABLED
+            from tool_schemas import get_tools_for_context, model_supports_tools, route_tools_for_message, log_tool_usage
             from tool_executor import SignalToolExecutor
         except ImportError as e:
             logger.error(f"Failed to import shared_utils: {e}")
             return None
 
-        # Build context (use bot's context_window setting)
-        context_window = bot_data.get('context_window', 25)
-        context_messages = memory.get_context_messages(limit=context_window)
-
-        # DEBUG: Log context before filtering
-        logger.info(f"[DEBUG] Context retrieved: {len(context_messages)} messages, trigger: '{trigger_message[:50] if trigger_message else 'None'}...'")
-        if context_messages:
-            last_content = context_messages[-1].get('content', '')
-            logger.info(f"[DEBUG] Last context msg: '{last_content[:50]}...'")
-            logger.info(f"[DEBUG] Match check: last==trigger? {last_content == trigger_message}")
-
-        # Exclude the current message from context - it was already logged to DB
-        # but will be sent separately as the prompt (to avoid duplication)
-        if context_messages and context_messages[-1].get('content') == trigger_message:
-            logger.info(f"[DEBUG] Excluding last message from context (matches trigger)")
-            context_messages = context_messages[:-1]
-
-        # DEBUG: Log final context
-        logger.info(f"[DEBUG] Final context: {len(context_messages)} messages")
-
-        # Build system prompt
+        # Build system prompt. The bot's own prompt is kept byte-identical between calls so
+        # providers can cache it (together with the tool schemas); per-message context goes
+        # into a separate suffix after the cache breakpoint.
         system_prompt = bot_data.get('system_prompt') or self._get_default_system_prompt(bot_data['name'])
+        system_context = ""
 
-        # Inject member memories (locations, personal info) - now prioritized by speaker
-        member_memories = format_member_memories_for_context(
+        # Inject member memories (locations, personal info) - now prioritized by speaker.
+        # Off the event loop: ambiguous messages ask the location relevance LLM
+        member_memories = await asyncio.to_thread(
+            format_member_memories_for_context,
             group_id=group_id,
             current_speaker_name=sender_name,
             current_speaker_id=sender_id,
             message_content=trigger_message,
-            member_memory_model=bot_data.get('member_memory_model')
+            member_memory_model=bot_data.get('member_memory_model'),
+            message_features=message_features,
+            bot_id=bot_data['id']
         )
         if member_memories:
             logger.info(f"Injecting member memories for {sender_name}:\n{member_memories[:500]}...")
-            system_prompt += f"\n{member_memories}"
+            system_context += f"\n{member_memories}"
 
         # Inject memory confirmation instruction if a memory was just saved
         if memory_confirmation:
-            system_prompt += f"\n\n{memory_confirmation}"
+            system_context += f"\n\n{memory_confirmation}"
 
         # Get model ID
-        model_id = AI_MODELS.get(bot_data['model'], bot_data['model'])
+        model_id = model_for_tier(bot_data, model_tier)
+
+        hedge = self._hedge_policy(bot_data, model_id) if latency_critical else None
 
         # Check if reaction tool is enabled (needed for context formatting)
         reaction_enabled = bot_data.get('reaction_tool_enabled', False)
 
-        # Format conversation for API with message indices for reaction tool
-        formatted_messages = []
-        reaction_metadata = []  # Stores metadata for messages that can be reacted to
-
-        for idx, msg in enumerate(context_messages):
-            role = msg["role"]
-            raw_content = msg["content"]
-
-            # Handle structured content (list with text + image) vs plain text
-            if isinstance(raw_content, list):
-                # Structured content with image - modify text portion, keep image as-is
-                formatted_content = []
-                for item in raw_content:
-                    if item.get("type") == "text":
-                        # Add name/index prefix to text portion
-                        text = item["text"]
-                        if reaction_enabled:
-                            prefix = f"[{idx}] "
-                            name_prefix = f"{msg['name']}: " if role == "user" and msg.get("name") else ""
-                            text = f"{prefix}{name_prefix}{text}"
-                        else:
-                            if role == "user" and msg.get("name"):
-                                text = f"{msg['name']}: {text}"
-                        formatted_content.append({"type": "text", "text": text})
-                    else:
-                        # Keep image or other content types as-is
-                        formatted_content.append(item)
-                formatted_messages.append({"role": role, "content": formatted_content})
-            else:
-                # Plain text content - existing logic
-                if reaction_enabled:
-                    if role == "user" and msg.get("name"):
-                        content = f"[{idx}] {msg['name']}: {raw_content}"
-                    else:
-                        content = f"[{idx}] {raw_content}"
-                else:
-                    if role == "user" and msg.get("name"):
-                        content = f"{msg['name']}: {raw_content}"
-                    else:
-                        content = raw_content
-                formatted_messages.append({"role": role, "content": content})
-
-            # Build reaction metadata for user messages with valid Signal metadata
-            if role == "user" and msg.get("signal_timestamp") and msg.get("sender_id"):
-                reaction_metadata.append({
-                    "index": idx,
-                    "sender_id": msg["sender_id"],
-                    "signal_timestamp": msg["signal_timestamp"]
-                })
-
-        # DEBUG: Log ALL messages being sent to API
-        logger.info(f"[DEBUG] ===== CONTEXT DUMP ({len(formatted_messages)} messages) =====")
-        for i, msg in enumerate(formatted_messages):
-            content = msg.get('content')
-            if isinstance(content, list):
-                # Extract text preview from structured content
-                text_parts = [item.get('text', '')[:40] for item in content if item.get('type') == 'text']
-                has_image = any(item.get('type') == 'image' for item in content)
-                content_preview = f"{' '.join(text_parts)}{'[+IMG]' if has_image else ''}"
-            else:
-                content_preview = content[:60].replace('\n', ' ') if content else 'None'
-            logger.info(f"[DEBUG] [{i}] {msg['role']}: {content_preview}...")
         logger.info(f"[DEBUG] ===== RAW TRIGGER: {trigger_message[:60] if trigger_message else 'None'}... =====")
 
         try:
@@ -431,11 +653,49 @@ class MessageHandler:
             chat_log_enabled = bot_data.get('chat_log_enabled', False)
             # reaction_enabled already set above for context formatting
             any_tools_enabled = image_enabled or weather_enabled or finance_enabled or time_enabled or wikipedia_enabled or reaction_enabled or sheets_enabled or calendar_enabled or member_memory_tools_enabled or triggers_enabled or dnd_enabled or chat_log_enabled
+            tool_calling = (OPENROUTER_TOOL_CALLING_ENABLED and
+                            any_tools_enabled and
+                            model_supports_tools(model_id))
+
+            # First round tools: try fast-path routing based on message content
+            expanded_categories = {}  # Track expanded categories: {"finance": {"finance_quotes"}, "sheets": {"sheets_core"}}
+            fast_path_used = False
+            fast_path_domain = None
+            initial_tools = None
+            if tool_calling:
+                initial_tools, fast_path_used, fast_path_domain = route_tools_for_message(
+                    message=trigger_message,
+                    bot_data=bot_data,
+                    expanded_categories=expanded_categories,
+                    features=message_features
+                )
+                if fast_path_used:
+                    logger.info(f"Fast-path routed to '{fast_path_domain}' for {bot_data.get('name')}")
+
+            # Build context incrementally: up to context_window messages, limited to the
+            # token budget left after the system prompt, memories, tools and trigger
+            token_budget = get_context_token_budget(bot_data, model_id)
+            fixed_tokens = (
+                estimate_tokens(system_prompt)
+                + estimate_tokens(system_context)
+                + estimate_tools_tokens(initial_tools)
+                + estimate_tokens(trigger_message)
+                + IMAGE_TOKEN_ESTIMATE * len(incoming_images or [])
+            )
+            prompt = self.get_prompt_builder(bot_data, group_id).build(
+                trigger_message,
+                token_budget=max(0, token_budget - fixed_tokens)
+            )
+            logger.info(f"[DEBUG] Token budget {token_budget}: fixed ~{fixed_tokens}, history ~{prompt.tokens}")
+
+            # History is already formatted with message indices for the reaction tool
+            formatted_messages = prompt.messages
+            reaction_metadata = list(prompt.reaction_metadata)  # Copy: trigger is appended below
 
             # Build prompt - include images if present
             # Format trigger message with sender name to match context format
             # This ensures the AI knows who is asking (fixes member identity confusion)
-            next_idx = len(formatted_messages)
+            next_idx = prompt.trigger_index
             if reaction_enabled:
                 formatted_trigger = f"[{next_idx}] {sender_name}: {trigger_message}" if trigger_message else None
                 # Add trigger message to reaction metadata so AI can react to it
@@ -453,12 +713,13 @@ class MessageHandler:
                 prompt_text = formatted_trigger or f"{sender_name}: What do you see in this image?"
                 prompt_content = [{"type": "text", "text": prompt_text}]
                 for img in incoming_images:
+                    # Raw bytes, shared with the other bots' copies; base64-encoded in the request body
                     prompt_content.append({
                         "type": "image",
                         "source": {
-                            "type": "base64",
+                            "type": "bytes",
                             "media_type": img["media_type"],
-                            "data": img["data"]
+                            "data": memoryview(img["data"])
                         }
                     })
                 logger.info(f"Built structured prompt with {len(incoming_images)} image(s)")
@@ -467,117 +728,91 @@ class MessageHandler:
 
             logger.info(f"[DEBUG] ===== FORMATTED PROMPT: {formatted_trigger[:80] if formatted_trigger else 'None'}... =====")
 
-            # Two-phase meta-tool expansion loop with fast-path routing
-            expanded_categories = {}  # Track expanded categories: {"finance": {"finance_quotes"}, "sheets": {"sheets_core"}}
-            expansion_intents = []  # Track intents from meta-tool calls for context in retry
-            max_expansions = 5  # Allow multiple sheet categories + finance + retries
-            fast_path_used = False
-            fast_path_domain = None
+            # Meta-tools unlock their category in place, inside the running tool conversation
+            def context_tools():
+                """Standard tool set for the current expansion state."""
+                return get_tools_for_context(
+                    context="signal",
+                    image_enabled=image_enabled,
+                    weather_enabled=weather_enabled,
+                    finance_enabled=finance_enabled,
+                    time_enabled=time_enabled,
+                    wikipedia_enabled=wikipedia_enabled,
+                    reaction_enabled=reaction_enabled,
+                    sheets_enabled=sheets_enabled,
+                    calendar_enabled=calendar_enabled,
+                    member_memory_enabled=member_memory_tools_enabled,
+                    triggers_enabled=triggers_enabled,
+                    dnd_enabled=dnd_enabled,
+                    chat_log_enabled=chat_log_enabled,
+                    expanded_categories=expanded_categories
+                )
 
-            for expansion_iteration in range(max_expansions + 1):
-                if (OPENROUTER_TOOL_CALLING_ENABLED and
-                    any_tools_enabled and
-                    model_supports_tools(model_id)):
-
-                    # First iteration: try fast-path routing based on message content
-                    if expansion_iteration == 0:
-                        use_tools, fast_path_used, fast_path_domain = route_tools_for_message(
-                            message=trigger_message,
-                            bot_data=bot_data,
-                            expanded_categories=expanded_categories
-                        )
-                        if fast_path_used:
-                            logger.info(f"Fast-path routed to '{fast_path_domain}' for {bot_data.get('name')}")
-                    else:
-                        # Subsequent iterations: use standard expansion (fast-path wasn't used or meta-tool expansion triggered)
-                        use_tools = get_tools_for_context(
-                            context="signal",
-                            image_enabled=image_enabled,
-                            weather_enabled=weather_enabled,
-                            finance_enabled=finance_enabled,
-                            time_enabled=time_enabled,
-                            wikipedia_enabled=wikipedia_enabled,
-                            reaction_enabled=reaction_enabled,
-                            sheets_enabled=sheets_enabled,
-                            calendar_enabled=calendar_enabled,
-                            member_memory_enabled=member_memory_tools_enabled,
-                            triggers_enabled=triggers_enabled,
-                            dnd_enabled=dnd_enabled,
-                            chat_log_enabled=chat_log_enabled,
-                            expanded_categories=expanded_categories
-                        )
-
-                    signal_executor = SignalToolExecutor(
-                        bot_data=bot_data,
-                        group_id=group_id,
-                        send_image_callback=send_image_callback,
-                        send_reaction_callback=send_reaction_callback,
-                        reaction_metadata=reaction_metadata,
-                        max_reactions=bot_data.get('max_reactions_per_response', 3)
-                    )
-                    # Set sender name for sheet attribution
-                    signal_executor.sender_name = sender_name
-                    tool_executor = signal_executor.execute
-                    tools_list = [t['function']['name'] for t in use_tools]
-                    logger.info(f"Tool calling enabled for {bot_data.get('name')} (expansion {expansion_iteration}): {tools_list}")
-                else:
-                    use_tools = None
-                    tool_executor = None
-
-                # Build effective system prompt (include expansion context if retrying)
-                effective_system_prompt = system_prompt
-                if expansion_intents:
-                    intent_context = "\n\n[TOOL EXPANSION CONTEXT - You previously requested these tools and should now execute them:]\n"
-                    for intent_info in expansion_intents:
-                        intent_context += f"- Category '{intent_info['category']}' for intent: \"{intent_info['intent']}\"\n"
-                        intent_context += f"  Available tools: {', '.join(intent_info['tools'])}\n"
-                    intent_context += "\nPlease proceed with the actual tool calls to fulfill the user's request."
-                    effective_system_prompt += intent_context
-                    logger.info(f"Added expansion context to system prompt: {expansion_intents}")
-
-                # Call the AI API
-                response = call_openrouter_api(
-                    prompt=prompt_content,
-                    conversation_history=formatted_messages,
-                    model=model_id,
-                    system_prompt=effective_system_prompt,
-                    stream_callback=None,  # No streaming for Signal
-                    web_search=bot_data.get('web_search_enabled', False),
-                    tools=use_tools,
-                    tool_executor=tool_executor
+            def expand_in_place(expansion: dict, executor) -> list:
+                """Unlock a meta-tool's category inside the running tool conversation."""
+                for group, categories in executor.expanded_categories.items():
+                    expanded_categories.setdefault(group, set()).update(categories)
+                executor.expansion_requested = False  # Resolved in place, no retry needed
+                metrics.increment(bot_data['id'], "meta_tool_expansions_in_place")
+                logger.info(f"Meta-tool {expansion.get('category')} expanded in place, categories: {expanded_categories}")
+                return context_tools()
+
+            # Extraction ran while the prompt was built; give it a short grace period, then
+            # go ahead without it (the caller sends a follow-up acknowledgement instead)
+            if pending_memory is not None and not memory_confirmation:
+                confirmation = await pending_memory.confirmation_within(
+                    REALTIME_MEMORY_CONFIRM_WAIT_SECONDS, bot_data['id']
                 )
+                if confirmation:
+                    system_context += f"\n\n{confirmation}"
+                    metrics.increment(bot_data['id'], "memory_confirmations_inline")
 
-                # Check if meta-tool expansion was requested
-                if (signal_executor and
-                    signal_executor.expansion_requested and
-                    signal_executor.expanded_categories):
-                    # Merge newly expanded categories (union sets, don't overwrite)
-                    for group, categories in signal_executor.expanded_categories.items():
-                        if group not in expanded_categories:
-                            expanded_categories[group] = set()
-                        expanded_categories[group].update(categories)
-                    # Capture intent information for context in retry
-                    from tool_schemas import ALL_META_CATEGORIES
-                    for group, meta_tools in signal_executor.expanded_categories.items():
-                        for meta_tool in meta_tools:
-                            if meta_tool in ALL_META_CATEGORIES:
-                                expansion_intents.append({
-                                    "category": meta_tool,
-                                    "intent": signal_executor.last_meta_intent or "perform requested operation",
-                                    "tools": ALL_META_CATEGORIES[meta_tool]["sub_tools"]
-                                })
-                    logger.info(f"Meta-tool expansion triggered, expanded categories: {expanded_categories}, intents: {expansion_intents}")
-                    # Continue loop with expanded tools
-                    continue
+            metrics.increment(bot_data['id'], "responses_generated")
 
-                # No expansion needed, return response
-                return response
+            if tool_calling:
+                signal_executor = SignalToolExecutor(
+                    bot_data=bot_data,
+                    group_id=group_id,
+                    send_image_callback=send_image_callback,
+                    send_reaction_callback=send_reaction_callback,
+                    reaction_metadata=reaction_metadata,
+                    max_reactions=bot_data.get('max_reactions_per_response', 3),
+                    cancel_token=cancel_token
+                )
+                # Set sender name for sheet attribution
+                signal_executor.sender_name = sender_name
+                tool_executor = signal_executor.execute
+                expand_tools = lambda expansion: expand_in_place(expansion, signal_executor)
+                tools_list = [t['function']['name'] for t in initial_tools]
+                logger.info(f"Tool calling enabled for {bot_data.get('name')}: {tools_list}")
+            else:
+                signal_executor = None
+                tool_executor = None
+                expand_tools = None
+
+            # Call the AI API
+            response = await asyncio.to_thread(
+                call_openrouter_api,
+                prompt=prompt_content,
+                conversation_history=formatted_messages,
+                model=model_id,
+                system_prompt=system_prompt,
+                system_prompt_suffix=system_context,
+                stream_callback=streamer.on_chunk if streamer else None,
+                web_search=bot_data.get('web_search_enabled', False),
+                tools=initial_tools,
+                tool_executor=tool_executor,
+                expand_tools=expand_tools,
+                history_has_images=prompt.has_images,
+                usage_callback=lambda usage, seconds: metrics.record_llm_usage(
+                    bot_data['id'], usage, seconds, tier=model_tier),
+                hedge=hedge,
+                first_byte_callback=lambda seconds: metrics.record_latency(bot_data['id'], "llm_first_byte", seconds),
+                cancel_token=cancel_token
+            )
 
-            # Max iterations reached (shouldn't normally happen)
-            logger.warning(f"Max tool expansion iterations ({max_expansions}) reached")
-            # Don't return None (expansion signal) as a response - provide error message
-            if response is None:
-                return "I need more tool categories to complete this task. Please try a simpler request or break it into steps."
+            if signal_executor and TOOL_USAGE_LOG_ENABLED and response is not None:
+                log_tool_usage(trigger_message, signal_executor.tools_called, bot_id=bot_data['id'], routed=fast_path_domain)
             return response
 
         except Exception as e:
@@ -718,7 +953,7 @@ class MessageHandler:
         group_id: str,
         send_image_callback: Callable[[str], None]
     ):
-        """Execute parsed commands."""
+        """Execute parsed commands (media commands are queued and don't wait for the file)."""
         for cmd in commands:
             # Support both dict and AgentCommand dataclass
             action = cmd.action if hasattr(cmd, 'action') else cmd.get("action")
@@ -726,50 +961,86 @@ class MessageHandler:
 
             if action == "image" and bot_data.get('image_generation_enabled'):
                 prompt = params.get("prompt") if isinstance(params, dict) else params
-                await self._execute_image_command(
+                self._execute_image_command(
+                    prompt,
+                    bot_data,
+                    group_id,
+                    send_image_callback
+                )
+            elif action == "video" and bot_data.get('image_generation_enabled') and MEDIA_VIDEO_COMMANDS_ENABLED:
+                prompt = params.get("prompt") if isinstance(params, dict) else params
+                self._execute_video_command(
                     prompt,
                     bot_data,
                     group_id,
                     send_image_callback
                 )
 
-    async def _execute_image_command(
+    def _execute_image_command(
         self,
         prompt: str,
         bot_data: dict,
         group_id: str,
         send_image_callback: Callable[[str], None]
     ):
-        """Generate and send an image."""
-        try:
-            from shared_utils import generate_image_from_text
-        except ImportError:
-            logger.error("Cannot import generate_image_from_text")
+        """Queue an image; it is sent when ready, after the reply (see media_jobs)."""
+        if not prompt:
             return
-
         logger.info(f"Bot {bot_data['name']} generating image: {prompt[:50]}...")
 
-        try:
-            # Get image model from bot settings, fall back to default
-            image_model = bot_data.get('image_model') or "google/gemini-3-pro-image-preview"
-            result = generate_image_from_text(prompt, model=image_model)
-
-            if result and result.get("success"):
-                image_path = result.get("image_path")
-                if image_path:
-                    send_image_callback(image_path)
-
-                    self._log_activity(
-                        "image_generated",
-                        bot_data['id'],
-                        group_id,
-                        f"{bot_data['name']} generated image: {prompt[:30]}..."
-                    )
-            else:
-                logger.error(f"Image generation failed: {result}")
+        def deliver(image_path: str):
+            send_image_callback(image_path)
+            self._log_activity(
+                "image_generated",
+                bot_data['id'],
+                group_id,
+                f"{bot_data['name']} generated image: {prompt[:30]}..."
+            )
 
-        except Exception as e:
-            logger.error(f"Image generation error: {e}")
+        get_media_jobs().submit_image(bot_data, group_id, prompt, deliver)
+
+    def _execute_video_command(
+        self,
+        prompt: str,
+        bot_data: dict,
+        group_id: str,
+        send_image_callback: Callable[[str], None]
+    ):
+        """Queue a Sora video; the MP4 is sent as an attachment when the render finishes."""
+        if not prompt:
+            return
+        logger.info(f"Bot {bot_data['name']} generating video: {prompt[:50]}...")
+
+        def deliver(video_path: str):
+            send_image_callback(video_path)
+            self._log_activity(
+                "video_generated",
+                bot_data['id'],
+                group_id,
+                f"{bot_data['name']} generated video: {prompt[:30]}..."
+            )
+
+        get_media_jobs().submit_video(bot_data, group_id, prompt, deliver)
+
+    def _hedge_policy(self, bot_data: dict, model_id: str):
+        """Hedging policy for a latency-critical response, or None if the bot hasn't opted in.
+
+        The hedge delay is the bot's recent p95 time to first byte (HEDGE_PERCENTILE),
+        so roughly the slowest 5% of calls get a second request.
+        """
+        if not bot_data.get('hedging_enabled', False):
+            return None
+        from shared_utils import HedgePolicy
+
+        threshold = metrics.get_percentile(
+            bot_data['id'], "llm_first_byte", HEDGE_PERCENTILE, min_samples=HEDGE_MIN_SAMPLES
+        )
+        delay = max(HEDGE_MIN_DELAY_SECONDS, threshold) if threshold is not None else HEDGE_DEFAULT_DELAY_SECONDS
+        return HedgePolicy(
+            delay=delay,
+            fallback_model=HEDGE_FALLBACK_MODELS.get(model_id),
+            on_outcome=lambda outcome: metrics.record_hedge(bot_data['id'], outcome)
+        )
 
     def _get_default_system_prompt(self, bot_name: str) -> str:
         """Get a default system prompt for a bot."""
@@ -788,7 +1059,7 @@ Guidelines:
     def _log_activity(self, event_type: str, bot_id: str, group_id: str, description: str):
         """Log an activity event."""
         try:
-            with _flask_app.app_context():
+            with db_session():
                 log = ActivityLog(
                     event_type=event_type,
                     bot_id=bot_id,
@@ -809,7 +1080,7 @@ Guidelines:
         is_bot: bool = False,
         bot_id: str = None,
         signal_timestamp: int = None,
-        image_data: str = None,
+        image_bytes: bytes = None,
         image_media_type: str = None
     ):
         """
@@ -819,14 +1090,14 @@ Guidelines:
         Uses signal_timestamp for deduplication.
 
         Args:
-            image_data: Base64 encoded image data (primary storage when chat_log enabled)
+            image_bytes: Raw image bytes (primary storage when chat_log enabled)
             image_media_type: MIME type of the image, e.g., "image/jpeg"
         """
         if not content or not content.strip():
             return
 
         try:
-            with _flask_app.app_context():
+            with db_session():
                 # Check for duplicate using signal_timestamp
                 if signal_timestamp:
                     existing = ChatLog.query.filter_by(signal_timestamp=signal_timestamp).first()
@@ -842,7 +1113,7 @@ Guidelines:
                     is_bot=is_bot,
                     bot_id=bot_id,
                     signal_timestamp=signal_timestamp,
-                    image_data=image_data,
+                    image_bytes=image_bytes,
                     image_media_type=image_media_type
                 )
                 db.session.add(log_entry)
@@ -0,0 +1,108 @@
+"""
+Keyword lists and trigger patterns scanned once per message by message_features.
+
+Kept free of app dependencies (Flask, the database) so that tool routing
+(tool_schemas.routing) can analyse a message without importing the bot app.
+realtime_memory and member_memory_scanner re-export the names they use.
+"""
+
+# Trigger patterns by category - if any match, we attempt real-time extraction
+REMEMBER_TRIGGERS = {
+    # Explicit memory requests (highest priority)
+    "explicit": [
+        r"remember\s+(that\s+)?(i|my)\s+",           # "remember I prefer..."
+        r"don\'?t\s+forget\s+(that\s+)?(i|my)\s+",   # "don't forget I..."
+        r"keep\s+in\s+mind\s+(that\s+)?(i|my)?\s*",  # "keep in mind I work nights"
+        r"note\s+that\s+i\s+",                        # "note that I live in Denver"
+        r"fyi\s+i\s+",                                # "fyi I'll be traveling"
+        r"please\s+remember\s+",                      # "please remember..."
+        r"save\s+(this|that)\s+(to\s+)?memory",       # "save this to memory"
+        r"add\s+(this|that)\s+to\s+(your\s+)?memory", # "add this to your memory"
+    ],
+
+    # Response preference indicators
+    "response_prefs": [
+        r"(give\s+me|i\s+(want|like|prefer))\s+(shorter|longer|brief|detailed|succinct|concise)",
+        r"(stop|quit|don\'?t)\s+(being\s+so|with\s+the)\s+(verbose|wordy|lengthy)",
+        r"(be\s+)?(more|less)\s+(words|text|explanation|verbose|brief|detailed)",
+        r"be\s+(more\s+)?(brief|concise|succinct|direct|detailed|verbose)",
+        r"i\s+prefer\s+(short|long|brief|detailed|succinct|concise)\s+(responses?|answers?|replies?)",
+        r"respond\s+(to\s+me\s+)?(with|in)\s+(bullets?|lists?|paragraphs?)",
+        # Additional patterns for common phrasings
+        r"limit\s+(your\s+)?(responses?|replies?|answers?)\s+to",  # "limit responses to 1 sentence"
+        r"only\s+(speak|respond|reply|answer)\s+when\s+(prompted|mentioned|asked|tagged)",  # "only speak when prompted"
+        r"(keep|make)\s+(it|them|responses?)\s+(short|brief|concise)",  # "keep it short"
+        r"(shorter|briefer|less\s+wordy)\s*(please|thanks|thx)?$",  # "shorter please"
+        r"(one|1|two|2|three|3)\s+(sentence|word|line|paragraph)",  # "1 sentence responses"
+        r"don\'?t\s+(respond|reply|answer)\s+(unless|until)",  # "don't respond unless asked"
+        r"(no|stop)\s+(unsolicited|random|unprompted)\s+(responses?|replies?|comments?)",  # "no random responses"
+    ],
+
+    # Location indicators
+    "location": [
+        r"i\s+(live|am|reside)\s+in\s+",              # "I live in Denver"
+        r"i\'?m\s+(based|located)\s+(in|at)\s+",      # "I'm based in NYC"
+        r"i\'?m\s+(going|traveling|heading)\s+to\s+", # "I'm going to Miami"
+        r"i\'?ll\s+be\s+in\s+",                       # "I'll be in LA next week"
+        r"(back\s+)?home\s+(is|in)\s+",               # "home is in Texas"
+        r"i\s+moved\s+to\s+",                         # "I moved to Seattle"
+        r"flying\s+(out\s+)?to\s+",                   # "flying to NYC tomorrow"
+    ],
+
+    # Interest indicators
+    "interests": [
+        r"i\s+(really\s+)?(love|enjoy|like|am\s+into)\s+",
+        r"i\'?m\s+(really\s+)?(into|a\s+fan\s+of|obsessed\s+with)\s+",
+        r"my\s+favorite\s+\w+\s+is\s+",
+        r"i\'?m\s+(going\s+to|attending)\s+(the|a)\s+\w+\s+(concert|show|game|event)",
+    ],
+
+    # Life events
+    "life_events": [
+        r"(my|i\'?m\s+getting)\s+(wedding|married|engaged)",
+        r"my\s+birthday\s+is\s+",
+        r"i\'?m\s+(graduating|retiring|moving|having\s+a\s+baby)\s+",
+        r"(getting|got)\s+(married|engaged|divorced)",
+        r"my\s+anniversary\s+is\s+",
+    ],
+
+    # Work info
+    "work_info": [
+        r"i\s+work\s+(as|at|for)\s+",
+        r"i\'?m\s+a\s+\w+\s+(at|for|engineer|developer|manager|designer|doctor|lawyer|teacher)",
+        r"my\s+job\s+(is|involves)\s+",
+        r"i\s+just\s+(started|got|accepted)\s+a\s+(job|position|role)\s+",
+    ],
+}
+
+# Keywords that make location contextually relevant
+LOCATION_KEYWORDS = [
+    "weather", "temperature", "forecast", "rain", "snow", "hot", "cold",
+    "time", "timezone", "what time",
+    "local", "nearby", "around here", "in your area",
+    "visit", "travel", "trip", "vacation", "flying",
+    "where are you", "where do you live", "where does", "where is",
+    "where i live", "where they live", "live in", "lives in",
+    "location", "home", "hometown", "from",
+    "distance", "how far", "drive", "flight",
+    "restaurant", "food", "eat", "coffee", "bar",
+    "event", "concert", "game", "show",
+]
+
+# Weaker hints that location might matter; messages with one of these (or a
+# mid-sentence capitalised word, e.g. a place name) but no LOCATION_KEYWORDS hit
+# are escalated to the LLM when member_memory_model is set. Everything else is
+# decided locally.
+LOCATION_CUE_KEYWORDS = [
+    "where", "here", "there", "city", "town", "country", "state", "place", "area",
+    "near", "outside", "downtown", "abroad", "moving", "heading", "going to", "leaving",
+    "tonight", "tomorrow", "weekend", "next week",
+    "airport", "hotel", "beach", "park", "mountain", "commute", "traffic",
+    "sunny", "umbrella", "jacket", "storm", "wind",
+]
+
+# Keywords indicating request for ALL members' info
+COLLECTIVE_KEYWORDS = [
+    "everyone", "everybody", "all of us", "each of us", "the group",
+    "all members", "whole group", "all of you", "each person",
+]
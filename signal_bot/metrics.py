@@ -0,0 +1,166 @@
+"""In-process performance metrics for the Signal bots.
+
+Counters and latency samples are kept per bot in memory (the bots and the
+admin UI share a process when started with ``--with-bots``) and exposed at
+the admin ``/api/metrics`` endpoint. Nothing here touches the database, so
+recording a metric is safe from any thread or coroutine.
+"""
+
+import threading
+from collections import defaultdict, deque
+from typing import Optional
+
+# Latency samples kept per (bot, metric) for percentile estimates
+MAX_SAMPLES = 200
+
+_lock = threading.Lock()
+_counters: dict[str, dict[str, float]] = defaultdict(lambda: defaultdict(float))
+_latencies: dict[str, dict[str, deque]] = defaultdict(dict)
+
+
+def increment(bot_id: Optional[str], name: str, amount: float = 1):
+    """Add to a per-bot counter."""
+    with _lock:
+        _counters[bot_id or "global"][name] += amount
+
+
+def record_latency(bot_id: Optional[str], name: str, seconds: float):
+    """Record a latency sample (in seconds) for a per-bot metric."""
+    with _lock:
+        samples = _latencies[bot_id or "global"].get(name)
+        if samples is None:
+            samples = deque(maxlen=MAX_SAMPLES)
+            _latencies[bot_id or "global"][name] = samples
+        samples.append(seconds)
+
+
+def get_percentile(bot_id: Optional[str], name: str, percentile: float, min_samples: int = 1) -> Optional[float]:
+    """Get a latency percentile (0-100) in seconds, or None with fewer than min_samples samples."""
+    with _lock:
+        samples = list(_latencies.get(bot_id or "global", {}).get(name, ()))
+    if not samples or len(samples) < min_samples:
+        return None
+    samples.sort()
+    k = min(len(samples) - 1, max(0, int(round(percentile / 100 * (len(samples) - 1)))))
+    return samples[k]
+
+
+def record_llm_usage(bot_id: Optional[str], usage: Optional[dict], seconds: float, tier: Optional[str] = None):
+    """Record token usage (including prompt-cache reads/writes) for one LLM call.
+
+    Latency is split by whether the call read from the prompt cache, so the
+    two summaries show the time saved by cache hits. With a model tier (see
+    model_tiers), calls, tokens and latency are also kept per tier.
+    """
+    usage = usage or {}
+    details = usage.get("prompt_tokens_details") or {}
+    cache_read = details.get("cached_tokens") or usage.get("cache_read_input_tokens") or 0
+    cache_write = details.get("cache_write_tokens") or usage.get("cache_creation_input_tokens") or 0
+
+    with _lock:
+        counters = _counters[bot_id or "global"]
+        counters["llm_calls"] += 1
+        counters["prompt_tokens"] += usage.get("prompt_tokens") or 0
+        counters["completion_tokens"] += usage.get("completion_tokens") or 0
+        counters["cache_read_tokens"] += cache_read
+        counters["cache_write_tokens"] += cache_write
+        if cache_read:
+            counters["llm_calls_cache_hit"] += 1
+        if tier:
+            counters[f"tier_{tier}_llm_calls"] += 1
+            counters[f"tier_{tier}_prompt_tokens"] += usage.get("prompt_tokens") or 0
+            counters[f"tier_{tier}_completion_tokens"] += usage.get("completion_tokens") or 0
+
+    record_latency(bot_id, "llm_call_cache_hit" if cache_read else "llm_call_cache_miss", seconds)
+    if tier:
+        record_latency(bot_id, f"tier_{tier}_llm_call", seconds)
+
+
+def record_hedge(bot_id: Optional[str], outcome: str):
+    """Record the outcome of a hedged LLM request ("not_needed", "primary" or "hedge")."""
+    with _lock:
+        counters = _counters[bot_id or "global"]
+        counters["hedge_eligible_calls"] += 1
+        if outcome != "not_needed":
+            counters["hedges_sent"] += 1
+        if outcome == "hedge":
+            counters["hedge_wins"] += 1
+
+
+def _summarize(samples: list[float]) -> dict:
+    """Summarize latency samples in milliseconds."""
+    ordered = sorted(samples)
+    n = len(ordered)
+    return {
+        "count": n,
+        "avg_ms": round(sum(ordered) / n * 1000, 1),
+        "p50_ms": round(ordered[n // 2] * 1000, 1),
+        "p95_ms": round(ordered[min(n - 1, int(n * 0.95))] * 1000, 1),
+        "max_ms": round(ordered[-1] * 1000, 1),
+    }
+
+
+def get_metrics(bot_id: Optional[str] = None) -> dict:
+    """Snapshot counters and latency summaries, for one bot or all bots."""
+    with _lock:
+        keys = [bot_id] if bot_id else sorted(set(_counters) | set(_latencies))
+        snapshot = {
+            key: {
+                "counters": dict(_counters.get(key, {})),
+                "latencies": {name: list(s) for name, s in _latencies.get(key, {}).items() if s},
+            }
+            for key in keys
+        }
+
+    for data in snapshot.values():
+        data["latencies"] = {name: _summarize(s) for name, s in data["latencies"].items()}
+        responses = data["counters"].get("responses_generated")
+        if responses:
+            data["llm_calls_per_response"] = round(data["counters"].get("llm_calls", 0) / responses, 2)
+        prompt_tokens = data["counters"].get("prompt_tokens")
+        if prompt_tokens:
+            data["cache_read_ratio"] = round(data["counters"].get("cache_read_tokens", 0) / prompt_tokens, 3)
+        cache_lookups = sum(data["counters"].get(name, 0) for name in
+                            ("tool_cache_hits", "tool_cache_coalesced", "tool_cache_misses"))
+        if cache_lookups:
+            served = data["counters"].get("tool_cache_hits", 0) + data["counters"].get("tool_cache_coalesced", 0)
+            data["tool_cache_hit_rate"] = round(served / cache_lookups, 3)
+        location_checks = sum(data["counters"].get(name, 0) for name in
+                              ("location_checks_local", "location_checks_memo", "location_checks_llm"))
+        if location_checks:
+            avoided = location_checks - data["counters"].get("location_checks_llm", 0)
+            data["location_llm_avoided_ratio"] = round(avoided / location_checks, 3)
+            llm_latency = data["latencies"].get("location_llm")
+            if llm_latency:
+                # Estimate: each avoided check would have cost an average LLM call
+                data["location_llm_saved_ms"] = round(avoided * llm_latency["avg_ms"], 1)
+        tiers = {}
+        for name, value in data["counters"].items():
+            if name.startswith("tier_") and name.endswith("_llm_calls"):
+                tier = name[len("tier_"):-len("_llm_calls")]
+                tiers[tier] = {
+                    "llm_calls": int(value),
+                    "prompt_tokens": int(data["counters"].get(f"tier_{tier}_prompt_tokens", 0)),
+                    "completion_tokens": int(data["counters"].get(f"tier_{tier}_completion_tokens", 0)),
+                    "latency": data["latencies"].get(f"tier_{tier}_llm_call"),
+                }
+        if tiers:
+            data["tiers"] = tiers
+        candidates = data["counters"].get("arbitration_candidates")
+        if candidates:
+            data["arbitration_skip_rate"] = round(
+                data["counters"].get("responses_arbitrated_away", 0) / candidates, 3)
+        eligible = data["counters"].get("hedge_eligible_calls")
+        if eligible:
+            hedges = data["counters"].get("hedges_sent", 0)
+            data["hedge_rate"] = round(hedges / eligible, 3)
+            if hedges:
+                data["hedge_win_rate"] = round(data["counters"].get("hedge_wins", 0) / hedges, 3)
+    return snapshot
+
+
+def reset_metrics():
+    """Clear all metrics."""
+    with _lock:
+        _counters.clear()
+        _latencies.clear()
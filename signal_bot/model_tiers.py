@@ -0,0 +1,63 @@
+"""
+Per-message model tiers.
+
+A bot with a ``fast_model`` set answers low-stakes messages with it: random
+chance replies and idle news. Its main ``model`` stays in charge of
+anything someone is waiting on (mentions, replies, commands), of messages
+with images, and of requests that route to the tool domains that need
+multi-step tool use. Without a fast model every message uses the main one.
+
+LLM calls are counted per tier (see metrics.record_llm_usage) so the admin
+can compare latency and token use.
+"""
+
+from typing import Optional
+
+from signal_bot.trigger_logic import ADDRESSED_REASONS
+
+TIER_MAIN = "main"
+TIER_FAST = "fast"
+TIERS = (TIER_MAIN, TIER_FAST)
+
+# Tool domains whose requests go to the main model (spreadsheets, scheduling, market data)
+HEAVY_TOOL_DOMAINS = frozenset({"sheets", "calendar", "finance", "triggers"})
+
+
+def select_model_tier(
+    bot_data: dict,
+    reason: str,
+    message_text: str = "",
+    features=None,
+    has_images: bool = False
+) -> str:
+    """
+    Pick the tier for a response from the respond reason and the tool routing signals.
+
+    Args:
+        bot_data: Bot configuration dict (fast_model, dnd_enabled, google_connected)
+        reason: Why the bot is responding (from should_bot_respond, or "idle_news")
+        message_text: The message being answered
+        features: Pre-computed MessageFeatures for message_text (optional)
+        has_images: Whether the message carries images
+    """
+    if not bot_data.get('fast_model'):
+        return TIER_MAIN
+    if reason in ADDRESSED_REASONS or has_images:
+        return TIER_MAIN
+    if message_text:
+        from tool_schemas.routing import detect_tool_domains
+
+        dnd_enabled = bool(bot_data.get('dnd_enabled') and bot_data.get('google_connected'))
+        domains = detect_tool_domains(message_text, dnd_enabled=dnd_enabled, features=features)
+        if domains & HEAVY_TOOL_DOMAINS:
+            return TIER_MAIN
+    return TIER_FAST
+
+
+def model_for_tier(bot_data: dict, tier: Optional[str]) -> str:
+    """OpenRouter model ID for a bot's tier (the main model if no fast model is set)."""
+    from config import AI_MODELS
+
+    model = bot_data.get('fast_model') if tier == TIER_FAST else None
+    model = model or bot_data['model']
+    return AI_MODELS.get(model, model)
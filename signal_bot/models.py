@@ -60,9 +60,15 @@ class Bot(db.Model):
     # Signal feature settings
     typing_enabled = db.Column(db.Boolean, default=True)  # Send typing indicators while composing
     read_receipts_enabled = db.Column(db.Boolean, default=False)  # Send read receipts for messages
+    streaming_enabled = db.Column(db.Boolean, default=False)  # Send first sentence early, then edit in the rest
+    hedging_enabled = db.Column(db.Boolean, default=False)  # Race a second LLM request when a mention reply is slow to start
 
     # Context settings
     context_window = db.Column(db.Integer, default=25)  # Number of messages to include in context (5-100)
+    context_token_budget = db.Column(db.Integer, nullable=True)  # Max prompt tokens (None = default, capped by model context)
+
+    # Model tiering
+    fast_model = db.Column(db.String(100), nullable=True)  # Cheaper model for random-chance replies and idle news
 
     # Member memory settings
     member_memory_model = db.Column(db.String(100), nullable=True)  # Small/fast model for relevance detection
@@ -119,8 +125,12 @@ class Bot(db.Model):
             "max_reactions_per_response": self.max_reactions_per_response or 3,
             "typing_enabled": self.typing_enabled,
             "read_receipts_enabled": self.read_receipts_enabled,
+            "streaming_enabled": self.streaming_enabled if self.streaming_enabled is not None else False,
+            "hedging_enabled": self.hedging_enabled if self.hedging_enabled is not None else False,
             "context_window": self.context_window or 25,
+            "context_token_budget": self.context_token_budget,
             "member_memory_model": self.member_memory_model,
+            "fast_model": self.fast_model,
             "triggers_enabled": self.triggers_enabled if self.triggers_enabled is not None else True,
             "max_triggers": self.max_triggers or 10,
             "dnd_enabled": self.dnd_enabled if self.dnd_enabled is not None else False,
@@ -253,7 +263,9 @@ class MessageLog(db.Model):
     is_bot = db.Column(db.Boolean, default=False)
     bot_id = db.Column(db.String(50), nullable=True)  # If sent by a bot
     has_image = db.Column(db.Boolean, default=False)
-    image_data = db.Column(db.Text, nullable=True)  # Base64 encoded image (fallback storage when chat_log disabled)
+    # Image bytes load only when accessed (deferred), not with every context query
+    image_bytes = db.deferred(db.Column(db.LargeBinary, nullable=True))  # Raw image (fallback storage when chat_log disabled)
+    image_data = db.deferred(db.Column(db.Text, nullable=True))  # Legacy base64 image (rows from before migrate_image_bytes)
     image_media_type = db.Column(db.String(50), nullable=True)  # e.g., "image/jpeg"
     timestamp = db.Column(db.DateTime, default=datetime.utcnow)
     signal_timestamp = db.Column(db.BigInteger, nullable=True)  # Signal's message timestamp (ms) for deduplication
@@ -291,7 +303,8 @@ class ChatLog(db.Model):
     content = db.Column(db.Text, nullable=False)
     is_bot = db.Column(db.Boolean, default=False)
     bot_id = db.Column(db.String(50), nullable=True)  # If sent by a bot
-    image_data = db.Column(db.Text, nullable=True)  # Base64 encoded image (primary storage when chat_log enabled)
+    image_bytes = db.deferred(db.Column(db.LargeBinary, nullable=True))  # Raw image (primary storage when chat_log enabled)
+    image_data = db.deferred(db.Column(db.Text, nullable=True))  # Legacy base64 image (rows from before migrate_image_bytes)
     image_media_type = db.Column(db.String(50), nullable=True)  # e.g., "image/jpeg"
     timestamp = db.Column(db.DateTime, default=datetime.utcnow, index=True)
     signal_timestamp = db.Column(db.BigInteger, nullable=True, unique=True)  # For deduplication
@@ -426,12 +439,15 @@ class MemoryScanState(db.Model):
     group_id = db.Column(db.String(100), db.ForeignKey("groups.id"), primary_key=True)
     last_scan_at = db.Column(db.DateTime, nullable=True)
     last_message_id_scanned = db.Column(db.Integer, nullable=True)  # Track which messages we've processed
+    # Table the cursor's id refers to: "chat_logs" or "message_logs" (a cursor without one is ignored)
+    last_message_source = db.Column(db.String(20), nullable=True)
 
     def to_dict(self):
         return {
             "group_id": self.group_id,
             "last_scan_at": self.last_scan_at.isoformat() if self.last_scan_at else None,
             "last_message_id_scanned": self.last_message_id_scanned,
+            "last_message_source": self.last_message_source,
         }
 
 
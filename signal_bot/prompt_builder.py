@@ -0,0 +1,266 @@
+"""
+Incremental prompt assembly for conversation history.
+
+One ConversationPromptBuilder is kept per (bot, group). It remembers the
+formatted history from the previous response and, on the next one, only
+fetches and formats messages that arrived since (by MessageLog id). Sliding
+the window drops entries from the front without touching the rest.
+
+When the reaction tool is enabled, each message carries a ``[n]`` tag. Tags
+are stable sequence numbers assigned when a message enters the builder
+rather than positions in the window, so nothing has to be renumbered when
+the window slides (and the history prefix stays byte-identical between
+turns). Reaction metadata is kept alongside the entries.
+
+Each entry also carries a token estimate, so a build can be limited to a
+token budget: text is filled newest-first, and images (the most expensive
+parts) only go to the newest messages while budget remains. The message
+that doesn't fit is cut to the remaining budget rather than sent whole.
+"""
+
+import logging
+from collections import deque
+from dataclasses import dataclass
+from typing import Optional
+
+from signal_bot.db_session import db_session
+from signal_bot.memory_manager import MemoryManager
+from signal_bot.token_budget import estimate_tokens, MESSAGE_OVERHEAD_TOKENS
+from signal_bot.config_signal import IMAGE_TOKEN_ESTIMATE
+
+logger = logging.getLogger(__name__)
+
+MAX_IMAGE_MESSAGES = 3  # Only the most recent N image messages keep their image
+TRUNCATION_MARKER = " [...truncated]"
+MIN_TRUNCATED_TOKENS = 16  # Smaller remainders drop the message instead of cutting it
+
+
+@dataclass
+class PromptEntry:
+    """A single formatted history message."""
+    message_id: int
+    index: int
+    role: str
+    raw_content: str
+    text: str
+    has_image: bool
+    tokens: int = 0  # Estimated text tokens (images counted separately)
+    reaction_target: Optional[dict] = None
+    image_part: Optional[dict] = None
+    image_loaded: bool = False
+
+    def message(self, with_image: bool = True) -> dict:
+        """A new API message dict for this entry, with its image part if loaded and wanted."""
+        if with_image and self.image_part:
+            return {"role": self.role, "content": [{"type": "text", "text": self.text}, self.image_part]}
+        return {"role": self.role, "content": self.text}
+
+
+@dataclass
+class BuiltPrompt:
+    """Result of a build: history ready for the API plus precomputed metadata."""
+    messages: list[dict]
+    reaction_metadata: list[dict]
+    has_images: bool
+    trigger_index: int
+    tokens: int = 0
+
+
+class ConversationPromptBuilder:
+    """Keeps the formatted conversation history for one bot in one group."""
+
+    def __init__(self, memory: MemoryManager, window: int, reaction_enabled: bool):
+        self.memory = memory
+        self.window = window
+        self.reaction_enabled = reaction_enabled
+        self._entries: deque[PromptEntry] = deque()
+        self._next_index = 0
+        self._last_message_id: Optional[int] = None
+
+    def configure(self, window: int, reaction_enabled: bool):
+        """Apply current bot settings, resetting if formatting would change."""
+        if window != self.window or reaction_enabled != self.reaction_enabled:
+            self.window = window
+            self.reaction_enabled = reaction_enabled
+            self.reset()
+
+    def reset(self):
+        """Drop all cached entries; the next build reloads the full window."""
+        self._entries.clear()
+        self._next_index = 0
+        self._last_message_id = None
+
+    def _format_text(self, index: int, role: str, name: Optional[str], content: str) -> str:
+        """Apply the [idx] tag and sender name prefix to message text."""
+        name_prefix = f"{name}: " if role == "user" and name else ""
+        if self.reaction_enabled:
+            return f"[{index}] {name_prefix}{content}"
+        return f"{name_prefix}{content}"
+
+    def _append(self, msg: dict):
+        """Format a context dict and append it to the window."""
+        index = self._next_index
+        self._next_index += 1
+
+        role = msg["role"]
+        raw_content = msg["content"] or ""
+        entry = PromptEntry(
+            message_id=msg["id"],
+            index=index,
+            role=role,
+            raw_content=raw_content,
+            text=self._format_text(index, role, msg.get("name"), raw_content),
+            has_image=msg.get("has_image", False),
+        )
+        entry.tokens = estimate_tokens(entry.text) + MESSAGE_OVERHEAD_TOKENS
+
+        # Reaction metadata for user messages with valid Signal metadata
+        if role == "user" and msg.get("signal_timestamp") and msg.get("sender_id"):
+            entry.reaction_target = {
+                "index": index,
+                "sender_id": msg["sender_id"],
+                "signal_timestamp": msg["signal_timestamp"]
+            }
+
+        self._entries.append(entry)
+        self._last_message_id = entry.message_id
+        logger.info(f"[DEBUG] +[{index}] {role}: {entry.text[:60].replace(chr(10), ' ')}{'[+IMG]' if entry.has_image else ''}")
+
+    def _refresh(self):
+        """Fetch messages logged since the last build and slide the window."""
+        if self._last_message_id is None:
+            new_messages = self.memory.get_messages_after(0, self.window)
+        else:
+            new_messages = self.memory.get_messages_after(self._last_message_id, self.window)
+            if new_messages and new_messages[0]["id"] == self._last_message_id:
+                new_messages = new_messages[1:]
+            else:
+                # Last seen message is gone (log cleared or too many new messages) - start over
+                self.reset()
+                new_messages = self.memory.get_messages_after(0, self.window)
+
+        for msg in new_messages[-self.window:]:
+            self._append(msg)
+
+        while len(self._entries) > self.window:
+            self._entries.popleft()
+
+    def _update_images(self) -> bool:
+        """Load images for the newest image messages and drop them from older ones."""
+        has_images = False
+        images_included = 0
+        for entry in reversed(self._entries):
+            if not entry.has_image:
+                continue
+
+            if images_included < MAX_IMAGE_MESSAGES:
+                images_included += 1
+                if not entry.image_loaded:
+                    entry.image_part = self.memory.get_image_part({"id": entry.message_id})
+                    entry.image_loaded = True
+                if entry.image_part:
+                    has_images = True
+            elif entry.image_part:
+                # Fell out of the recent-images set - back to text only
+                entry.image_part = None
+
+        return has_images
+
+    @staticmethod
+    def _truncate_text(text: str, max_tokens: int) -> tuple[str, int]:
+        """Longest prefix of text within max_tokens, plus TRUNCATION_MARKER; returns (text, tokens)."""
+        max_tokens -= estimate_tokens(TRUNCATION_MARKER)
+        low, high = 0, len(text)
+        while low < high:  # Longest prefix length whose estimate fits
+            mid = (low + high + 1) // 2
+            if estimate_tokens(text[:mid]) <= max_tokens:
+                low = mid
+            else:
+                high = mid - 1
+        truncated = text[:low].rstrip() + TRUNCATION_MARKER
+        return truncated, estimate_tokens(truncated)
+
+    @classmethod
+    def _fit_budget(cls, entries: list[PromptEntry], token_budget: int) -> tuple[list[dict], int, bool]:
+        """
+        Select history for a token budget.
+
+        Text is filled newest-first. The first message that doesn't fit is cut
+        to the remaining budget (with TRUNCATION_MARKER, and without its image),
+        or dropped if less than MIN_TRUNCATED_TOKENS remain; older ones are
+        left out. Then images are kept on the newest image messages while
+        budget remains; older images fall back to their text. Returns
+        (messages, tokens, has_images).
+        """
+        selected = []
+        truncated = None  # (entry, text) for the message cut to fit
+        used = 0
+        for entry in reversed(entries):
+            if used + entry.tokens > token_budget:
+                remaining = token_budget - used - MESSAGE_OVERHEAD_TOKENS
+                if remaining >= MIN_TRUNCATED_TOKENS:
+                    text, tokens = cls._truncate_text(entry.text, remaining)
+                    truncated = (entry, text)
+                    selected.append(entry)
+                    used += tokens + MESSAGE_OVERHEAD_TOKENS
+                break
+            selected.append(entry)
+            used += entry.tokens
+
+        messages = []
+        has_images = False
+        for entry in selected:  # Newest first, so newer images win
+            if truncated and entry is truncated[0]:
+                messages.append({"role": entry.role, "content": truncated[1]})
+            elif entry.image_part and used + IMAGE_TOKEN_ESTIMATE <= token_budget:
+                used += IMAGE_TOKEN_ESTIMATE
+                has_images = True
+                messages.append(entry.message())
+            else:
+                messages.append(entry.message(with_image=False))
+        messages.reverse()
+
+        if len(selected) < len(entries) or truncated:
+            logger.info(f"[DEBUG] Token budget {token_budget}: kept {len(selected)}/{len(entries)} messages"
+                        f"{' (oldest truncated)' if truncated else ''}")
+        return messages, used, has_images
+
+    def build(self, trigger_message: str, token_budget: Optional[int] = None) -> BuiltPrompt:
+        """
+        Bring the history up to date and return it for the API.
+
+        The most recent message is left out when it equals the trigger (it was
+        already logged, but is sent separately as the prompt).
+
+        Args:
+            trigger_message: The message being responded to
+            token_budget: Tokens available for history (None = message window only)
+        """
+        with db_session():
+            self._refresh()
+            has_images = self._update_images()
+
+        entries = list(self._entries)
+        trigger_index = self._next_index
+        if entries and entries[-1].raw_content == trigger_message:
+            logger.info(f"[DEBUG] Excluding last message from context (matches trigger)")
+            trigger_index = entries[-1].index
+            entries = entries[:-1]
+
+        if token_budget is not None:
+            messages, tokens, has_images = self._fit_budget(entries, token_budget)
+            entries = entries[len(entries) - len(messages):]
+        else:
+            messages = [e.message() for e in entries]
+            tokens = sum(e.tokens + (IMAGE_TOKEN_ESTIMATE if e.image_part else 0) for e in entries)
+
+        reaction_metadata = [e.reaction_target for e in entries if e.reaction_target]
+        logger.info(f"[DEBUG] Prompt history: {len(entries)} messages (window {self.window}), ~{tokens} tokens, images: {has_images}")
+
+        return BuiltPrompt(
+            messages=messages,
+            reaction_metadata=reaction_metadata,
+            has_images=has_images,
+            trigger_index=trigger_index,
+            tokens=tokens,
+        )
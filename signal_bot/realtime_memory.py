@@ -2,17 +2,22 @@
 Real-time memory extraction for Signal bot.
 
 Detects when users ask the bot to remember something and saves it immediately,
-rather than waiting for the 6-hour background scan.
+rather than waiting for the 6-hour background scan. Extraction runs alongside
+response generation (see PendingMemory) instead of delaying it.
 """
 
+import asyncio
 import json
 import logging
-import re
 from datetime import datetime
 from typing import Optional
 
 from flask import Flask
 
+from signal_bot.member_memory_index import invalidate_member_memory_index
+from signal_bot.message_features import get_trigger_matcher
+from signal_bot.message_keywords import REMEMBER_TRIGGERS  # noqa: F401 (re-exported)
+
 logger = logging.getLogger(__name__)
 
 # Flask app reference for database context
@@ -25,94 +30,18 @@ def set_flask_app(app: Flask):
     _flask_app = app
 
 
-# Trigger patterns by category - if any match, we attempt real-time extraction
-REMEMBER_TRIGGERS = {
-    # Explicit memory requests (highest priority)
-    "explicit": [
-        r"remember\s+(that\s+)?(i|my)\s+",           # "remember I prefer..."
-        r"don\'?t\s+forget\s+(that\s+)?(i|my)\s+",   # "don't forget I..."
-        r"keep\s+in\s+mind\s+(that\s+)?(i|my)?\s*",  # "keep in mind I work nights"
-        r"note\s+that\s+i\s+",                        # "note that I live in Denver"
-        r"fyi\s+i\s+",                                # "fyi I'll be traveling"
-        r"please\s+remember\s+",                      # "please remember..."
-        r"save\s+(this|that)\s+(to\s+)?memory",       # "save this to memory"
-        r"add\s+(this|that)\s+to\s+(your\s+)?memory", # "add this to your memory"
-    ],
-
-    # Response preference indicators
-    "response_prefs": [
-        r"(give\s+me|i\s+(want|like|prefer))\s+(shorter|longer|brief|detailed|succinct|concise)",
-        r"(stop|quit|don\'?t)\s+(being\s+so|with\s+the)\s+(verbose|wordy|lengthy)",
-        r"(be\s+)?(more|less)\s+(words|text|explanation|verbose|brief|detailed)",
-        r"be\s+(more\s+)?(brief|concise|succinct|direct|detailed|verbose)",
-        r"i\s+prefer\s+(short|long|brief|detailed|succinct|concise)\s+(responses?|answers?|replies?)",
-        r"respond\s+(to\s+me\s+)?(with|in)\s+(bullets?|lists?|paragraphs?)",
-        # Additional patterns for common phrasings
-        r"limit\s+(your\s+)?(responses?|replies?|answers?)\s+to",  # "limit responses to 1 sentence"
-        r"only\s+(speak|respond|reply|answer)\s+when\s+(prompted|mentioned|asked|tagged)",  # "only speak when prompted"
-        r"(keep|make)\s+(it|them|responses?)\s+(short|brief|concise)",  # "keep it short"
-        r"(shorter|briefer|less\s+wordy)\s*(please|thanks|thx)?$",  # "shorter please"
-        r"(one|1|two|2|three|3)\s+(sentence|word|line|paragraph)",  # "1 sentence responses"
-        r"don\'?t\s+(respond|reply|answer)\s+(unless|until)",  # "don't respond unless asked"
-        r"(no|stop)\s+(unsolicited|random|unprompted)\s+(responses?|replies?|comments?)",  # "no random responses"
-    ],
-
-    # Location indicators
-    "location": [
-        r"i\s+(live|am|reside)\s+in\s+",              # "I live in Denver"
-        r"i\'?m\s+(based|located)\s+(in|at)\s+",      # "I'm based in NYC"
-        r"i\'?m\s+(going|traveling|heading)\s+to\s+", # "I'm going to Miami"
-        r"i\'?ll\s+be\s+in\s+",                       # "I'll be in LA next week"
-        r"(back\s+)?home\s+(is|in)\s+",               # "home is in Texas"
-        r"i\s+moved\s+to\s+",                         # "I moved to Seattle"
-        r"flying\s+(out\s+)?to\s+",                   # "flying to NYC tomorrow"
-    ],
-
-    # Interest indicators
-    "interests": [
-        r"i\s+(really\s+)?(love|enjoy|like|am\s+into)\s+",
-        r"i\'?m\s+(really\s+)?(into|a\s+fan\s+of|obsessed\s+with)\s+",
-        r"my\s+favorite\s+\w+\s+is\s+",
-        r"i\'?m\s+(going\s+to|attending)\s+(the|a)\s+\w+\s+(concert|show|game|event)",
-    ],
-
-    # Life events
-    "life_events": [
-        r"(my|i\'?m\s+getting)\s+(wedding|married|engaged)",
-        r"my\s+birthday\s+is\s+",
-        r"i\'?m\s+(graduating|retiring|moving|having\s+a\s+baby)\s+",
-        r"(getting|got)\s+(married|engaged|divorced)",
-        r"my\s+anniversary\s+is\s+",
-    ],
-
-    # Work info
-    "work_info": [
-        r"i\s+work\s+(as|at|for)\s+",
-        r"i\'?m\s+a\s+\w+\s+(at|for|engineer|developer|manager|designer|doctor|lawyer|teacher)",
-        r"my\s+job\s+(is|involves)\s+",
-        r"i\s+just\s+(started|got|accepted)\s+a\s+(job|position|role)\s+",
-    ],
-}
-
-# Compile all patterns for efficiency
-_compiled_triggers = {}
-for category, patterns in REMEMBER_TRIGGERS.items():
-    _compiled_triggers[category] = [re.compile(p, re.IGNORECASE) for p in patterns]
-
-
 def check_for_memory_trigger(message_text: str) -> Optional[str]:
     """
     Check if a message contains any memory trigger patterns.
 
+    Patterns are checked in category order against the lowercased message
+    (see message_features.get_trigger_matcher).
+
     Returns:
         The matched category (e.g., "explicit", "response_prefs", "location")
         or None if no trigger matched.
     """
-    for category, patterns in _compiled_triggers.items():
-        for pattern in patterns:
-            if pattern.search(message_text):
-                return category
-    return None
+    return get_trigger_matcher().first_group((message_text or "").lower())
 
 
 MEMORY_EXTRACTION_SCHEMA = {
@@ -219,8 +148,9 @@ Extract the memory:"""
             logger.error("No bot model provided for memory extraction")
             return None
 
-        # Use structured outputs for guaranteed valid JSON
-        result = call_openrouter_api_structured(
+        # Use structured outputs for guaranteed valid JSON (blocking HTTP, so off the event loop)
+        result = await asyncio.to_thread(
+            call_openrouter_api_structured,
             prompt=user_prompt,
             model=model_id,
             system_prompt=system_prompt,
@@ -307,7 +237,9 @@ def save_member_memory(
             db.session.add(log)
 
             db.session.commit()
-            return True
+
+        invalidate_member_memory_index(group_id)
+        return True
 
     except Exception as e:
         logger.error(f"Error saving member memory: {e}")
@@ -355,12 +287,81 @@ def format_memory_confirmation_instruction(memory_result: dict, member_name: str
     return confirmations.get(slot_type, f"Briefly acknowledge you've noted: {content}")
 
 
+def format_memory_acknowledgement(memory_result: dict, member_name: str) -> str:
+    """
+    Short follow-up message for a memory saved after the response was already generated.
+
+    Args:
+        memory_result: The saved memory dict
+        member_name: Name of the user whose memory was saved
+
+    Returns:
+        The acknowledgement text to send
+    """
+    if memory_result.get("slot_type") == "response_prefs":
+        return f"Noted, {member_name}, I'll keep that in mind from now on."
+    return f"Noted, {member_name}: {memory_result.get('content', '')}"
+
+
+class PendingMemory:
+    """A real-time memory extraction running alongside response generation.
+
+    The response includes the confirmation instruction only if the save finishes
+    in time (confirmation_within); it counts as confirmed once that response is
+    actually sent (mark_delivered). Otherwise acknowledgement() gives a short
+    follow-up message to send once the save is done. One extraction may be shared
+    by several bots in a group; only the first caller gets the follow-up.
+    """
+
+    def __init__(self, task: asyncio.Task, sender_name: str):
+        self.task = task
+        self.sender_name = sender_name
+        self.confirmed = False
+        self.acknowledged = False
+        # Bots whose prompt carries the confirmation instruction
+        self._offered_to: set[str] = set()
+
+    async def _result(self, timeout: Optional[float] = None) -> Optional[dict]:
+        try:
+            # Shielded: a timeout here must not cancel the extraction itself
+            return await asyncio.wait_for(asyncio.shield(self.task), timeout)
+        except asyncio.TimeoutError:
+            return None
+        except Exception as e:
+            logger.error(f"Real-time memory extraction failed: {e}")
+            return None
+
+    async def confirmation_within(self, timeout: float, bot_id: str) -> Optional[str]:
+        """The confirmation instruction for bot_id's prompt if the memory is saved within timeout seconds."""
+        result = await self._result(timeout)
+        if result and result.get('saved'):
+            self._offered_to.add(bot_id)
+            return format_memory_confirmation_instruction(result, self.sender_name)
+        return None
+
+    def mark_delivered(self, bot_id: str):
+        """Record that bot_id's response was sent; it confirms the memory if its prompt did."""
+        if bot_id in self._offered_to:
+            self.confirmed = True
+
+    async def acknowledgement(self) -> Optional[str]:
+        """Wait for the save; the follow-up text if it wasn't confirmed in the response."""
+        if self.confirmed:
+            return None
+        result = await self._result()
+        if result and result.get('saved') and not self.confirmed and not self.acknowledged:
+            self.acknowledged = True
+            return format_memory_acknowledgement(result, self.sender_name)
+        return None
+
+
 async def check_and_save_realtime_memory(
     message_text: str,
     sender_name: str,
     sender_id: str,
     group_id: str,
-    bot_data: dict
+    bot_data: dict,
+    features=None
 ) -> Optional[dict]:
     """
     Main entry point: check for memory triggers, extract, and save.
@@ -371,6 +372,7 @@ async def check_and_save_realtime_memory(
         sender_id: Signal UUID of sender
         group_id: Group ID
         bot_data: Bot configuration dict
+        features: Pre-computed MessageFeatures for message_text (optional)
 
     Returns:
         Dict with 'saved': True and memory details if saved, None otherwise
@@ -382,7 +384,10 @@ async def check_and_save_realtime_memory(
         return None
 
     # Check for trigger patterns
-    triggered_category = check_for_memory_trigger(message_text)
+    if features is not None:
+        triggered_category = features.memory_trigger
+    else:
+        triggered_category = check_for_memory_trigger(message_text)
     if not triggered_category:
         return None
 
@@ -416,7 +421,8 @@ async def check_and_save_realtime_memory(
             pass
 
     # Save to database
-    saved = save_member_memory(
+    saved = await asyncio.to_thread(
+        save_member_memory,
         group_id=group_id,
         member_id=sender_id or sender_name,
         member_name=sender_name,
@@ -0,0 +1,120 @@
+"""
+Group-level arbitration between bots that want to answer the same message.
+
+With several bots in a group, each one rolls its random chance on its own,
+so a single message could get a full LLM response from every bot. Bots
+that decide to respond register here per (group_id, Signal timestamp):
+
+- Addressed bots (mentioned, replied to, commanded) always respond, without
+  waiting.
+- Bots responding on random chance wait ARBITRATION_WINDOW_SECONDS from the
+  first candidate. Then up to ARBITRATION_MAX_RESPONDERS bots in total
+  respond, with the free slots filled by a weighted choice (weight =
+  random_chance_percent).
+
+Candidates that lose never call the model. They are counted per bot as
+responses_arbitrated_away, next to arbitration_candidates.
+"""
+
+import asyncio
+import logging
+import random
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from signal_bot import metrics
+from signal_bot.trigger_logic import ADDRESSED_REASONS
+
+logger = logging.getLogger(__name__)
+
+# Decided rounds are kept this long for bots whose copy of the envelope arrives late
+ROUND_TTL_SECONDS = 300
+
+
+class _Round:
+    """Candidate responders for one message."""
+
+    def __init__(self, opened_at: float):
+        self.opened_at = opened_at
+        self.selected: set[str] = set()
+        self.weights: dict[str, float] = {}  # Random-chance candidates awaiting the decision
+        self.decided = asyncio.Event()
+        self.closer: Optional[asyncio.TimerHandle] = None
+
+
+class ResponseArbiter:
+    """Caps how many bots respond to one group message."""
+
+    def __init__(self, window_seconds: float, max_responders: int):
+        self.window_seconds = window_seconds
+        self.max_responders = max_responders
+        self._rounds: OrderedDict = OrderedDict()  # (group_id, signal_timestamp) -> _Round
+
+    def _prune(self, now: float):
+        while self._rounds:
+            key, rnd = next(iter(self._rounds.items()))
+            if now - rnd.opened_at < ROUND_TTL_SECONDS or not rnd.decided.is_set():
+                break
+            del self._rounds[key]
+
+    async def admit(self, group_id: str, signal_timestamp: Optional[int], bot_id: str,
+                    reason: str, weight: float = 1.0) -> bool:
+        """Whether this bot should go on to generate a response to the message."""
+        if not signal_timestamp:
+            return True
+
+        metrics.increment(bot_id, "arbitration_candidates")
+        now = time.monotonic()
+        self._prune(now)
+        key = (group_id, signal_timestamp)
+        rnd = self._rounds.get(key)
+        if rnd is None:
+            rnd = self._rounds[key] = _Round(now)
+
+        if reason in ADDRESSED_REASONS:
+            rnd.selected.add(bot_id)
+            return True
+
+        if rnd.decided.is_set():
+            # Arrived after the window closed: take a free slot if there is one
+            admitted = len(rnd.selected) < self.max_responders
+            if admitted:
+                rnd.selected.add(bot_id)
+        else:
+            rnd.weights[bot_id] = max(weight, 1.0)
+            if rnd.closer is None:
+                delay = max(0.0, self.window_seconds - (now - rnd.opened_at))
+                rnd.closer = asyncio.get_running_loop().call_later(delay, self._decide, rnd)
+            await rnd.decided.wait()
+            admitted = bot_id in rnd.selected
+
+        if not admitted:
+            metrics.increment(bot_id, "responses_arbitrated_away")
+        return admitted
+
+    def _decide(self, rnd: _Round):
+        """Fill the free slots from the random-chance candidates by weighted choice."""
+        pool = dict(rnd.weights)
+        slots = self.max_responders - len(rnd.selected)
+        while slots > 0 and pool:
+            bot_ids = list(pool)
+            choice = random.choices(bot_ids, weights=[pool[b] for b in bot_ids])[0]
+            rnd.selected.add(choice)
+            del pool[choice]
+            slots -= 1
+        if pool:
+            logger.info(f"Arbitration: {len(rnd.selected)} responder(s), {len(pool)} bot(s) held back")
+        rnd.decided.set()
+
+
+_arbiter: Optional[ResponseArbiter] = None
+
+
+def get_response_arbiter() -> ResponseArbiter:
+    """Get the shared arbiter (all bots run on one event loop)."""
+    global _arbiter
+    if _arbiter is None:
+        from signal_bot.config_signal import ARBITRATION_WINDOW_SECONDS, ARBITRATION_MAX_RESPONDERS
+        _arbiter = ResponseArbiter(ARBITRATION_WINDOW_SECONDS, ARBITRATION_MAX_RESPONDERS)
+    return _arbiter
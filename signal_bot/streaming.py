@@ -0,0 +1,200 @@
+"""
+Progressive delivery of streamed model output to Signal.
+
+The model call runs in a worker thread and feeds text chunks to
+``SignalStreamer.on_chunk`` (only from rounds that end without tool calls, so
+tool preambles never reach the chat). The streamer hops back onto the event loop,
+sends the first complete sentence as a new message as soon as it exists, and
+then edits that message with the growing text at a limited rate (Signal caps
+how often a message can be edited). ``finish`` applies the final, fully
+parsed text once generation completes.
+"""
+
+import asyncio
+import logging
+import re
+import time
+from typing import Awaitable, Callable, Optional
+
+from signal_bot.config_signal import (
+    STREAM_MIN_FIRST_CHARS,
+    STREAM_EDIT_INTERVAL_SECONDS,
+    STREAM_MAX_EDITS,
+)
+
+logger = logging.getLogger(__name__)
+
+# End of a sentence (optionally followed by closing quotes/brackets) or a line break
+SENTENCE_END = re.compile(r'[.!?…]["\')\]]*\s|\n')
+
+
+class SignalStreamer:
+    """Turns a stream of text chunks into one Signal message plus edits."""
+
+    def __init__(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        send_first: Callable[[str, list], Awaitable[tuple[bool, Optional[int]]]],
+        edit: Callable[[int, str, list], Awaitable[bool]],
+        render: Callable[[str], tuple[str, list]],
+        on_first_visible: Optional[Callable[[], None]] = None,
+        not_before: float = 0.0,
+    ):
+        """
+        Args:
+            loop: Event loop the Signal callbacks run on
+            send_first: Coroutine (text, text_styles) -> (sent, message timestamp or None)
+            edit: Coroutine (timestamp, text, text_styles) -> success
+            render: Converts raw model text into (display_text, text_styles)
+            on_first_visible: Called once when the first text is visible in the chat
+            not_before: time.monotonic() value before which nothing is sent (response delay floor)
+        """
+        self.loop = loop
+        self.send_first = send_first
+        self.edit = edit
+        self.render = render
+        self.on_first_visible = on_first_visible
+        self.not_before = not_before
+
+        self._buffer = ""
+        self._timestamp: Optional[int] = None
+        self._first_attempted = False
+        self._first_sent = False
+        self._shown = ""
+        self._edits = 0
+        self._last_update = 0.0
+        self._task: Optional[asyncio.Task] = None
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._finished = False
+
+    @property
+    def committed(self) -> bool:
+        """Whether sending has begun (the response can no longer be silently dropped)."""
+        return self._first_attempted
+
+    @property
+    def started(self) -> bool:
+        """Whether a message has been sent for this stream."""
+        return self._timestamp is not None
+
+    def on_chunk(self, chunk: str):
+        """Stream callback; safe to call from the worker thread running the model."""
+        if chunk:
+            self.loop.call_soon_threadsafe(self._feed, chunk)
+
+    def cancel(self):
+        """Stop without sending anything further (response was superseded)."""
+        self._finished = True
+        if self._flush_handle:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+
+    def _feed(self, chunk: str):
+        if self._finished:
+            return
+        self._buffer += chunk
+        self._maybe_flush()
+
+    def _maybe_flush(self):
+        """Send or edit if there's something new to show and we're allowed to."""
+        if self._finished or (self._task and not self._task.done()):
+            return  # Re-checked when the in-flight request completes
+
+        if not self._first_attempted:
+            text = self._complete_sentences()
+            wait = self.not_before - time.monotonic()
+            if text and wait > 0:
+                if self._flush_handle is None:
+                    self._flush_handle = self.loop.call_later(wait, self._on_timer)
+            elif text:
+                self._first_attempted = True
+                self._task = self.loop.create_task(self._send_first(text))
+            return
+
+        if self._timestamp is None or self._edits >= STREAM_MAX_EDITS - 1:
+            return  # First send failed, or only the final edit is left
+
+        text = self._complete_words()
+        if not text or text == self._shown:
+            return
+
+        wait = STREAM_EDIT_INTERVAL_SECONDS - (time.monotonic() - self._last_update)
+        if wait > 0:
+            if self._flush_handle is None:
+                self._flush_handle = self.loop.call_later(wait, self._on_timer)
+            return
+
+        self._task = self.loop.create_task(self._edit(text))
+
+    def _on_timer(self):
+        self._flush_handle = None
+        self._maybe_flush()
+
+    def _complete_sentences(self) -> Optional[str]:
+        """Buffer text up to the last sentence boundary, if long enough."""
+        last_end = None
+        for match in SENTENCE_END.finditer(self._buffer):
+            last_end = match.end()
+        if last_end is None:
+            return None
+        text = self._buffer[:last_end].strip()
+        return text if len(text) >= STREAM_MIN_FIRST_CHARS else None
+
+    def _complete_words(self) -> str:
+        """Buffer text up to the last whitespace (avoids showing half words)."""
+        cut = max(self._buffer.rfind(" "), self._buffer.rfind("\n"))
+        return self._buffer[:cut].strip() if cut > 0 else ""
+
+    async def _send_first(self, raw_text: str):
+        text, styles = self.render(raw_text)
+        if not text.strip():
+            self._first_attempted = False
+            return
+        self._first_sent, self._timestamp = await self.send_first(text, styles)
+        self._last_update = time.monotonic()
+        if self._first_sent:
+            self._shown = raw_text
+            if self.on_first_visible:
+                self.on_first_visible()
+            logger.info(f"Streaming: first sentence sent ({len(text)} chars)")
+        self._after_request()
+
+    async def _edit(self, raw_text: str):
+        text, styles = self.render(raw_text)
+        if text.strip() and await self.edit(self._timestamp, text, styles):
+            self._edits += 1
+            self._shown = raw_text
+        self._last_update = time.monotonic()
+        self._after_request()
+
+    def _after_request(self):
+        if not self._finished:
+            self.loop.call_soon(self._maybe_flush)
+
+    async def finish(self, final_text: str, text_styles: Optional[list]) -> bool:
+        """
+        Apply the final text once generation is done.
+
+        Args:
+            final_text: Fully parsed response text to display
+            text_styles: Signal text styles for final_text
+
+        Returns:
+            True if the response is now visible via the streamed message,
+            False if there is no editable message (the caller should send normally).
+        """
+        self._finished = True
+        if self._flush_handle:
+            self._flush_handle.cancel()
+        if self._task and not self._task.done():
+            await self._task
+
+        if self._timestamp is None:
+            if self._first_sent:
+                # Delivered without a timestamp (partial delivery) - can't edit it
+                logger.warning("Streaming: first message has no timestamp, sending full response instead")
+            return False
+
+        if final_text.strip():
+            await self.edit(self._timestamp, final_text, text_styles or [])
+        return True
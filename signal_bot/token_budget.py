@@ -0,0 +1,126 @@
+"""
+Local token estimation and per-bot prompt token budgets.
+
+The estimator is a dependency-free approximation of BPE tokenizers: short
+ASCII words are usually one token, longer ones split roughly every four
+characters, punctuation is a token of its own, and non-ASCII text (CJK,
+emoji) costs about a token per character. It deliberately errs on the high
+side so a budget computed from it is safe to send.
+"""
+
+import json
+import logging
+import re
+import threading
+import time
+from typing import Optional
+
+from signal_bot.config_signal import (
+    DEFAULT_CONTEXT_TOKEN_BUDGET,
+    CONTEXT_BUDGET_MODEL_FRACTION,
+    IMAGE_TOKEN_ESTIMATE,
+    MODEL_CONTEXT_LENGTH_TTL_SECONDS,
+)
+
+logger = logging.getLogger(__name__)
+
+MESSAGE_OVERHEAD_TOKENS = 4  # Role markers and separators per chat message
+
+_PIECE_PATTERN = re.compile(r"\w+|[^\w\s]")
+
+
+def estimate_tokens(text: Optional[str]) -> int:
+    """Estimate the number of tokens in a piece of text."""
+    if not text:
+        return 0
+
+    tokens = 0
+    for match in _PIECE_PATTERN.finditer(text):
+        piece = match.group()
+        if not piece.isascii():
+            tokens += len(piece)
+        elif len(piece) <= 4:
+            tokens += 1
+        else:
+            tokens += (len(piece) + 3) // 4
+    return tokens
+
+
+def estimate_content_tokens(content) -> int:
+    """Estimate tokens for message content (plain text or structured parts with images)."""
+    if isinstance(content, str):
+        return estimate_tokens(content)
+    if not isinstance(content, list):
+        return 0
+
+    tokens = 0
+    for part in content:
+        part_type = part.get("type")
+        if part_type == "text":
+            tokens += estimate_tokens(part.get("text", ""))
+        elif part_type in ("image", "image_url"):
+            tokens += IMAGE_TOKEN_ESTIMATE
+    return tokens
+
+
+def estimate_message_tokens(message: dict) -> int:
+    """Estimate tokens for one chat message including per-message overhead."""
+    return estimate_content_tokens(message.get("content")) + MESSAGE_OVERHEAD_TOKENS
+
+
+def estimate_tools_tokens(tools: Optional[list]) -> int:
+    """Estimate tokens for a tool schema list.
+
+    Schemas are dense JSON, so a character count is both faster and closer
+    than the word-based estimate.
+    """
+    if not tools:
+        return 0
+    encoded = getattr(tools, "json_bytes", None)  # ToolBundles carry their encoding
+    if encoded is not None:
+        return len(encoded) // 3
+    return len(json.dumps(tools, separators=(",", ":"))) // 3
+
+
+# Model context lengths (from CustomModel) keyed by model ID, with load time
+_context_lengths: dict[str, tuple[Optional[int], float]] = {}
+_lock = threading.Lock()
+
+
+def get_model_context_length(model_id: str) -> Optional[int]:
+    """Get a model's context length from the custom models table (cached), if known."""
+    with _lock:
+        cached = _context_lengths.get(model_id)
+    if cached and time.monotonic() - cached[1] < MODEL_CONTEXT_LENGTH_TTL_SECONDS:
+        return cached[0]
+
+    context_length = None
+    try:
+        from signal_bot.db_session import db_session
+        from signal_bot.models import CustomModel
+
+        with db_session():
+            model = CustomModel.query.get(model_id)
+            context_length = model.context_length if model else None
+    except Exception as e:
+        logger.warning(f"Could not look up context length for {model_id}: {e}")
+
+    with _lock:
+        _context_lengths[model_id] = (context_length, time.monotonic())
+    return context_length
+
+
+def get_context_token_budget(bot_data: dict, model_id: str) -> int:
+    """
+    Total prompt token budget for a bot.
+
+    Uses the bot's context_token_budget setting (or the default), capped to a
+    fraction of the model's context length when that is known, leaving room
+    for tool results and the response.
+    """
+    budget = bot_data.get('context_token_budget') or DEFAULT_CONTEXT_TOKEN_BUDGET
+
+    context_length = get_model_context_length(model_id)
+    if context_length:
+        budget = min(budget, int(context_length * CONTEXT_BUDGET_MODEL_FRACTION))
+    return budget
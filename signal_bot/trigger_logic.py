@@ -6,6 +6,11 @@ from typing import Optional, Union
 
 from signal_bot.models import Bot
 
+# Reasons meaning someone is waiting on this bot's reply (the rest are random chance)
+ADDRESSED_REASONS = frozenset({
+    "native_mention", "reply_to_bot", "direct_message", "mentioned", "command_trigger",
+})
+
 
 def should_bot_respond(
     bot_data: Union[Bot, dict],
@@ -210,6 +210,10 @@ class TriggerScheduler:
                     port=signal_api_port
                 )
 
+            # Generation runs in a worker thread, so schedule sends back onto this loop
+            from signal_bot.bot_manager import schedule_on_loop
+            loop = asyncio.get_running_loop()
+
             # Call message handler as if this were a @mention
             # The instructions become the "message" that triggers the AI
             await self.bot_manager.message_handler.handle_incoming_message(
@@ -219,8 +223,8 @@ class TriggerScheduler:
                 message_text=trigger_content,
                 bot_data=bot_data,
                 is_mentioned=True,  # Force response
-                send_callback=lambda t, *a, **k: asyncio.create_task(send_text(t, *a, **k)),
-                send_image_callback=lambda p: asyncio.create_task(send_image(p))
+                send_callback=lambda t, *a, **k: schedule_on_loop(loop, send_text(t, *a, **k)),
+                send_image_callback=lambda p: schedule_on_loop(loop, send_image(p))
             )
 
             logger.info(f"Task executed for trigger {trigger_id}")
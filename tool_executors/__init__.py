@@ -4,6 +4,8 @@ Tool executors package for OpenRouter native function calling.
 This package contains tool execution classes organized by category:
 - signal_executor: SignalToolExecutor for Signal bots
 - base: Base classes and utility functions
+- registry: @tool decorator mapping tool names to handler methods
+- cache: TTL result cache for idempotent tools
 - basic_tools: Weather, time, Wikipedia, dice, reaction mixins
 - finance_executor: Stock/crypto financial data mixins
 - sheets_core: Core Google Sheets operations mixins
@@ -19,8 +21,14 @@ from .signal_executor import SignalToolExecutor
 # Utility functions
 from .base import create_tool_executor_callback, process_tool_calls
 
+# Tool handler registry
+from .registry import TOOL_REGISTRY, ToolSpec, get_tool_spec
+
 __all__ = [
     'SignalToolExecutor',
     'create_tool_executor_callback',
     'process_tool_calls',
+    'TOOL_REGISTRY',
+    'ToolSpec',
+    'get_tool_spec',
 ]
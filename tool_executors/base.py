@@ -26,7 +26,8 @@ class SignalToolExecutorBase:
         send_image_callback: Optional[Callable[[str], None]] = None,
         send_reaction_callback: Optional[Callable[[str, int, str], None]] = None,
         reaction_metadata: Optional[list[dict]] = None,
-        max_reactions: int = 3
+        max_reactions: int = 3,
+        cancel_token=None
     ):
         """
         Args:
@@ -36,6 +37,8 @@ class SignalToolExecutorBase:
             send_reaction_callback: Optional callback to send emoji reactions (sender_id, timestamp, emoji)
             reaction_metadata: List of dicts with message index, sender_id, and signal_timestamp
             max_reactions: Maximum reactions allowed per response
+            cancel_token: signal_bot.cancellation.CancelToken for the response; side-effecting tools
+                are refused once it is cancelled
         """
         self.bot_data = bot_data
         self.group_id = group_id
@@ -43,6 +46,7 @@ class SignalToolExecutorBase:
         self.send_reaction_callback = send_reaction_callback
         self.reaction_metadata = reaction_metadata or []
         self.max_reactions = max_reactions
+        self.cancel_token = cancel_token
         self.reactions_sent = 0  # Track reactions sent in this response
         self.sender_name = None  # Set by message handler for sheet attribution
 
@@ -50,6 +54,7 @@ class SignalToolExecutorBase:
         self.expansion_requested = False
         self.expanded_categories = {}  # {"finance": "finance_quotes", "sheets": "sheets_core"}
         self.last_meta_intent = None  # Track intent from the most recent meta-tool call
+        self.tools_called = []  # Names of tools called, logged as tool router training data
 
     def _sheets_enabled(self) -> bool:
         """Check if Google Sheets is enabled for this bot."""
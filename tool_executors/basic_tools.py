@@ -7,6 +7,8 @@ Contains weather, time, Wikipedia, dice, and reaction tool methods.
 import logging
 from typing import TYPE_CHECKING, Callable, Optional
 
+from .registry import tool
+
 logger = logging.getLogger(__name__)
 
 
@@ -20,6 +22,7 @@ class BasicToolsMixin:
     max_reactions: int
     reactions_sent: int
 
+    @tool("get_weather", category="weather", timeout=15, cache_ttl=600)
     def _execute_weather(self, arguments: dict) -> dict:
         """Execute the get_weather tool call."""
         if not self.bot_data.get('weather_enabled'):
@@ -52,6 +55,7 @@ class BasicToolsMixin:
 
     # Time tool execution methods
 
+    @tool("get_datetime", category="time")
     def _execute_get_datetime(self, arguments: dict) -> dict:
         """Execute the get_datetime tool call."""
         if not self.bot_data.get('time_enabled'):
@@ -77,6 +81,7 @@ class BasicToolsMixin:
             logger.error(f"Error getting datetime: {e}")
             return {"success": False, "message": f"Error getting datetime: {str(e)}"}
 
+    @tool("get_unix_timestamp", category="time")
     def _execute_get_unix_timestamp(self, arguments: dict) -> dict:
         """Execute the get_unix_timestamp tool call."""
         if not self.bot_data.get('time_enabled'):
@@ -99,6 +104,7 @@ class BasicToolsMixin:
 
     # Wikipedia tool execution methods
 
+    @tool("search_wikipedia", category="wikipedia", timeout=15, cache_ttl=86400)
     def _execute_search_wikipedia(self, arguments: dict) -> dict:
         """Execute the search_wikipedia tool call."""
         if not self.bot_data.get('wikipedia_enabled'):
@@ -128,6 +134,7 @@ class BasicToolsMixin:
             logger.error(f"Error searching Wikipedia: {e}")
             return {"success": False, "message": f"Error searching Wikipedia: {str(e)}"}
 
+    @tool("get_wikipedia_article", category="wikipedia", timeout=15, cache_ttl=86400)
     def _execute_get_wikipedia_article(self, arguments: dict) -> dict:
         """Execute the get_wikipedia_article tool call."""
         if not self.bot_data.get('wikipedia_enabled'):
@@ -156,6 +163,7 @@ class BasicToolsMixin:
             logger.error(f"Error getting Wikipedia article: {e}")
             return {"success": False, "message": f"Error getting Wikipedia article: {str(e)}"}
 
+    @tool("get_random_wikipedia_article", category="wikipedia", timeout=15)
     def _execute_random_wikipedia_article(self, arguments: dict) -> dict:
         """Execute the get_random_wikipedia_article tool call."""
         if not self.bot_data.get('wikipedia_enabled'):
@@ -182,6 +190,7 @@ class BasicToolsMixin:
     # Finance tool execution methods
 
     # Reaction tool
+    @tool("react_to_message", category="reaction", side_effects=True)
     def _execute_react_to_message(self, arguments: dict) -> dict:
         """Execute the react_to_message tool call."""
         if not self.bot_data.get('reaction_tool_enabled'):
@@ -243,6 +252,7 @@ class BasicToolsMixin:
     # Google Sheets tool execution methods
 
     # Dice rolling tool
+    @tool("roll_dice", category="dice")
     def _execute_roll_dice(self, arguments: dict) -> dict:
         """Execute the roll_dice tool call for tabletop gaming."""
         try:
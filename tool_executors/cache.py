@@ -0,0 +1,130 @@
+"""
+Shared TTL cache for idempotent tool results.
+
+Tools registered with a cache_ttl (weather, Wikipedia, finance data) return
+the same answer for the same arguments for a while, and groups ask the same
+things repeatedly. Successful results are kept per (tool, normalised
+arguments) for the tool's TTL, shared by all bots, in a size-bounded LRU.
+Concurrent identical calls are de-duplicated: one caller runs the tool and
+the others wait for its result (single-flight).
+
+Hits, misses and coalesced calls are counted per bot in signal_bot.metrics
+(tool_cache_hits / tool_cache_misses / tool_cache_coalesced).
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Optional
+
+from .registry import ToolSpec
+
+# Arguments compared upper-cased (tickers)
+UPPERCASE_ARGUMENTS = frozenset({"symbol", "symbols", "ticker"})
+# Arguments the tools treat case-insensitively (places, searches, enum-like options). Other
+# strings keep their case: "Red dwarf" and "Red Dwarf" are different Wikipedia articles
+CASEFOLD_ARGUMENTS = frozenset({"location", "query", "entity_type", "sector", "period", "interval", "option_type"})
+
+
+def _normalize(name: Optional[str], value: Any):
+    """Hashable, whitespace-insensitive form of an argument value (case-insensitive where allowed)."""
+    if isinstance(value, str):
+        value = " ".join(value.split())
+        if name in UPPERCASE_ARGUMENTS:
+            return value.upper()
+        return value.casefold() if name in CASEFOLD_ARGUMENTS else value
+    if isinstance(value, dict):
+        return tuple(sorted(((k, _normalize(k, v)) for k, v in value.items()), key=lambda item: item[0]))
+    if isinstance(value, (list, tuple)):
+        return tuple(_normalize(name, v) for v in value)
+    return value
+
+
+def make_cache_key(tool_name: str, arguments: Optional[dict]) -> tuple:
+    """Cache key for a tool call: "AAPL " and "aapl" or location "New  York" and "new york" share a key."""
+    return tool_name, _normalize(None, arguments or {})
+
+
+class _Flight:
+    """A tool call in progress that identical calls can wait on."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error: Optional[BaseException] = None
+
+
+class ToolResultCache:
+    """LRU cache of successful tool results with per-tool TTLs and single-flight calls."""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: OrderedDict = OrderedDict()  # key -> (expires_at, result)
+        self._in_flight: dict[tuple, _Flight] = {}
+        self._lock = threading.Lock()
+
+    def call(self, spec: ToolSpec, arguments: dict, compute: Callable[[], dict],
+             bot_id: Optional[str] = None) -> dict:
+        """Return a cached result for the call, or run compute() (once for concurrent identical calls)."""
+        from signal_bot import metrics
+
+        key = make_cache_key(spec.name, arguments)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] > time.monotonic():
+                    self._entries.move_to_end(key)
+                    metrics.increment(bot_id, "tool_cache_hits")
+                    return dict(entry[1])
+                del self._entries[key]
+            flight = self._in_flight.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._in_flight[key] = _Flight()
+
+        if not leader:
+            metrics.increment(bot_id, "tool_cache_coalesced")
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return dict(flight.result) if isinstance(flight.result, dict) else flight.result
+
+        metrics.increment(bot_id, "tool_cache_misses")
+        try:
+            result = compute()
+            flight.result = result
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._in_flight[key]
+                if isinstance(flight.result, dict) and flight.result.get("success"):
+                    self._entries[key] = (time.monotonic() + spec.cache_ttl, flight.result)
+                    self._entries.move_to_end(key)
+                    while len(self._entries) > self.max_entries:
+                        self._entries.popitem(last=False)
+            flight.done.set()
+        return result
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+_tool_cache: Optional[ToolResultCache] = None
+_tool_cache_lock = threading.Lock()
+
+
+def get_tool_cache() -> ToolResultCache:
+    """Get the process-wide tool result cache."""
+    global _tool_cache
+    if _tool_cache is None:
+        with _tool_cache_lock:
+            if _tool_cache is None:
+                from signal_bot.config_signal import TOOL_CACHE_MAX_ENTRIES
+                _tool_cache = ToolResultCache(TOOL_CACHE_MAX_ENTRIES)
+    return _tool_cache
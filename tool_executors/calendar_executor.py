@@ -7,6 +7,8 @@ Contains Google Calendar and scheduled trigger tool methods.
 import logging
 from typing import Optional
 
+from .registry import tool
+
 logger = logging.getLogger(__name__)
 
 
@@ -25,6 +27,7 @@ class CalendarTriggersMixin:
             self.bot_data.get('google_connected', False)
         )
 
+    @tool("create_calendar", category="calendar", timeout=30, side_effects=True)
     def _execute_create_calendar(self, arguments: dict) -> dict:
         """Execute the create_calendar tool call."""
         if not self._calendar_enabled():
@@ -75,6 +78,7 @@ class CalendarTriggersMixin:
             logger.error(f"Error creating calendar: {e}")
             return {"success": False, "message": f"Error creating calendar: {str(e)}"}
 
+    @tool("list_calendars", category="calendar", timeout=30)
     def _execute_list_calendars(self, arguments: dict) -> dict:
         """Execute the list_calendars tool call."""
         if not self._calendar_enabled():
@@ -101,6 +105,7 @@ class CalendarTriggersMixin:
             logger.error(f"Error listing calendars: {e}")
             return {"success": False, "message": f"Error listing calendars: {str(e)}"}
 
+    @tool("list_events", category="calendar", timeout=30)
     def _execute_list_events(self, arguments: dict) -> dict:
         """Execute the list_events tool call."""
         if not self._calendar_enabled():
@@ -138,6 +143,7 @@ class CalendarTriggersMixin:
             logger.error(f"Error listing events: {e}")
             return {"success": False, "message": f"Error listing events: {str(e)}"}
 
+    @tool("get_event", category="calendar", timeout=30)
     def _execute_get_event(self, arguments: dict) -> dict:
         """Execute the get_event tool call."""
         if not self._calendar_enabled():
@@ -163,6 +169,7 @@ class CalendarTriggersMixin:
             logger.error(f"Error getting event: {e}")
             return {"success": False, "message": f"Error getting event: {str(e)}"}
 
+    @tool("create_event", category="calendar", timeout=30, side_effects=True)
     def _execute_create_event(self, arguments: dict) -> dict:
         """Execute the create_event tool call."""
         if not self._calendar_enabled():
@@ -233,6 +240,7 @@ class CalendarTriggersMixin:
             logger.error(f"Error creating event: {e}")
             return {"success": False, "message": f"Error creating event: {str(e)}"}
 
+    @tool("update_event", category="calendar", timeout=30, side_effects=True)
     def _execute_update_event(self, arguments: dict) -> dict:
         """Execute the update_event tool call."""
         if not self._calendar_enabled():
@@ -271,6 +279,7 @@ class CalendarTriggersMixin:
             logger.error(f"Error updating event: {e}")
             return {"success": False, "message": f"Error updating event: {str(e)}"}
 
+    @tool("delete_event", category="calendar", timeout=30, side_effects=True)
     def _execute_delete_event(self, arguments: dict) -> dict:
         """Execute the delete_event tool call."""
         if not self._calendar_enabled():
@@ -296,6 +305,7 @@ class CalendarTriggersMixin:
             logger.error(f"Error deleting event: {e}")
             return {"success": False, "message": f"Error deleting event: {str(e)}"}
 
+    @tool("quick_add_event", category="calendar", timeout=30, side_effects=True)
     def _execute_quick_add_event(self, arguments: dict) -> dict:
         """Execute the quick_add_event tool call."""
         if not self._calendar_enabled():
@@ -331,6 +341,7 @@ class CalendarTriggersMixin:
             logger.error(f"Error quick adding event: {e}")
             return {"success": False, "message": f"Error quick adding event: {str(e)}"}
 
+    @tool("share_calendar", category="calendar", timeout=30, side_effects=True)
     def _execute_share_calendar(self, arguments: dict) -> dict:
         """Execute the share_calendar tool call."""
         if not self._calendar_enabled():
@@ -381,6 +392,7 @@ class CalendarTriggersMixin:
     # Scheduled Trigger Tools
     # =========================================================================
 
+    @tool("create_trigger", category="triggers", side_effects=True)
     def _execute_create_trigger(self, arguments: dict) -> dict:
         """Execute the create_trigger tool call."""
         if not self.bot_data.get('triggers_enabled', True):
@@ -528,6 +540,7 @@ class CalendarTriggersMixin:
             logger.error(f"Error creating trigger: {e}", exc_info=True)
             return {"success": False, "message": f"Error creating trigger: {str(e)}"}
 
+    @tool("list_triggers", category="triggers")
     def _execute_list_triggers(self, arguments: dict) -> dict:
         """Execute the list_triggers tool call."""
         try:
@@ -587,6 +600,7 @@ class CalendarTriggersMixin:
             logger.error(f"Error listing triggers: {e}")
             return {"success": False, "message": f"Error listing triggers: {str(e)}"}
 
+    @tool("cancel_trigger", category="triggers", side_effects=True)
     def _execute_cancel_trigger(self, arguments: dict) -> dict:
         """Execute the cancel_trigger tool call."""
         try:
@@ -631,6 +645,7 @@ class CalendarTriggersMixin:
             logger.error(f"Error cancelling trigger: {e}")
             return {"success": False, "message": f"Error cancelling trigger: {str(e)}"}
 
+    @tool("update_trigger", category="triggers", side_effects=True)
     def _execute_update_trigger(self, arguments: dict) -> dict:
         """Execute the update_trigger tool call."""
         try:
@@ -8,6 +8,8 @@ import logging
 from datetime import datetime, timedelta
 from typing import TYPE_CHECKING
 
+from .registry import tool
+
 logger = logging.getLogger(__name__)
 
 
@@ -18,6 +20,7 @@ class ChatLogToolsMixin:
     bot_data: dict
     group_id: str
 
+    @tool("search_chat_log", category="chat_log")
     def _execute_search_chat_log(self, arguments: dict) -> dict:
         """Execute the search_chat_log tool call."""
         if not self.bot_data.get('chat_log_enabled'):
@@ -88,6 +91,7 @@ class ChatLogToolsMixin:
             logger.error(f"Error searching chat log: {e}")
             return {"success": False, "message": f"Error searching chat log: {str(e)}"}
 
+    @tool("get_chat_log_summary", category="chat_log")
     def _execute_get_chat_log_summary(self, arguments: dict) -> dict:
         """Execute the get_chat_log_summary tool call."""
         if not self.bot_data.get('chat_log_enabled'):
@@ -6,6 +6,8 @@ Contains D&D campaign management tool methods.
 
 import logging
 
+from .registry import tool
+
 logger = logging.getLogger(__name__)
 
 
@@ -20,6 +22,7 @@ class DndToolsMixin:
     # D&D GAME MASTER TOOL HANDLERS
     # =========================================================================
 
+    @tool("start_dnd_campaign", category="dnd", side_effects=True)
     def _execute_start_dnd_campaign(self, arguments: dict) -> dict:
         """Start a new D&D campaign with a structured spreadsheet."""
         try:
@@ -190,6 +193,7 @@ class DndToolsMixin:
             logger.error(f"Error starting D&D campaign: {e}")
             return {"success": False, "message": f"Error starting campaign: {str(e)}"}
 
+    @tool("get_campaign_state", category="dnd")
     def _execute_get_campaign_state(self, arguments: dict) -> dict:
         """Load the current state of a D&D campaign."""
         try:
@@ -395,6 +399,7 @@ class DndToolsMixin:
             logger.error(f"Error getting campaign state: {e}")
             return {"success": False, "message": f"Error loading campaign: {str(e)}"}
 
+    @tool("update_campaign_state", category="dnd", side_effects=True)
     def _execute_update_campaign_state(self, arguments: dict) -> dict:
         """Update the campaign state after significant events."""
         try:
@@ -505,6 +510,7 @@ class DndToolsMixin:
             logger.error(f"Error updating campaign state: {e}")
             return {"success": False, "message": f"Error updating campaign: {str(e)}"}
 
+    @tool("create_character", category="dnd", side_effects=True)
     def _execute_create_character(self, arguments: dict) -> dict:
         """Create a new player character."""
         try:
@@ -610,6 +616,7 @@ class DndToolsMixin:
             logger.error(f"Error creating character: {e}")
             return {"success": False, "message": f"Error creating character: {str(e)}"}
 
+    @tool("update_character", category="dnd", side_effects=True)
     def _execute_update_character(self, arguments: dict) -> dict:
         """Update a character's stats."""
         try:
@@ -709,6 +716,7 @@ class DndToolsMixin:
             logger.error(f"Error updating character: {e}")
             return {"success": False, "message": f"Error updating character: {str(e)}"}
 
+    @tool("start_combat", category="dnd", side_effects=True)
     def _execute_start_combat(self, arguments: dict) -> dict:
         """Initialize a combat encounter."""
         try:
@@ -843,6 +851,7 @@ class DndToolsMixin:
             logger.error(f"Error starting combat: {e}")
             return {"success": False, "message": f"Error starting combat: {str(e)}"}
 
+    @tool("end_combat", category="dnd", side_effects=True)
     def _execute_end_combat(self, arguments: dict) -> dict:
         """End a combat encounter."""
         try:
@@ -958,6 +967,7 @@ class DndToolsMixin:
             logger.error(f"Error ending combat: {e}")
             return {"success": False, "message": f"Error ending combat: {str(e)}"}
 
+    @tool("add_npc", category="dnd", side_effects=True)
     def _execute_add_npc(self, arguments: dict) -> dict:
         """Add a new NPC to the campaign."""
         try:
@@ -1026,6 +1036,7 @@ class DndToolsMixin:
             logger.error(f"Error adding NPC: {e}")
             return {"success": False, "message": f"Error adding NPC: {str(e)}"}
 
+    @tool("add_location", category="dnd", side_effects=True)
     def _execute_add_location(self, arguments: dict) -> dict:
         """Add a new location to the campaign."""
         try:
@@ -1094,6 +1105,7 @@ class DndToolsMixin:
             logger.error(f"Error adding location: {e}")
             return {"success": False, "message": f"Error adding location: {str(e)}"}
 
+    @tool("list_campaigns", category="dnd")
     def _execute_list_campaigns(self, arguments: dict) -> dict:
         """List all D&D campaigns for this group."""
         try:
@@ -1144,6 +1156,7 @@ class DndToolsMixin:
     # NEW CAMPAIGN SETUP TOOL HANDLERS
     # =========================================================================
 
+    @tool("generate_locations", category="dnd", side_effects=True)
     def _execute_generate_locations(self, arguments: dict) -> dict:
         """Generate locations for a campaign based on setting and size."""
         try:
@@ -1180,6 +1193,7 @@ class DndToolsMixin:
             logger.error(f"Error generating locations: {e}")
             return {"success": False, "message": f"Error generating locations: {str(e)}"}
 
+    @tool("save_locations", category="dnd", side_effects=True)
     def _execute_save_locations(self, arguments: dict) -> dict:
         """Save generated locations to the campaign spreadsheet."""
         try:
@@ -1232,6 +1246,7 @@ class DndToolsMixin:
             logger.error(f"Error saving locations: {e}")
             return {"success": False, "message": f"Error saving locations: {str(e)}"}
 
+    @tool("assign_route", category="dnd", side_effects=True)
     def _execute_assign_route(self, arguments: dict) -> dict:
         """Determine start and end locations via dice rolls."""
         try:
@@ -1373,6 +1388,7 @@ class DndToolsMixin:
             logger.error(f"Error assigning route: {e}")
             return {"success": False, "message": f"Error assigning route: {str(e)}"}
 
+    @tool("generate_npcs_for_location", category="dnd", side_effects=True)
     def _execute_generate_npcs_for_location(self, arguments: dict) -> dict:
         """Auto-generate NPCs for a specific location."""
         try:
@@ -1472,6 +1488,7 @@ class DndToolsMixin:
             logger.error(f"Error generating NPCs: {e}")
             return {"success": False, "message": f"Error generating NPCs: {str(e)}"}
 
+    @tool("finalize_starting_items", category="dnd", side_effects=True)
     def _execute_finalize_starting_items(self, arguments: dict) -> dict:
         """Confirm starting equipment and add special items."""
         try:
@@ -1593,6 +1610,7 @@ class DndToolsMixin:
             logger.error(f"Error finalizing items: {e}")
             return {"success": False, "message": f"Error finalizing items: {str(e)}"}
 
+    @tool("update_campaign_phase", category="dnd", side_effects=True)
     def _execute_update_campaign_phase(self, arguments: dict) -> dict:
         """Update the campaign's current phase."""
         try:
@@ -1677,6 +1695,7 @@ class DndToolsMixin:
     # TURN & EVENT LOGGING TOOL HANDLERS
     # =========================================================================
 
+    @tool("complete_turn", category="dnd", side_effects=True)
     def _execute_complete_turn(self, arguments: dict) -> dict:
         """Complete a combat turn with HP updates, conditions, and initiative advancement."""
         try:
@@ -1956,6 +1975,7 @@ class DndToolsMixin:
             logger.error(f"Error completing turn: {e}")
             return {"success": False, "message": f"Error completing turn: {str(e)}"}
 
+    @tool("log_event", category="dnd", side_effects=True)
     def _execute_log_event(self, arguments: dict) -> dict:
         """Log an exploration or story event."""
         try:
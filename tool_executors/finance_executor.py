@@ -6,6 +6,8 @@ Contains stock quote, news, search, and financial data tool methods.
 
 import logging
 
+from .registry import tool
+
 logger = logging.getLogger(__name__)
 
 
@@ -15,6 +17,7 @@ class FinanceToolsMixin:
     # Type hints for attributes provided by SignalToolExecutorBase
     bot_data: dict
 
+    @tool("get_stock_quote", category="finance", timeout=30, cache_ttl=30)
     def _execute_stock_quote(self, arguments: dict) -> dict:
         """Execute the get_stock_quote tool call."""
         if not self.bot_data.get('finance_enabled'):
@@ -42,6 +45,7 @@ class FinanceToolsMixin:
             logger.error(f"Error getting stock quote: {e}")
             return {"success": False, "message": f"Error getting stock quote: {str(e)}"}
 
+    @tool("get_stock_news", category="finance", timeout=30, cache_ttl=300)
     def _execute_stock_news(self, arguments: dict) -> dict:
         """Execute the get_stock_news tool call."""
         if not self.bot_data.get('finance_enabled'):
@@ -71,6 +75,7 @@ class FinanceToolsMixin:
             logger.error(f"Error getting stock news: {e}")
             return {"success": False, "message": f"Error getting stock news: {str(e)}"}
 
+    @tool("search_stocks", category="finance", timeout=30, cache_ttl=3600)
     def _execute_search_stocks(self, arguments: dict) -> dict:
         """Execute the search_stocks tool call."""
         if not self.bot_data.get('finance_enabled'):
@@ -100,6 +105,7 @@ class FinanceToolsMixin:
             logger.error(f"Error searching stocks: {e}")
             return {"success": False, "message": f"Error searching stocks: {str(e)}"}
 
+    @tool("get_top_stocks", category="finance", timeout=30, cache_ttl=60)
     def _execute_top_stocks(self, arguments: dict) -> dict:
         """Execute the get_top_stocks tool call."""
         if not self.bot_data.get('finance_enabled'):
@@ -127,6 +133,7 @@ class FinanceToolsMixin:
             logger.error(f"Error getting top stocks: {e}")
             return {"success": False, "message": f"Error getting top stocks: {str(e)}"}
 
+    @tool("get_price_history", category="finance", timeout=30, cache_ttl=300)
     def _execute_price_history(self, arguments: dict) -> dict:
         """Execute the get_price_history tool call."""
         if not self.bot_data.get('finance_enabled'):
@@ -157,6 +164,7 @@ class FinanceToolsMixin:
             logger.error(f"Error getting price history: {e}")
             return {"success": False, "message": f"Error getting price history: {str(e)}"}
 
+    @tool("get_options", category="finance", timeout=30, cache_ttl=60)
     def _execute_options(self, arguments: dict) -> dict:
         """Execute the get_options tool call."""
         if not self.bot_data.get('finance_enabled'):
@@ -187,6 +195,7 @@ class FinanceToolsMixin:
             logger.error(f"Error getting options: {e}")
             return {"success": False, "message": f"Error getting options: {str(e)}"}
 
+    @tool("get_earnings", category="finance", timeout=30, cache_ttl=3600)
     def _execute_earnings(self, arguments: dict) -> dict:
         """Execute the get_earnings tool call."""
         if not self.bot_data.get('finance_enabled'):
@@ -216,6 +225,7 @@ class FinanceToolsMixin:
             logger.error(f"Error getting earnings: {e}")
             return {"success": False, "message": f"Error getting earnings: {str(e)}"}
 
+    @tool("get_analyst_ratings", category="finance", timeout=30, cache_ttl=3600)
     def _execute_analyst_ratings(self, arguments: dict) -> dict:
         """Execute the get_analyst_ratings tool call."""
         if not self.bot_data.get('finance_enabled'):
@@ -243,6 +253,7 @@ class FinanceToolsMixin:
             logger.error(f"Error getting analyst ratings: {e}")
             return {"success": False, "message": f"Error getting analyst ratings: {str(e)}"}
 
+    @tool("get_dividends", category="finance", timeout=30, cache_ttl=3600)
     def _execute_dividends(self, arguments: dict) -> dict:
         """Execute the get_dividends tool call."""
         if not self.bot_data.get('finance_enabled'):
@@ -272,6 +283,7 @@ class FinanceToolsMixin:
             logger.error(f"Error getting dividends: {e}")
             return {"success": False, "message": f"Error getting dividends: {str(e)}"}
 
+    @tool("get_financials", category="finance", timeout=30, cache_ttl=3600)
     def _execute_financials(self, arguments: dict) -> dict:
         """Execute the get_financials tool call."""
         if not self.bot_data.get('finance_enabled'):
@@ -301,6 +313,7 @@ class FinanceToolsMixin:
             logger.error(f"Error getting financials: {e}")
             return {"success": False, "message": f"Error getting financials: {str(e)}"}
 
+    @tool("get_holders", category="finance", timeout=30, cache_ttl=3600)
     def _execute_holders(self, arguments: dict) -> dict:
         """Execute the get_holders tool call."""
         if not self.bot_data.get('finance_enabled'):
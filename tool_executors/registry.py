@@ -0,0 +1,68 @@
+"""
+Tool handler registry for the Signal tool executor.
+
+Executor methods register themselves for a tool name with the ``@tool``
+decorator, along with metadata the executor and callers can use:
+
+- category: tool group (weather, finance, sheets, ...)
+- timeout: seconds before an async handler is cancelled (sync handlers that
+  run over are logged, they can't be interrupted safely)
+- cache_ttl: seconds a successful result may be reused for identical calls
+  (the result depends only on the arguments for that long; see cache.py)
+- side_effects: the call changes something outside the bot (sends, writes)
+
+Dispatch is a single dict lookup; see SignalToolExecutor.execute.
+"""
+
+import inspect
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+
+@dataclass(frozen=True)
+class ToolSpec:
+    """A registered tool handler and its metadata."""
+    name: str
+    handler: Callable  # Unbound executor method: handler(executor, arguments) -> dict
+    category: str
+    timeout: Optional[float] = None
+    cache_ttl: Optional[float] = None
+    side_effects: bool = False
+    is_async: bool = False
+
+    @property
+    def cacheable(self) -> bool:
+        return self.cache_ttl is not None
+
+
+TOOL_REGISTRY: dict[str, ToolSpec] = {}
+
+
+def tool(
+    name: str,
+    category: str,
+    timeout: Optional[float] = None,
+    cache_ttl: Optional[float] = None,
+    side_effects: bool = False
+):
+    """Register an executor method as the handler for a tool."""
+    def decorator(func: Callable) -> Callable:
+        existing = TOOL_REGISTRY.get(name)
+        if existing and existing.handler.__qualname__ != func.__qualname__:
+            raise ValueError(f"Tool '{name}' already registered by {existing.handler.__qualname__}")
+        TOOL_REGISTRY[name] = ToolSpec(
+            name=name,
+            handler=func,
+            category=category,
+            timeout=timeout,
+            cache_ttl=cache_ttl,
+            side_effects=side_effects,
+            is_async=inspect.iscoroutinefunction(func),
+        )
+        return func
+    return decorator
+
+
+def get_tool_spec(name: str) -> Optional[ToolSpec]:
+    """Look up a registered tool by name."""
+    return TOOL_REGISTRY.get(name)
@@ -6,6 +6,8 @@ Contains advanced spreadsheet operations: charts, pivots, protection, groups, sl
 
 import logging
 
+from .registry import tool
+
 logger = logging.getLogger(__name__)
 
 
@@ -19,6 +21,7 @@ class SheetsAdvancedMixin:
     # Method provided by SheetsCoreMixin (declared here for type checking)
     def _sheets_enabled(self) -> bool: ...
 
+    @tool("set_text_format", category="sheets", timeout=60, side_effects=True)
     def _execute_set_text_format(self, arguments: dict) -> dict:
         """Execute the set_text_format tool call."""
         if not self._sheets_enabled():
@@ -60,6 +63,7 @@ class SheetsAdvancedMixin:
             logger.error(f"Error setting text format: {e}")
             return {"success": False, "message": f"Error setting text format: {str(e)}"}
 
+    @tool("set_text_color", category="sheets", timeout=60, side_effects=True)
     def _execute_set_text_color(self, arguments: dict) -> dict:
         """Execute the set_text_color tool call."""
         if not self._sheets_enabled():
@@ -99,6 +103,7 @@ class SheetsAdvancedMixin:
             logger.error(f"Error setting text color: {e}")
             return {"success": False, "message": f"Error setting text color: {str(e)}"}
 
+    @tool("set_background_color", category="sheets", timeout=60, side_effects=True)
     def _execute_set_background_color(self, arguments: dict) -> dict:
         """Execute the set_background_color tool call."""
         if not self._sheets_enabled():
@@ -138,6 +143,7 @@ class SheetsAdvancedMixin:
             logger.error(f"Error setting background color: {e}")
             return {"success": False, "message": f"Error setting background color: {str(e)}"}
 
+    @tool("add_hyperlink", category="sheets", timeout=60, side_effects=True)
     def _execute_add_hyperlink(self, arguments: dict) -> dict:
         """Execute the add_hyperlink tool call."""
         if not self._sheets_enabled():
@@ -181,6 +187,7 @@ class SheetsAdvancedMixin:
 
     # Filtering tool execution methods (Batch 2)
 
+    @tool("set_basic_filter", category="sheets", timeout=60, side_effects=True)
     def _execute_set_basic_filter(self, arguments: dict) -> dict:
         """Execute the set_basic_filter tool call."""
         if not self._sheets_enabled():
@@ -216,6 +223,7 @@ class SheetsAdvancedMixin:
             logger.error(f"Error setting basic filter: {e}")
             return {"success": False, "message": f"Error setting basic filter: {str(e)}"}
 
+    @tool("clear_basic_filter", category="sheets", timeout=60, side_effects=True)
     def _execute_clear_basic_filter(self, arguments: dict) -> dict:
         """Execute the clear_basic_filter tool call."""
         if not self._sheets_enabled():
@@ -249,6 +257,7 @@ class SheetsAdvancedMixin:
             logger.error(f"Error clearing basic filter: {e}")
             return {"success": False, "message": f"Error clearing basic filter: {str(e)}"}
 
+    @tool("create_filter_view", category="sheets", timeout=60, side_effects=True)
     def _execute_create_filter_view(self, arguments: dict) -> dict:
         """Execute the create_filter_view tool call."""
         if not self._sheets_enabled():
@@ -288,6 +297,7 @@ class SheetsAdvancedMixin:
             logger.error(f"Error creating filter view: {e}")
             return {"success": False, "message": f"Error creating filter view: {str(e)}"}
 
+    @tool("delete_filter_view", category="sheets", timeout=60, side_effects=True)
     def _execute_delete_filter_view(self, arguments: dict) -> dict:
         """Execute the delete_filter_view tool call."""
         if not self._sheets_enabled():
@@ -325,6 +335,7 @@ class SheetsAdvancedMixin:
 
     # Named & protected range tool execution methods (Batch 3)
 
+    @tool("create_named_range", category="sheets", timeout=60, side_effects=True)
     def _execute_create_named_range(self, arguments: dict) -> dict:
         """Execute the create_named_range tool call."""
         if not self._sheets_enabled():
@@ -364,6 +375,7 @@ class SheetsAdvancedMixin:
             logger.error(f"Error creating named range: {e}")
             return {"success": False, "message": f"Error creating named range: {str(e)}"}
 
+    @tool("delete_named_range", category="sheets", timeout=60, side_effects=True)
     def _execute_delete_named_range(self, arguments: dict) -> dict:
         """Execute the delete_named_range tool call."""
         if not self._sheets_enabled():
@@ -399,6 +411,7 @@ class SheetsAdvancedMixin:
             logger.error(f"Error deleting named range: {e}")
             return {"success": False, "message": f"Error deleting named range: {str(e)}"}
 
+    @tool("list_named_ranges", category="sheets", timeout=60)
     def _execute_list_named_ranges(self, arguments: dict) -> dict:
         """Execute the list_named_ranges tool call."""
         if not self._sheets_enabled():
@@ -430,6 +443,7 @@ class SheetsAdvancedMixin:
             logger.error(f"Error listing named ranges: {e}")
             return {"success": False, "message": f"Error listing named ranges: {str(e)}"}
 
+    @tool("protect_range", category="sheets", timeout=60, side_effects=True)
     def _execute_protect_range(self, arguments: dict) -> dict:
         """Execute the protect_range tool call."""
         if not self._sheets_enabled():
@@ -471,6 +485,7 @@ class SheetsAdvancedMixin:
 
     # Find/Replace & Copy/Paste tool execution methods (Batch 4)
 
+    @tool("find_replace", category="sheets", timeout=60, side_effects=True)
     def _execute_find_replace(self, arguments: dict) -> dict:
         """Execute the find_replace tool call."""
         if not self._sheets_enabled():
@@ -516,6 +531,7 @@ class SheetsAdvancedMixin:
             logger.error(f"Error in find/replace: {e}")
             return {"success": False, "message": f"Error in find/replace: {str(e)}"}
 
+    @tool("copy_paste", category="sheets", timeout=60, side_effects=True)
     def _execute_copy_paste(self, arguments: dict) -> dict:
         """Execute the copy_paste tool call."""
         if not self._sheets_enabled():
@@ -557,6 +573,7 @@ class SheetsAdvancedMixin:
             logger.error(f"Error in copy/paste: {e}")
             return {"success": False, "message": f"Error in copy/paste: {str(e)}"}
 
+    @tool("cut_paste", category="sheets", timeout=60, side_effects=True)
     def _execute_cut_paste(self, arguments: dict) -> dict:
         """Execute the cut_paste tool call."""
         if not self._sheets_enabled():
@@ -598,6 +615,7 @@ class SheetsAdvancedMixin:
 
     # Spreadsheet Properties tool execution methods (Batch 8)
 
+    @tool("set_spreadsheet_timezone", category="sheets", timeout=60, side_effects=True)
     def _execute_set_spreadsheet_timezone(self, arguments: dict) -> dict:
         """Execute the set_spreadsheet_timezone tool call."""
         if not self._sheets_enabled():
@@ -633,6 +651,7 @@ class SheetsAdvancedMixin:
             logger.error(f"Error setting timezone: {e}")
             return {"success": False, "message": f"Error setting timezone: {str(e)}"}
 
+    @tool("set_spreadsheet_locale", category="sheets", timeout=60, side_effects=True)
     def _execute_set_spreadsheet_locale(self, arguments: dict) -> dict:
         """Execute the set_spreadsheet_locale tool call."""
         if not self._sheets_enabled():
@@ -668,6 +687,7 @@ class SheetsAdvancedMixin:
             logger.error(f"Error setting locale: {e}")
             return {"success": False, "message": f"Error setting locale: {str(e)}"}
 
+    @tool("set_recalculation_interval", category="sheets", timeout=60, side_effects=True)
     def _execute_set_recalculation_interval(self, arguments: dict) -> dict:
         """Execute the set_recalculation_interval tool call."""
         if not self._sheets_enabled():
@@ -707,6 +727,7 @@ class SheetsAdvancedMixin:
             logger.error(f"Error setting recalculation interval: {e}")
             return {"success": False, "message": f"Error setting recalculation interval: {str(e)}"}
 
+    @tool("get_spreadsheet_properties", category="sheets", timeout=60)
     def _execute_get_spreadsheet_properties(self, arguments: dict) -> dict:
         """Execute the get_spreadsheet_properties tool call."""
         if not self._sheets_enabled():
@@ -738,6 +759,7 @@ class SheetsAdvancedMixin:
             logger.error(f"Error getting spreadsheet properties: {e}")
             return {"success": False, "message": f"Error getting properties: {str(e)}"}
 
+    @tool("set_spreadsheet_theme", category="sheets", timeout=60, side_effects=True)
     def _execute_set_spreadsheet_theme(self, arguments: dict) -> dict:
         """Execute the set_spreadsheet_theme tool call."""
         if not self._sheets_enabled():
@@ -797,6 +819,7 @@ class SheetsAdvancedMixin:
 
     # Developer Metadata tool execution methods (Batch 9)
 
+    @tool("set_developer_metadata", category="sheets", timeout=60, side_effects=True)
     def _execute_set_developer_metadata(self, arguments: dict) -> dict:
         """Execute the set_developer_metadata tool call."""
         if not self._sheets_enabled():
@@ -848,6 +871,7 @@ class SheetsAdvancedMixin:
             logger.error(f"Error setting developer metadata: {e}")
             return {"success": False, "message": f"Error setting metadata: {str(e)}"}
 
+    @tool("get_developer_metadata", category="sheets", timeout=60)
     def _execute_get_developer_metadata(self, arguments: dict) -> dict:
         """Execute the get_developer_metadata tool call."""
         if not self._sheets_enabled():
@@ -881,6 +905,7 @@ class SheetsAdvancedMixin:
             logger.error(f"Error getting developer metadata: {e}")
             return {"success": False, "message": f"Error getting metadata: {str(e)}"}
 
+    @tool("delete_developer_metadata", category="sheets", timeout=60, side_effects=True)
     def _execute_delete_developer_metadata(self, arguments: dict) -> dict:
         """Execute the delete_developer_metadata tool call."""
         if not self._sheets_enabled():
@@ -918,6 +943,7 @@ class SheetsAdvancedMixin:
 
     # Member memory tool execution methods
 
+    @tool("save_member_memory", category="member_memory", side_effects=True)
     def _execute_save_member_memory(self, arguments: dict) -> dict:
         """Execute the save_member_memory tool call."""
         if not self.bot_data.get('member_memory_tools_enabled'):
@@ -941,6 +967,7 @@ class SheetsAdvancedMixin:
 
         try:
             from signal_bot.models import GroupMemberMemory, MessageLog, db
+            from signal_bot.member_memory_index import invalidate_member_memory_index
             from datetime import datetime
 
             # Try to find member_id from message logs
@@ -1007,6 +1034,7 @@ class SheetsAdvancedMixin:
                 action = "Saved"
 
             db.session.commit()
+            invalidate_member_memory_index(self.group_id)
 
             logger.info(f"Member memory {action.lower()}: {canonical_name} ({slot_type}): {content[:50]}...")
 
@@ -1025,6 +1053,7 @@ class SheetsAdvancedMixin:
             logger.error(f"Error saving member memory: {e}")
             return {"success": False, "message": f"Error saving memory: {str(e)}"}
 
+    @tool("get_member_memories", category="member_memory")
     def _execute_get_member_memories(self, arguments: dict) -> dict:
         """Execute the get_member_memories tool call."""
         if not self.bot_data.get('member_memory_tools_enabled'):
@@ -1131,6 +1160,7 @@ class SheetsAdvancedMixin:
             logger.error(f"Error getting member memories: {e}")
             return {"success": False, "message": f"Error getting memories: {str(e)}"}
 
+    @tool("delete_member_memory", category="member_memory", side_effects=True)
     def _execute_delete_member_memory(self, arguments: dict) -> dict:
         """Execute the delete_member_memory tool call."""
         if not self.bot_data.get('member_memory_tools_enabled'):
@@ -1151,6 +1181,7 @@ class SheetsAdvancedMixin:
 
         try:
             from signal_bot.models import GroupMemberMemory, MessageLog, db
+            from signal_bot.member_memory_index import invalidate_member_memory_index
 
             # Try to find member_id from message logs
             msg = MessageLog.query.filter_by(
@@ -1212,6 +1243,7 @@ class SheetsAdvancedMixin:
                         db.session.delete(mem)
 
                 db.session.commit()
+                invalidate_member_memory_index(self.group_id)
 
                 if deleted_count == 0:
                     return {
@@ -1263,6 +1295,7 @@ class SheetsAdvancedMixin:
                 old_content = memory.content
                 db.session.delete(memory)
                 db.session.commit()
+                invalidate_member_memory_index(self.group_id)
 
                 logger.info(f"Deleted {slot_type} memory for {canonical_name}: {old_content[:50]}...")
                 return {
@@ -1279,6 +1312,7 @@ class SheetsAdvancedMixin:
             logger.error(f"Error deleting member memory: {e}")
             return {"success": False, "message": f"Error deleting memory: {str(e)}"}
 
+    @tool("list_group_members", category="member_memory")
     def _execute_list_group_members(self, arguments: dict) -> dict:
         """Execute the list_group_members tool call."""
         if not self.bot_data.get('member_memory_tools_enabled'):
@@ -1393,6 +1427,7 @@ class SheetsAdvancedMixin:
     # Sheet Properties Extension Tools
     # =========================================================================
 
+    @tool("hide_sheet", category="sheets", timeout=60, side_effects=True)
     def _execute_hide_sheet(self, arguments: dict) -> dict:
         """Execute the hide_sheet tool call."""
         if not self._sheets_enabled():
@@ -1428,6 +1463,7 @@ class SheetsAdvancedMixin:
             logger.error(f"Error hiding sheet: {e}")
             return {"success": False, "message": f"Error hiding sheet: {str(e)}"}
 
+    @tool("show_sheet", category="sheets", timeout=60, side_effects=True)
     def _execute_show_sheet(self, arguments: dict) -> dict:
         """Execute the show_sheet tool call."""
         if not self._sheets_enabled():
@@ -1463,6 +1499,7 @@ class SheetsAdvancedMixin:
             logger.error(f"Error showing sheet: {e}")
             return {"success": False, "message": f"Error showing sheet: {str(e)}"}
 
+    @tool("set_tab_color", category="sheets", timeout=60, side_effects=True)
     def _execute_set_tab_color(self, arguments: dict) -> dict:
         """Execute the set_tab_color tool call."""
         if not self._sheets_enabled():
@@ -1502,6 +1539,7 @@ class SheetsAdvancedMixin:
             logger.error(f"Error setting tab color: {e}")
             return {"success": False, "message": f"Error setting tab color: {str(e)}"}
 
+    @tool("set_right_to_left", category="sheets", timeout=60, side_effects=True)
     def _execute_set_right_to_left(self, arguments: dict) -> dict:
         """Execute the set_right_to_left tool call."""
         if not self._sheets_enabled():
@@ -1539,6 +1577,7 @@ class SheetsAdvancedMixin:
             logger.error(f"Error setting RTL: {e}")
             return {"success": False, "message": f"Error setting RTL: {str(e)}"}
 
+    @tool("get_sheet_properties", category="sheets", timeout=60)
     def _execute_get_sheet_properties(self, arguments: dict) -> dict:
         """Execute the get_sheet_properties tool call."""
         if not self._sheets_enabled():
@@ -1576,6 +1615,7 @@ class SheetsAdvancedMixin:
     # Protected Ranges Management Tools
     # =========================================================================
 
+    @tool("list_protected_ranges", category="sheets", timeout=60)
     def _execute_list_protected_ranges(self, arguments: dict) -> dict:
         """Execute the list_protected_ranges tool call."""
         if not self._sheets_enabled():
@@ -1609,6 +1649,7 @@ class SheetsAdvancedMixin:
             logger.error(f"Error listing protected ranges: {e}")
             return {"success": False, "message": f"Error listing protected ranges: {str(e)}"}
 
+    @tool("update_protected_range", category="sheets", timeout=60, side_effects=True)
     def _execute_update_protected_range(self, arguments: dict) -> dict:
         """Execute the update_protected_range tool call."""
         if not self._sheets_enabled():
@@ -1650,6 +1691,7 @@ class SheetsAdvancedMixin:
             logger.error(f"Error updating protected range: {e}")
             return {"success": False, "message": f"Error updating protected range: {str(e)}"}
 
+    @tool("delete_protected_range", category="sheets", timeout=60, side_effects=True)
     def _execute_delete_protected_range(self, arguments: dict) -> dict:
         """Execute the delete_protected_range tool call."""
         if not self._sheets_enabled():
@@ -1685,6 +1727,7 @@ class SheetsAdvancedMixin:
             logger.error(f"Error deleting protected range: {e}")
             return {"success": False, "message": f"Error deleting protected range: {str(e)}"}
 
+    @tool("protect_sheet", category="sheets", timeout=60, side_effects=True)
     def _execute_protect_sheet(self, arguments: dict) -> dict:
         """Execute the protect_sheet tool call."""
         if not self._sheets_enabled():
@@ -1732,6 +1775,7 @@ class SheetsAdvancedMixin:
     # Filter Views Tools
     # =========================================================================
 
+    @tool("list_filter_views", category="sheets", timeout=60)
     def _execute_list_filter_views(self, arguments: dict) -> dict:
         """Execute the list_filter_views tool call."""
         if not self._sheets_enabled():
@@ -1769,6 +1813,7 @@ class SheetsAdvancedMixin:
     # Dimension Groups (Row/Column Grouping) Tools
     # =========================================================================
 
+    @tool("create_row_group", category="sheets", timeout=60, side_effects=True)
     def _execute_create_row_group(self, arguments: dict) -> dict:
         """Execute the create_row_group tool call."""
         if not self._sheets_enabled():
@@ -1810,6 +1855,7 @@ class SheetsAdvancedMixin:
             logger.error(f"Error creating row group: {e}")
             return {"success": False, "message": f"Error creating row group: {str(e)}"}
 
+    @tool("create_column_group", category="sheets", timeout=60, side_effects=True)
     def _execute_create_column_group(self, arguments: dict) -> dict:
         """Execute the create_column_group tool call."""
         if not self._sheets_enabled():
@@ -1851,6 +1897,7 @@ class SheetsAdvancedMixin:
             logger.error(f"Error creating column group: {e}")
             return {"success": False, "message": f"Error creating column group: {str(e)}"}
 
+    @tool("delete_row_group", category="sheets", timeout=60, side_effects=True)
     def _execute_delete_row_group(self, arguments: dict) -> dict:
         """Execute the delete_row_group tool call."""
         if not self._sheets_enabled():
@@ -1892,6 +1939,7 @@ class SheetsAdvancedMixin:
             logger.error(f"Error deleting row group: {e}")
             return {"success": False, "message": f"Error deleting row group: {str(e)}"}
 
+    @tool("delete_column_group", category="sheets", timeout=60, side_effects=True)
     def _execute_delete_column_group(self, arguments: dict) -> dict:
         """Execute the delete_column_group tool call."""
         if not self._sheets_enabled():
@@ -1933,6 +1981,7 @@ class SheetsAdvancedMixin:
             logger.error(f"Error deleting column group: {e}")
             return {"success": False, "message": f"Error deleting column group: {str(e)}"}
 
+    @tool("collapse_expand_group", category="sheets", timeout=60, side_effects=True)
     def _execute_collapse_expand_group(self, arguments: dict) -> dict:
         """Execute the collapse_expand_group tool call."""
         if not self._sheets_enabled():
@@ -1988,6 +2037,7 @@ class SheetsAdvancedMixin:
             logger.error(f"Error updating dimension group: {e}")
             return {"success": False, "message": f"Error updating dimension group: {str(e)}"}
 
+    @tool("set_group_control_position", category="sheets", timeout=60, side_effects=True)
     def _execute_set_group_control_position(self, arguments: dict) -> dict:
         """Execute the set_group_control_position tool call."""
         if not self._sheets_enabled():
@@ -2029,6 +2079,7 @@ class SheetsAdvancedMixin:
 
     # ==================== Slicers ====================
 
+    @tool("list_slicers", category="sheets", timeout=60)
     def _execute_list_slicers(self, arguments: dict) -> dict:
         """Execute the list_slicers tool call."""
         if not self._sheets_enabled():
@@ -2062,6 +2113,7 @@ class SheetsAdvancedMixin:
             logger.error(f"Error listing slicers: {e}")
             return {"success": False, "message": f"Error listing slicers: {str(e)}"}
 
+    @tool("create_slicer", category="sheets", timeout=60, side_effects=True)
     def _execute_create_slicer(self, arguments: dict) -> dict:
         """Execute the create_slicer tool call."""
         if not self._sheets_enabled():
@@ -2111,6 +2163,7 @@ class SheetsAdvancedMixin:
             logger.error(f"Error creating slicer: {e}")
             return {"success": False, "message": f"Error creating slicer: {str(e)}"}
 
+    @tool("update_slicer", category="sheets", timeout=60, side_effects=True)
     def _execute_update_slicer(self, arguments: dict) -> dict:
         """Execute the update_slicer tool call."""
         if not self._sheets_enabled():
@@ -2152,6 +2205,7 @@ class SheetsAdvancedMixin:
             logger.error(f"Error updating slicer: {e}")
             return {"success": False, "message": f"Error updating slicer: {str(e)}"}
 
+    @tool("delete_slicer", category="sheets", timeout=60, side_effects=True)
     def _execute_delete_slicer(self, arguments: dict) -> dict:
         """Execute the delete_slicer tool call."""
         if not self._sheets_enabled():
@@ -2189,6 +2243,7 @@ class SheetsAdvancedMixin:
 
     # ==================== Tables ====================
 
+    @tool("list_tables", category="sheets", timeout=60)
     def _execute_list_tables(self, arguments: dict) -> dict:
         """Execute the list_tables tool call."""
         if not self._sheets_enabled():
@@ -2220,6 +2275,7 @@ class SheetsAdvancedMixin:
             logger.error(f"Error listing tables: {e}")
             return {"success": False, "message": f"Error listing tables: {str(e)}"}
 
+    @tool("create_table", category="sheets", timeout=60, side_effects=True)
     def _execute_create_table(self, arguments: dict) -> dict:
         """Execute the create_table tool call."""
         if not self._sheets_enabled():
@@ -2264,6 +2320,7 @@ class SheetsAdvancedMixin:
             logger.error(f"Error creating table: {e}")
             return {"success": False, "message": f"Error creating table: {str(e)}"}
 
+    @tool("delete_table", category="sheets", timeout=60, side_effects=True)
     def _execute_delete_table(self, arguments: dict) -> dict:
         """Execute the delete_table tool call."""
         if not self._sheets_enabled():
@@ -2299,6 +2356,7 @@ class SheetsAdvancedMixin:
             logger.error(f"Error deleting table: {e}")
             return {"success": False, "message": f"Error deleting table: {str(e)}"}
 
+    @tool("update_table_column", category="sheets", timeout=60, side_effects=True)
     def _execute_update_table_column(self, arguments: dict) -> dict:
         """Execute the update_table_column tool call."""
         if not self._sheets_enabled():
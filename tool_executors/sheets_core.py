@@ -7,6 +7,8 @@ Contains core spreadsheet operations: create, read, write, format, etc.
 import logging
 from typing import Optional
 
+from .registry import tool
+
 logger = logging.getLogger(__name__)
 
 
@@ -25,6 +27,7 @@ class SheetsCoreMixin:
             self.bot_data.get('google_connected', False)
         )
 
+    @tool("create_spreadsheet", category="sheets", timeout=60, side_effects=True)
     def _execute_create_spreadsheet(self, arguments: dict) -> dict:
         """Execute the create_spreadsheet tool call."""
         if not self._sheets_enabled():
@@ -60,6 +63,7 @@ class SheetsCoreMixin:
             logger.error(f"Error creating spreadsheet: {e}")
             return {"success": False, "message": f"Error creating spreadsheet: {str(e)}"}
 
+    @tool("list_spreadsheets", category="sheets", timeout=60)
     def _execute_list_spreadsheets(self, arguments: dict) -> dict:
         """Execute the list_spreadsheets tool call."""
         if not self._sheets_enabled():
@@ -86,6 +90,7 @@ class SheetsCoreMixin:
             logger.error(f"Error listing spreadsheets: {e}")
             return {"success": False, "message": f"Error listing spreadsheets: {str(e)}"}
 
+    @tool("read_sheet", category="sheets", timeout=60)
     def _execute_read_sheet(self, arguments: dict) -> dict:
         """Execute the read_sheet tool call."""
         if not self._sheets_enabled():
@@ -119,6 +124,7 @@ class SheetsCoreMixin:
             logger.error(f"Error reading sheet: {e}")
             return {"success": False, "message": f"Error reading sheet: {str(e)}"}
 
+    @tool("write_to_sheet", category="sheets", timeout=60, side_effects=True)
     def _execute_write_to_sheet(self, arguments: dict) -> dict:
         """Execute the write_to_sheet tool call."""
         if not self._sheets_enabled():
@@ -158,6 +164,7 @@ class SheetsCoreMixin:
             logger.error(f"Error writing to sheet: {e}")
             return {"success": False, "message": f"Error writing to sheet: {str(e)}"}
 
+    @tool("add_row_to_sheet", category="sheets", timeout=60, side_effects=True)
     def _execute_add_row_to_sheet(self, arguments: dict) -> dict:
         """Execute the add_row_to_sheet tool call."""
         if not self._sheets_enabled():
@@ -197,6 +204,7 @@ class SheetsCoreMixin:
             logger.error(f"Error adding row to sheet: {e}")
             return {"success": False, "message": f"Error adding row to sheet: {str(e)}"}
 
+    @tool("search_sheets", category="sheets", timeout=60)
     def _execute_search_sheets(self, arguments: dict) -> dict:
         """Execute the search_sheets tool call."""
         if not self._sheets_enabled():
@@ -229,6 +237,7 @@ class SheetsCoreMixin:
             logger.error(f"Error searching sheets: {e}")
             return {"success": False, "message": f"Error searching sheets: {str(e)}"}
 
+    @tool("format_columns", category="sheets", timeout=60, side_effects=True)
     def _execute_format_columns(self, arguments: dict) -> dict:
         """Execute the format_columns tool call."""
         if not self._sheets_enabled():
@@ -275,6 +284,7 @@ class SheetsCoreMixin:
             logger.error(f"Error formatting columns: {e}")
             return {"success": False, "message": f"Error formatting columns: {str(e)}"}
 
+    @tool("clear_range", category="sheets", timeout=60, side_effects=True)
     def _execute_clear_range(self, arguments: dict) -> dict:
         """Execute the clear_range tool call."""
         if not self._sheets_enabled():
@@ -310,6 +320,7 @@ class SheetsCoreMixin:
             logger.error(f"Error clearing range: {e}")
             return {"success": False, "message": f"Error clearing range: {str(e)}"}
 
+    @tool("delete_rows", category="sheets", timeout=60, side_effects=True)
     def _execute_delete_rows(self, arguments: dict) -> dict:
         """Execute the delete_rows tool call."""
         if not self._sheets_enabled():
@@ -349,6 +360,7 @@ class SheetsCoreMixin:
             logger.error(f"Error deleting rows: {e}")
             return {"success": False, "message": f"Error deleting rows: {str(e)}"}
 
+    @tool("delete_columns", category="sheets", timeout=60, side_effects=True)
     def _execute_delete_columns(self, arguments: dict) -> dict:
         """Execute the delete_columns tool call."""
         if not self._sheets_enabled():
@@ -384,6 +396,7 @@ class SheetsCoreMixin:
             logger.error(f"Error deleting columns: {e}")
             return {"success": False, "message": f"Error deleting columns: {str(e)}"}
 
+    @tool("insert_rows", category="sheets", timeout=60, side_effects=True)
     def _execute_insert_rows(self, arguments: dict) -> dict:
         """Execute the insert_rows tool call."""
         if not self._sheets_enabled():
@@ -423,6 +436,7 @@ class SheetsCoreMixin:
             logger.error(f"Error inserting rows: {e}")
             return {"success": False, "message": f"Error inserting rows: {str(e)}"}
 
+    @tool("insert_columns", category="sheets", timeout=60, side_effects=True)
     def _execute_insert_columns(self, arguments: dict) -> dict:
         """Execute the insert_columns tool call."""
         if not self._sheets_enabled():
@@ -460,6 +474,7 @@ class SheetsCoreMixin:
             logger.error(f"Error inserting columns: {e}")
             return {"success": False, "message": f"Error inserting columns: {str(e)}"}
 
+    @tool("add_sheet", category="sheets", timeout=60, side_effects=True)
     def _execute_add_sheet(self, arguments: dict) -> dict:
         """Execute the add_sheet tool call."""
         if not self._sheets_enabled():
@@ -495,6 +510,7 @@ class SheetsCoreMixin:
             logger.error(f"Error adding sheet: {e}")
             return {"success": False, "message": f"Error adding sheet: {str(e)}"}
 
+    @tool("delete_sheet", category="sheets", timeout=60, side_effects=True)
     def _execute_delete_sheet(self, arguments: dict) -> dict:
         """Execute the delete_sheet tool call."""
         if not self._sheets_enabled():
@@ -530,6 +546,7 @@ class SheetsCoreMixin:
             logger.error(f"Error deleting sheet: {e}")
             return {"success": False, "message": f"Error deleting sheet: {str(e)}"}
 
+    @tool("rename_sheet", category="sheets", timeout=60, side_effects=True)
     def _execute_rename_sheet(self, arguments: dict) -> dict:
         """Execute the rename_sheet tool call."""
         if not self._sheets_enabled():
@@ -569,6 +586,7 @@ class SheetsCoreMixin:
             logger.error(f"Error renaming sheet: {e}")
             return {"success": False, "message": f"Error renaming sheet: {str(e)}"}
 
+    @tool("freeze_rows", category="sheets", timeout=60, side_effects=True)
     def _execute_freeze_rows(self, arguments: dict) -> dict:
         """Execute the freeze_rows tool call."""
         if not self._sheets_enabled():
@@ -606,6 +624,7 @@ class SheetsCoreMixin:
             logger.error(f"Error freezing rows: {e}")
             return {"success": False, "message": f"Error freezing rows: {str(e)}"}
 
+    @tool("freeze_columns", category="sheets", timeout=60, side_effects=True)
     def _execute_freeze_columns(self, arguments: dict) -> dict:
         """Execute the freeze_columns tool call."""
         if not self._sheets_enabled():
@@ -643,6 +662,7 @@ class SheetsCoreMixin:
             logger.error(f"Error freezing columns: {e}")
             return {"success": False, "message": f"Error freezing columns: {str(e)}"}
 
+    @tool("sort_range", category="sheets", timeout=60, side_effects=True)
     def _execute_sort_range(self, arguments: dict) -> dict:
         """Execute the sort_range tool call."""
         if not self._sheets_enabled():
@@ -682,6 +702,7 @@ class SheetsCoreMixin:
             logger.error(f"Error sorting range: {e}")
             return {"success": False, "message": f"Error sorting range: {str(e)}"}
 
+    @tool("auto_resize_columns", category="sheets", timeout=60, side_effects=True)
     def _execute_auto_resize_columns(self, arguments: dict) -> dict:
         """Execute the auto_resize_columns tool call."""
         if not self._sheets_enabled():
@@ -715,6 +736,7 @@ class SheetsCoreMixin:
             logger.error(f"Error auto-resizing columns: {e}")
             return {"success": False, "message": f"Error auto-resizing columns: {str(e)}"}
 
+    @tool("merge_cells", category="sheets", timeout=60, side_effects=True)
     def _execute_merge_cells(self, arguments: dict) -> dict:
         """Execute the merge_cells tool call."""
         if not self._sheets_enabled():
@@ -750,6 +772,7 @@ class SheetsCoreMixin:
             logger.error(f"Error merging cells: {e}")
             return {"success": False, "message": f"Error merging cells: {str(e)}"}
 
+    @tool("unmerge_cells", category="sheets", timeout=60, side_effects=True)
     def _execute_unmerge_cells(self, arguments: dict) -> dict:
         """Execute the unmerge_cells tool call."""
         if not self._sheets_enabled():
@@ -787,6 +810,7 @@ class SheetsCoreMixin:
 
     # Batch 4: Formatting & Validation tool execution methods
 
+    @tool("conditional_format", category="sheets", timeout=60, side_effects=True)
     def _execute_conditional_format(self, arguments: dict) -> dict:
         """Execute the conditional_format tool call."""
         if not self._sheets_enabled():
@@ -832,6 +856,7 @@ class SheetsCoreMixin:
             logger.error(f"Error adding conditional format: {e}")
             return {"success": False, "message": f"Error adding conditional format: {str(e)}"}
 
+    @tool("data_validation", category="sheets", timeout=60, side_effects=True)
     def _execute_data_validation(self, arguments: dict) -> dict:
         """Execute the data_validation tool call."""
         if not self._sheets_enabled():
@@ -879,6 +904,7 @@ class SheetsCoreMixin:
             logger.error(f"Error adding data validation: {e}")
             return {"success": False, "message": f"Error adding data validation: {str(e)}"}
 
+    @tool("alternating_colors", category="sheets", timeout=60, side_effects=True)
     def _execute_alternating_colors(self, arguments: dict) -> dict:
         """Execute the alternating_colors tool call."""
         if not self._sheets_enabled():
@@ -922,6 +948,7 @@ class SheetsCoreMixin:
 
     # Batch 5: Cell Enhancements tool execution methods
 
+    @tool("add_note", category="sheets", timeout=60, side_effects=True)
     def _execute_add_note(self, arguments: dict) -> dict:
         """Execute the add_note tool call."""
         if not self._sheets_enabled():
@@ -959,6 +986,7 @@ class SheetsCoreMixin:
             logger.error(f"Error adding note: {e}")
             return {"success": False, "message": f"Error adding note: {str(e)}"}
 
+    @tool("set_borders", category="sheets", timeout=60, side_effects=True)
     def _execute_set_borders(self, arguments: dict) -> dict:
         """Execute the set_borders tool call."""
         if not self._sheets_enabled():
@@ -1000,6 +1028,7 @@ class SheetsCoreMixin:
             logger.error(f"Error setting borders: {e}")
             return {"success": False, "message": f"Error setting borders: {str(e)}"}
 
+    @tool("set_alignment", category="sheets", timeout=60, side_effects=True)
     def _execute_set_alignment(self, arguments: dict) -> dict:
         """Execute the set_alignment tool call."""
         if not self._sheets_enabled():
@@ -1045,6 +1074,7 @@ class SheetsCoreMixin:
 
     # Batch 10: Additional Cell Formatting tool execution methods
 
+    @tool("set_text_direction", category="sheets", timeout=60, side_effects=True)
     def _execute_set_text_direction(self, arguments: dict) -> dict:
         """Execute the set_text_direction tool call."""
         if not self._sheets_enabled():
@@ -1084,6 +1114,7 @@ class SheetsCoreMixin:
             logger.error(f"Error setting text direction: {e}")
             return {"success": False, "message": f"Error setting text direction: {str(e)}"}
 
+    @tool("set_text_rotation", category="sheets", timeout=60, side_effects=True)
     def _execute_set_text_rotation(self, arguments: dict) -> dict:
         """Execute the set_text_rotation tool call."""
         if not self._sheets_enabled():
@@ -1126,6 +1157,7 @@ class SheetsCoreMixin:
             logger.error(f"Error setting text rotation: {e}")
             return {"success": False, "message": f"Error setting text rotation: {str(e)}"}
 
+    @tool("set_cell_padding", category="sheets", timeout=60, side_effects=True)
     def _execute_set_cell_padding(self, arguments: dict) -> dict:
         """Execute the set_cell_padding tool call."""
         if not self._sheets_enabled():
@@ -1171,6 +1203,7 @@ class SheetsCoreMixin:
             logger.error(f"Error setting cell padding: {e}")
             return {"success": False, "message": f"Error setting cell padding: {str(e)}"}
 
+    @tool("set_rich_text", category="sheets", timeout=60, side_effects=True)
     def _execute_set_rich_text(self, arguments: dict) -> dict:
         """Execute the set_rich_text tool call."""
         if not self._sheets_enabled():
@@ -1216,6 +1249,7 @@ class SheetsCoreMixin:
 
     # Batch 6: Charts tool execution methods
 
+    @tool("create_chart", category="sheets", timeout=60, side_effects=True)
     def _execute_create_chart(self, arguments: dict) -> dict:
         """Execute the create_chart tool call."""
         if not self._sheets_enabled():
@@ -1259,6 +1293,7 @@ class SheetsCoreMixin:
             logger.error(f"Error creating chart: {e}")
             return {"success": False, "message": f"Error creating chart: {str(e)}"}
 
+    @tool("list_charts", category="sheets", timeout=60)
     def _execute_list_charts(self, arguments: dict) -> dict:
         """Execute the list_charts tool call."""
         if not self._sheets_enabled():
@@ -1290,6 +1325,7 @@ class SheetsCoreMixin:
             logger.error(f"Error listing charts: {e}")
             return {"success": False, "message": f"Error listing charts: {str(e)}"}
 
+    @tool("update_chart", category="sheets", timeout=60, side_effects=True)
     def _execute_update_chart(self, arguments: dict) -> dict:
         """Execute the update_chart tool call."""
         if not self._sheets_enabled():
@@ -1329,6 +1365,7 @@ class SheetsCoreMixin:
             logger.error(f"Error updating chart: {e}")
             return {"success": False, "message": f"Error updating chart: {str(e)}"}
 
+    @tool("delete_chart", category="sheets", timeout=60, side_effects=True)
     def _execute_delete_chart(self, arguments: dict) -> dict:
         """Execute the delete_chart tool call."""
         if not self._sheets_enabled():
@@ -1366,6 +1403,7 @@ class SheetsCoreMixin:
 
     # Batch 7: Pivot Tables tool execution methods
 
+    @tool("create_pivot_table", category="sheets", timeout=60, side_effects=True)
     def _execute_create_pivot_table(self, arguments: dict) -> dict:
         """Execute the create_pivot_table tool call."""
         if not self._sheets_enabled():
@@ -1421,6 +1459,7 @@ class SheetsCoreMixin:
             logger.error(f"Error creating pivot table: {e}")
             return {"success": False, "message": f"Error creating pivot table: {str(e)}"}
 
+    @tool("delete_pivot_table", category="sheets", timeout=60, side_effects=True)
     def _execute_delete_pivot_table(self, arguments: dict) -> dict:
         """Execute the delete_pivot_table tool call."""
         if not self._sheets_enabled():
@@ -10,65 +10,75 @@ This package contains tool definitions organized by category:
 - memory_tools: Member memory management
 - trigger_tools: Scheduled triggers
 - dnd_tools: D&D Game Master tools
+- categories: Finance/sheets meta-tool categories
 - helpers: Meta-tool generation and context selection
+- routing / learned_router: Fast-path tool routing (keyword and learned)
 - constants: Model lists and capability patterns
-"""
-
-# Constants
-from .constants import AVAILABLE_MODELS, TOOL_CAPABLE_MODEL_PATTERNS
-
-# Agent/GUI tools
-from .agent_tools import AGENT_TOOLS, SIGNAL_TOOLS
-
-# Basic tools (weather, time, wikipedia, reaction, dice)
-from .basic_tools import (
-    WEATHER_TOOL,
-    TIME_TOOLS,
-    WIKIPEDIA_TOOLS,
-    REACTION_TOOL,
-    DICE_TOOLS,
-)
 
-# Finance tools
-from .finance_tools import FINANCE_TOOLS, FINANCE_CATEGORIES
-
-# Google Sheets tools
-from .sheets_tools import SHEETS_TOOLS, SHEETS_CATEGORIES
+Exports are resolved lazily (PEP 562): ``from tool_schemas import X`` only
+imports the submodule that defines X, so bots with sheets or D&D disabled
+never load those schema modules.
+"""
 
-# Google Calendar tools
-from .calendar_tools import CALENDAR_TOOLS
+import importlib
 
-# Member memory tools
-from .memory_tools import MEMBER_MEMORY_TOOLS
+# Export name -> defining submodule
+_EXPORTS = {
+    # Constants
+    'AVAILABLE_MODELS': 'constants',
+    'TOOL_CAPABLE_MODEL_PATTERNS': 'constants',
+    # Agent/GUI tools
+    'AGENT_TOOLS': 'agent_tools',
+    'SIGNAL_TOOLS': 'agent_tools',
+    # Basic tools (weather, time, wikipedia, reaction, dice)
+    'WEATHER_TOOL': 'basic_tools',
+    'TIME_TOOLS': 'basic_tools',
+    'WIKIPEDIA_TOOLS': 'basic_tools',
+    'REACTION_TOOL': 'basic_tools',
+    'DICE_TOOLS': 'basic_tools',
+    # Finance, Google Sheets, Calendar, memory, trigger, D&D and chat log tools
+    'FINANCE_TOOLS': 'finance_tools',
+    'SHEETS_TOOLS': 'sheets_tools',
+    'CALENDAR_TOOLS': 'calendar_tools',
+    'MEMBER_MEMORY_TOOLS': 'memory_tools',
+    'TRIGGER_TOOLS': 'trigger_tools',
+    'DND_TOOLS': 'dnd_tools',
+    'CHAT_LOG_TOOLS': 'chat_log_tools',
+    # Categories
+    'FINANCE_CATEGORIES': 'categories',
+    'SHEETS_CATEGORIES': 'categories',
+    # Helper functions
+    'ALL_META_CATEGORIES': 'helpers',
+    'ToolBundle': 'helpers',
+    'get_meta_tools_for_categories': 'helpers',
+    'get_finance_meta_tools': 'helpers',
+    'get_sheets_meta_tools': 'helpers',
+    'get_tools_for_category': 'helpers',
+    'get_finance_tools_for_category': 'helpers',
+    'get_sheets_tools_for_category': 'helpers',
+    'get_tools_for_context': 'helpers',
+    'model_supports_tools': 'helpers',
+    # Fast-path routing
+    'route_tools_for_message': 'routing',
+    'detect_tool_domains': 'routing',
+    'get_fast_path_tools': 'routing',
+    'get_router_model': 'learned_router',
+    'log_tool_usage': 'learned_router',
+}
 
-# Scheduled trigger tools
-from .trigger_tools import TRIGGER_TOOLS
 
-# D&D Game Master tools
-from .dnd_tools import DND_TOOLS
+def __getattr__(name):
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module_name}", __name__), name)
+    globals()[name] = value  # Later lookups skip __getattr__
+    return value
 
-# Chat log search tools
-from .chat_log_tools import CHAT_LOG_TOOLS
 
-# Helper functions
-from .helpers import (
-    ALL_META_CATEGORIES,
-    get_meta_tools_for_categories,
-    get_finance_meta_tools,
-    get_sheets_meta_tools,
-    get_tools_for_category,
-    get_finance_tools_for_category,
-    get_sheets_tools_for_category,
-    get_tools_for_context,
-    model_supports_tools,
-)
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS))
 
-# Fast-path routing
-from .routing import (
-    route_tools_for_message,
-    detect_tool_domains,
-    get_fast_path_tools,
-)
 
 __all__ = [
     # Constants
@@ -93,6 +103,7 @@ __all__ = [
     'FINANCE_CATEGORIES',
     'SHEETS_CATEGORIES',
     'ALL_META_CATEGORIES',
+    'ToolBundle',
     # Functions
     'get_meta_tools_for_categories',
     'get_finance_meta_tools',
@@ -106,4 +117,6 @@ __all__ = [
     'route_tools_for_message',
     'detect_tool_domains',
     'get_fast_path_tools',
+    'get_router_model',
+    'log_tool_usage',
 ]
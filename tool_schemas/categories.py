@@ -0,0 +1,75 @@
+"""
+Meta-tool category definitions for finance and sheets tools.
+
+Kept apart from the (large) schema modules so meta-tool lists and
+category lookups don't load the full tool definitions.
+"""
+
+# Two-phase meta-tool categories for finance tools
+FINANCE_CATEGORIES = {
+    "finance_quotes": {
+        "description": "Get current stock/crypto prices, search tickers, find top movers",
+        "sub_tools": ["get_stock_quote", "search_stocks", "get_top_stocks"]
+    },
+    "finance_analysis": {
+        "description": "Get news, analyst ratings, and ownership data",
+        "sub_tools": ["get_stock_news", "get_analyst_ratings", "get_holders"]
+    },
+    "finance_fundamentals": {
+        "description": "Get price history, earnings, dividends, financials, options",
+        "sub_tools": ["get_price_history", "get_earnings", "get_dividends", "get_financials", "get_options"]
+    }
+}
+
+
+# Two-phase meta-tool categories for sheets tools
+SHEETS_CATEGORIES = {
+    "sheets_core": {
+        "description": "Create, read, write, and search spreadsheets",
+        "sub_tools": ["create_spreadsheet", "list_spreadsheets", "read_sheet", "write_to_sheet", "add_row_to_sheet", "search_sheets"]
+    },
+    "sheets_rows_columns": {
+        "description": "Insert, delete, clear, and sort rows/columns",
+        "sub_tools": ["delete_rows", "delete_columns", "insert_rows", "insert_columns", "clear_range", "sort_range"]
+    },
+    "sheets_tabs": {
+        "description": "Add, delete, rename, hide/show sheet tabs",
+        "sub_tools": ["add_sheet", "delete_sheet", "rename_sheet", "hide_sheet", "show_sheet", "get_sheet_properties"]
+    },
+    "sheets_formatting": {
+        "description": "Text styles, colors, borders, alignment, cell formatting",
+        "sub_tools": ["format_columns", "set_text_format", "set_text_color", "set_background_color", "set_alignment", "set_borders", "set_text_direction", "set_text_rotation", "set_cell_padding", "set_rich_text", "merge_cells", "unmerge_cells"]
+    },
+    "sheets_layout": {
+        "description": "Freeze rows/columns, resize, banding, tab colors",
+        "sub_tools": ["freeze_rows", "freeze_columns", "auto_resize_columns", "alternating_colors", "set_tab_color"]
+    },
+    "sheets_charts": {
+        "description": "Create, update, list, delete charts",
+        "sub_tools": ["create_chart", "list_charts", "update_chart", "delete_chart"]
+    },
+    "sheets_pivot_tables": {
+        "description": "Create and manage pivot tables for data analysis",
+        "sub_tools": ["create_pivot_table", "delete_pivot_table", "list_pivot_tables", "get_pivot_table"]
+    },
+    "sheets_validation": {
+        "description": "Conditional formatting, data validation, cell notes",
+        "sub_tools": ["conditional_format", "data_validation", "add_note"]
+    },
+    "sheets_filtering": {
+        "description": "Basic filters and filter views",
+        "sub_tools": ["set_basic_filter", "clear_basic_filter", "create_filter_view", "delete_filter_view", "list_filter_views"]
+    },
+    "sheets_protection": {
+        "description": "Named ranges and cell/sheet protection",
+        "sub_tools": ["create_named_range", "delete_named_range", "list_named_ranges", "protect_range", "list_protected_ranges", "update_protected_range", "delete_protected_range", "protect_sheet"]
+    },
+    "sheets_grouping": {
+        "description": "Row/column groups and slicers for interactive filtering",
+        "sub_tools": ["create_row_group", "create_column_group", "delete_row_group", "delete_column_group", "collapse_expand_group", "set_group_control_position", "list_slicers", "create_slicer", "update_slicer", "delete_slicer"]
+    },
+    "sheets_advanced": {
+        "description": "Tables, find/replace, copy/paste, spreadsheet properties, developer metadata",
+        "sub_tools": ["list_tables", "create_table", "delete_table", "update_table_column", "add_hyperlink", "find_replace", "copy_paste", "cut_paste", "set_spreadsheet_timezone", "set_spreadsheet_locale", "set_recalculation_interval", "get_spreadsheet_properties", "set_spreadsheet_theme", "set_developer_metadata", "get_developer_metadata", "delete_developer_metadata", "set_right_to_left"]
+    }
+}
@@ -4,6 +4,8 @@ Finance tool schemas for Signal bots.
 Contains stock, crypto, and financial data tools.
 """
 
+from .categories import FINANCE_CATEGORIES  # noqa: F401 (re-exported)
+
 # Finance tools for Signal bots
 FINANCE_TOOLS = [
     {
@@ -267,19 +269,3 @@ FINANCE_TOOLS = [
         }
     }
 ]
-
-# Two-phase meta-tool categories for finance tools
-FINANCE_CATEGORIES = {
-    "finance_quotes": {
-        "description": "Get current stock/crypto prices, search tickers, find top movers",
-        "sub_tools": ["get_stock_quote", "search_stocks", "get_top_stocks"]
-    },
-    "finance_analysis": {
-        "description": "Get news, analyst ratings, and ownership data",
-        "sub_tools": ["get_stock_news", "get_analyst_ratings", "get_holders"]
-    },
-    "finance_fundamentals": {
-        "description": "Get price history, earnings, dividends, financials, options",
-        "sub_tools": ["get_price_history", "get_earnings", "get_dividends", "get_financials", "get_options"]
-    }
-}
@@ -2,24 +2,48 @@
 Helper functions for tool schemas.
 
 Contains meta-tool generation, tool selection, and model capability detection.
+
+Schema modules are imported on first use, so a bot only loads the tool
+definitions for the features it has enabled.
 """
 
+import json
+from functools import cached_property, lru_cache
 from typing import Optional
 
 from .constants import TOOL_CAPABLE_MODEL_PATTERNS
-from .agent_tools import AGENT_TOOLS, SIGNAL_TOOLS
-from .basic_tools import WEATHER_TOOL, TIME_TOOLS, WIKIPEDIA_TOOLS, REACTION_TOOL, DICE_TOOLS
-from .finance_tools import FINANCE_TOOLS, FINANCE_CATEGORIES
-from .sheets_tools import SHEETS_TOOLS, SHEETS_CATEGORIES
-from .calendar_tools import CALENDAR_TOOLS
-from .memory_tools import MEMBER_MEMORY_TOOLS
-from .trigger_tools import TRIGGER_TOOLS
-from .dnd_tools import DND_TOOLS
-from .chat_log_tools import CHAT_LOG_TOOLS
+from .categories import FINANCE_CATEGORIES, SHEETS_CATEGORIES
 
 # Combined lookup for all meta-tool categories
 ALL_META_CATEGORIES = {**FINANCE_CATEGORIES, **SHEETS_CATEGORIES}
 
+# Signal tool feature flags, in bitmask order (see get_tools_for_context)
+SIGNAL_TOOL_FLAGS = (
+    "image", "weather", "finance", "time", "wikipedia", "reaction",
+    "sheets", "calendar", "member_memory", "triggers", "dnd", "chat_log",
+)
+
+
+class ToolBundle(tuple):
+    """
+    An immutable, shareable tool list with its JSON encoding cached.
+
+    Bundles are memoised per feature set, so the same object (and the same
+    encoded bytes) is reused for every message with that configuration.
+    The request payload builder splices json_bytes in directly instead of
+    re-encoding the schemas.
+    """
+
+    @cached_property
+    def json_bytes(self) -> bytes:
+        """Compact JSON encoding of the tool list."""
+        return json.dumps(list(self), separators=(",", ":")).encode("utf-8")
+
+    @cached_property
+    def names(self) -> tuple:
+        """Function names of the tools, in order."""
+        return tuple(t["function"]["name"] for t in self)
+
 
 def get_meta_tools_for_categories(categories: dict) -> list:
     """Generate meta-tool definitions from a categories dict."""
@@ -46,14 +70,19 @@ def get_meta_tools_for_categories(categories: dict) -> list:
     return meta_tools
 
 
+@lru_cache(maxsize=None)
+def _meta_tools(group: str) -> tuple:
+    return tuple(get_meta_tools_for_categories(FINANCE_CATEGORIES if group == "finance" else SHEETS_CATEGORIES))
+
+
 def get_finance_meta_tools() -> list:
     """Get the 3 finance meta-tools for Phase 1."""
-    return get_meta_tools_for_categories(FINANCE_CATEGORIES)
+    return list(_meta_tools("finance"))
 
 
 def get_sheets_meta_tools() -> list:
     """Get the 12 sheets meta-tools for Phase 1."""
-    return get_meta_tools_for_categories(SHEETS_CATEGORIES)
+    return list(_meta_tools("sheets"))
 
 
 def get_tools_for_category(category: str, source_tools: list, categories: dict) -> list:
@@ -64,14 +93,23 @@ def get_tools_for_category(category: str, source_tools: list, categories: dict)
     return [t for t in source_tools if t["function"]["name"] in sub_tool_names]
 
 
+@lru_cache(maxsize=None)
+def _category_tools(group: str, category: str) -> tuple:
+    if group == "finance":
+        from .finance_tools import FINANCE_TOOLS
+        return tuple(get_tools_for_category(category, FINANCE_TOOLS, FINANCE_CATEGORIES))
+    from .sheets_tools import SHEETS_TOOLS
+    return tuple(get_tools_for_category(category, SHEETS_TOOLS, SHEETS_CATEGORIES))
+
+
 def get_finance_tools_for_category(category: str) -> list:
     """Get finance tools for a specific category."""
-    return get_tools_for_category(category, FINANCE_TOOLS, FINANCE_CATEGORIES)
+    return list(_category_tools("finance", category))
 
 
 def get_sheets_tools_for_category(category: str) -> list:
     """Get sheets tools for a specific category."""
-    return get_tools_for_category(category, SHEETS_TOOLS, SHEETS_CATEGORIES)
+    return list(_category_tools("sheets", category))
 
 
 def get_tools_for_context(
@@ -112,78 +150,112 @@ def get_tools_for_context(
         triggers_enabled: Include scheduled trigger tools (Signal bot only)
         dnd_enabled: Include D&D Game Master tools (Signal bot only)
         chat_log_enabled: Include chat log search tools (Signal bot only)
-        expanded_categories: Dict mapping tool group to expanded category name
-                            e.g. {"finance": "finance_quotes", "sheets": "sheets_core"}
+        expanded_categories: Dict mapping tool group to expanded category names
+                            e.g. {"finance": {"finance_quotes"}, "sheets": {"sheets_core"}}
 
     Returns:
-        List of tool definitions appropriate for the context
+        List of tool definitions appropriate for the context. Signal tool lists
+        are memoised ToolBundles (immutable, with cached JSON encoding).
     """
-    expanded_categories = expanded_categories or {}
+    if context != "signal":
+        from .agent_tools import AGENT_TOOLS
+        return AGENT_TOOLS
 
-    if context == "signal":
-        tools = []
-        if image_enabled:
-            tools.extend(SIGNAL_TOOLS)
-        if weather_enabled:
-            tools.append(WEATHER_TOOL)
-
-        # Finance tools - use two-phase expansion
-        if finance_enabled:
-            finance_expanded = expanded_categories.get("finance", set())
-            if finance_expanded:
-                # Phase 2: Show expanded categories' tools + remaining meta-tools
-                for category in finance_expanded:
-                    tools.extend(get_finance_tools_for_category(category))
-                tools.extend([m for m in get_finance_meta_tools()
-                             if m["function"]["name"] not in finance_expanded])
-            else:
-                # Phase 1: Show only meta-tools
-                tools.extend(get_finance_meta_tools())
-
-        if time_enabled:
-            tools.extend(TIME_TOOLS)
-        if wikipedia_enabled:
-            tools.extend(WIKIPEDIA_TOOLS)
-        if reaction_enabled:
-            tools.append(REACTION_TOOL)
-
-        # Sheets tools - use two-phase expansion
-        if sheets_enabled:
-            sheets_expanded = expanded_categories.get("sheets", set())
-            if sheets_expanded:
-                # Phase 2: Show expanded categories' tools + remaining meta-tools
-                for category in sheets_expanded:
-                    tools.extend(get_sheets_tools_for_category(category))
-                tools.extend([m for m in get_sheets_meta_tools()
-                             if m["function"]["name"] not in sheets_expanded])
-            else:
-                # Phase 1: Show only meta-tools
-                tools.extend(get_sheets_meta_tools())
-
-        # Calendar tools - simple list (9 tools, no meta-expansion needed)
-        if calendar_enabled:
-            tools.extend(CALENDAR_TOOLS)
-
-        if member_memory_enabled:
-            tools.extend(MEMBER_MEMORY_TOOLS)
-
-        # Trigger tools - simple list (4 tools)
-        if triggers_enabled:
-            tools.extend(TRIGGER_TOOLS)
-
-        # D&D Game Master tools - for running campaigns (10 tools)
-        if dnd_enabled:
-            tools.extend(DND_TOOLS)
-
-        # Chat log search tools (2 tools)
-        if chat_log_enabled:
-            tools.extend(CHAT_LOG_TOOLS)
-
-        # Dice tools - always available (no toggle needed)
-        tools.extend(DICE_TOOLS)
-
-        return tools
-    return AGENT_TOOLS
+    flags = (image_enabled, weather_enabled, finance_enabled, time_enabled, wikipedia_enabled,
+             reaction_enabled, sheets_enabled, calendar_enabled, member_memory_enabled,
+             triggers_enabled, dnd_enabled, chat_log_enabled)
+    mask = sum(1 << i for i, enabled in enumerate(flags) if enabled)
+
+    expanded_categories = expanded_categories or {}
+    return _signal_tool_bundle(
+        mask,
+        _category_set(expanded_categories.get("finance")) if finance_enabled else frozenset(),
+        _category_set(expanded_categories.get("sheets")) if sheets_enabled else frozenset(),
+    )
+
+
+def _category_set(categories) -> frozenset:
+    """Normalise an expanded-categories entry (set, list or a single name) for use as a cache key."""
+    if not categories:
+        return frozenset()
+    if isinstance(categories, str):
+        return frozenset([categories])
+    return frozenset(categories)
+
+
+@lru_cache(maxsize=256)
+def _signal_tool_bundle(mask: int, finance_expanded: frozenset, sheets_expanded: frozenset) -> ToolBundle:
+    """Build the Signal tool list for a feature bitmask (SIGNAL_TOOL_FLAGS order) and expansion state."""
+    from .basic_tools import WEATHER_TOOL, TIME_TOOLS, WIKIPEDIA_TOOLS, REACTION_TOOL, DICE_TOOLS
+
+    enabled = {flag for i, flag in enumerate(SIGNAL_TOOL_FLAGS) if mask & (1 << i)}
+
+    tools = []
+    if "image" in enabled:
+        from .agent_tools import SIGNAL_TOOLS
+        tools.extend(SIGNAL_TOOLS)
+    if "weather" in enabled:
+        tools.append(WEATHER_TOOL)
+
+    # Finance tools - use two-phase expansion
+    if "finance" in enabled:
+        if finance_expanded:
+            # Phase 2: Show expanded categories' tools + remaining meta-tools
+            for category in sorted(finance_expanded):  # Stable order keeps the prompt prefix cacheable
+                tools.extend(_category_tools("finance", category))
+            tools.extend([m for m in _meta_tools("finance")
+                         if m["function"]["name"] not in finance_expanded])
+        else:
+            # Phase 1: Show only meta-tools
+            tools.extend(_meta_tools("finance"))
+
+    if "time" in enabled:
+        tools.extend(TIME_TOOLS)
+    if "wikipedia" in enabled:
+        tools.extend(WIKIPEDIA_TOOLS)
+    if "reaction" in enabled:
+        tools.append(REACTION_TOOL)
+
+    # Sheets tools - use two-phase expansion
+    if "sheets" in enabled:
+        if sheets_expanded:
+            # Phase 2: Show expanded categories' tools + remaining meta-tools
+            for category in sorted(sheets_expanded):  # Stable order keeps the prompt prefix cacheable
+                tools.extend(_category_tools("sheets", category))
+            tools.extend([m for m in _meta_tools("sheets")
+                         if m["function"]["name"] not in sheets_expanded])
+        else:
+            # Phase 1: Show only meta-tools
+            tools.extend(_meta_tools("sheets"))
+
+    # Calendar tools - simple list (9 tools, no meta-expansion needed)
+    if "calendar" in enabled:
+        from .calendar_tools import CALENDAR_TOOLS
+        tools.extend(CALENDAR_TOOLS)
+
+    if "member_memory" in enabled:
+        from .memory_tools import MEMBER_MEMORY_TOOLS
+        tools.extend(MEMBER_MEMORY_TOOLS)
+
+    # Trigger tools - simple list (4 tools)
+    if "triggers" in enabled:
+        from .trigger_tools import TRIGGER_TOOLS
+        tools.extend(TRIGGER_TOOLS)
+
+    # D&D Game Master tools - for running campaigns (10 tools)
+    if "dnd" in enabled:
+        from .dnd_tools import DND_TOOLS
+        tools.extend(DND_TOOLS)
+
+    # Chat log search tools (2 tools)
+    if "chat_log" in enabled:
+        from .chat_log_tools import CHAT_LOG_TOOLS
+        tools.extend(CHAT_LOG_TOOLS)
+
+    # Dice tools - always available (no toggle needed)
+    tools.extend(DICE_TOOLS)
+
+    return ToolBundle(tools)
 
 
 def model_supports_tools(model_id: str) -> bool:
@@ -0,0 +1,414 @@
+"""
+Learned tool routing from logged tool usage.
+
+A small multi-label linear classifier (one logistic regression per tool
+domain) over hashed word and character n-grams. It is trained offline from
+the (message, tools actually used) pairs the Signal bots log to
+``logs/tool_usage.jsonl`` and predicts which tool domains a new message
+needs. Prediction is a sparse dot product over a few hundred features, well
+under a millisecond per message.
+
+When a trained model is present, routing.route_tools_for_message uses it in
+place of the keyword sets; without one (or without NumPy) the keyword
+fast-path is used as before.
+
+Usage:
+    python -m tool_schemas.learned_router train [--data PATH] [--model PATH]
+    python -m tool_schemas.learned_router evaluate [--data PATH] [--model PATH]
+"""
+import argparse
+import json
+import logging
+import math
+import random
+import re
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Iterable, Optional
+
+try:
+    import numpy as np
+except ImportError:  # Router is optional; keyword routing is used without it
+    np = None
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = Path(__file__).parent.parent
+TOOL_USAGE_LOG_PATH = PROJECT_ROOT / "logs" / "tool_usage.jsonl"
+ROUTER_MODEL_PATH = PROJECT_ROOT / "settings" / "tool_router.npz"
+
+# Domains the router predicts (same names as routing.get_fast_path_tools)
+DOMAINS = ("calendar", "weather", "time", "wikipedia", "dice", "finance", "sheets", "triggers", "chat_log")
+
+FEATURE_BITS = 14  # 16384 hashed features
+CONFIDENCE_THRESHOLD = 0.6  # Minimum probability for a domain to be fast-pathed
+MAX_ROUTED_DOMAINS = 2  # More confident domains than this -> use the full meta-tool system
+
+_WORD_PATTERN = re.compile(r"[a-z0-9$/%]+")
+_CHAR_NGRAM = 3
+
+_tool_domains: Optional[dict[str, str]] = None
+
+
+def get_tool_domain_map() -> dict[str, str]:
+    """Map tool and meta-tool names to routing domains (tools outside any domain are omitted)."""
+    global _tool_domains
+    if _tool_domains is None:
+        from .basic_tools import WEATHER_TOOL, TIME_TOOLS, WIKIPEDIA_TOOLS, DICE_TOOLS
+        from .calendar_tools import CALENDAR_TOOLS
+        from .trigger_tools import TRIGGER_TOOLS
+        from .finance_tools import FINANCE_TOOLS, FINANCE_CATEGORIES
+        from .sheets_tools import SHEETS_TOOLS, SHEETS_CATEGORIES
+        from .chat_log_tools import CHAT_LOG_TOOLS
+
+        tool_sets = {
+            "calendar": CALENDAR_TOOLS,
+            "weather": [WEATHER_TOOL],
+            "time": TIME_TOOLS,
+            "wikipedia": WIKIPEDIA_TOOLS,
+            "dice": DICE_TOOLS,
+            "finance": FINANCE_TOOLS,
+            "sheets": SHEETS_TOOLS,
+            "triggers": TRIGGER_TOOLS,
+            "chat_log": CHAT_LOG_TOOLS,
+        }
+        mapping = {t["function"]["name"]: domain for domain, tools in tool_sets.items() for t in tools}
+        mapping.update({name: "finance" for name in FINANCE_CATEGORIES})
+        mapping.update({name: "sheets" for name in SHEETS_CATEGORIES})
+        _tool_domains = mapping
+    return _tool_domains
+
+
+def tools_to_domains(tool_names: Iterable[str]) -> set[str]:
+    """Convert the tool names used for a message into routing domains."""
+    mapping = get_tool_domain_map()
+    return {mapping[name] for name in tool_names if name in mapping}
+
+
+def extract_features(message: str) -> list[str]:
+    """Word unigrams/bigrams and character trigrams of a message, plus a ticker flag."""
+    from .routing import TICKER_PATTERN
+
+    words = _WORD_PATTERN.findall(message.lower())
+    features = [f"w:{w}" for w in words]
+    features.extend(f"b:{a} {b}" for a, b in zip(words, words[1:]))
+    for word in words:
+        padded = f" {word} "
+        features.extend(f"c:{padded[i:i + _CHAR_NGRAM]}" for i in range(len(padded) - _CHAR_NGRAM + 1))
+    if TICKER_PATTERN.search(message):
+        features.append("ticker")
+    return features
+
+
+def _vectorize(message: str):
+    """Hash a message's features into (indices, L2-normalised values)."""
+    mask = (1 << FEATURE_BITS) - 1
+    features = extract_features(message)
+    if not features:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32)
+    hashed = np.fromiter((zlib.crc32(f.encode()) & mask for f in features), dtype=np.int64, count=len(features))
+    indices, counts = np.unique(hashed, return_counts=True)
+    values = counts.astype(np.float32)
+    values /= np.sqrt(np.dot(values, values))
+    return indices, values
+
+
+class ToolRouterModel:
+    """One-vs-rest logistic regression over hashed n-gram features."""
+
+    def __init__(self, weights, bias, domains: tuple = DOMAINS):
+        self.weights = weights  # (n_features, n_domains)
+        self.bias = bias  # (n_domains,)
+        self.domains = tuple(domains)
+
+    def predict_proba(self, message: str) -> dict[str, float]:
+        """Probability that each domain's tools are needed for the message."""
+        indices, values = _vectorize(message)
+        scores = values @ self.weights[indices] + self.bias
+        probs = 1.0 / (1.0 + np.exp(-scores))
+        return dict(zip(self.domains, probs.tolist()))
+
+    def top_domains(self, message: str, k: int = MAX_ROUTED_DOMAINS,
+                    threshold: float = CONFIDENCE_THRESHOLD) -> list[tuple[str, float]]:
+        """Up to k (domain, probability) pairs at or above the threshold, most likely first."""
+        ranked = sorted(self.predict_proba(message).items(), key=lambda item: item[1], reverse=True)
+        return [(domain, p) for domain, p in ranked[:k] if p >= threshold]
+
+    def select_domains(self, message: str) -> Optional[list[str]]:
+        """
+        Domains to fast-path for a message.
+
+        Returns:
+            List of confident domains (empty if the message needs no tools),
+            or None if too many domains are likely and the full meta-tool
+            system should be used.
+        """
+        confident = self.top_domains(message, k=MAX_ROUTED_DOMAINS + 1)
+        if len(confident) > MAX_ROUTED_DOMAINS:
+            return None
+        return [domain for domain, _ in confident]
+
+    def save(self, path: Path = ROUTER_MODEL_PATH):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        np.savez_compressed(path, weights=self.weights, bias=self.bias, domains=np.array(self.domains),
+                            feature_bits=np.array(FEATURE_BITS))
+
+    @classmethod
+    def load(cls, path: Path = ROUTER_MODEL_PATH) -> "ToolRouterModel":
+        with np.load(path) as data:
+            if int(data["feature_bits"]) != FEATURE_BITS:
+                raise ValueError(f"Model uses {int(data['feature_bits'])} feature bits, expected {FEATURE_BITS}")
+            return cls(data["weights"], data["bias"], tuple(str(d) for d in data["domains"]))
+
+
+def train_model(samples: list[tuple[str, set[str]]], epochs: int = 15, learning_rate: float = 0.5,
+                l2: float = 1e-6, seed: int = 0) -> ToolRouterModel:
+    """
+    Train a router with plain SGD on the logistic loss.
+
+    Args:
+        samples: (message, domains used) pairs; an empty domain set means no tools were used
+        epochs: Passes over the training data
+        learning_rate: Initial step size (decays as 1/sqrt(epoch))
+        l2: L2 penalty on the touched weights
+        seed: Shuffle seed
+    """
+    n_domains = len(DOMAINS)
+    weights = np.zeros((1 << FEATURE_BITS, n_domains), dtype=np.float32)
+    bias = np.zeros(n_domains, dtype=np.float32)
+
+    vectors = [_vectorize(message) for message, _ in samples]
+    targets = [np.array([d in used for d in DOMAINS], dtype=np.float32) for _, used in samples]
+    order = list(range(len(samples)))
+    rng = random.Random(seed)
+
+    for epoch in range(epochs):
+        rng.shuffle(order)
+        step = learning_rate / math.sqrt(epoch + 1)
+        for i in order:
+            indices, values = vectors[i]
+            rows = weights[indices]
+            probs = 1.0 / (1.0 + np.exp(-(values @ rows + bias)))
+            grad = probs - targets[i]
+            weights[indices] = rows - step * (np.outer(values, grad) + l2 * rows)
+            bias -= step * grad
+
+    return ToolRouterModel(weights, bias)
+
+
+_model: Optional[ToolRouterModel] = None
+_model_loaded = False
+_model_lock = threading.Lock()
+
+
+def get_router_model() -> Optional[ToolRouterModel]:
+    """The trained router (loaded once), or None if there is no model or NumPy is missing."""
+    global _model, _model_loaded
+    if _model_loaded:
+        return _model
+    with _model_lock:
+        if not _model_loaded:
+            if np is not None and ROUTER_MODEL_PATH.exists():
+                try:
+                    _model = ToolRouterModel.load(ROUTER_MODEL_PATH)
+                    logger.info(f"Loaded learned tool router from {ROUTER_MODEL_PATH}")
+                except Exception as e:
+                    logger.warning(f"Could not load learned tool router: {e}")
+            _model_loaded = True
+    return _model
+
+
+_log_lock = threading.Lock()
+
+
+def _backup_path(path: Path, n: int) -> Path:
+    return path.with_name(f"{path.name}.{n}")
+
+
+def _rotate_log(path: Path, backups: int):
+    """Shift path -> path.1 -> path.2 ...; the oldest backup beyond `backups` is deleted."""
+    if backups <= 0:
+        path.unlink(missing_ok=True)
+        return
+    _backup_path(path, backups).unlink(missing_ok=True)
+    for n in range(backups - 1, 0, -1):
+        if _backup_path(path, n).exists():
+            _backup_path(path, n).replace(_backup_path(path, n + 1))
+    path.replace(_backup_path(path, 1))
+
+
+def log_tool_usage(message: str, tool_names: list[str], bot_id: Optional[str] = None,
+                   routed: Optional[str] = None):
+    """Append a (message, tools used) training example to the tool usage log.
+
+    Callers check config.TOOL_USAGE_LOG_ENABLED. The log is rotated at
+    TOOL_USAGE_LOG_MAX_BYTES, keeping TOOL_USAGE_LOG_BACKUPS older files.
+    """
+    from config import TOOL_USAGE_LOG_MAX_BYTES, TOOL_USAGE_LOG_BACKUPS
+
+    if not message:
+        return
+    record = {
+        "ts": time.time(),
+        "bot_id": bot_id,
+        "message": message,
+        "tools": tool_names,
+        "routed": routed,
+    }
+    line = json.dumps(record) + "\n"
+    try:
+        with _log_lock:
+            TOOL_USAGE_LOG_PATH.parent.mkdir(parents=True, exist_ok=True)
+            if (TOOL_USAGE_LOG_PATH.exists() and
+                    TOOL_USAGE_LOG_PATH.stat().st_size + len(line) > TOOL_USAGE_LOG_MAX_BYTES):
+                _rotate_log(TOOL_USAGE_LOG_PATH, TOOL_USAGE_LOG_BACKUPS)
+            with open(TOOL_USAGE_LOG_PATH, "a", encoding="utf-8") as f:
+                f.write(line)
+    except OSError as e:
+        logger.warning(f"Could not write tool usage log: {e}")
+
+
+def load_samples(path: Path) -> list[tuple[str, set[str]]]:
+    """Read (message, domains used) pairs from a tool usage log and its rotated backups."""
+    paths = []
+    n = 1
+    while _backup_path(path, n).exists():
+        paths.append(_backup_path(path, n))
+        n += 1
+    paths.reverse()  # Oldest first
+    if path.exists() or not paths:
+        paths.append(path)
+
+    samples = []
+    for log_path in paths:
+        with open(log_path, encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if record.get("message"):
+                    samples.append((record["message"], tools_to_domains(record.get("tools") or [])))
+    return samples
+
+
+def _split(samples: list, test_fraction: float = 0.2, seed: int = 0) -> tuple[list, list]:
+    shuffled = list(samples)
+    random.Random(seed).shuffle(shuffled)
+    cut = int(len(shuffled) * (1 - test_fraction))
+    return shuffled[:cut], shuffled[cut:]
+
+
+def _keyword_decision(message: str) -> list[str]:
+    """What the keyword router would fast-path (single matches only)."""
+    from .routing import detect_tool_domains
+
+    domains = detect_tool_domains(message)
+    return list(domains) if len(domains) == 1 else []
+
+
+def evaluate(model: ToolRouterModel, samples: list[tuple[str, set[str]]]) -> dict:
+    """
+    Score a router against held-out samples, alongside the keyword router.
+
+    A routing decision is "covered" when the fast-pathed domains include
+    everything the message actually used (no meta-tool round trip needed),
+    and "wasted" when it fast-paths domains for a message that used no tools.
+    """
+    stats = {d: {"tp": 0, "fp": 0, "fn": 0} for d in DOMAINS}
+    summary = {"samples": len(samples)}
+    for name in ("learned", "keyword"):
+        summary[name] = {"routed": 0, "covered": 0, "wasted": 0}
+
+    timings = []
+    for message, used in samples:
+        start = time.perf_counter()
+        selected = model.select_domains(message) or []
+        timings.append(time.perf_counter() - start)
+
+        for domain in DOMAINS:
+            if domain in selected and domain in used:
+                stats[domain]["tp"] += 1
+            elif domain in selected:
+                stats[domain]["fp"] += 1
+            elif domain in used:
+                stats[domain]["fn"] += 1
+
+        for name, decision in (("learned", selected), ("keyword", _keyword_decision(message))):
+            if decision:
+                summary[name]["routed"] += 1
+                if used and used <= set(decision):
+                    summary[name]["covered"] += 1
+                if not used:
+                    summary[name]["wasted"] += 1
+
+    summary["per_domain"] = {}
+    for domain, s in stats.items():
+        if s["tp"] + s["fp"] + s["fn"] == 0:
+            continue
+        precision = s["tp"] / (s["tp"] + s["fp"]) if s["tp"] + s["fp"] else 0.0
+        recall = s["tp"] / (s["tp"] + s["fn"]) if s["tp"] + s["fn"] else 0.0
+        summary["per_domain"][domain] = {"precision": round(precision, 3), "recall": round(recall, 3),
+                                         "support": s["tp"] + s["fn"]}
+
+    if timings:
+        timings.sort()
+        summary["avg_us"] = round(sum(timings) / len(timings) * 1e6, 1)
+        summary["p99_us"] = round(timings[min(len(timings) - 1, int(len(timings) * 0.99))] * 1e6, 1)
+    return summary
+
+
+def _print_summary(summary: dict):
+    print(f"Samples: {summary['samples']}")
+    print(f"{'domain':<10} {'precision':>9} {'recall':>7} {'support':>8}")
+    for domain, s in summary["per_domain"].items():
+        print(f"{domain:<10} {s['precision']:>9.3f} {s['recall']:>7.3f} {s['support']:>8}")
+    needs_tools = sum(s["support"] for s in summary["per_domain"].values())
+    print(f"\n{'router':<8} {'fast-pathed':>11} {'covered':>8} {'wasted':>7}")
+    for name in ("learned", "keyword"):
+        s = summary[name]
+        print(f"{name:<8} {s['routed']:>11} {s['covered']:>8} {s['wasted']:>7}")
+    print(f"(domain uses in test set: {needs_tools})")
+    if "avg_us" in summary:
+        print(f"\nPrediction latency: avg {summary['avg_us']} us, p99 {summary['p99_us']} us")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Train or evaluate the learned tool router")
+    parser.add_argument("command", choices=["train", "evaluate"])
+    parser.add_argument("--data", type=Path, default=TOOL_USAGE_LOG_PATH, help="Tool usage log (JSONL)")
+    parser.add_argument("--model", type=Path, default=ROUTER_MODEL_PATH, help="Model file (.npz)")
+    parser.add_argument("--epochs", type=int, default=15)
+    parser.add_argument("--test-fraction", type=float, default=0.2)
+    args = parser.parse_args()
+
+    if np is None:
+        parser.error("NumPy is required to train or evaluate the tool router")
+
+    samples = load_samples(args.data)
+    if not samples:
+        parser.error(f"No training samples in {args.data}")
+
+    if args.command == "train":
+        train, test = _split(samples, args.test_fraction)
+        start = time.perf_counter()
+        model = train_model(train, epochs=args.epochs)
+        print(f"Trained on {len(train)} samples in {time.perf_counter() - start:.1f}s")
+        if test:
+            _print_summary(evaluate(model, test))
+        # Final model uses all samples
+        model = train_model(samples, epochs=args.epochs)
+        model.save(args.model)
+        print(f"\nSaved model to {args.model}")
+    else:
+        _print_summary(evaluate(ToolRouterModel.load(args.model), samples))
+
+
+if __name__ == "__main__":
+    main()
@@ -5,6 +5,7 @@ Routes obvious single-domain requests directly to focused tool sets,
 bypassing meta-tool expansion for better accuracy and lower latency.
 """
 import re
+from functools import lru_cache
 from typing import Optional, Set, Tuple
 
 # HIGH-CONFIDENCE: Fast-path immediately (unambiguous)
@@ -36,7 +37,7 @@ SHEETS_STRONG_SIGNALS = {"spreadsheet", "google sheet", "add to sheet", "update
 DND_CONTEXT_SIGNALS = {"campaign", "character", "inventory", "gold pieces", "dungeon"}
 
 
-def detect_tool_domains(message: str, dnd_enabled: bool = False) -> Set[str]:
+def detect_tool_domains(message: str, dnd_enabled: bool = False, features=None) -> Set[str]:
     """
     Detect which tool domains match the message.
 
@@ -44,51 +45,45 @@ def detect_tool_domains(message: str, dnd_enabled: bool = False) -> Set[str]:
     - Empty set: no matches, use full system
     - Single item: fast-path candidate
     - Multiple items: use full system (ambiguous)
+
+    Args:
+        message: The user's message text
+        dnd_enabled: Whether D&D context can suppress the finance fast-path
+        features: Pre-computed MessageFeatures for the message (analysed here if omitted)
     """
-    message_lower = message.lower()
+    if features is None:
+        from signal_bot.message_features import analyze_message
+        features = analyze_message(message)
     matched = set()
 
     # Check high-confidence keywords first
-    for domain, keywords in HIGH_CONFIDENCE_KEYWORDS.items():
-        if any(kw in message_lower for kw in keywords):
+    for domain in HIGH_CONFIDENCE_KEYWORDS:
+        if features.has(f"high:{domain}"):
             matched.add(domain)
 
     # Finance: Use ticker pattern detection
-    if TICKER_PATTERN.search(message):
+    if features.has_ticker:
         # Suppress if D&D context is strong (avoid "stock of arrows" confusion)
-        if not (dnd_enabled and any(sig in message_lower for sig in DND_CONTEXT_SIGNALS)):
+        if not (dnd_enabled and features.has("dnd_context")):
             matched.add("finance")
-    elif any(sig in message_lower for sig in FINANCE_STRONG_SIGNALS):
+    elif features.has("finance_strong"):
         matched.add("finance")
 
     # Sheets: Strong signals only
-    if any(sig in message_lower for sig in SHEETS_STRONG_SIGNALS):
+    if features.has("sheets_strong"):
         matched.add("sheets")
 
     # Medium-confidence: only add if no high-confidence matches yet
     if len(matched) == 0:
-        for domain, keywords in MEDIUM_CONFIDENCE_KEYWORDS.items():
-            if any(kw in message_lower for kw in keywords):
+        for domain in MEDIUM_CONFIDENCE_KEYWORDS:
+            if features.has(f"medium:{domain}"):
                 matched.add(domain)
 
     return matched
 
 
-def get_fast_path_tools(domain: str, bot_data: dict) -> Optional[list]:
-    """
-    Return focused tool set for a single domain.
-
-    Returns None if the domain is not enabled in bot_data.
-    Always includes DICE_TOOLS (always-on).
-    Includes REACTION_TOOL if enabled (cross-cutting feature).
-    """
-    from .basic_tools import WEATHER_TOOL, TIME_TOOLS, WIKIPEDIA_TOOLS, DICE_TOOLS, REACTION_TOOL
-    from .calendar_tools import CALENDAR_TOOLS
-    from .trigger_tools import TRIGGER_TOOLS
-    from .finance_tools import FINANCE_TOOLS
-    from .chat_log_tools import CHAT_LOG_TOOLS
-
-    # Check if domain is enabled
+def _domain_enabled(domain: str, bot_data: dict) -> bool:
+    """Whether a routing domain's tools are enabled for a bot."""
     enabled_map = {
         "calendar": bot_data.get("google_calendar_enabled") and bot_data.get("google_connected"),
         "weather": bot_data.get("weather_enabled"),
@@ -100,81 +95,143 @@ def get_fast_path_tools(domain: str, bot_data: dict) -> Optional[list]:
         "triggers": bot_data.get("triggers_enabled"),
         "chat_log": bot_data.get("chat_log_enabled"),
     }
+    return bool(enabled_map.get(domain, False))
 
-    if not enabled_map.get(domain, False):
-        return None
 
-    # Map domain to tool set
-    tool_map = {
-        "calendar": list(CALENDAR_TOOLS),
-        "weather": [WEATHER_TOOL],
-        "time": list(TIME_TOOLS),
-        "wikipedia": list(WIKIPEDIA_TOOLS),
-        "dice": list(DICE_TOOLS),
-        "triggers": list(TRIGGER_TOOLS),
-        "finance": list(FINANCE_TOOLS),  # All 11 tools - skip meta expansion!
-        "chat_log": list(CHAT_LOG_TOOLS),
-    }
+def get_fast_path_tools(domain: str, bot_data: dict) -> Optional[list]:
+    """
+    Return focused tool set for a single domain.
 
-    # Sheets: conservative fast-path - pre-expand sheets_core only
+    Returns None if the domain is not enabled in bot_data.
+    Always includes DICE_TOOLS (always-on).
+    Includes REACTION_TOOL if enabled (cross-cutting feature).
+    The result is a memoised ToolBundle shared by all bots with the same settings.
+    """
+    if not _domain_enabled(domain, bot_data):
+        return None
+    return _fast_path_bundle((domain,), bool(bot_data.get("reaction_tool_enabled")))
+
+
+def _domain_tools(domain: str) -> list:
+    """Fast-path tools for one domain (imports only that domain's schemas)."""
+    if domain == "calendar":
+        from .calendar_tools import CALENDAR_TOOLS
+        return list(CALENDAR_TOOLS)
+    if domain == "weather":
+        from .basic_tools import WEATHER_TOOL
+        return [WEATHER_TOOL]
+    if domain == "time":
+        from .basic_tools import TIME_TOOLS
+        return list(TIME_TOOLS)
+    if domain == "wikipedia":
+        from .basic_tools import WIKIPEDIA_TOOLS
+        return list(WIKIPEDIA_TOOLS)
+    if domain == "triggers":
+        from .trigger_tools import TRIGGER_TOOLS
+        return list(TRIGGER_TOOLS)
+    if domain == "finance":
+        from .finance_tools import FINANCE_TOOLS
+        return list(FINANCE_TOOLS)  # All 11 tools - skip meta expansion!
+    if domain == "chat_log":
+        from .chat_log_tools import CHAT_LOG_TOOLS
+        return list(CHAT_LOG_TOOLS)
     if domain == "sheets":
+        # Sheets: conservative fast-path - pre-expand sheets_core only
         from .helpers import get_sheets_tools_for_category, get_sheets_meta_tools
-        core_tools = get_sheets_tools_for_category("sheets_core")
-        other_metas = [m for m in get_sheets_meta_tools() if m["function"]["name"] != "sheets_core"]
-        tools = core_tools + other_metas + list(DICE_TOOLS)
-        if bot_data.get("reaction_tool_enabled"):
-            tools.append(REACTION_TOOL)
-        return tools
+        return get_sheets_tools_for_category("sheets_core") + \
+            [m for m in get_sheets_meta_tools() if m["function"]["name"] != "sheets_core"]
+    return []  # "dice" is added for every domain
 
-    # Get base tools for domain
-    base_tools = tool_map.get(domain, [])
 
-    # Always include dice (unless domain IS dice)
-    if domain != "dice":
-        base_tools = base_tools + list(DICE_TOOLS)
+@lru_cache(maxsize=128)
+def _fast_path_bundle(domains: tuple, reaction_enabled: bool):
+    """Fast-path tools for one or more domains (in order, no duplicates)."""
+    from .basic_tools import DICE_TOOLS, REACTION_TOOL
+    from .helpers import ToolBundle
 
-    # Include reaction tool if enabled (cross-cutting feature)
-    if bot_data.get("reaction_tool_enabled"):
-        base_tools = base_tools + [REACTION_TOOL]
+    tools = []
+    for domain in domains:
+        tools.extend(_domain_tools(domain))
 
-    return base_tools
+    # Always include dice
+    tools.extend(DICE_TOOLS)
+
+    # Include reaction tool if enabled (cross-cutting feature)
+    if reaction_enabled:
+        tools.append(REACTION_TOOL)
+
+    seen = set()
+    unique = []
+    for tool in tools:
+        name = tool["function"]["name"]
+        if name not in seen:
+            seen.add(name)
+            unique.append(tool)
+    return ToolBundle(unique)
+
+
+def _merge_fast_path_tools(domains: list, bot_data: dict) -> Optional[list]:
+    """Combine the fast-path tool sets of several domains (enabled domains only, no duplicates)."""
+    enabled = tuple(d for d in domains if _domain_enabled(d, bot_data))
+    if not enabled:
+        return None
+    return _fast_path_bundle(enabled, bool(bot_data.get("reaction_tool_enabled")))
 
 
 def route_tools_for_message(
     message: str,
     bot_data: dict,
-    expanded_categories: Optional[dict] = None
+    expanded_categories: Optional[dict] = None,
+    features=None
 ) -> Tuple[list, bool, Optional[str]]:
     """
     Route to appropriate tools based on message content.
 
-    Implements fast-path routing for obvious single-domain requests.
-    Falls back to full meta-tool system for ambiguous or multi-domain requests.
+    Implements fast-path routing for obvious requests: the learned router's
+    confident domains when a trained model is available, otherwise single
+    keyword matches. Falls back to full meta-tool system for ambiguous requests.
 
     Args:
         message: The user's message text
         bot_data: Bot configuration dictionary with feature flags
         expanded_categories: Current meta-tool expansion state (for fallback)
+        features: Pre-computed MessageFeatures for the message (optional)
 
     Returns:
         Tuple of (tools_list, fast_path_used, matched_domain)
         - tools_list: List of tool definitions
         - fast_path_used: True if fast-path was used
-        - matched_domain: Domain name if fast-path, None otherwise
+        - matched_domain: Domain name(s) if fast-path (joined with '+'), None otherwise
     """
     from .helpers import get_tools_for_context
+    from .learned_router import get_router_model
+    from signal_bot.message_features import analyze_message
 
     dnd_enabled = bot_data.get("dnd_enabled") and bot_data.get("google_connected")
-    domains = detect_tool_domains(message, dnd_enabled=dnd_enabled)
-
-    # Only fast-path for exactly 1 domain match
-    if len(domains) == 1:
-        domain = next(iter(domains))
-        tools = get_fast_path_tools(domain, bot_data)
-        if tools:
-            return tools, True, domain
-
-    # Fallback: full meta-tool system (0 matches or 2+ matches)
+    if features is None:
+        features = analyze_message(message)
+
+    model = get_router_model()
+    if model is not None:
+        # Learned router: fast-path the confident domains (up to MAX_ROUTED_DOMAINS)
+        domains = model.select_domains(message)
+        if domains and dnd_enabled and "finance" in domains and features.has("dnd_context"):
+            domains.remove("finance")
+        if domains:
+            tools = _merge_fast_path_tools(domains, bot_data)
+            if tools:
+                return tools, True, "+".join(domains)
+    else:
+        domains = detect_tool_domains(message, dnd_enabled=dnd_enabled, features=features)
+
+        # Only fast-path for exactly 1 domain match
+        if len(domains) == 1:
+            domain = next(iter(domains))
+            tools = get_fast_path_tools(domain, bot_data)
+            if tools:
+                return tools, True, domain
+
+    # Fallback: full meta-tool system (no confident match or ambiguous)
     tools = get_tools_for_context(
         context="signal",
         image_enabled=bot_data.get("image_generation_enabled", False),